@@ -0,0 +1,133 @@
+"""
+Benchmark of the analytic jacobians of the built-in 1d fit models.
+
+Each model is fitted on synthetic noisy data of increasing size, with and
+without its analytic jacobian, see sources.fit.getJacobian.
+The best time over several runs and the number of model evaluations are
+printed for each model, size and minimization method.
+
+Usage
+-----
+    python benchmarks/fit_jacobian.py
+    python benchmarks/fit_jacobian.py --sizes 1000 100000 --methods leastsq
+"""
+import argparse
+import time
+import numpy as np
+import lmfit
+from typing import List, Tuple
+
+from pyplotter.sources.fit import FitModel, getJacobian
+from pyplotter.ui.plot.plot1d import dialogFit
+
+
+# Model class name, x range, parameters used to generate the data
+MODELS = (('T11d',           (0., 50e-6),        {'amplitude' : 1.,
+                                                   't1' : 10e-6,
+                                                   'background' : 0.1}),
+          ('T2',             (0., 20e-6),        {'amplitude' : 0.5,
+                                                   'period' : 2e-6,
+                                                   'phi' : 0.,
+                                                   't2' : 5e-6,
+                                                   'background' : 0.}),
+          ('LorentzianPeak', (-1., 1.),          {'background' : 0.1,
+                                                   'center' : 0.05,
+                                                   'fwhm' : 0.1,
+                                                   'height' : 1.}),
+          ('GaussianPeak',   (-1., 1.),          {'background' : 0.1,
+                                                   'center' : 0.05,
+                                                   'fwhm' : 0.1,
+                                                   'height' : 1.}),
+          ('ResonanceDipdB', (5.998e9, 6.002e9), {'f0' : 6e9,
+                                                   'qi' : 1e5,
+                                                   'qc' : 5e4,
+                                                   'phi' : 0.1,
+                                                   'background' : -20.}))
+
+
+
+def getData(modelClass: type,
+            xRange: Tuple[float, float],
+            values: dict,
+            nbPoint: int,
+            rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the model evaluated on nbPoint points with 2% of gaussian noise.
+    """
+
+    x = np.linspace(*xRange, nbPoint)
+
+    p = lmfit.Parameters()
+    for name, value in values.items():
+        p.add(name, value=value)
+    y = FitModel(modelClass, x).func(p, x)
+
+    return x, y + 0.02*np.ptp(y)*rng.standard_normal(nbPoint)
+
+
+
+def benchmark(modelClass: type,
+              x: np.ndarray,
+              y: np.ndarray,
+              method: str,
+              jacobian: bool,
+              repeat: int) -> Tuple[float, int]:
+    """
+    Fit the data as fit1d does, return the best time and the number of model
+    evaluations.
+    """
+
+    model = FitModel(modelClass, x, y)
+
+    def residual(p: lmfit.Parameters) -> np.ndarray:
+        return model.func(p, model.xData) - model.yData
+
+    kwargs = getJacobian(model, method) if jacobian else {}
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = lmfit.minimize(residual,
+                                model.getInitialParams(),
+                                method=method,
+                                **kwargs)
+        best = min(best, time.perf_counter()-start)
+
+    return best, result.nfev
+
+
+
+def main(sizes: List[int],
+         methods: List[str],
+         repeat: int) -> None:
+
+    rng = np.random.default_rng(0)
+
+    print('{:<16} {:>8} {:<9} {:>12} {:>12} {:>7} {:>7}'.format('model', 'points', 'method',
+                                                                  'numeric (s)', 'analytic (s)',
+                                                                  'nfev', 'nfev'))
+    for name, xRange, values in MODELS:
+        modelClass = getattr(dialogFit, name)
+        for nbPoint in sizes:
+            x, y = getData(modelClass, xRange, values, nbPoint, rng)
+            for method in methods:
+                tNumeric, nfevNumeric = benchmark(modelClass, x, y, method, False, repeat)
+                tAnalytic, nfevAnalytic = benchmark(modelClass, x, y, method, True, repeat)
+                print('{:<16} {:>8} {:<9} {:>12.4f} {:>12.4f} {:>7} {:>7}'.format(name, nbPoint, method,
+                                                                                   tNumeric, tAnalytic,
+                                                                                   nfevNumeric, nfevAnalytic))
+
+
+
+if __name__=='__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                        help='Number of points of the fitted data.')
+    parser.add_argument('--methods', nargs='+', default=['leastsq', 'lbfgsb'],
+                        help='lmfit minimization methods.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of runs, the best time is kept.')
+    args = parser.parse_args()
+
+    main(args.sizes, args.methods, args.repeat)
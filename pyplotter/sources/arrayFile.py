@@ -0,0 +1,168 @@
+import os
+import numpy as np
+from typing import List, Dict
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+# Binary files read by getArrayMembers and loadArrayMembers
+NPY_EXTENSIONS     = ('npy',)
+HDF5_EXTENSIONS    = ('h5', 'hdf5')
+PARQUET_EXTENSIONS = ('parquet',)
+ARRAY_EXTENSIONS   = NPY_EXTENSIONS+HDF5_EXTENSIONS+PARQUET_EXTENSIONS
+
+
+
+def getExtension(filePath: str) -> str:
+
+    return os.path.splitext(filePath)[-1][1:].lower()
+
+
+
+def getNpyMembers(filePath: str) -> List[dict]:
+    """
+    Return the arrays of a .npy file, its header only being read.
+    A 2d array with at most config['npyMaxColumn'] columns is seen as
+    columns, as a csv file, other arrays as a whole.
+    """
+
+    array = np.load(filePath, mmap_mode='r')
+
+    if array.ndim==2 and array.shape[1]<=config['npyMaxColumn']:
+        return [{'name'   : 'column '+str(i),
+                 'shape'  : array.shape[:1],
+                 'dtype'  : array.dtype,
+                 'column' : i} for i in range(array.shape[1])]
+
+    return [{'name'   : os.path.splitext(os.path.basename(filePath))[0],
+             'shape'  : array.shape,
+             'dtype'  : array.dtype,
+             'column' : None}]
+
+
+
+def getHdf5Members(filePath: str) -> List[dict]:
+    """
+    Return the numerical datasets of a HDF5 file, of any group, without
+    reading their data.
+    The datasets stored contiguously and uncompressed are memory-mapped, their
+    position in the file being given by "offset", None otherwise.
+    """
+
+    if h5py is None:
+        raise ImportError('h5py is needed to read HDF5 files')
+
+    members = []
+    def visit(name: str, item) -> None:
+        if isinstance(item, h5py.Dataset) and item.dtype.kind in 'biufc':
+            members.append({'name'   : name,
+                            'shape'  : item.shape,
+                            'dtype'  : item.dtype,
+                            'offset' : item.id.get_offset()})
+
+    with h5py.File(filePath, 'r') as f:
+        f.visititems(visit)
+
+    return members
+
+
+
+def getParquetMembers(filePath: str) -> List[dict]:
+    """
+    Return the numerical columns of a Parquet file, only its metadata being
+    read.
+    """
+
+    if pq is None:
+        raise ImportError('pyarrow is needed to read Parquet files')
+
+    parquetFile = pq.ParquetFile(filePath)
+    nbRow = parquetFile.metadata.num_rows
+
+    return [{'name'  : field.name,
+             'shape' : (nbRow,),
+             'dtype' : np.dtype(field.type.to_pandas_dtype())}
+            for field in parquetFile.schema_arrow
+            if np.issubdtype(np.dtype(field.type.to_pandas_dtype()), np.number)]
+
+
+
+def getArrayMembers(filePath: str) -> List[dict]:
+    """
+    Return the arrays of a .npy, HDF5 or Parquet file, without their data.
+
+    Return
+    ------
+    members : List[dict]
+        For each array, "name", "shape", "dtype" and how to load it, see
+        loadArrayMembers.
+    """
+
+    extension = getExtension(filePath)
+    if extension in NPY_EXTENSIONS:
+        return getNpyMembers(filePath)
+    elif extension in HDF5_EXTENSIONS:
+        return getHdf5Members(filePath)
+    elif extension in PARQUET_EXTENSIONS:
+        return getParquetMembers(filePath)
+    else:
+        raise ValueError('unknown file extension: '+extension)
+
+
+
+def loadArrayMembers(filePath: str,
+                     members: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Return the data of arrays of a .npy, HDF5 or Parquet file, see
+    getArrayMembers.
+    .npy files and contiguous HDF5 datasets are memory-mapped, read only,
+    other HDF5 datasets are read at once and only the asked Parquet columns
+    are read.
+
+    Return
+    ------
+    data : Dict[str, np.ndarray]
+        {name : data}
+    """
+
+    extension = getExtension(filePath)
+    data: Dict[str, np.ndarray] = {}
+
+    if extension in NPY_EXTENSIONS:
+        array = np.load(filePath, mmap_mode='r')
+        for member in members:
+            if member['column'] is None:
+                data[member['name']] = array
+            else:
+                data[member['name']] = array[:,member['column']]
+
+    elif extension in HDF5_EXTENSIONS:
+        with h5py.File(filePath, 'r') as f:
+            for member in members:
+                if member['offset'] is not None:
+                    data[member['name']] = np.memmap(filePath,
+                                                     dtype=member['dtype'],
+                                                     mode='r',
+                                                     offset=member['offset'],
+                                                     shape=member['shape'])
+                else:
+                    data[member['name']] = f[member['name']][()]
+
+    elif extension in PARQUET_EXTENSIONS:
+        table = pq.read_table(filePath,
+                              columns=[member['name'] for member in members],
+                              memory_map=True)
+        for member in members:
+            data[member['name']] = table.column(member['name']).to_numpy()
+
+    return data
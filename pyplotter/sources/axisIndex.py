@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class AxisIndex:
+
+
+
+    def __init__(self, axis: np.ndarray,
+                       chunkSize: int=2**22) -> None:
+        """
+        Index of an axis giving the position of its point closest to a value
+        in O(log n) and without temporary array, instead of the O(n)
+        np.abs(axis-value).argmin().
+
+        Monotonic axes, increasing or decreasing, are searched directly.
+        Other axes, e.g. back and forth sweeps or axes containing nan, are
+        sorted once, the nan being put at the end and never returned unless
+        the axis only contains nan.
+
+        Parameters
+        ----------
+        axis : np.ndarray
+            1d array.
+        chunkSize : int, optional
+            Number of points checked at once for the monotonicity, so that
+            curves stored on disk are not loaded in memory at once, by default
+            2**22.
+        """
+
+        self.length = len(axis)
+
+        increasing = True
+        decreasing = True
+        for start in range(0, self.length, chunkSize):
+            d = np.diff(np.asarray(axis[start:start+chunkSize+1]))
+            # Comparisons with nan are False, such axes are sorted
+            increasing = increasing and bool(np.all(d>=0))
+            decreasing = decreasing and bool(np.all(d<=0))
+            if not increasing and not decreasing:
+                break
+
+        # Structure
+        # self.sortedAxis[i] = axis[self.order[i]]
+        if increasing:
+            self.sortedAxis = axis
+            self.order = None
+        elif decreasing:
+            self.sortedAxis = axis[::-1]
+            self.order = slice(None, None, -1)
+        else:
+            self.order = np.argsort(axis, kind='stable')
+            self.sortedAxis = axis[self.order]
+            self.length -= int(np.count_nonzero(np.isnan(self.sortedAxis)))
+
+
+
+    def originalIndex(self, i: int) -> int:
+        """
+        Return the index in the axis of the i-th sorted point.
+        """
+
+        if self.order is None:
+            return i
+        elif isinstance(self.order, slice):
+            return len(self.sortedAxis)-1-i
+        else:
+            return int(self.order[i])
+
+
+
+    def nearest(self, value: float) -> int:
+        """
+        Return the index of the axis point closest to value.
+        """
+
+        # Only nan are skipped
+        length = max(self.length, 1)
+        i = int(np.searchsorted(self.sortedAxis[:length], value))
+
+        if i==0:
+            return self.originalIndex(0)
+        elif i>=length:
+            return self.originalIndex(length-1)
+
+        # Closest of the two neighbours, the first one on tie as argmin
+        if abs(self.sortedAxis[i]-value)<abs(value-self.sortedAxis[i-1]):
+            return self.originalIndex(i)
+
+        return self.originalIndex(i-1)
+
+
+
+def getAxisIndex(owner: object,
+                 name: str) -> AxisIndex:
+    """
+    Return the index of the axis stored as the attribute "name" of owner.
+    The index is built once and kept until the attribute changes.
+
+    Parameters
+    ----------
+    owner : object
+        Object having the axis as attribute, e.g. a pg.PlotDataItem and its
+        xData.
+    name : str
+        Name of the attribute.
+    """
+
+    axis = getattr(owner, name)
+
+    # Structure
+    # owner.axisIndexes = {name : (axis, AxisIndex)}
+    if not hasattr(owner, 'axisIndexes'):
+        owner.axisIndexes = {}
+
+    if name not in owner.axisIndexes or owner.axisIndexes[name][0] is not axis:
+        owner.axisIndexes[name] = (axis, AxisIndex(axis))
+
+    return owner.axisIndexes[name][1]
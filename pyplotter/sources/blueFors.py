@@ -0,0 +1,467 @@
+import os
+import io
+import hashlib
+import datetime
+import numpy as np
+import pandas as pd
+from platformdirs import user_cache_dir
+from typing import List, Tuple, Dict, Optional
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+from .functions import isBlueForsFolder, isBlueForsRange, BLUEFORS_RANGE_SEPARATOR
+
+
+# Length of the date suffix of the BlueFors log files, " YY-MM-DD.log"
+FILE_SUFFIX_LENGTH = 13
+
+
+
+def getBlueForsRangePath(currentPath: str,
+                         folderNames: List[str]) -> str:
+    """
+    Return the path of the time range covered by several BlueFors folders of
+    the same parent folder, see getBlueForsFolders.
+    One folder gives its own path.
+    """
+
+    folderNames = sorted(folderNames)
+    if len(folderNames)==1:
+        return os.path.join(currentPath, folderNames[0])
+
+    return os.path.join(currentPath, folderNames[0]+BLUEFORS_RANGE_SEPARATOR+folderNames[-1])
+
+
+
+def getBlueForsFolders(absPath: str) -> List[str]:
+    """
+    Return the BlueFors folders of a time range, all the day folders of the
+    parent folder from the first to the last one, or the folder itself.
+    """
+
+    if not isBlueForsRange(absPath):
+        return [absPath]
+
+    currentPath = os.path.dirname(absPath)
+    first, last = os.path.basename(absPath).split(BLUEFORS_RANGE_SEPARATOR)
+
+    return [os.path.join(currentPath, folderName)
+            for folderName in sorted(os.listdir(currentPath))
+            if isBlueForsFolder(folderName) and first<=folderName<=last
+            and os.path.isdir(os.path.join(currentPath, folderName))]
+
+
+
+def getBlueForsFiles(absPath: str) -> List[Tuple[str, str]]:
+    """
+    Return the log files of a BlueFors folder handled by the plotter, see the
+    BlueFors part of the config.
+
+    Return
+    ------
+    files : List[Tuple[str, str]]
+        Name, as in the config, and absolute path of each file.
+    """
+
+    files = []
+    for file in sorted(os.listdir(absPath)):
+        fileName = file[:-FILE_SUFFIX_LENGTH]
+        if fileName in config.keys():
+            files.append((fileName, os.path.join(absPath, file)))
+
+    return files
+
+
+
+def getBlueForsParameters(fileName: str,
+                          filePath: str) -> List[dict]:
+    """
+    Return the parameters of a BlueFors log file, without their data, see
+    loadBlueForsFile.
+    Only the file name is used so that the parameters are known without
+    reading the file.
+    """
+
+    if fileName=='maxigauge':
+        keys = ['ch'+str(i) for i in range(1, 7)]
+        labels = [config[fileName][key] for key in keys]
+    elif fileName=='Status':
+        keys = list(config[fileName].keys())
+        labels = [config[fileName][key] for key in keys]
+    else:
+        keys = ['y']
+        labels = [config[fileName]]
+
+    return [{'depends_on' : ['time'],
+             'name'       : label['labelText'],
+             'label'      : label['labelText'],
+             'unit'       : label['labelUnits'],
+             'fileName'   : fileName,
+             'filePath'   : filePath,
+             'key'        : key} for key, label in zip(keys, labels)]
+
+
+
+def getBlueForsRangeParameters(absPath: str) -> List[dict]:
+    """
+    Return the parameters of a BlueFors folder or time range, without their
+    data.
+    The parameters of a time range have the log files of every day in
+    "filePaths".
+    """
+
+    parameters: Dict[str, dict] = {}
+    for folderPath in getBlueForsFolders(absPath):
+        for fileName, filePath in getBlueForsFiles(folderPath):
+            for parameter in getBlueForsParameters(fileName, filePath):
+                if parameter['name'] in parameters:
+                    parameters[parameter['name']]['filePaths'].append(filePath)
+                else:
+                    parameter['filePaths'] = [filePath]
+                    parameters[parameter['name']] = parameter
+
+    return list(parameters.values())
+
+
+
+def parseTimestamps(date: np.ndarray,
+                    time: np.ndarray) -> np.ndarray:
+    """
+    Return the timestamps in second of the BlueFors date, "dd-mm-yy", and
+    time, "HH:MM:SS", columns.
+    Both formats have a fixed width, the digits are read directly from the
+    characters instead of parsing each string.
+    Old log files have a space before the day, it is removed.
+
+    Parameters
+    ----------
+    date : np.ndarray
+        Dates, as strings.
+    time : np.ndarray
+        Times, as strings.
+    """
+
+    date = np.char.strip(np.asarray(date, dtype='S')).astype('S8')
+    time = np.char.strip(np.asarray(time, dtype='S')).astype('S8')
+
+    # One row of 8 digits, separators included, per timestamp
+    d = np.frombuffer(date.tobytes(), dtype=np.uint8).reshape(-1, 8).astype(np.int64)-ord('0')
+    t = np.frombuffer(time.tobytes(), dtype=np.uint8).reshape(-1, 8).astype(np.int64)-ord('0')
+
+    day   = d[:,0]*10+d[:,1]
+    month = d[:,3]*10+d[:,4]
+    year  = d[:,6]*10+d[:,7]
+    # Same century as the %y directive of strptime
+    year += np.where(year<69, 2000, 1900)
+
+    days = ((year-1970)*12+month-1).astype('datetime64[M]').astype('datetime64[D]')+(day-1)
+
+    return (days.astype(np.int64)*86400+
+            (t[:,0]*10+t[:,1])*3600+
+            (t[:,3]*10+t[:,4])*60+
+            t[:,6]*10+t[:,7])
+
+
+
+def readBlueForsLines(data: bytes) -> pd.DataFrame:
+    """
+    Return the columns of lines of a BlueFors log file.
+    Rows have different lengths in some files, the number of columns is
+    given by the longest one.
+    """
+
+    nbColumn = max(line.count(b',')+1 for line in data.splitlines())
+
+    return pd.read_csv(io.BytesIO(data),
+                       delimiter=',',
+                       names=list(range(nbColumn)),
+                       header=None,
+                       dtype={0 : str, 1 : str})
+
+
+
+def parseBlueForsLines(fileName: str,
+                       filePath: str,
+                       data: bytes) -> List[dict]:
+    """
+    Return the parameters of lines of a BlueFors log file with their data,
+    x being the timestamps in second and y the values in SI units.
+    The number of bytes parsed is given by "nbByte".
+
+    Parameters
+    ----------
+    fileName : str
+        Name of the file, as in the config.
+    filePath : str
+        Absolute path of the file.
+    data : bytes
+        Complete lines of the file.
+    """
+
+    parameters = getBlueForsParameters(fileName, filePath)
+
+    if len(data.strip())==0:
+        for parameter in parameters:
+            parameter['x'] = np.empty(0, dtype=np.int64)
+            parameter['y'] = np.empty(0)
+            parameter['nbByte'] = len(data)
+        return parameters
+
+    df = readBlueForsLines(data)
+    x = parseTimestamps(df[0].to_numpy(), df[1].to_numpy())
+
+    for parameter in parameters:
+
+        # Maxigauges file, each gauge has six columns, name, void, status,
+        # pressure, void, void
+        if fileName=='maxigauge':
+            column = 2+6*(int(parameter['key'][2:])-1)+3
+            y = df[column].to_numpy(dtype=float)*1e-3
+
+        # Status file, "name, value" pairs whose position depends on the
+        # version of the BlueFors software
+        elif fileName=='Status':
+            names = df.iloc[0].to_numpy()
+            column = int(np.nonzero(names==parameter['key'])[0][0])+1
+            y = df[column].to_numpy(dtype=float)
+
+        # Thermometers and flowmeter files
+        else:
+            y = df[2].to_numpy(dtype=float)*1e-3
+
+        parameter['x'] = x
+        parameter['y'] = y
+        parameter['nbByte'] = len(data)
+
+    return parameters
+
+
+
+def readCompleteLines(filePath: str,
+                      offset: int=0) -> bytes:
+    """
+    Return the complete lines of a file from offset, the last line being
+    possibly still written.
+    """
+
+    with open(filePath, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    return data[:data.rfind(b'\n')+1]
+
+
+
+def loadBlueForsFile(fileName: str,
+                     filePath: str) -> List[dict]:
+    """
+    Return the parameters of a BlueFors log file with their data, see
+    parseBlueForsLines.
+
+    Parameters
+    ----------
+    fileName : str
+        Name of the file, as in the config.
+    filePath : str
+        Absolute path of the file.
+    """
+
+    return parseBlueForsLines(fileName,
+                              filePath,
+                              readCompleteLines(filePath))
+
+
+
+def getCachePath(filePath: str) -> str:
+    """
+    Return the path of the npz file caching a BlueFors log file, in a folder
+    per BlueFors folder of the user cache folder.
+    """
+
+    folderPath, file = os.path.split(os.path.abspath(filePath))
+    folderHash = hashlib.md5(folderPath.encode()).hexdigest()
+
+    return os.path.join(user_cache_dir('pyplotter'),
+                        'bluefors',
+                        os.path.basename(folderPath)+'_'+folderHash,
+                        file+'.npz')
+
+
+
+def loadBlueForsFileCached(fileName: str,
+                           filePath: str) -> List[dict]:
+    """
+    Return the parameters of a BlueFors log file with their data, see
+    loadBlueForsFile.
+    The data are read from the cache if the file size and modification time
+    did not change since it was written, otherwise the file is parsed and
+    the cache written.
+    Logs of the current day, still written, are then parsed each time.
+    """
+
+    if not config['blueForsCache']:
+        return loadBlueForsFile(fileName, filePath)
+
+    stat = os.stat(filePath)
+    cachePath = getCachePath(filePath)
+
+    try:
+        with np.load(cachePath) as cache:
+            if cache['size']==stat.st_size and cache['mtime']==stat.st_mtime_ns:
+                parameters = getBlueForsParameters(fileName, filePath)
+                for parameter in parameters:
+                    parameter['x'] = cache['x']
+                    parameter['y'] = cache['y_'+parameter['key']]
+                    parameter['nbByte'] = int(cache['nbByte'])
+                return parameters
+    except (OSError, KeyError, ValueError):
+        pass
+
+    parameters = loadBlueForsFile(fileName, filePath)
+
+    try:
+        os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+        # Written then renamed so that an interrupted writing is never read
+        with open(cachePath+'.tmp', 'wb') as f:
+            np.savez(f,
+                     size=stat.st_size,
+                     mtime=stat.st_mtime_ns,
+                     nbByte=parameters[0]['nbByte'],
+                     x=parameters[0]['x'],
+                     **{'y_'+parameter['key'] : parameter['y'] for parameter in parameters})
+        os.replace(cachePath+'.tmp', cachePath)
+    except OSError:
+        pass
+
+    return parameters
+
+
+
+def loadBlueForsParameters(parameters: List[dict]) -> List[dict]:
+    """
+    Return the parameters of one log file name of a BlueFors folder or time
+    range, see getBlueForsRangeParameters, with their data, the days being
+    concatenated.
+    Each log file is read once for all its parameters.
+    """
+
+    data: Dict[str, Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+    nbByte = 0
+    for filePath in parameters[0]['filePaths']:
+        for dayParameter in loadBlueForsFileCached(parameters[0]['fileName'], filePath):
+            x, y = data.setdefault(dayParameter['key'], ([], []))
+            x.append(dayParameter['x'])
+            y.append(dayParameter['y'])
+            nbByte = dayParameter['nbByte']
+
+    # nbByte is the number of bytes read of the last file, see BlueForsTail
+    loaded = []
+    for parameter in parameters:
+        x, y = data[parameter['key']]
+        loaded.append(dict(parameter,
+                           x=np.concatenate(x),
+                           y=np.concatenate(y),
+                           nbByte=nbByte))
+
+    return loaded
+
+
+
+def getBlueForsNextDayPath(filePath: str) -> Optional[str]:
+    """
+    Return the path of the log file of the same name the day after, None if
+    it does not exist yet.
+    """
+
+    folderPath, file = os.path.split(filePath)
+    folderName = os.path.basename(folderPath)
+
+    day = datetime.datetime.strptime(folderName, '%y-%m-%d')
+    nextFolderName = (day+datetime.timedelta(days=1)).strftime('%y-%m-%d')
+    nextPath = os.path.join(os.path.dirname(folderPath),
+                            nextFolderName,
+                            file.replace(folderName, nextFolderName))
+
+    if os.path.isfile(nextPath):
+        return nextPath
+    else:
+        return None
+
+
+
+def isBlueForsToday(filePath: str) -> bool:
+    """
+    Return True if a BlueFors log file is the one of the current day, still
+    written by the controller.
+    """
+
+    folderName = os.path.basename(os.path.dirname(filePath))
+
+    return folderName==datetime.date.today().strftime('%y-%m-%d')
+
+
+
+class BlueForsTail:
+
+
+
+    def __init__(self, fileName: str,
+                       filePath: str,
+                       nbByte: int) -> None:
+        """
+        Follow a BlueFors log file while the controller appends lines to it.
+        Only the bytes appended since the last read are parsed, see read.
+        At midnight, the log file of the next day is followed.
+
+        Parameters
+        ----------
+        fileName : str
+            Name of the file, as in the config.
+        filePath : str
+            Absolute path of the file.
+        nbByte : int
+            Number of bytes already read.
+        """
+
+        self.fileName = fileName
+        self.filePath = filePath
+        self.nbByte   = nbByte
+
+
+
+    def read(self) -> List[dict]:
+        """
+        Return the parameters of the lines appended since the last read,
+        see parseBlueForsLines, an empty list if there are none.
+        The file is only opened if its size changed.
+        """
+
+        parameters: List[List[dict]] = []
+        while True:
+
+            if os.path.getsize(self.filePath)>self.nbByte:
+                data = readCompleteLines(self.filePath, self.nbByte)
+                if len(data)>0:
+                    self.nbByte += len(data)
+                    parameters.append(parseBlueForsLines(self.fileName,
+                                                         self.filePath,
+                                                         data))
+
+            # Lines of the day are read, the file of the next day may have
+            # been created
+            nextPath = getBlueForsNextDayPath(self.filePath)
+            if nextPath is None:
+                break
+            self.filePath = nextPath
+            self.nbByte   = 0
+
+        if len(parameters)==0:
+            return []
+        elif len(parameters)==1:
+            return parameters[0]
+
+        # Several days read at once
+        return [dict(parameter,
+                     x=np.concatenate([i[n]['x'] for i in parameters]),
+                     y=np.concatenate([i[n]['y'] for i in parameters]))
+                for n, parameter in enumerate(parameters[-1])]
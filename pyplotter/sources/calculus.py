@@ -0,0 +1,225 @@
+import numpy as np
+import weakref
+from scipy.integrate import cumulative_trapezoid
+from typing import Tuple, Optional, Dict
+
+from .curveStorage import isOutOfCore
+from .filtering import savitzkyGolay
+
+
+def getRoot(data: np.ndarray) -> np.ndarray:
+    """
+    Return the array owning the memory of data, data itself if it is not a
+    view.
+    """
+
+    while isinstance(data.base, np.ndarray):
+        data = data.base
+
+    return data
+
+
+
+def getStart(view: np.ndarray,
+             root: np.ndarray) -> Optional[int]:
+    """
+    Return the index of root at which view starts if view is a contiguous
+    slice of the 1d array root, None otherwise.
+    """
+
+    if (view.ndim!=1 or root.ndim!=1 or
+        view.strides!=root.strides or view.dtype!=root.dtype):
+        return None
+
+    offset = view.__array_interface__['data'][0]-root.__array_interface__['data'][0]
+    start, remainder = divmod(offset, root.strides[0])
+    if remainder!=0 or start<0 or start+len(view)>len(root):
+        return None
+
+    return int(start)
+
+
+
+class Calculus:
+
+
+
+    def __init__(self, x: np.ndarray,
+                       y: np.ndarray) -> None:
+        """
+        Derivatives and primitive of a whole curve, computed once so that the
+        ones of any selection of the curve are slices of them.
+        The primitive of a selection is then obtained in O(k) for k selected
+        points instead of integrating the selection, see integrate.
+
+        Only weak references to the curve are kept, the calculus is
+        invalidated when the curve data are replaced.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Data along the x axis of the whole curve.
+        y : np.ndarray
+            Data along the y axis of the whole curve.
+        """
+
+        self.x = weakref.ref(x)
+        self.y = weakref.ref(y)
+
+        # Cumulative trapezoid integral, nan segments counting for 0, and
+        # cumulative number of nan segments
+        self.primitive: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        # Structure
+        # self.derivatives = {(order, smoothing) : derivative}
+        self.derivatives: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+
+    def getSlice(self, x: np.ndarray,
+                       y: np.ndarray) -> Optional[slice]:
+        """
+        Return the position of the selection x, y in the curve, None if they
+        are not a slice of it.
+        """
+
+        xRoot, yRoot = self.x(), self.y()
+        if xRoot is None or yRoot is None:
+            return None
+        if getRoot(x) is not xRoot or getRoot(y) is not yRoot:
+            return None
+
+        start = getStart(x, xRoot)
+        if start is None or start!=getStart(y, yRoot):
+            return None
+
+        return slice(start, start+len(x))
+
+
+
+    def getPrimitive(self) -> Tuple[np.ndarray, np.ndarray]:
+
+        if self.primitive is None:
+            x, y = self.x(), self.y()
+            area = np.diff(x)*(y[1:]+y[:-1])/2
+            isNan = np.isnan(area)
+            self.primitive = (np.concatenate(([0.], np.cumsum(np.where(isNan, 0., area)))),
+                              np.concatenate(([0], np.cumsum(isNan))))
+
+        return self.primitive
+
+
+
+    def integrate(self, s: slice) -> np.ndarray:
+        """
+        Return the primitive of the slice s of the curve, starting from 0.
+        As for cumulative_trapezoid, the primitive is nan after a nan.
+        """
+
+        primitive, nbNan = self.getPrimitive()
+
+        return np.where(nbNan[s]-nbNan[s.start]>0,
+                        np.nan,
+                        primitive[s]-primitive[s.start])
+
+
+
+    def differentiate(self, s: slice,
+                            order: int,
+                            smoothing: int) -> np.ndarray:
+        """
+        Return the derivative of the slice s of the curve, see differentiate.
+        The derivative at the edges of the slice are central differences
+        involving the points next to the slice.
+        """
+
+        if (order, smoothing) not in self.derivatives:
+            self.derivatives[(order, smoothing)] = differentiate(self.x(), self.y(), order, smoothing)
+
+        return self.derivatives[(order, smoothing)][s]
+
+
+
+def getCalculus(owner: object,
+                x: np.ndarray,
+                y: np.ndarray) -> Tuple[Optional[Calculus], Optional[slice]]:
+    """
+    Return the calculus of the curve the selection x, y belongs to, and the
+    position of the selection in the curve.
+    The calculus is kept as the attribute "calculus" of owner until the curve
+    changes.
+    Selections which are not slices of a curve, or of curves stored on disk,
+    for which the calculus of the whole curve would be loaded in memory, give
+    None.
+
+    Parameters
+    ----------
+    owner : object
+        Object keeping the calculus, e.g. the calculus groupBox.
+    x : np.ndarray
+        Data along the x axis of the selection.
+    y : np.ndarray
+        Data along the y axis of the selection.
+    """
+
+    calculus: Optional[Calculus] = getattr(owner, 'calculus', None)
+    if calculus is not None:
+        s = calculus.getSlice(x, y)
+        if s is not None:
+            return calculus, s
+
+    xRoot, yRoot = getRoot(x), getRoot(y)
+    if (len(xRoot)!=len(yRoot) or len(xRoot)<2 or
+        isOutOfCore(xRoot) or isOutOfCore(yRoot)):
+        return None, None
+
+    calculus = Calculus(xRoot, yRoot)
+    s = calculus.getSlice(x, y)
+    if s is None:
+        return None, None
+
+    owner.calculus = calculus
+
+    return calculus, s
+
+
+
+def differentiate(x: np.ndarray,
+                  y: np.ndarray,
+                  order: int=1,
+                  smoothing: int=0) -> np.ndarray:
+    """
+    Return the derivative of y along x, x being possibly non uniform.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis.
+    y : np.ndarray
+        Data along the y axis.
+    order : int, optional
+        Order of the derivative, by default 1.
+    smoothing : int, optional
+        For noisy data, window length of a Savitzky-Golay filter applied
+        before derivation, no smoothing if smaller than 3, by default 0.
+    """
+
+    # Odd window length
+    windowLength = smoothing+1-smoothing%2
+    if smoothing>=3 and len(y)>=windowLength:
+        y = savitzkyGolay(y, windowLength, min(3, windowLength-1))
+
+    for _ in range(order):
+        y = np.gradient(y, x)
+
+    return y
+
+
+
+def integrate(x: np.ndarray,
+              y: np.ndarray) -> np.ndarray:
+    """
+    Return the primitive of y along x, starting from 0.
+    """
+
+    return cumulative_trapezoid(y, x, initial=0)
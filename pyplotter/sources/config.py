@@ -25,15 +25,23 @@ configPackage = {
                     'triton',
                     'data',
                     '2021'],
-# Other files will not appear in the plotter
+# Other files will not appear in the plotter, except Touchstone files .s1p to
+# .sNp
 'authorizedExtension' : ['db',
                          'csv',
                          'npz',
-                         's2p'],
+                         'npy',
+                         'h5',
+                         'hdf5',
+                         'parquet'],
 # Will not be displayed, usefull for some windows file
 'forbiddenFile' : ['thumbs.db',
                    'Thumbs.db'],
 
+# Number of browsed folders whose content is kept in memory, a folder being
+# read again only when modified
+'folderCacheSize' : 100, # int
+
 # If False the path is displayed in the plot title
 'displayOnlyDbNameInPlotTitle' : True,
 # If True the run id is added to the window title
@@ -54,8 +62,12 @@ configPackage = {
 'delayBetweenProgressBarUpdate' : 100, # int
 # Number of runs to be transferred at the same time when displaying a database
 'NbRunEmit' : 100, # int
-# Delay between to consecutive check of the total nb of run in a database
-'delayBetweendataBaseNbRunCheck' : 5, # in s
+# Notifications of a modified folder or database are gathered over this
+# delay, a database being written continuously during a measurement
+'fileWatcherDelay' : 1000, # int, in ms
+# Delay between two checks of the current folder and database, for network
+# shares whose modifications are not notified
+'fileWatcherPollDelay' : 5, # int, in s
 # Message to display when station has not been defined in a qcodes experiment
 'defaultSnapshot' : '<span style="color: red; font-weight: bold;">Station undefined, you fool</span>',
 
@@ -140,7 +152,31 @@ configPackage = {
                            'labelUnits' : u'°C'},
             'cpatemph'  : {'labelText'  : 'Compressor helium temperature',
                            'labelUnits' : u'°C'}},
-
+# Parsed BlueFors log files are kept as npz in the user cache folder
+'blueForsCache' : True, # bool
+# Delay between two reads of the BlueFors logs of the day being plotted
+'blueForsLiveDelay' : 10, # int, in s
+
+## csv
+# Number of lines of a csv file parsed at once, the progress bar being
+# updated after each chunk
+'csvChunkSize' : 1000000, # int
+
+## Run search
+# Runs of all the databases of these folders are indexed in background to be
+# searched from the main window, the search being disabled if empty
+'runIndexRoots' : [], # list of str
+# Values of these snapshot keys are searchable, as the instrument names
+'runIndexSnapshotKeys' : ['comment', 'sample', 'sample_name'], # list of str
+# Delay between two updates of the index, only the modified databases being
+# read again
+'runIndexDelay' : 600, # int, in s
+'runIndexMaxResult' : 200, # int
+
+## npy, HDF5 and Parquet
+# A 2d .npy array having at most this number of columns is displayed as
+# columns, as a csv file, otherwise as a map
+'npyMaxColumn' : 10, # int
 
 # Layout parameters
 'dialogWindowSize' : (1314, 500),
@@ -302,6 +338,10 @@ configPackage = {
 'plot1dGrid' : True,
 'plot1dSymbol' : ['o', 's', 't', 'd', '+'],
 'plot1dAntialias' : False,
+'plot1dInteractionDelay' : 50, # int, in ms, delay without new selection before the interaction plots, fft, histogram, ..., are updated
+'plot1dMemmapMinPoints' : 10000000, # int, curves having more points are stored on disk in memory-mapped files instead of memory
+'plot1dMemmapDirectory' : None, # str, folder of the memory-mapped curves, None for the system temporary folder
+'plot1dMemmapDelay' : 10, # int, in s, delay without update before a live curve is stored on disk, updates being kept in memory
 'plot2dcm' : 'Viridis', # Default colormap
 'plotHideInteractionPanel': False, # auto hide the interaction panel of a new plot window
 # List of derivative for 2d plot
@@ -338,6 +378,20 @@ configPackage = {
 "plotCoordinateNbNumber" : '2', # str, how many decimal for coordinates
 
 "fitParameterNbNumber" : 3, # int, how many decimal for the displayed fit parameters
+"fitMaxNbEvaluation" : 10000, # int, maximum number of model evaluations of a 2d fit
+"fitNbProcess" : None, # int, number of processes used to fit in parallel, None to use all cpus but one
+"fitNbChunkPerProcess" : 4, # int, number of chunks of slices given to each process when fitting all slices of a 2d map
+"fitCacheSize" : 100, # int, number of 1d fit results kept in memory, per plot
+"fitWarmStartMinOverlap" : 0.5, # float, minimum overlap between two successive 1d fit selections to start the fit from the previous result
+
+"fftWelchSegmentLength" : 1024, # int, default number of points of the segments averaged by the power spectral density
+"fftWelchOverlap" : 0.5, # float, default overlap between successive segments of the power spectral density, from 0 to 1 excluded
+"fftWelchWindow" : 'hann', # str, default window applied to the segments of the power spectral density, see scipy.signal.get_window
+"fftLombScargleOversampling" : 4, # int, number of frequencies per FFT frequency step in the Lomb-Scargle periodogram of non uniformly sampled data
+
+"statisticsNbBin" : 4096, # int, number of bins of the histogram accumulated by the 1d statistics, the displayed histograms are exact within (max-min)/statisticsNbBin
+
+"filteringFftMinKernel" : 64, # int, filters whose kernel has more points are applied by FFT convolution
 
 # crosshair
 'crossHairLineWidth' : 3,
@@ -0,0 +1,139 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Callable, Dict
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+# Number of bytes read to guess the format of a csv file
+SNIFF_SIZE = 2**16
+
+
+
+def isNumber(field: str) -> bool:
+
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+
+def sniffCsv(filePath: str) -> dict:
+    """
+    Guess the format of a csv file from its first lines, the file being read
+    once.
+
+    Comment lines start with a character which can't start a number or a
+    column name, e.g. "#" or "%".
+    The delimiter is "," or ";" or a tabulation if found on every line,
+    otherwise columns are separated by white spaces.
+    The first line after the comments gives the column names, unless it only
+    contains numbers.
+
+    Return
+    ------
+    csvFormat : dict
+        "comment": comment character or None, "skiprows": number of lines
+        before the data, "delimiter": delimiter or None for white spaces,
+        "names": column names.
+    """
+
+    with open(filePath, 'rb') as f:
+        sample = f.read(SNIFF_SIZE)
+        isComplete = len(f.read(1))==0
+
+    # utf-8-sig drops a byte order mark, which would be taken for a comment
+    lines = sample.decode('utf-8-sig', errors='replace').splitlines()
+    # The last line may be cut
+    if not isComplete:
+        lines = lines[:-1]
+
+    comment = None
+    first = lines[0].lstrip() if len(lines)>0 else ''
+    if len(first)>0 and not (first[0].isalnum() or first[0] in '+-."\'_'):
+        comment = first[0]
+
+    skiprows = 0
+    for line in lines:
+        if line.strip()=='' or (comment is not None and line.lstrip().startswith(comment)):
+            skiprows += 1
+        else:
+            break
+    if skiprows==len(lines):
+        raise ValueError('no data found')
+
+    # Blank lines, e.g. at the end of the file, have no delimiter
+    sample = [line for line in lines[skiprows:skiprows+10]
+              if line.strip()!='' and not (comment is not None and line.lstrip().startswith(comment))]
+    delimiter: Optional[str] = None
+    for candidate in (',', ';', '\t'):
+        if all(candidate in line for line in sample):
+            delimiter = candidate
+            break
+
+    fields = [i.strip().strip('"\'') for i in lines[skiprows].split(delimiter)]
+    if all(isNumber(i) for i in fields):
+        names = [str(i) for i in range(len(fields))]
+    else:
+        names = fields
+        skiprows += 1
+
+    return {'comment'   : comment,
+            'skiprows'  : skiprows,
+            'delimiter' : delimiter,
+            'names'     : names}
+
+
+
+def loadCsvColumns(filePath: str,
+                   csvFormat: dict,
+                   columns: List[int],
+                   progress: Optional[Callable[[float], None]]=None) -> Dict[int, np.ndarray]:
+    """
+    Return columns of a csv file as float64 arrays.
+    Only the given columns are parsed, by chunks of config['csvChunkSize']
+    lines so that the progress of large files can be followed.
+
+    Parameters
+    ----------
+    filePath : str
+        Absolute path of the csv file.
+    csvFormat : dict
+        Format of the file, see sniffCsv.
+    columns : List[int]
+        Index of the columns.
+    progress : Optional[Callable[[float], None]], optional
+        Called after each chunk with the fraction of the file parsed, by
+        default None.
+
+    Return
+    ------
+    data : Dict[int, np.ndarray]
+        {column : data}
+    """
+
+    size = max(os.path.getsize(filePath), 1)
+
+    chunks: Dict[int, List[np.ndarray]] = {column : [] for column in columns}
+    with open(filePath, 'rb') as f:
+        reader = pd.read_csv(f,
+                             sep=csvFormat['delimiter'] or r'\s+',
+                             comment=csvFormat['comment'],
+                             skiprows=csvFormat['skiprows'],
+                             header=None,
+                             usecols=columns,
+                             dtype=np.float64,
+                             engine='c',
+                             chunksize=config['csvChunkSize'])
+        for df in reader:
+            for column in columns:
+                chunks[column].append(df[column].to_numpy())
+            if progress is not None:
+                progress(min(f.tell()/size, 1.))
+
+    return {column : np.concatenate(chunk) if len(chunk)>0 else np.empty(0)
+            for column, chunk in chunks.items()}
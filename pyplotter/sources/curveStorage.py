@@ -0,0 +1,104 @@
+import os
+import mmap
+import tempfile
+import weakref
+import numpy as np
+from typing import Tuple, Optional
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+def removeFile(path: str) -> None:
+    """
+    Remove a memory-mapped file once no array uses it anymore.
+    """
+
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+
+def toMemmap(data: np.ndarray,
+             chunkSize: int=2**22) -> np.memmap:
+    """
+    Copy an array in a temporary memory-mapped file.
+    The data are then only read from the disk when needed, the OS keeping in
+    memory the parts recently used.
+    The file is removed when the returned array, and all its views, are
+    garbage collected.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        1d array to store.
+    chunkSize : int, optional
+        Number of points copied at once, by default 2**22.
+    """
+
+    fd, path = tempfile.mkstemp(prefix='pyplotter_',
+                                suffix='.dat',
+                                dir=config['plot1dMemmapDirectory'])
+    os.close(fd)
+
+    array = np.memmap(path,
+                      dtype=data.dtype,
+                      mode='w+',
+                      shape=data.shape)
+    for start in range(0, len(data), chunkSize):
+        array[start:start+chunkSize] = data[start:start+chunkSize]
+    array.flush()
+
+    weakref.finalize(array, removeFile, path)
+
+    return array
+
+
+
+def isOutOfCore(data: np.ndarray) -> bool:
+    """
+    Return True if the array is stored on disk.
+    """
+
+    while data is not None:
+        if isinstance(data, (np.memmap, mmap.mmap)):
+            return True
+        data = getattr(data, 'base', None)
+
+    return False
+
+
+
+def storeCurve(x: np.ndarray,
+               y: np.ndarray,
+               yErr: Optional[np.ndarray]=None) -> Tuple[np.ndarray,
+                                                         np.ndarray,
+                                                         Optional[np.ndarray]]:
+    """
+    Return the data of a curve stored in memory-mapped files if the curve is
+    longer than config['plot1dMemmapMinPoints'], unchanged otherwise.
+    Once the data given as argument are released, the memory used by the
+    curve is bounded whatever its length: the plot only displays its
+    downsampled visible part, see downsampling.MinMaxIndex, and analysis
+    panels only read the slices they select.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis.
+    y : np.ndarray
+        Data along the y axis.
+    yErr : Optional[np.ndarray], optional
+        Uncertainty along the y axis, by default None.
+    """
+
+    if config['plot1dMemmapMinPoints'] is None or len(x)<config['plot1dMemmapMinPoints']:
+        return x, y, yErr
+
+    x, y = [d if isOutOfCore(d) else toMemmap(np.asarray(d)) for d in (x, y)]
+    if yErr is not None and not isOutOfCore(yErr):
+        yErr = toMemmap(np.asarray(yErr))
+
+    return x, y, yErr
@@ -0,0 +1,119 @@
+import weakref
+import numpy as np
+from typing import Tuple
+
+
+class CurveStore:
+
+
+
+    def __init__(self) -> None:
+        """
+        Central store of the curves displayed in the 1d plots, keyed by curveId.
+
+        Arrays are handed out read-only so that the plots and the data they
+        send to the analysis panels share them without copy.
+        An array given again for the same curve, or an x axis equal to the
+        one of another curve, e.g. all the parameters of a run sharing the same
+        setpoints, is replaced by the stored one.
+
+        The store only keeps weak references, an array is freed once no plot
+        nor panel uses it anymore.
+        """
+
+        # Structure
+        # self._arrays = {(curveId, 'x') : np.ndarray,
+        #                 (curveId, 'y') : np.ndarray}
+        self._arrays: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+
+    @staticmethod
+    def isSame(stored: np.ndarray,
+               data: np.ndarray) -> bool:
+        """
+        Return True if the data are the stored array or are equal to it.
+        """
+
+        if stored is data:
+            return True
+        if stored.shape!=data.shape or stored.dtype!=data.dtype:
+            return False
+        if stored.size==0:
+            return True
+
+        equalNan = data.dtype.kind in 'fc'
+
+        # Quick rejection on the last point and a few others before comparing
+        # all of them
+        step = max(len(data)//64, 1)
+        if not (np.array_equal(stored[-1], data[-1], equal_nan=equalNan) and
+                np.array_equal(stored[::step], data[::step], equal_nan=equalNan)):
+            return False
+
+        return np.array_equal(stored, data, equal_nan=equalNan)
+
+
+
+    def share(self, curveId: str,
+                    axis: str,
+                    data: np.ndarray,
+                    replace: bool=False) -> np.ndarray:
+        """
+        Return the read-only array stored for the given curve axis.
+
+        Parameters
+        ----------
+        curveId : str
+            Id of the curve.
+        axis : str
+            "x" or "y".
+        data : np.ndarray
+            Data of the curve axis, stored if they differ from the ones of the
+            curve.
+        replace : bool, optional
+            If True, the data are stored even if equal to stored ones, e.g.
+            when moved on disk, by default False.
+        """
+
+        stored = self._arrays.get((curveId, axis))
+        if not replace and stored is not None and self.isSame(stored, data):
+            return stored
+
+        # Curves often share their x axis, each distinct array being compared
+        # once
+        if axis=='x' and not replace:
+            compared = set()
+            for key, stored in list(self._arrays.items()):
+                if key[1]!='x' or id(stored) in compared:
+                    continue
+                compared.add(id(stored))
+                if self.isSame(stored, data):
+                    self._arrays[(curveId, axis)] = stored
+                    return stored
+
+        # A view is made read-only, leaving the given array untouched
+        readOnly = data.view()
+        readOnly.flags.writeable = False
+        self._arrays[(curveId, axis)] = readOnly
+
+        return readOnly
+
+
+
+    def add(self, curveId: str,
+                  x: np.ndarray,
+                  y: np.ndarray,
+                  replace: bool=False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Store the data of a curve and return their shared read-only version,
+        see share.
+        """
+
+        return (self.share(curveId, 'x', np.asanyarray(x), replace),
+                self.share(curveId, 'y', np.asanyarray(y), replace))
+
+
+
+# Shared by all the plots
+curveStore = CurveStore()
@@ -0,0 +1,288 @@
+import numpy as np
+from typing import Tuple, List
+
+
+class MinMaxIndex:
+
+
+
+    def __init__(self, x: np.ndarray,
+                       y: np.ndarray,
+                       blockSize: int=32,
+                       levelFactor: int=4) -> None:
+        """
+        Multi-level index of the minimum and maximum of a curve used to
+        downsample it with the M4 algorithm: for each horizontal pixel, only the
+        first, last, minimum and maximum points are displayed.
+        The result is visually identical to the full curve, spikes included,
+        while never having more than 4 points per pixel.
+
+        The index stores, for blocks of blockSize, blockSize*levelFactor, ...
+        points, the indexes of their minimum and maximum so that a downsampled
+        view only costs a few times the number of pixels, whatever the number
+        of points of the curve.
+        The x axis may be non uniform, if it is not sorted, the curve is
+        downsampled along its indexes.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Data along the x axis.
+        y : np.ndarray
+            Data along the y axis.
+        blockSize : int, optional
+            Number of points of the blocks of the finest level, by default 32.
+        levelFactor : int, optional
+            Number of blocks of a level grouped in a block of the next level,
+            by default 4.
+        """
+
+        self.x = x
+        self.y = y
+
+        # Structure
+        # self.levels = [(blockSize, minIndexes, maxIndexes), ...]
+        self.levels: List[Tuple[int, np.ndarray, np.ndarray]] = []
+
+        # The data are read by chunks so that curves stored on disk are never
+        # loaded in memory at once, see curveStorage
+        chunkSize = blockSize*2**16
+        self.isSorted = True
+        minIndexes = []
+        maxIndexes = []
+        for start in range(0, len(y), chunkSize):
+            xChunk = np.asarray(x[start:start+chunkSize+1])
+            with np.errstate(invalid='ignore'):
+                self.isSorted = self.isSorted and bool(np.all(np.diff(xChunk)>=0))
+            yChunk = np.asarray(y[start:start+chunkSize])
+            indexes = np.arange(start, start+len(yChunk))
+            minIndexes.append(self.reduceLevel(indexes, self.fillNan(yChunk, np.inf), blockSize, np.argmin, np.inf))
+            maxIndexes.append(self.reduceLevel(indexes, self.fillNan(yChunk, -np.inf), blockSize, np.argmax, -np.inf))
+
+        if len(y)<blockSize:
+            return
+
+        minIndexes = np.concatenate(minIndexes)
+        maxIndexes = np.concatenate(maxIndexes)
+        size = blockSize
+        self.levels.append((size, minIndexes, maxIndexes))
+        while len(minIndexes)>=levelFactor:
+            minIndexes = self.reduceLevel(minIndexes, self.getValues(minIndexes, np.inf), levelFactor, np.argmin, np.inf)
+            maxIndexes = self.reduceLevel(maxIndexes, self.getValues(maxIndexes, -np.inf), levelFactor, np.argmax, -np.inf)
+            size *= levelFactor
+            self.levels.append((size, minIndexes, maxIndexes))
+
+
+
+    @staticmethod
+    def fillNan(values: np.ndarray,
+                fillValue: float) -> np.ndarray:
+        """
+        nan are ignored, unless a whole block is nan.
+        """
+
+        return np.where(np.isnan(values), fillValue, values)
+
+
+
+    def getValues(self, indexes: np.ndarray,
+                        fillValue: float) -> np.ndarray:
+        """
+        Return the y values at the given indexes, nan being replaced by
+        fillValue.
+        """
+
+        return self.fillNan(np.asarray(self.y[indexes]), fillValue)
+
+
+
+    @staticmethod
+    def reduceLevel(indexes: np.ndarray,
+                    values: np.ndarray,
+                    factor: int,
+                    argFunction: callable,
+                    fillValue: float) -> np.ndarray:
+        """
+        Group the blocks of a level by factor and return the index of the
+        extremum of each group.
+
+        Parameters
+        ----------
+        indexes : np.ndarray
+            Indexes of the extremum of each block of the level.
+        values : np.ndarray
+            Values at these indexes.
+        """
+
+        n = int(np.ceil(len(indexes)/factor))
+        blockValues = np.full(n*factor, fillValue)
+        blockValues[:len(indexes)] = values
+        blockIndexes = np.zeros(n*factor, dtype=indexes.dtype)
+        blockIndexes[:len(indexes)] = indexes
+
+        arg = argFunction(blockValues.reshape(n, factor), axis=1)
+
+        return blockIndexes.reshape(n, factor)[np.arange(n), arg]
+
+
+
+    def getData(self, xMin: float,
+                      xMax: float,
+                      nbPixel: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the downsampled data visible between xMin and xMax.
+        One point before and after the visible range are kept so that the
+        curve goes up to the edges of the view.
+
+        Parameters
+        ----------
+        xMin : float
+            Left edge of the view.
+        xMax : float
+            Right edge of the view.
+        nbPixel : int
+            Width of the view in pixel.
+
+        Return
+        ------
+        x : np.ndarray
+            Downsampled data along the x axis.
+        y : np.ndarray
+            Downsampled data along the y axis.
+        """
+
+        nbPixel = max(int(nbPixel), 1)
+
+        # Range of the visible data and edges of the pixels in index
+        if self.isSorted:
+            start, stop = np.searchsorted(self.x, (xMin, xMax))
+            stop = min(stop+1, len(self.x))
+            start = max(start-1, 0)
+            edges = np.searchsorted(self.x, np.linspace(xMin, xMax, nbPixel+1))
+            edges = np.clip(edges, start, stop)
+            edges[0], edges[-1] = start, stop
+        else:
+            start, stop = 0, len(self.x)
+            edges = np.linspace(start, stop, nbPixel+1).astype(int)
+
+        # Nothing to downsample
+        if stop-start<=4*nbPixel:
+            return self.x[start:stop], self.y[start:stop]
+
+        # Pixels containing some data
+        edges = np.unique(edges)
+        first = edges[:-1]
+        last  = edges[1:]-1
+
+        # Coarsest level having at least 4 blocks per pixel
+        pointsPerPixel = (stop-start)/nbPixel
+        nbLevel = 0
+        for levelSize, _, _ in self.levels:
+            if levelSize*4>pointsPerPixel:
+                break
+            nbLevel += 1
+
+        # Each pixel is covered by the largest blocks it fully contains, from
+        # the coarsest level to the finest one, the few points left at its
+        # edges being read directly.
+        # A block is never shared by two pixels so that the extrema of each
+        # pixel are exact.
+        pixels = np.arange(len(first))
+        starts = first
+        stops  = last+1
+        minIndexes = []
+        maxIndexes = []
+        blockPixels = []
+        for size, levelMin, levelMax in reversed(self.levels[:nbLevel]):
+            blockStart = -(-starts//size)
+            blockStop  = np.maximum(stops//size, blockStart)
+            blocks = self.getRanges(blockStart, blockStop)
+            minIndexes.append(levelMin[blocks])
+            maxIndexes.append(levelMax[blocks])
+            blockPixels.append(np.repeat(pixels, blockStop-blockStart))
+
+            # Points left on both sides of the blocks
+            full = blockStart<blockStop
+            pixels = np.concatenate((pixels[~full], pixels[full], pixels[full]))
+            starts, stops = (np.concatenate((starts[~full], starts[full], blockStop[full]*size)),
+                             np.concatenate((stops[~full], blockStart[full]*size, stops[full])))
+            left = starts<stops
+            pixels, starts, stops = pixels[left], starts[left], stops[left]
+
+        minIndexes.append(self.getRangeExtremum(starts, stops, np.inf))
+        maxIndexes.append(self.getRangeExtremum(starts, stops, -np.inf))
+        blockPixels.append(pixels)
+
+        minIndexes = np.concatenate(minIndexes)
+        maxIndexes = np.concatenate(maxIndexes)
+        pixels = np.concatenate(blockPixels)
+
+        indexes = [first,
+                   last,
+                   self.getExtremum(minIndexes, self.getValues(minIndexes, np.inf), pixels),
+                   self.getExtremum(maxIndexes, -self.getValues(maxIndexes, -np.inf), pixels)]
+
+        # Points sorted along the curve
+        indexes = np.unique(np.concatenate(indexes))
+
+        return self.x[indexes], self.y[indexes]
+
+
+
+    @staticmethod
+    def getRanges(starts: np.ndarray,
+                  stops: np.ndarray) -> np.ndarray:
+        """
+        Return the concatenation of np.arange(start, stop) for each start,
+        stop pair.
+        """
+
+        lengths = stops-starts
+        offsets = np.cumsum(lengths)-lengths
+
+        return np.repeat(starts-offsets, lengths)+np.arange(lengths.sum(), dtype=starts.dtype)
+
+
+
+    def getRangeExtremum(self, starts: np.ndarray,
+                               stops: np.ndarray,
+                               fillValue: float) -> np.ndarray:
+        """
+        Return the index of the minimum, or maximum if fillValue is -inf, of
+        the points of each start, stop range.
+        """
+
+        if len(starts)==0:
+            return starts
+
+        lengths = stops-starts
+        offsets = np.cumsum(lengths)-lengths
+        points = self.getRanges(starts, stops)
+        values = self.getValues(points, fillValue)
+        if fillValue>0:
+            extremums = np.minimum.reduceat(values, offsets)
+        else:
+            extremums = np.maximum.reduceat(values, offsets)
+
+        # First point of each range reaching its extremum
+        positions = np.flatnonzero(values==np.repeat(extremums, lengths))
+        _, firstPosition = np.unique(np.repeat(np.arange(len(starts)), lengths)[positions], return_index=True)
+
+        return points[positions[firstPosition]]
+
+
+
+    @staticmethod
+    def getExtremum(indexes: np.ndarray,
+                    values: np.ndarray,
+                    pixels: np.ndarray) -> np.ndarray:
+        """
+        Return the index of the minimum value of each pixel.
+        """
+
+        # Sorted by pixel then by value, the first point of each pixel is its
+        # minimum
+        order = np.lexsort((values, pixels))
+        _, firstPosition = np.unique(pixels[order], return_index=True)
+
+        return indexes[order[firstPosition]]
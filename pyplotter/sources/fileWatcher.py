@@ -0,0 +1,170 @@
+from PyQt5 import QtCore
+import os
+from typing import List, Optional, Tuple
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+from .functions import isLabradFolder
+
+
+
+def getSignature(paths: List[str]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """
+    Return the size and modification time of files or folders, None for the
+    ones which do not exist.
+    """
+
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append(None)
+
+    return tuple(signature)
+
+
+
+class FileWatcher(QtCore.QObject):
+
+
+    # When an item of the current folder is added, removed or renamed
+    # directory
+    signalFolderChanged = QtCore.pyqtSignal(str)
+
+    # When the current database is modified
+    # databaseAbsPath
+    signalDatabaseChanged = QtCore.pyqtSignal(str)
+
+
+
+    def __init__(self, parent=None) -> None:
+        """
+        Watch the folder displayed in the tableWidgetFolder and the database
+        displayed in the tableWidgetDatabase.
+
+        The changes are notified by the OS through a QFileSystemWatcher.
+        Since network shares are often not notified, the files are also
+        checked every config['fileWatcherPollDelay'] s from their size and
+        modification time.
+        Notifications are coalesced over config['fileWatcherDelay'] ms, a
+        database being written continuously during a measurement.
+        """
+
+        super(FileWatcher, self).__init__(parent)
+
+        self.folder: str = ''
+        self.database: str = ''
+        self.folderSignature: tuple = ()
+        self.databaseSignature: tuple = ()
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.slotChanged)
+        self.watcher.fileChanged.connect(self.slotChanged)
+
+        self.timerNotify = QtCore.QTimer(self)
+        self.timerNotify.setSingleShot(True)
+        self.timerNotify.setInterval(config['fileWatcherDelay'])
+        self.timerNotify.timeout.connect(self.check)
+
+        self.timerPoll = QtCore.QTimer(self)
+        self.timerPoll.setInterval(config['fileWatcherPollDelay']*1000)
+        self.timerPoll.timeout.connect(self.check)
+        self.timerPoll.start()
+
+
+
+    def getFolderPaths(self) -> List[str]:
+
+        if self.folder=='':
+            return []
+        return [self.folder]
+
+
+
+    def getDatabasePaths(self) -> List[str]:
+        """
+        QCoDeS databases are written in their "-wal" file before being
+        checkpointed, Labrad datavault runs are files of their folder.
+        """
+
+        if self.database=='':
+            return []
+        elif isLabradFolder(self.database):
+            return [self.database]
+        else:
+            return [self.database, self.database+'-wal']
+
+
+
+    def updateWatcher(self) -> None:
+        """
+        Watch the existing files, the "-wal" file of a database and deleted
+        then recreated files not being watched otherwise.
+        """
+
+        paths = [path for path in self.getFolderPaths()+self.getDatabasePaths()
+                 if os.path.exists(path)]
+        watched = self.watcher.files()+self.watcher.directories()
+
+        removed = [path for path in watched if path not in paths]
+        if len(removed)>0:
+            self.watcher.removePaths(removed)
+
+        added = [path for path in paths if path not in watched]
+        if len(added)>0:
+            self.watcher.addPaths(added)
+
+
+
+    @QtCore.pyqtSlot(str)
+    def watchFolder(self, directory: str) -> None:
+        """
+        Called when a folder is displayed in the tableWidgetFolder.
+        """
+
+        self.folder = directory
+        self.folderSignature = getSignature(self.getFolderPaths())
+        self.updateWatcher()
+
+
+
+    @QtCore.pyqtSlot(str)
+    def watchDatabase(self, databaseAbsPath: str) -> None:
+        """
+        Called when a database is displayed in the tableWidgetDatabase.
+        """
+
+        self.database = databaseAbsPath
+        self.databaseSignature = getSignature(self.getDatabasePaths())
+        self.updateWatcher()
+
+
+
+    @QtCore.pyqtSlot(str)
+    def slotChanged(self, path: str) -> None:
+
+        if not self.timerNotify.isActive():
+            self.timerNotify.start()
+
+
+
+    @QtCore.pyqtSlot()
+    def check(self) -> None:
+        """
+        Emit the signals of the watched items whose size or modification
+        time changed.
+        """
+
+        folderSignature = getSignature(self.getFolderPaths())
+        if folderSignature!=self.folderSignature:
+            self.folderSignature = folderSignature
+            self.signalFolderChanged.emit(self.folder)
+
+        databaseSignature = getSignature(self.getDatabasePaths())
+        if databaseSignature!=self.databaseSignature:
+            self.databaseSignature = databaseSignature
+            self.signalDatabaseChanged.emit(self.database)
+
+        self.updateWatcher()
@@ -0,0 +1,210 @@
+import numpy as np
+from functools import lru_cache
+from scipy.ndimage import uniform_filter1d, median_filter
+from scipy.signal import (oaconvolve, savgol_coeffs, savgol_filter, butter,
+                          cheby1, sosfiltfilt)
+from typing import Tuple, Union
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+def convolve(y: np.ndarray,
+             kernel: np.ndarray) -> np.ndarray:
+    """
+    Return the convolution of y by a kernel of odd length, with the same
+    length as y, the data being extended by their edge values.
+    Kernels longer than config['filteringFftMinKernel'] are applied by
+    overlap-add FFT convolution, in O(n log k) instead of the O(n k) of the
+    direct convolution.
+    As with the direct convolution, a nan only spreads over the kernel
+    length: the FFT convolution is done with nan set to zero, the points
+    whose kernel covers a nan being then set to nan.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        Data to be filtered.
+    kernel : np.ndarray
+        Convolution kernel, of odd length.
+    """
+
+    half = len(kernel)//2
+    padded = np.pad(np.asarray(y, dtype=float), half, mode='edge')
+
+    if len(kernel)<config['filteringFftMinKernel']:
+        return np.convolve(padded, kernel, mode='valid')
+
+    nan = np.isnan(padded)
+    if not nan.any():
+        return oaconvolve(padded, kernel, mode='valid')
+
+    yFiltered = oaconvolve(np.where(nan, 0., padded), kernel, mode='valid')
+
+    # Number of nan covered by the kernel at each point
+    nbNan = np.concatenate(([0], np.cumsum(nan)))
+    yFiltered[nbNan[len(kernel):]-nbNan[:-len(kernel)]>0] = np.nan
+
+    return yFiltered
+
+
+
+@lru_cache(maxsize=32)
+def getSavitzkyGolayKernel(windowLength: int,
+                           polyorder: int) -> np.ndarray:
+    """
+    Return the convolution kernel of a Savitzky-Golay filter, see
+    scipy.signal.savgol_coeffs.
+    """
+
+    return savgol_coeffs(windowLength, polyorder, use='conv')
+
+
+
+def savitzkyGolay(y: np.ndarray,
+                  windowLength: int,
+                  polyorder: int) -> np.ndarray:
+    """
+    Savitzky-Golay filter, same result as scipy.signal.savgol_filter with
+    its default "interp" mode.
+    The interior of the data is filtered by convolution, see convolve, only
+    the edges, where a polynomial is fitted, are computed by
+    scipy.signal.savgol_filter.
+    """
+
+    if len(y)<=windowLength:
+        return savgol_filter(y, windowLength, polyorder)
+
+    yFiltered = convolve(y, getSavitzkyGolayKernel(windowLength, polyorder))
+
+    half = windowLength//2
+    yFiltered[:half]  = savgol_filter(y[:windowLength], windowLength, polyorder)[:half]
+    yFiltered[-half:] = savgol_filter(y[-windowLength:], windowLength, polyorder)[-half:]
+
+    return yFiltered
+
+
+
+def movingAverage(y: np.ndarray,
+                  windowLength: int) -> np.ndarray:
+    """
+    Average on windowLength points centered on each point, in O(n) whatever
+    the window length.
+    """
+
+    return uniform_filter1d(np.asarray(y, dtype=float), windowLength, mode='nearest')
+
+
+
+def median(y: np.ndarray,
+           windowLength: int) -> np.ndarray:
+    """
+    Median on windowLength points centered on each point.
+    Unlike the other filters, removes spikes without spreading them.
+    """
+
+    return median_filter(np.asarray(y, dtype=float), size=windowLength, mode='nearest')
+
+
+
+@lru_cache(maxsize=32)
+def getGaussianKernel(sigma: float) -> np.ndarray:
+    """
+    Return a normalized gaussian kernel of standard deviation sigma, in
+    number of points, truncated at 4 sigma.
+    """
+
+    half = max(int(4*sigma+0.5), 1)
+    x = np.arange(-half, half+1)
+    kernel = np.exp(-0.5*(x/sigma)**2)
+
+    return kernel/kernel.sum()
+
+
+
+def gaussian(y: np.ndarray,
+             sigma: float) -> np.ndarray:
+    """
+    Convolution by a gaussian of standard deviation sigma, in number of
+    points, see convolve.
+    """
+
+    return convolve(y, getGaussianKernel(sigma))
+
+
+
+@lru_cache(maxsize=32)
+def getButterworthSos(order: int,
+                      cutoff: Union[float, Tuple[float, float]],
+                      btype: str) -> np.ndarray:
+    """
+    Return the second-order sections of a Butterworth filter.
+
+    Parameters
+    ----------
+    order : int
+        Order of the filter.
+    cutoff : Union[float, Tuple[float, float]]
+        Cutoff frequency, or frequencies for a band-pass, as a fraction of the
+        Nyquist frequency.
+    btype : str
+        "lowpass", "highpass" or "bandpass".
+    """
+
+    return butter(order, cutoff, btype=btype, output='sos')
+
+
+
+def zeroPhaseFilter(sos: np.ndarray,
+                    y: np.ndarray) -> np.ndarray:
+    """
+    Filter the data forward and backward, as scipy.signal.sosfiltfilt, the
+    edge padding being reduced for data shorter than the default one instead
+    of raising a ValueError.
+    """
+
+    # Default padding of sosfiltfilt
+    nbZero = min(np.count_nonzero(sos[:, 2]==0), np.count_nonzero(sos[:, 5]==0))
+    padlen = 3*(2*len(sos)+1-nbZero)
+
+    return sosfiltfilt(sos, y, padlen=min(padlen, max(len(y)-1, 0)))
+
+
+
+def butterworth(y: np.ndarray,
+                order: int,
+                cutoff: Union[float, Tuple[float, float]],
+                btype: str) -> np.ndarray:
+    """
+    Zero-phase Butterworth filter, the data are filtered forward and
+    backward, see getButterworthSos and zeroPhaseFilter.
+    The effective order is then twice the given one.
+    """
+
+    return zeroPhaseFilter(getButterworthSos(order, cutoff, btype), y)
+
+
+
+@lru_cache(maxsize=32)
+def getDecimationSos(factor: int) -> np.ndarray:
+    """
+    Return the second-order sections of the anti-aliasing filter used to
+    decimate by factor, same as scipy.signal.decimate.
+    """
+
+    return cheby1(8, 0.05, 0.8/factor, output='sos')
+
+
+
+def decimate(x: np.ndarray,
+             y: np.ndarray,
+             factor: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep one point every factor after a zero-phase anti-aliasing filter,
+    see getDecimationSos.
+    """
+
+    if factor<=1:
+        return x, y
+
+    return x[::factor], zeroPhaseFilter(getDecimationSos(factor), y)[::factor]
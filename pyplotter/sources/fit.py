@@ -0,0 +1,426 @@
+import numpy as np
+# We remove warning from lmfit
+import warnings
+warnings.filterwarnings(
+    action='ignore',
+    module=r'lmfit',
+)
+warnings.filterwarnings(
+    action='ignore',
+    module=r'numpy',
+)
+import lmfit
+import inspect
+import multiprocess as mp
+from typing import Tuple, Optional, Any, List
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+class FitModel:
+
+
+
+    def __init__(self, modelClass: type,
+                       xData: Optional[np.ndarray]=None,
+                       yData: Optional[np.ndarray]=None) -> None:
+        """
+        Picklable stand-in of a fit dialog.
+
+        Fit models are QDialog which can't be sent to another process.
+        Their getInitialParams and func methods only rely on the xData and
+        yData attributes, they are called here on this light object instead
+        so that the fit can be done outside of the GUI.
+        The modelClass itself is pickled by reference.
+
+        Parameters
+        ----------
+        modelClass : type
+            Fit model class, see plot1d.dialogFit and plot2d.dialogFit.
+        xData : Optional[np.ndarray], optional
+            Data along the x axis of a 1d fit, by default None.
+        yData : Optional[np.ndarray], optional
+            Data along the y axis of a 1d fit, by default None.
+        """
+
+        self.modelClass = modelClass
+        self.xData      = xData
+        self.yData      = yData
+
+
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Give access to the attributes of the model class, e.g. staticmethod
+        used by the model such as GaussianPeak.fwhm2sigma.
+        """
+
+        if name=='modelClass':
+            raise AttributeError(name)
+
+        for klass in self.modelClass.__mro__:
+            if name in klass.__dict__:
+                attr = klass.__dict__[name]
+                if isinstance(attr, (staticmethod, classmethod)):
+                    return attr.__get__(None, self.modelClass)
+                elif inspect.isfunction(attr):
+                    return attr.__get__(self, type(self))
+                return attr
+
+        raise AttributeError(name)
+
+
+
+    def getInitialParams(self, *args) -> lmfit.Parameters:
+
+        return self.modelClass.getInitialParams(self, *args)
+
+
+
+    def func(self, p: lmfit.Parameters,
+                   *args) -> np.ndarray:
+
+        return self.modelClass.func(self, p, *args)
+
+
+
+###########################################################################
+#
+#
+#                           2d fit
+#
+#
+###########################################################################
+
+
+
+def fit2d(modelClass: type,
+          x: np.ndarray,
+          y: np.ndarray,
+          z: np.ndarray,
+          iterCallback: Optional[callable]=None) -> Tuple[np.ndarray,
+                                                          lmfit.Parameters,
+                                                          str]:
+    """
+    Fit a 2d model on a 2d map.
+
+    Parameters
+    ----------
+    modelClass : type
+        Fit model class, see plot2d.dialogFit.
+    x : np.ndarray
+        Data along the x axis, 1d array.
+    y : np.ndarray
+        Data along the y axis, 1d array.
+    z : np.ndarray
+        Data along the z axis, 2d array.
+    iterCallback : Optional[callable], optional
+        Called at each iteration with the lmfit iter_cb signature, by default
+        None.
+
+    Return
+    ------
+    zFit : np.ndarray
+        Model evaluated with the fitted parameters.
+    params : lmfit.Parameters
+        Fitted parameters.
+    report : str
+        lmfit fit report.
+    """
+
+    model = FitModel(modelClass)
+
+    def residual(p: lmfit.Parameters) -> np.ndarray:
+        return (model.func(p, x, y) - z).flatten()
+
+    result = lmfit.minimize(fcn=residual,
+                            params=model.getInitialParams(x, y, z),
+                            iter_cb=iterCallback,
+                            max_nfev=config['fitMaxNbEvaluation'])
+
+    return model.func(result.params, x, y), result.params, lmfit.fit_report(result)
+
+
+
+def fit2dmp(modelClass: type,
+            x: np.ndarray,
+            y: np.ndarray,
+            z: np.ndarray,
+            queueData: mp.Queue,
+            queueProgressBar: mp.Queue,
+            queueDone: mp.Queue) -> None:
+    """
+    Fit a 2d model on a 2d map, see fit2d.
+    Meant to be launched in another process, the progress is given by the
+    number of model evaluations compared to config['fitMaxNbEvaluation'].
+    The result is put in queueData as (zFit, params, report) or as an error
+    message if the fit failed.
+    """
+
+    def iterCallback(params: lmfit.Parameters,
+                     iteration: int,
+                     resid: np.ndarray,
+                     *args, **kwargs) -> None:
+        if iteration%10==0:
+            queueProgressBar.get()
+            queueProgressBar.put(min(iteration/config['fitMaxNbEvaluation']*100, 100))
+
+    try:
+        queueData.put(fit2d(modelClass, x, y, z, iterCallback))
+    except Exception as e:
+        queueData.put(str(e))
+
+    queueDone.put(True)
+
+
+
+###########################################################################
+#
+#
+#                           1d fit
+#
+#
+###########################################################################
+
+
+
+def getJacobian(model: FitModel,
+                method: str) -> dict:
+    """
+    Return the lmfit keyword arguments giving the analytic jacobian of a 1d
+    model, empty if the model does not provide its derivatives.
+    Without them, lmfit estimates the jacobian by finite differences, costing
+    one model evaluation per varying parameter.
+
+    Parameters
+    ----------
+    model : FitModel
+        1d fit model whose xData and yData are fitted.
+    method : str
+        lmfit minimization method.
+    """
+
+    if not hasattr(model.modelClass, 'derivatives'):
+        return {}
+
+    def jacobian(p: lmfit.Parameters) -> np.ndarray:
+        # One row per varying parameter, ordered as lmfit var_names
+        d = model.derivatives(p, model.xData)
+        return np.stack([np.broadcast_to(d[name], model.xData.shape) for name, par in p.items() if par.vary])
+
+    # Least squares methods use the jacobian of the residual
+    # Given transposed, it is used by MINPACK without copy
+    if method=='leastsq':
+        return {'Dfun' : jacobian,
+                'col_deriv' : True}
+    elif method=='least_squares':
+        return {'jac' : lambda p: jacobian(p).T}
+
+    # Scalar methods use the gradient of the sum of squared residual
+    # lmfit ignores it for the methods not using a gradient
+    def gradient(p: lmfit.Parameters) -> np.ndarray:
+        return 2.*jacobian(p)@(model.func(p, model.xData) - model.yData)
+
+    return {'jac' : gradient}
+
+
+
+def fit1d(modelClass: type,
+          x: np.ndarray,
+          y: np.ndarray,
+          method: str,
+          initialParams: Optional[lmfit.Parameters]=None) -> Tuple[np.ndarray,
+                                                                   lmfit.Parameters,
+                                                                   str]:
+    """
+    Fit a 1d model on 1d data.
+    Raise an error if the fit fails.
+
+    Parameters
+    ----------
+    modelClass : type
+        Fit model class, see plot1d.dialogFit.
+    x : np.ndarray
+        Data along the x axis.
+    y : np.ndarray
+        Data along the y axis.
+    method : str
+        lmfit minimization method.
+    initialParams : Optional[lmfit.Parameters], optional
+        Parameters used as starting point, usually the result of a previous
+        fit on similar data.
+        If None or if the fit starting from them fails, the model guess is
+        used, by default None.
+
+    Return
+    ------
+    yFit : np.ndarray
+        Model evaluated with the fitted parameters.
+    params : lmfit.Parameters
+        Fitted parameters.
+    report : str
+        lmfit fit report.
+    """
+
+    # nan are not handled by the fit models
+    mask = ~np.isnan(y)
+    model = FitModel(modelClass, x[mask], y[mask])
+
+    def residual(p: lmfit.Parameters) -> np.ndarray:
+        return model.func(p, model.xData) - model.yData
+
+    result = None
+    if initialParams is not None:
+        try:
+            result = lmfit.minimize(residual,
+                                    initialParams.copy(),
+                                    method=method,
+                                    **getJacobian(model, method))
+            if not np.isfinite(result.chisqr):
+                result = None
+        except Exception:
+            result = None
+
+    if result is None:
+        result = lmfit.minimize(residual,
+                                model.getInitialParams(),
+                                method=method,
+                                **getJacobian(model, method))
+
+    return model.func(result.params, x), result.params, lmfit.fit_report(result)
+
+
+
+###########################################################################
+#
+#
+#                           Slice by slice fit
+#
+#
+###########################################################################
+
+
+
+def fitSlice(modelClass: type,
+             x: np.ndarray,
+             y: np.ndarray,
+             method: str,
+             initialParams: Optional[lmfit.Parameters]=None) -> Tuple[np.ndarray,
+                                                                      Optional[lmfit.Parameters]]:
+    """
+    Fit a 1d model on a single slice of a 2d map, see fit1d.
+
+    Return
+    ------
+    yFit : np.ndarray
+        Model evaluated with the fitted parameters, nan if the fit failed.
+    params : Optional[lmfit.Parameters]
+        Fitted parameters, None if the fit failed.
+    """
+
+    try:
+        yFit, params, report = fit1d(modelClass, x, y, method, initialParams)
+    except Exception:
+        return np.full(len(x), np.nan), None
+
+    return yFit, params
+
+
+
+def fitSlices(args: Tuple[type, np.ndarray, np.ndarray, str]) -> List[Tuple[np.ndarray,
+                                                                           Optional[lmfit.Parameters]]]:
+    """
+    Fit a 1d model on consecutive slices of a 2d map, each fit starting from
+    the result of the previous slice.
+    Take a single tuple as argument to be used with multiprocess.Pool.imap.
+
+    Parameters
+    ----------
+    args : Tuple[type, np.ndarray, np.ndarray, str]
+        modelClass, x, slices and lmfit method.
+        modelClass is a fit model class, see plot1d.dialogFit.
+        slices is a 2d array, slices[i] being fitted against x.
+
+    Return
+    ------
+    results : List[Tuple[np.ndarray, Optional[lmfit.Parameters]]]
+        yFit and params of each slice, see fitSlice.
+    """
+
+    modelClass, x, slices, method = args
+
+    results = []
+    initialParams = None
+    for y in slices:
+        yFit, params = fitSlice(modelClass, x, y, method, initialParams)
+        results.append((yFit, params))
+
+        if params is not None:
+            initialParams = params
+
+    return results
+
+
+
+def getSlicesChunks(nbSlices: int,
+                    nbProcess: int) -> List[slice]:
+    """
+    Split the slices of a map in contiguous chunks to be fitted in parallel.
+    Since slices are seeded by their neighbour, only the first slice of a chunk
+    starts from the model guess.
+    Several chunks per process are used to follow the progress of the fit and
+    balance the load between processes.
+    """
+
+    nbChunk = min(nbSlices, nbProcess*config['fitNbChunkPerProcess'])
+    bounds = np.linspace(0, nbSlices, nbChunk+1).astype(int)
+
+    return [slice(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+
+def getParameterValues(params: List[Optional[lmfit.Parameters]],
+                       name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the values and uncertainties of a parameter along the fitted
+    slices.
+    Slices whose fit failed, or whose uncertainty could not be estimated,
+    are returned as nan.
+
+    Parameters
+    ----------
+    params : List[Optional[lmfit.Parameters]]
+        Fitted parameters of each slice, None if the fit failed.
+    name : str
+        Name of the parameter.
+
+    Return
+    ------
+    values : np.ndarray
+        Value of the parameter for each slice.
+    stderr : np.ndarray
+        Standard error of the parameter for each slice.
+    """
+
+    values = np.full(len(params), np.nan)
+    stderr = np.full(len(params), np.nan)
+    for i, p in enumerate(params):
+        if p is not None:
+            values[i] = p[name].value
+            if p[name].stderr is not None:
+                stderr[i] = p[name].stderr
+
+    return values, stderr
+
+
+
+def getNbProcess() -> int:
+    """
+    Return the number of processes used to fit in parallel.
+    """
+
+    if config['fitNbProcess'] is None:
+        return max(mp.cpu_count()-1, 1)
+    else:
+        return int(config['fitNbProcess'])
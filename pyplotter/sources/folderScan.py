@@ -0,0 +1,115 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+from .touchstone import getTouchstonePortNumber
+
+
+
+def scanFolder(directory: str) -> Tuple[List[dict], List[os.DirEntry]]:
+    """
+    Return the folders and the authorized files of a folder, see
+    config['authorizedExtension'], and the Touchstone files of any number of
+    ports, from a single os.scandir pass.
+    Files and folders starting with a "." are not returned.
+
+    Return
+    ------
+    entries : List[dict]
+        For each item, sorted by reverse name, "name", "isDir", "extension",
+        "opened", True if a QCoDeS database is opened by someone else, i.e.
+        has a "-wal" file, and "size", None until getFileSize is called.
+    dirEntries : List[os.DirEntry]
+        os.DirEntry of each item, see getFileSize.
+    """
+
+    items = []
+    names = set()
+    with os.scandir(directory) as it:
+        for dirEntry in it:
+            names.add(dirEntry.name)
+            if dirEntry.name[0]=='.':
+                continue
+
+            try:
+                isDir = dirEntry.is_dir()
+            except OSError:
+                isDir = False
+
+            extension = os.path.splitext(dirEntry.name)[-1][1:].lower()
+            if isDir or (dirEntry.name not in config['forbiddenFile'] and
+                         (extension in config['authorizedExtension'] or
+                          getTouchstonePortNumber(dirEntry.name)>0)):
+                items.append((dirEntry, isDir, extension))
+
+    items.sort(key=lambda item: item[0].name, reverse=True)
+
+    entries = [{'name'      : dirEntry.name,
+                'isDir'     : isDir,
+                'extension' : extension,
+                'opened'    : not isDir and dirEntry.name[:-2]+'db-wal' in names,
+                'size'      : None} for dirEntry, isDir, extension in items]
+
+    return entries, [item[0] for item in items]
+
+
+
+def getFileSize(dirEntry: os.DirEntry) -> Optional[int]:
+    """
+    Return the size of a file in bytes, None if it can't be read.
+    """
+
+    try:
+        return dirEntry.stat().st_size
+    except OSError:
+        return None
+
+
+
+class FolderCache:
+
+
+
+    def __init__(self) -> None:
+        """
+        Content of the last browsed folders, see scanFolder, at most
+        config['folderCacheSize'].
+        A folder content is valid as long as the folder modification time is
+        unchanged, i.e. no item has been added, removed or renamed.
+        The cache is shared between the folder threads.
+        """
+
+        self.lock = threading.Lock()
+        # {directory : (mtime, entries)}
+        self.folders = {}
+
+
+
+    def get(self, directory: str,
+                  mtime: int) -> Optional[List[dict]]:
+        """
+        Return the content of a folder if cached and still valid, None
+        otherwise.
+        """
+
+        with self.lock:
+            if directory in self.folders and self.folders[directory][0]==mtime:
+                # Most recently used folders are kept
+                self.folders[directory] = self.folders.pop(directory)
+                return [dict(entry) for entry in self.folders[directory][1]]
+
+        return None
+
+
+
+    def set(self, directory: str,
+                  mtime: int,
+                  entries: List[dict]) -> None:
+
+        with self.lock:
+            self.folders.pop(directory, None)
+            self.folders[directory] = (mtime, [dict(entry) for entry in entries])
+            while len(self.folders)>config['folderCacheSize']:
+                del self.folders[next(iter(self.folders))]
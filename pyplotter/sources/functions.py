@@ -7,6 +7,7 @@ import pandas as pd
 
 from .config import loadConfigCurrent
 config = loadConfigCurrent()
+from .touchstone import getTouchstonePortNumber
 
 
 def parse_number(number: float,
@@ -113,6 +114,21 @@ def isBlueForsFolder(folderName : str) -> bool:
     return len(folderName.split('-'))==3 and all([len(i)==2 for i in folderName.split('-')])
 
 
+# Separator of the first and last folders of a BlueFors time range
+BLUEFORS_RANGE_SEPARATOR = ' to '
+
+
+def isBlueForsRange(folderName : str) -> bool:
+    """
+    Return True if a string follow the BlueFors time range pattern, the first
+    and last BlueFors log folders of the range.
+    """
+
+    names = os.path.basename(folderName).split(BLUEFORS_RANGE_SEPARATOR)
+
+    return len(names)==2 and all([isBlueForsFolder(i) for i in names])
+
+
 def isQcodesData(folderName: str) -> bool:
     """
     Return True if a string follow Qcodes database name pattern.
@@ -213,8 +229,9 @@ def getPlotRef(databaseAbsPath: str,
     # If Labrad data folder
     elif isLabradFolder(databaseAbsPath):
         dataPath = databaseAbsPath+str(runId)
-    # If csv or s2p files we return the filename without the extension
-    elif databaseAbsPath[-3:].lower() in ('csv', 's2p'):
+    # If csv or Touchstone files we return the filename without the extension
+    elif (databaseAbsPath[-3:].lower()=='csv' or
+          getTouchstonePortNumber(databaseAbsPath)>0):
         dataPath = currentPath
     else:
         dataPath = currentPath+str(runId)
@@ -240,11 +257,13 @@ def getPlotTitle(databaseAbsPath: str,
     if databaseAbsPath is None:
         return ''
     # If BlueFors log files
-    elif isBlueForsFolder(os.path.basename(databaseAbsPath)):
+    elif (isBlueForsFolder(os.path.basename(databaseAbsPath)) or
+          isBlueForsRange(databaseAbsPath)):
         return os.path.basename(databaseAbsPath)
-    # If csv or s2p files we return the filename without the extension
-    elif databaseAbsPath[-3:].lower() in ['csv', 's2p']:
-        return databaseAbsPath[:-4]
+    # If csv or Touchstone files we return the filename without the extension
+    elif (databaseAbsPath[-3:].lower()=='csv' or
+          getTouchstonePortNumber(databaseAbsPath)>0):
+        return os.path.splitext(databaseAbsPath)[0]
     else:
         # If user only wants the database path
         if config['displayOnlyDbNameInPlotTitle']:
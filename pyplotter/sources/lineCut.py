@@ -0,0 +1,180 @@
+import numpy as np
+from typing import Tuple, Optional
+
+
+def coordinate2Index(axis: np.ndarray,
+                     values: np.ndarray) -> np.ndarray:
+    """
+    Return the fractional indexes of the values along a monotonic axis.
+    Values outside the axis range are returned as np.nan so that they are
+    ignored by the interpolation.
+
+    Parameters
+    ----------
+    axis : np.ndarray
+        Monotonic 1d array, may be increasing or decreasing and contain nan.
+    values : np.ndarray
+        Physical coordinates to be converted in fractional indexes.
+
+    Return
+    ------
+    index : np.ndarray
+        Fractional indexes, same shape as values.
+    """
+
+    index = np.arange(len(axis), dtype=float)
+
+    # make_grid may leave some nan along the axis
+    mask = ~np.isnan(axis)
+    axis  = axis[mask]
+    index = index[mask]
+
+    # np.interp only handles increasing abscissa
+    if axis[-1]<axis[0]:
+        axis  = axis[::-1]
+        index = index[::-1]
+
+    fractionalIndex = np.interp(values, axis, index)
+    fractionalIndex[(values<axis[0]) | (values>axis[-1])] = np.nan
+
+    return fractionalIndex
+
+
+def bilinearInterpolation(z: np.ndarray,
+                          xIndex: np.ndarray,
+                          yIndex: np.ndarray) -> np.ndarray:
+    """
+    Vectorised bilinear interpolation of a 2d array at fractional indexes.
+    Points with nan index, or touching a nan pixel, return nan.
+
+    Parameters
+    ----------
+    z : np.ndarray
+        2d array of shape (len(x), len(y)).
+    xIndex : np.ndarray
+        Fractional indexes along the first dimension of z.
+    yIndex : np.ndarray
+        Fractional indexes along the second dimension of z, same shape as
+        xIndex.
+    """
+
+    outside = np.isnan(xIndex) | np.isnan(yIndex)
+    xIndex = np.where(outside, 0., xIndex)
+    yIndex = np.where(outside, 0., yIndex)
+
+    # Lower left pixel, clipped so that the upper right one exists
+    # Maps with a single row or column are interpolated along one axis only
+    nx, ny = z.shape
+    x0 = np.clip(np.floor(xIndex).astype(int), 0, max(nx-2, 0))
+    y0 = np.clip(np.floor(yIndex).astype(int), 0, max(ny-2, 0))
+    x1 = np.minimum(x0+1, nx-1)
+    y1 = np.minimum(y0+1, ny-1)
+    fx = xIndex-x0
+    fy = yIndex-y0
+
+    zInterp = (z[x0, y0]*(1.-fx)*(1.-fy)
+              +z[x1, y0]*fx*(1.-fy)
+              +z[x0, y1]*(1.-fx)*fy
+              +z[x1, y1]*fx*fy)
+    zInterp[outside] = np.nan
+
+    return zInterp
+
+
+def getLineCut(x: np.ndarray,
+               y: np.ndarray,
+               z: np.ndarray,
+               xSlice: Tuple[float, float],
+               ySlice: Tuple[float, float],
+               nbPoints: Optional[int]=None,
+               width: float=0.,
+               nbWidthPoints: Optional[int]=None) -> Tuple[np.ndarray,
+                                                           np.ndarray,
+                                                           np.ndarray]:
+    """
+    Return the data along an arbitrary segment of a 2d map.
+    The map is sampled with a bilinear interpolation at regularly spaced
+    points along the segment, in physical coordinates, so that non regular
+    axes are correctly handled.
+    If a width is given, the cut is averaged along the direction perpendicular
+    to the segment.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis, 1d array.
+    y : np.ndarray
+        Data along the y axis, 1d array.
+    z : np.ndarray
+        Data along the z axis, 2d array of shape (len(x), len(y)).
+    xSlice : Tuple[float, float]
+        x coordinates of the segment extremities.
+    ySlice : Tuple[float, float]
+        y coordinates of the segment extremities.
+    nbPoints : Optional[int], optional
+        Number of points along the cut.
+        If None or 0, one point per pixel crossed by the segment, by default
+        None.
+    width : float, optional
+        Width of the cut in pixels, by default 0 meaning no averaging.
+    nbWidthPoints : Optional[int], optional
+        Number of points averaged across the cut.
+        If None, one point per pixel of width, made odd so that the cut
+        itself is sampled, by default None.
+
+    Return
+    ------
+    xCut : np.ndarray
+        x coordinates of the cut points.
+    yCut : np.ndarray
+        y coordinates of the cut points.
+    zCut : np.ndarray
+        Interpolated, and eventually averaged, z values along the cut.
+    """
+
+    # Mean pixel size, used to define the pixel space in which the length and
+    # the perpendicular direction of the cut are defined
+    dx = (np.nanmax(x)-np.nanmin(x))/max(len(x)-1, 1)
+    dy = (np.nanmax(y)-np.nanmin(y))/max(len(y)-1, 1)
+    if dx==0:
+        dx = 1.
+    if dy==0:
+        dy = 1.
+
+    # Segment in pixel unit
+    ux = (xSlice[1]-xSlice[0])/dx
+    uy = (ySlice[1]-ySlice[0])/dy
+    length = np.hypot(ux, uy)
+
+    if not nbPoints:
+        nbPoints = int(np.ceil(length))+1
+    nbPoints = max(int(nbPoints), 2)
+
+    t = np.linspace(0., 1., nbPoints)
+    xCut = xSlice[0]+t*(xSlice[1]-xSlice[0])
+    yCut = ySlice[0]+t*(ySlice[1]-ySlice[0])
+
+    if width>0 and length>0:
+        if not nbWidthPoints:
+            nbWidthPoints = int(np.ceil(width))+1
+            nbWidthPoints += 1-nbWidthPoints%2
+        nbWidthPoints = max(int(nbWidthPoints), 2)
+
+        # Unit vector perpendicular to the cut, in physical unit
+        offsets = np.linspace(-width/2., width/2., nbWidthPoints)[:,np.newaxis]
+        xSample = xCut[np.newaxis,:]-offsets*uy/length*dx
+        ySample = yCut[np.newaxis,:]+offsets*ux/length*dy
+    else:
+        xSample = xCut[np.newaxis,:]
+        ySample = yCut[np.newaxis,:]
+
+    zSample = bilinearInterpolation(z,
+                                    coordinate2Index(x, xSample),
+                                    coordinate2Index(y, ySample))
+
+    # Average across the cut while ignoring the points outside the map
+    count = np.sum(~np.isnan(zSample), axis=0)
+    zCut = np.full(nbPoints, np.nan)
+    np.divide(np.nansum(zSample, axis=0), count, out=zCut, where=count>0)
+
+    return xCut, yCut, zCut
@@ -0,0 +1,104 @@
+import struct
+import zipfile
+import numpy as np
+from typing import List, Dict
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+# Size of the fixed part of a zip local file header
+LOCAL_HEADER_SIZE = 30
+
+
+
+def readNpyHeader(f) -> tuple:
+    """
+    Return the shape, fortran order and dtype of a .npy file, only its header
+    being read.
+    """
+
+    version = np.lib.format.read_magic(f)
+    if version==(1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    else:
+        return np.lib.format.read_array_header_2_0(f)
+
+
+
+def getNpzMembers(filePath: str) -> List[dict]:
+    """
+    Return the arrays of a npz file, without their data.
+    Only the zip directory and the .npy headers are read, the data are loaded
+    by loadNpzMember.
+
+    Return
+    ------
+    members : List[dict]
+        For each array, in the order of the archive, "name", "shape",
+        "dtype", "fortranOrder" and "offset", the position of the data in the
+        npz file for uncompressed arrays, None otherwise.
+    """
+
+    members = []
+    with open(filePath, 'rb') as file, zipfile.ZipFile(file) as archive:
+        for info in archive.infolist():
+            if not info.filename.endswith('.npy'):
+                continue
+
+            with archive.open(info) as f:
+                shape, fortranOrder, dtype = readNpyHeader(f)
+                headerSize = f.tell()
+
+            # Uncompressed arrays are memory-mapped, their data follow the
+            # local header of the zip entry and the .npy header
+            offset = None
+            if info.compress_type==zipfile.ZIP_STORED and not dtype.hasobject:
+                file.seek(info.header_offset)
+                localHeader = file.read(LOCAL_HEADER_SIZE)
+                nameLength, extraLength = struct.unpack('<HH', localHeader[26:30])
+                offset = info.header_offset+LOCAL_HEADER_SIZE+nameLength+extraLength+headerSize
+
+            members.append({'name'         : info.filename[:-4],
+                            'shape'        : shape,
+                            'dtype'        : dtype,
+                            'fortranOrder' : fortranOrder,
+                            'offset'       : offset})
+
+    return members
+
+
+
+def loadNpzMember(filePath: str,
+                  member: dict) -> np.ndarray:
+    """
+    Return the data of an array of a npz file, see getNpzMembers.
+    Uncompressed arrays are memory-mapped, read only, instead of being loaded
+    in memory, compressed ones are decompressed.
+    """
+
+    if member['offset'] is not None:
+        return np.memmap(filePath,
+                         dtype=member['dtype'],
+                         mode='r',
+                         offset=member['offset'],
+                         shape=member['shape'],
+                         order='F' if member['fortranOrder'] else 'C')
+
+    with np.load(filePath) as file:
+        return file[member['name']]
+
+
+
+def loadNpzMembers(filePath: str,
+                   members: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Return the data of arrays of a npz file, see loadNpzMember.
+
+    Return
+    ------
+    data : Dict[str, np.ndarray]
+        {name : data}
+    """
+
+    return {member['name'] : loadNpzMember(filePath, member) for member in members}
@@ -8,6 +8,7 @@ except AttributeError:
     import pyqtgraph as pg
 from .config import loadConfigCurrent
 config = loadConfigCurrent()
+from .downsampling import MinMaxIndex
 
 pg.setConfigOption('background', None)
 pg.setConfigOption('useOpenGL', config['pyqtgraphOpenGL'])
@@ -62,19 +63,18 @@ def getData(self):
     if not isinstance(ds, int):
         ds = 1
 
-    if self.opts['autoDownsample']:
-        # this option presumes that x-values have uniform spacing
-        if view_range is not None and len(x) > 1:
-            dx = float(x[-1]-x[0]) / (len(x)-1)
-            if dx != 0.0:
-                x0 = (view_range.left()-x[0]) / dx
-                x1 = (view_range.right()-x[0]) / dx
-                width = self.getViewBox().width()
-                if width != 0.0:
-                    ds = int(max(1, int((x1-x0) / (width*self.opts['autoDownsampleFactor']))))
-                ## downsampling is expensive; delay until after clipping.
-
-    if self.opts['clipToView']:
+    # Automatic downsampling keeps the first, last, min and max points of each
+    # horizontal pixel (M4), the x axis may be non uniform
+    m4 = False
+    if self.opts['autoDownsample'] and view is not None:
+        width = view.width()
+        if width>0 and len(x)>4*width:
+            x, y = getMinMaxIndex(self, x, y).getData(view_range.left(),
+                                                      view_range.right(),
+                                                      width)
+            m4 = True
+
+    if self.opts['clipToView'] and not m4:
         if view is None or view.autoRangeEnabled()[0]:
             pass # no ViewBox to clip to, or view will autoscale to data range.
         else:
@@ -173,6 +173,23 @@ def getData(self):
 
 pg.PlotDataItem.getData = getData
 
+def getMinMaxIndex(self, x, y):
+    """
+    Return the min/max index of the displayed data of a PlotDataItem, see
+    MinMaxIndex.
+    The index is built once and kept until the data or the display mode, fft,
+    log, ..., of the curve change.
+    """
+    modes = (self.opts['fftMode'], self.opts['derivativeMode'],
+             self.opts['phasemapMode'], tuple(self.opts['logMode']))
+    if getattr(self, 'minMaxIndexKey', None)!=(id(self.xData), id(self.yData), modes):
+        self.minMaxIndex = MinMaxIndex(x, y)
+        self.minMaxIndexKey = (id(self.xData), id(self.yData), modes)
+        # Keep the data alive so that their id can't be reused
+        self.minMaxIndexData = (self.xData, self.yData)
+
+    return self.minMaxIndex
+
 # Replace the setTitle function to have a litle bit more space below the title
 def setTitle(self, title=None, **args):
     """
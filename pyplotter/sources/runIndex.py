@@ -0,0 +1,442 @@
+import os
+import re
+import json
+import sqlite3
+import pathlib
+from typing import Callable, Iterator, List, Optional, Tuple
+from platformdirs import user_cache_dir
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+from .functions import isLabradFolder
+from .qcodesDatabase import timestamp2string
+
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS databases (databaseAbsPath TEXT PRIMARY KEY,
+                                      signature TEXT);
+CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY,
+                                 databaseAbsPath TEXT,
+                                 runId INTEGER,
+                                 completed INTEGER,
+                                 experimentName TEXT,
+                                 runName TEXT,
+                                 started TEXT);
+CREATE INDEX IF NOT EXISTS runsDatabase ON runs (databaseAbsPath, runId);
+CREATE VIRTUAL TABLE IF NOT EXISTS runsText USING fts5(runName,
+                                                        experimentName,
+                                                        sampleName,
+                                                        date,
+                                                        parameters,
+                                                        snapshot,
+                                                        database);
+"""
+
+# Labrad datavault runs, e.g. "00012 - flux sweep.hdf5"
+LABRAD_RUN = re.compile(r'^(\d+) - (.*)\.(hdf5|h5|csv)$')
+
+
+
+def getIndexPath() -> str:
+    """
+    Return the path of the run index, in the user cache folder.
+    """
+
+    return os.path.join(user_cache_dir('pyplotter'), 'runIndex.sqlite')
+
+
+
+def openIndex(indexPath: str) -> sqlite3.Connection:
+    """
+    Open the run index, creating it if needed.
+    The index is read by the search while being written by the indexer.
+    """
+
+    os.makedirs(os.path.dirname(indexPath), exist_ok=True)
+
+    conn = sqlite3.connect(indexPath, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(INDEX_SCHEMA)
+
+    return conn
+
+
+
+def getDatabaseSignature(databaseAbsPath: str) -> str:
+    """
+    Return the size and modification time of a QCoDeS database and its
+    "-wal" file, or of a Labrad datavault folder.
+    """
+
+    paths = [databaseAbsPath]
+    if not isLabradFolder(databaseAbsPath):
+        paths.append(databaseAbsPath+'-wal')
+
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append('{}:{}'.format(stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append('')
+
+    return '/'.join(signature)
+
+
+
+def getRunDate(timestamp: Optional[float]) -> str:
+    """
+    Return the searchable date of a run, e.g. "2024 march 2024-03-12".
+    """
+
+    if timestamp is None:
+        return ''
+
+    return timestamp2string(timestamp, '%Y %B %Y-%m-%d').lower()
+
+
+
+def getSnapshotText(snapshot: Optional[str]) -> str:
+    """
+    Return the searchable part of a run snapshot: the instrument names and
+    the values of the keys in config['runIndexSnapshotKeys'], at any depth.
+    """
+
+    if snapshot is None:
+        return ''
+
+    try:
+        snapshotDict = json.loads(snapshot)
+    except ValueError:
+        return ''
+
+    texts = []
+    station = snapshotDict.get('station', {}) if isinstance(snapshotDict, dict) else {}
+    if isinstance(station, dict):
+        texts += list(station.get('instruments', {}).keys())
+
+    stack = [snapshotDict]
+    while len(stack)>0:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key in config['runIndexSnapshotKeys'] and isinstance(value, (str, int, float)):
+                    texts.append(str(value))
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(item, list):
+            stack += [i for i in item if isinstance(i, (dict, list))]
+
+    return ' '.join(texts)
+
+
+
+def getParametersText(runDescription: Optional[str]) -> str:
+    """
+    Return the names and labels of the parameters of a run.
+    """
+
+    if runDescription is None:
+        return ''
+
+    try:
+        paramSpecs = json.loads(runDescription)['interdependencies']['paramspecs']
+    except (ValueError, KeyError, TypeError):
+        return ''
+
+    return ' '.join('{} {}'.format(i.get('name', ''), i.get('label', '')) for i in paramSpecs)
+
+
+
+def getQcodesRuns(databaseAbsPath: str,
+                  indexedRuns: dict) -> Tuple[List[tuple], List[int]]:
+    """
+    Return the runs of a QCoDeS database to be indexed: the new runs and the
+    ones not completed when last indexed.
+    The database is opened read only.
+
+    Parameters
+    ----------
+    databaseAbsPath : str
+        Absolute path of the database.
+    indexedRuns : dict
+        {runId : completed} of the runs already indexed.
+
+    Return
+    ------
+    (runs, removed) : tuple
+        runs : List[tuple]
+            Rows of the index, see indexDatabase.
+        removed : List[int]
+            Id of the indexed runs no longer in the database.
+    """
+
+    uri = pathlib.Path(os.path.abspath(databaseAbsPath)).as_uri()+'?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, timeout=5)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT run_id, completed_timestamp FROM runs")
+        states = {runId : completed is not None for runId, completed in cur.fetchall()}
+
+        runIds = [runId for runId, completed in states.items()
+                  if runId not in indexedRuns or (completed and not indexedRuns[runId])]
+
+        runs = []
+        # Runs are read by batches to keep each request small
+        for i in range(0, len(runIds), config['maximumRunPerRequest']):
+            batch = runIds[i:i+config['maximumRunPerRequest']]
+            cur.execute("SELECT r.run_id, r.name, e.name, e.sample_name, "
+                        "r.run_timestamp, r.completed_timestamp, "
+                        "r.run_description, r.snapshot "
+                        "FROM runs r LEFT JOIN experiments e ON r.exp_id=e.exp_id "
+                        "WHERE r.run_id IN ({})".format(','.join('?'*len(batch))),
+                        batch)
+            for row in cur.fetchall():
+                (runId, runName, experimentName, sampleName,
+                 started, completed, runDescription, snapshot) = row
+                runs.append((runId,
+                             completed is not None,
+                             experimentName or '',
+                             runName or '',
+                             timestamp2string(started) if started is not None else '',
+                             sampleName or '',
+                             getRunDate(started),
+                             getParametersText(runDescription),
+                             getSnapshotText(snapshot)))
+    finally:
+        conn.close()
+
+    removed = [runId for runId in indexedRuns if runId not in states]
+
+    return runs, removed
+
+
+
+def getLabradRuns(databaseAbsPath: str,
+                  indexedRuns: dict) -> Tuple[List[tuple], List[int]]:
+    """
+    Return the runs of a Labrad datavault folder to be indexed, from their
+    file names and modification times, see getQcodesRuns.
+    """
+
+    runs = []
+    runIds = set()
+    with os.scandir(databaseAbsPath) as it:
+        for dirEntry in it:
+            match = LABRAD_RUN.match(dirEntry.name)
+            if match is None:
+                continue
+
+            runId = int(match.group(1))
+            runIds.add(runId)
+            if runId in indexedRuns:
+                continue
+
+            try:
+                started = dirEntry.stat().st_mtime
+            except OSError:
+                started = None
+
+            runs.append((runId,
+                         True,
+                         dirEntry.name[:-len(match.group(3))-1],
+                         match.group(2),
+                         timestamp2string(started) if started is not None else '',
+                         '',
+                         getRunDate(started),
+                         '',
+                         ''))
+
+    removed = [runId for runId in indexedRuns if runId not in runIds]
+
+    return runs, removed
+
+
+
+def indexDatabase(conn: sqlite3.Connection,
+                  databaseAbsPath: str) -> bool:
+    """
+    Update the index of a QCoDeS database or Labrad datavault folder if it
+    changed since last indexed.
+
+    Return
+    ------
+    updated : bool
+        True if the database has been indexed.
+    """
+
+    signature = getDatabaseSignature(databaseAbsPath)
+    row = conn.execute("SELECT signature FROM databases WHERE databaseAbsPath=?",
+                       (databaseAbsPath,)).fetchone()
+    if row is not None and row[0]==signature:
+        return False
+
+    indexedRuns = {runId : bool(completed) for runId, completed in
+                   conn.execute("SELECT runId, completed FROM runs WHERE databaseAbsPath=?",
+                                (databaseAbsPath,))}
+
+    if isLabradFolder(databaseAbsPath):
+        runs, removed = getLabradRuns(databaseAbsPath, indexedRuns)
+    else:
+        runs, removed = getQcodesRuns(databaseAbsPath, indexedRuns)
+
+    databaseName = os.path.basename(databaseAbsPath)
+    with conn:
+        for runId in removed+[run[0] for run in runs if run[0] in indexedRuns]:
+            deleteRun(conn, databaseAbsPath, runId)
+
+        for (runId, completed, experimentName, runName, started,
+             sampleName, date, parameters, snapshot) in runs:
+            cur = conn.execute("INSERT INTO runs (databaseAbsPath, runId, completed, experimentName, runName, started) "
+                               "VALUES (?, ?, ?, ?, ?, ?)",
+                               (databaseAbsPath, runId, completed, experimentName, runName, started))
+            conn.execute("INSERT INTO runsText (rowid, runName, experimentName, sampleName, date, parameters, snapshot, database) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (cur.lastrowid, runName, experimentName, sampleName, date, parameters, snapshot, databaseName))
+
+        conn.execute("INSERT OR REPLACE INTO databases (databaseAbsPath, signature) VALUES (?, ?)",
+                     (databaseAbsPath, signature))
+
+    return True
+
+
+
+def deleteRun(conn: sqlite3.Connection,
+              databaseAbsPath: str,
+              runId: Optional[int]=None) -> None:
+    """
+    Remove a run, or all the runs if runId is None, of a database from the
+    index.
+    """
+
+    if runId is None:
+        ids = conn.execute("SELECT id FROM runs WHERE databaseAbsPath=?",
+                           (databaseAbsPath,)).fetchall()
+    else:
+        ids = conn.execute("SELECT id FROM runs WHERE databaseAbsPath=? AND runId=?",
+                           (databaseAbsPath, runId)).fetchall()
+
+    conn.executemany("DELETE FROM runsText WHERE rowid=?", ids)
+    conn.executemany("DELETE FROM runs WHERE id=?", ids)
+
+
+
+def getDatabases(roots: List[str]) -> Iterator[str]:
+    """
+    Yield the QCoDeS databases and Labrad datavault folders found in the
+    roots folders and their sub-folders, hidden folders being skipped.
+    """
+
+    for root in roots:
+        for dirPath, dirNames, fileNames in os.walk(root):
+            dirNames[:] = [i for i in dirNames if not i.startswith('.')]
+
+            if isLabradFolder(dirPath):
+                yield dirPath
+
+            for fileName in fileNames:
+                if fileName.endswith('.db') and fileName not in config['forbiddenFile']:
+                    yield os.path.join(dirPath, fileName)
+
+
+
+def updateIndex(indexPath: str,
+                roots: List[str],
+                isStopped: Callable[[], bool]=lambda: False) -> int:
+    """
+    Index the runs of every QCoDeS database and Labrad datavault folder of
+    the roots folders.
+    Only the databases modified since last indexed are read, and only their
+    new or not completed runs.
+    Databases removed from the roots folders are removed from the index.
+
+    Parameters
+    ----------
+    indexPath : str
+        Path of the index, see getIndexPath.
+    roots : List[str]
+        Folders to be indexed.
+    isStopped : Callable[[], bool], optional
+        Called between two databases, the indexing stops when it returns
+        True, by default never.
+
+    Return
+    ------
+    nbDatabase : int
+        Number of databases indexed.
+    """
+
+    # The same database is always indexed under the same path
+    roots = [os.path.abspath(os.path.expanduser(root)) for root in roots]
+
+    conn = openIndex(indexPath)
+    nbDatabase = 0
+    try:
+        found = set()
+        for databaseAbsPath in getDatabases(roots):
+            if isStopped():
+                return nbDatabase
+
+            found.add(databaseAbsPath)
+            try:
+                nbDatabase += indexDatabase(conn, databaseAbsPath)
+            # Not a QCoDeS database or database being written
+            except sqlite3.Error:
+                continue
+
+        roots = [os.path.join(root, '') for root in roots]
+        with conn:
+            for (databaseAbsPath,) in conn.execute("SELECT databaseAbsPath FROM databases").fetchall():
+                if (any(databaseAbsPath.startswith(root) for root in roots)
+                    and databaseAbsPath not in found):
+                    deleteRun(conn, databaseAbsPath)
+                    conn.execute("DELETE FROM databases WHERE databaseAbsPath=?",
+                                 (databaseAbsPath,))
+    finally:
+        conn.close()
+
+    return nbDatabase
+
+
+
+def getSearchQuery(text: str) -> str:
+    """
+    Return the FTS5 query of a text typed by a user, every word being
+    searched as a prefix, e.g. "flux mar" -> '"flux"* "mar"*'.
+    """
+
+    words = re.findall(r'\w+', text, re.UNICODE)
+
+    return ' '.join('"{}"*'.format(word) for word in words)
+
+
+
+def searchRuns(indexPath: str,
+               text: str) -> List[Tuple[str, int, str, str, str]]:
+    """
+    Return the runs matching a text, best match first, at most
+    config['runIndexMaxResult'].
+
+    Return
+    ------
+    runs : List[Tuple[str, int, str, str, str]]
+        databaseAbsPath, runId, experimentName, runName and started of each
+        run.
+    """
+
+    query = getSearchQuery(text)
+    if query=='' or not os.path.exists(indexPath):
+        return []
+
+    conn = sqlite3.connect(indexPath, timeout=1)
+    try:
+        rows = conn.execute("SELECT runs.databaseAbsPath, runs.runId, runs.experimentName, runs.runName, runs.started "
+                            "FROM runsText JOIN runs ON runs.id=runsText.rowid "
+                            "WHERE runsText MATCH ? ORDER BY rank LIMIT ?",
+                            (query, config['runIndexMaxResult'])).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+
+    return rows
@@ -0,0 +1,424 @@
+import numpy as np
+from scipy.signal import get_window
+from typing import Tuple, Optional
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+def getSamplingPeriod(x: np.ndarray) -> float:
+    """
+    Return the mean sampling period of x, positive for decreasing x too.
+    Unlike x[1]-x[0], it is not biased by a jitter of the first points.
+    """
+
+    return abs(float(x[-1]-x[0]))/(len(x)-1)
+
+
+
+def isUniform(x: np.ndarray,
+              rtol: float=1e-3) -> bool:
+    """
+    Return True if x is sampled with a constant step, within rtol of the mean
+    sampling period.
+    """
+
+    if len(x)<3:
+        return True
+
+    dx = np.diff(x)
+    # Signed, so that a decreasing sweep is uniform but not a zigzag
+    step = float(x[-1]-x[0])/(len(x)-1)
+
+    return bool(np.all(np.abs(dx-step)<=rtol*abs(step)))
+
+
+
+def rfft(x: np.ndarray,
+         y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the amplitude of the Fourier transform of real data along the
+    positive frequencies, Nyquist frequency included.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis, assumed to be uniformly sampled.
+    y : np.ndarray
+        Data along the y axis.
+
+    Return
+    ------
+    f : np.ndarray
+        Frequencies.
+    s : np.ndarray
+        Amplitude of the Fourier transform.
+    """
+
+    return (np.fft.rfftfreq(len(x), d=getSamplingPeriod(x)),
+            np.abs(np.fft.rfft(y)))
+
+
+
+class Welch:
+
+
+
+    def __init__(self, samplingPeriod: float,
+                       segmentLength: int,
+                       overlap: float,
+                       window: str,
+                       xStart: Optional[float]=None,
+                       curveId: str='') -> None:
+        """
+        Power spectral density estimated with the Welch method: the data are
+        cut in overlapping segments whose windowed periodograms are averaged.
+        Reduces the variance of the spectrum of long noise traces compared to
+        a single FFT.
+
+        Data may be given at once or as they arrive, during a live plot, see
+        update.
+        Only the last incomplete segment is kept in memory.
+
+        The result is the one of scipy.signal.welch with its default
+        "constant" detrend and "density" scaling.
+
+        Parameters
+        ----------
+        samplingPeriod : float
+            Sampling period of the data.
+        segmentLength : int
+            Number of points of a segment.
+        overlap : float
+            Overlap between successive segments, from 0 to 1 excluded.
+        window : str
+            Window applied to each segment, see scipy.signal.get_window.
+        xStart : Optional[float], optional
+            First x value of the data, used to recognize data continuing the
+            ones received, see isContinuedBy, by default None.
+        curveId : str, optional
+            Id of the curve of the data, used to recognize data continuing
+            the ones received, see isContinuedBy, by default ''.
+        """
+
+        self.samplingPeriod = samplingPeriod
+        self.segmentLength  = segmentLength
+        self.overlap        = overlap
+        self.windowName     = window
+        self.step           = max(int(segmentLength*(1-overlap)), 1)
+        self.window         = get_window(window, segmentLength)
+        self.xStart         = xStart
+        self.curveId        = curveId
+
+        # Density scaling, one-sided spectrum
+        self.scale = samplingPeriod/np.sum(self.window**2)
+
+        self.psdSum    = np.zeros(segmentLength//2+1)
+        self.nbSegment = 0
+        # Number of points received
+        self.nbPoint   = 0
+        # Points not yet part of a full segment
+        self.buffer    = np.empty(0)
+        # Some of the points received, to recognize modified data, see
+        # isContinuedBy
+        self.checkIndex = np.empty(0, dtype=int)
+        self.checkValue = np.empty(0)
+
+
+
+    def update(self, y: np.ndarray) -> None:
+        """
+        Add the periodograms of the complete segments of new data.
+
+        Parameters
+        ----------
+        y : np.ndarray
+            Data following the ones already given.
+        """
+
+        if len(y)>0:
+            index = np.unique(np.linspace(0, len(y)-1, 16).astype(int))
+            self.checkIndex = np.concatenate((self.checkIndex, self.nbPoint+index))
+            self.checkValue = np.concatenate((self.checkValue, y[index]))
+            # Bounded number of points, the last one being kept
+            if len(self.checkIndex)>1024:
+                self.checkIndex = self.checkIndex[::-2][::-1]
+                self.checkValue = self.checkValue[::-2][::-1]
+
+        self.nbPoint += len(y)
+        data = np.concatenate((self.buffer, y))
+
+        nbSegment = max((len(data)-self.segmentLength)//self.step+1, 0)
+        if nbSegment>0:
+            # Segments as a strided view, without copy
+            segments = np.lib.stride_tricks.sliding_window_view(data, self.segmentLength)[::self.step][:nbSegment]
+            segments = segments-segments.mean(axis=1, keepdims=True)
+            psd = np.abs(np.fft.rfft(segments*self.window, axis=1))**2
+
+            self.psdSum += psd.sum(axis=0)
+            self.nbSegment += nbSegment
+
+        # The next segment starts after the last computed one
+        self.buffer = data[nbSegment*self.step:].copy()
+
+
+
+    def getData(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the power spectral density averaged on the segments received.
+
+        Return
+        ------
+        f : np.ndarray
+            Frequencies.
+        psd : np.ndarray
+            Power spectral density.
+        """
+
+        psd = self.psdSum*self.scale/max(self.nbSegment, 1)
+
+        # One-sided spectrum, the Nyquist frequency only exists for even
+        # segment length
+        if self.segmentLength%2==0:
+            psd[1:-1] *= 2
+        else:
+            psd[1:] *= 2
+
+        return np.fft.rfftfreq(self.segmentLength, d=self.samplingPeriod), psd
+
+
+
+    def isContinuedBy(self, x: np.ndarray,
+                            y: np.ndarray,
+                            curveId: str,
+                            samplingPeriod: float) -> bool:
+        """
+        Return True if x, y, of the curve curveId, are the data already
+        received followed by new ones, as during a live plot.
+        The data received are compared on up to 1024 points, the last one
+        included, so that a curve whose y changed on the same x, e.g. a
+        moved 2d slice, is not continued.
+        """
+
+        return (self.nbPoint>0 and len(x)>=self.nbPoint and
+                curveId==self.curveId and
+                x[0]==self.xStart and
+                np.isclose(samplingPeriod, self.samplingPeriod, rtol=1e-3) and
+                np.array_equal(y[self.checkIndex], self.checkValue, equal_nan=True))
+
+
+
+def welch(x: np.ndarray,
+          y: np.ndarray,
+          segmentLength: Optional[int]=None,
+          overlap: Optional[float]=None,
+          window: Optional[str]=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the power spectral density of the data, see Welch.
+    Parameters not given are taken from the config.
+    The segment length is reduced to the number of points if needed.
+    """
+
+    if segmentLength is None:
+        segmentLength = config['fftWelchSegmentLength']
+    if overlap is None:
+        overlap = config['fftWelchOverlap']
+    if window is None:
+        window = config['fftWelchWindow']
+
+    w = Welch(getSamplingPeriod(x),
+              min(segmentLength, len(y)),
+              overlap,
+              window)
+    w.update(y)
+
+    return w.getData()
+
+
+
+def extirpolate(x: np.ndarray,
+                y: np.ndarray,
+                n: int,
+                order: int) -> np.ndarray:
+    """
+    Spread the values y located at the non integer positions x on a regular
+    grid of n points, such that sum(y*f(x)) ~ sum(grid*f(range(n))) for any
+    smooth function f.
+    Each value is spread on its order nearest grid points using Lagrange
+    interpolation weights, see Press & Rybicki, ApJ 338, 277 (1989).
+    """
+
+    grid = np.zeros(n)
+
+    # Values already on the grid
+    onGrid = x%1==0
+    grid += np.bincount(x[onGrid].astype(int), weights=y[onGrid], minlength=n)
+    x, y = x[~onGrid], y[~onGrid]
+
+    # First grid point of each value
+    lo = np.clip((x-order//2).astype(int), 0, n-order)
+    numerator = y*np.prod(x-lo-np.arange(order)[:, np.newaxis], axis=0)
+    denominator = float(np.prod(np.arange(1, order)))
+    for j in range(order):
+        if j>0:
+            denominator *= j/(j-order)
+        index = lo+(order-1-j)
+        grid += np.bincount(index, weights=numerator/(denominator*(x-index)), minlength=n)
+
+    return grid
+
+
+
+def trigonometricSum(x: np.ndarray,
+                     y: np.ndarray,
+                     df: float,
+                     nbFrequency: int,
+                     oversampling: int=4,
+                     order: int=4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the sums sum(y*sin(2 pi f x)) and sum(y*cos(2 pi f x)) for the
+    frequencies f = df, 2 df, ..., nbFrequency df.
+    y are extirpolated on a regular grid whose FFT gives all the sums at
+    once, in O(n log n) instead of the O(n nbFrequency) of the direct sums.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis, not necessarily sorted nor uniform.
+    y : np.ndarray
+        Weight of each point.
+    df : float
+        Frequency step.
+    nbFrequency : int
+        Number of frequencies.
+    oversampling : int, optional
+        Number of grid points per frequency, by default 4.
+    order : int, optional
+        Number of grid points each point is spread on, by default 4.
+
+    Return
+    ------
+    s : np.ndarray
+        Sum of the sine.
+    c : np.ndarray
+        Sum of the cosine.
+    """
+
+    # Power of 2 for a fast FFT
+    n = 2**int(np.ceil(np.log2(oversampling*(nbFrequency+1))))
+    xStart = x.min()
+
+    # Position on a grid of period 1/df
+    position = ((x-xStart)*n*df)%n
+
+    # Frequency j of the ifft of the grid is the frequency j*df
+    grid = n*np.fft.ifft(extirpolate(position, y, n, order))[1:nbFrequency+1]
+
+    # Back to the origin of x
+    grid *= np.exp(2j*np.pi*xStart*df*np.arange(1, nbFrequency+1))
+
+    return grid.imag, grid.real
+
+
+
+def lombScargle(x: np.ndarray,
+                y: np.ndarray,
+                oversampling: Optional[int]=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lomb-Scargle periodogram, the spectrum of non uniformly sampled data.
+    Each frequency is the least square fit of a sinusoid on the data, it
+    reduces to the squared FFT amplitude for uniform sampling.
+    The sums over the data are computed by FFT, see trigonometricSum, making
+    the periodogram O(n log n).
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along the x axis.
+    y : np.ndarray
+        Data along the y axis, nan are ignored.
+    oversampling : Optional[int], optional
+        Number of frequencies per 1/(xMax-xMin), taken from the config if None,
+        by default None.
+
+    Return
+    ------
+    f : np.ndarray
+        Frequencies, up to the Nyquist frequency of the mean sampling period.
+    p : np.ndarray
+        Periodogram, in the "psd" normalization of
+        scipy.signal.lombscargle.
+    """
+
+    if oversampling is None:
+        oversampling = config['fftLombScargleOversampling']
+
+    mask = ~np.isnan(y)
+    x = np.asarray(x[mask], dtype=float)
+    y = np.asarray(y[mask], dtype=float)
+    y = y-y.mean()
+
+    # Same resolution as the FFT for uniform data, 1/(n dx)
+    span = x.max()-x.min()
+    df = (len(x)-1)/(len(x)*span*oversampling)
+    nbFrequency = max(int(0.5*(len(x)-1)/span/df), 1)
+    f = df*np.arange(1, nbFrequency+1)
+
+    # Sums of y and of the 2 omega harmonics
+    sy, cy = trigonometricSum(x, y, df, nbFrequency)
+    s2, c2 = trigonometricSum(x, np.ones_like(x), 2*df, nbFrequency)
+
+    # Time offset tau making the sine and cosine orthogonal
+    norm = np.hypot(c2, s2)
+    cos2wt = np.divide(c2, norm, out=np.ones_like(norm), where=norm>0)
+    sin2wt = np.divide(s2, norm, out=np.zeros_like(norm), where=norm>0)
+    coswt = np.sqrt(0.5*(1+cos2wt))
+    sinwt = np.sign(sin2wt)*np.sqrt(0.5*(1-cos2wt))
+
+    yc = cy*coswt+sy*sinwt
+    ys = sy*coswt-cy*sinwt
+    cc = 0.5*(len(x)+c2*cos2wt+s2*sin2wt)
+    ss = 0.5*(len(x)-c2*cos2wt-s2*sin2wt)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = 0.5*(yc**2/cc+ys**2/ss)
+
+    # The extirpolation error may give slightly negative values where cc or
+    # ss vanish, e.g. at the Nyquist frequency of nearly uniform data
+    return f, np.maximum(np.nan_to_num(p), 0)
+
+
+
+def amplitudeSpectrum(x: np.ndarray,
+                      y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the amplitude of the Fourier transform of the data along the
+    positive frequencies.
+    Uniformly sampled data are transformed by FFT, see rfft, the others by
+    Lomb-Scargle periodogram, see lombScargle, scaled to the FFT amplitude:
+    a sinusoid of amplitude A gives a peak of n A/2 in both cases.
+    """
+
+    if isUniform(x):
+        return rfft(x, y)
+
+    f, p = lombScargle(x, y)
+    n = np.count_nonzero(~np.isnan(y))
+
+    return (np.concatenate(([0.], f)),
+            np.concatenate(([np.abs(np.nansum(y))], np.sqrt(n*p))))
+
+
+
+def lombScargleDensity(x: np.ndarray,
+                       y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the one-sided power spectral density of non uniformly sampled
+    data, from the Lomb-Scargle periodogram, see lombScargle.
+    Same scaling as welch for a single segment without window, the sampling
+    period being the mean one.
+    """
+
+    f, p = lombScargle(x, y)
+
+    return f, 2*getSamplingPeriod(x)*p
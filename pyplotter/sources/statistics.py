@@ -0,0 +1,323 @@
+import numpy as np
+from typing import Tuple, Optional
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+class Statistics:
+
+
+
+    def __init__(self, nbBin: Optional[int]=None,
+                       xStart: Optional[float]=None) -> None:
+        """
+        One-pass statistics of data: count, mean, standard deviation, extrema
+        and a fine histogram from which approximate quantiles and histograms of
+        any number of bins are obtained.
+
+        Data may be given at once, by chunks for curves stored on disk, or as
+        they arrive during a live plot, see update.
+        Statistics of different data can be combined, see merge.
+        The memory used does not depend on the number of points.
+
+        The mean and variance are accumulated with the Welford/Chan update,
+        numerically stable even for a large offset.
+        The histogram has a fixed number of bins of same width, when new data
+        fall outside of its range, the width is doubled by merging adjacent
+        bins until they fit.
+        Quantiles are then known within a bin width, about
+        (max-min)/nbBin, which is coarse for data with outliers or heavy
+        tails; the exact median is obtained by reading the data again, see
+        getMedian.
+
+        Parameters
+        ----------
+        nbBin : Optional[int], optional
+            Number of bins of the histogram, taken from the config if None, by
+            default None.
+        xStart : Optional[float], optional
+            First x value of the data, used to recognize data continuing the
+            ones received, see isContinuedBy, by default None.
+        """
+
+        if nbBin is None:
+            nbBin = config['statisticsNbBin']
+
+        # Even number of bins, merged two by two when the range grows
+        self.nbBin  = nbBin+nbBin%2
+        self.xStart = xStart
+
+        # Number of points received, nan included, and last one
+        self.nbPoint = 0
+        self.yLast   = np.nan
+
+        self.count = 0
+        self.mean  = np.nan
+        self.m2    = 0.
+        self.min   = np.nan
+        self.max   = np.nan
+
+        self.binStart  = np.nan
+        self.binWidth  = np.nan
+        self.histogram = np.zeros(self.nbBin, dtype=np.int64)
+
+
+
+    def update(self, y: np.ndarray,
+                     chunkSize: int=2**20) -> None:
+        """
+        Add data to the statistics, nan are ignored.
+        The data are read by chunks so that curves stored on disk are never
+        loaded in memory at once, see curveStorage.
+
+        Parameters
+        ----------
+        y : np.ndarray
+            Data following the ones already given.
+        chunkSize : int, optional
+            Number of points read at once, by default 2**20.
+        """
+
+        self.nbPoint += len(y)
+        if len(y)>0:
+            self.yLast = y[-1]
+
+        for start in range(0, len(y), chunkSize):
+            chunk = np.asarray(y[start:start+chunkSize], dtype=float)
+            chunk = chunk[~np.isnan(chunk)]
+            if len(chunk)==0:
+                continue
+
+            mean = chunk.mean()
+            self.addMoments(len(chunk), mean, float(np.sum((chunk-mean)**2)))
+            self.addValues(chunk, np.ones(len(chunk), dtype=np.int64), chunk.min(), chunk.max())
+
+
+
+    def addMoments(self, count: int,
+                         mean: float,
+                         m2: float) -> None:
+        """
+        Combine the moments of other data with the current ones, Chan et al.
+        pairwise update.
+
+        Parameters
+        ----------
+        count : int
+            Number of points of the other data.
+        mean : float
+            Mean of the other data.
+        m2 : float
+            Sum of the squared deviations to the mean of the other data.
+        """
+
+        if self.count==0:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return
+
+        total = self.count+count
+        delta = mean-self.mean
+        self.mean += delta*count/total
+        self.m2   += m2+delta**2*self.count*count/total
+        self.count = total
+
+
+
+    def addValues(self, values: np.ndarray,
+                        weights: np.ndarray,
+                        vMin: float,
+                        vMax: float) -> None:
+        """
+        Add weighted values to the histogram, extending its range if needed.
+        """
+
+        self.min = vMin if np.isnan(self.min) else min(self.min, vMin)
+        self.max = vMax if np.isnan(self.max) else max(self.max, vMax)
+
+        if np.isnan(self.binWidth):
+            self.binStart = vMin
+            self.binWidth = (vMax-vMin)/self.nbBin
+            # Constant data, the width is set by the first different value
+            if self.binWidth==0:
+                self.binWidth = max(abs(vMin), 1.)*np.finfo(float).eps*self.nbBin
+
+        while vMin<self.binStart:
+            self.extendRange(below=True)
+        while vMax>self.binStart+self.binWidth*self.nbBin:
+            self.extendRange(below=False)
+
+        index = np.clip(((values-self.binStart)/self.binWidth).astype(np.int64), 0, self.nbBin-1)
+        self.histogram += np.bincount(index, weights=weights, minlength=self.nbBin).astype(np.int64)
+
+
+
+    def extendRange(self, below: bool) -> None:
+        """
+        Double the range of the histogram by merging its bins two by two.
+        The current range becomes the upper half of the new one if below,
+        the lower half otherwise.
+        """
+
+        merged = self.histogram.reshape(-1, 2).sum(axis=1)
+        self.histogram = np.zeros(self.nbBin, dtype=np.int64)
+        if below:
+            self.histogram[self.nbBin//2:] = merged
+            self.binStart -= self.binWidth*self.nbBin
+        else:
+            self.histogram[:self.nbBin//2] = merged
+        self.binWidth *= 2
+
+
+
+    def merge(self, other: 'Statistics') -> None:
+        """
+        Add the statistics of other data, as if they had been given to update.
+        The bins of the other histogram are added at their center, within a
+        bin width of their values.
+        """
+
+        if other.count==0:
+            return
+
+        self.nbPoint += other.nbPoint
+        self.addMoments(other.count, other.mean, other.m2)
+
+        mask = other.histogram>0
+        centers = other.binStart+(np.nonzero(mask)[0]+0.5)*other.binWidth
+        self.addValues(np.clip(centers, other.min, other.max),
+                       other.histogram[mask],
+                       other.min,
+                       other.max)
+
+
+
+    def isContinuedBy(self, x: np.ndarray,
+                            y: np.ndarray) -> bool:
+        """
+        Return True if x, y are the data already received followed by new ones,
+        as during a live plot.
+        """
+
+        return (self.nbPoint>0 and len(x)>=self.nbPoint and
+                x[0]==self.xStart and
+                np.array_equal(y[self.nbPoint-1], self.yLast, equal_nan=True))
+
+
+
+    def getStd(self) -> float:
+        """
+        Return the standard deviation, as np.nanstd.
+        """
+
+        if self.count==0:
+            return np.nan
+
+        return float(np.sqrt(self.m2/self.count))
+
+
+
+    def getCdf(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the cumulative count along the histogram bin edges, the first
+        and last edges being moved to the data extrema.
+        """
+
+        edges = self.binStart+np.arange(self.nbBin+1)*self.binWidth
+        edges[0] = self.min
+        edges[-1] = self.max
+        edges = np.clip(edges, self.min, self.max)
+
+        return edges, np.concatenate(([0], np.cumsum(self.histogram)))
+
+
+
+    def getQuantile(self, q: float) -> float:
+        """
+        Return the approximate q quantile, within a bin width, by linear
+        interpolation of the cumulative count.
+        """
+
+        if self.count==0:
+            return np.nan
+
+        edges, cdf = self.getCdf()
+
+        return float(np.interp(q*self.count, cdf, edges))
+
+
+
+    def getMedian(self, y: np.ndarray,
+                        chunkSize: int=2**20) -> float:
+        """
+        Return the exact median of y, the data given to update, as
+        np.nanmedian.
+        The histogram locates the bins containing the median, only the points
+        of these bins are kept while y is read again by chunks, then
+        partitioned.
+        The memory used is then the number of points of these bins, not of
+        the data.
+
+        Parameters
+        ----------
+        y : np.ndarray
+            Data given to update.
+        chunkSize : int, optional
+            Number of points read at once, by default 2**20.
+        """
+
+        if self.count==0:
+            return np.nan
+
+        # Ranks of the median, averaged for an even count
+        ranks = np.array(((self.count-1)//2, self.count//2))
+
+        # Values around the bins of these ranks, one bin being added on each
+        # side for the points rounded to a neighbouring bin
+        edges, cdf = self.getCdf()
+        bins = np.searchsorted(cdf, ranks, side='right')-1
+        low  = edges[max(bins[0]-1, 0)]
+        high = edges[min(bins[1]+2, self.nbBin)]
+
+        nbBelow = 0
+        values = []
+        for start in range(0, len(y), chunkSize):
+            chunk = np.asarray(y[start:start+chunkSize], dtype=float)
+            nbBelow += np.count_nonzero(chunk<low)
+            values.append(chunk[(chunk>=low) & (chunk<=high)])
+        values = np.concatenate(values)
+
+        ranks -= nbBelow
+        # y are not the data of the histogram
+        if ranks[0]<0 or ranks[1]>=len(values):
+            return float(np.nanmedian(np.asarray(y)))
+
+        return float(np.mean(np.partition(values, ranks)[ranks]))
+
+
+
+    def getHistogram(self, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the histogram of the data from their minimum to their maximum in
+        bins of same width, as np.histogram.
+        The counts are obtained from the fine histogram, they are exact within
+        a fine bin width of the edges.
+
+        Return
+        ------
+        center : np.ndarray
+            Center of the bins.
+        count : np.ndarray
+            Number of points in each bin.
+        """
+
+        if self.count==0:
+            return np.empty(0), np.empty(0)
+
+        edges, cdf = self.getCdf()
+        binEdges = np.linspace(self.min, self.max, bins+1)
+        count = np.diff(np.round(np.interp(binEdges, edges, cdf)))
+        # Points at the maximum are in the last bin
+        count[-1] += self.count-count.sum()
+
+        return (binEdges[:-1]+binEdges[1:])/2, count
@@ -0,0 +1,206 @@
+import re
+import numpy as np
+from typing import List
+
+from .config import loadConfigCurrent
+config = loadConfigCurrent()
+
+
+# Frequency multiplier of the option line
+FREQUENCY_UNITS = {'hz'  : 1.,
+                   'khz' : 1e3,
+                   'mhz' : 1e6,
+                   'ghz' : 1e9}
+
+# Quantities derived from a S parameter, with their unit, see
+# getTouchstoneQuantity
+TOUCHSTONE_QUANTITIES = {'dB'              : 'dB',
+                         'phase'           : 'deg',
+                         'unwrapped phase' : 'deg',
+                         'group delay'     : 's',
+                         'real'            : '',
+                         'imaginary'       : ''}
+
+TOUCHSTONE_EXTENSION = re.compile(r'\.s(\d+)p$', re.IGNORECASE)
+
+
+
+def getTouchstonePortNumber(filePath: str) -> int:
+    """
+    Return the number of ports of a Touchstone file from its extension, e.g.
+    2 for a .s2p file, 0 if the file is not a Touchstone one.
+    """
+
+    match = TOUCHSTONE_EXTENSION.search(filePath)
+    if match is None:
+        return 0
+    return int(match.group(1))
+
+
+
+def getSParameterName(nbPort: int,
+                      i: int,
+                      j: int) -> str:
+    """
+    Return the name of a S parameter, e.g. "S21", indexes starting at 0.
+    """
+
+    if nbPort<10:
+        return 'S{}{}'.format(i+1, j+1)
+    else:
+        return 'S{},{}'.format(i+1, j+1)
+
+
+
+def loadTouchstone(filePath: str) -> dict:
+    """
+    Parse a Touchstone file, .s1p to .sNp, into a complex S matrix.
+    The file is read once, the quantities displayed being derived from the
+    S matrix by getTouchstoneQuantity.
+
+    Data may be written as real-imaginary, magnitude-angle or dB-angle pairs
+    and wrap over several lines. Noise parameters of 2 ports files are
+    ignored.
+
+    Return
+    ------
+    touchstone : dict
+        "frequency": frequencies in Hz, "s": S matrix of shape
+        (frequency, port, port), "comments": comment lines, "nbPort": number
+        of ports, "resistance": reference resistance in ohm.
+    """
+
+    nbPort = getTouchstonePortNumber(filePath)
+    if nbPort==0:
+        raise ValueError('not a Touchstone file extension')
+
+    frequencyUnit = 'ghz'
+    parameter     = 's'
+    dataFormat    = 'ma'
+    resistance    = 50.
+    # Order of the 2 ports data, "21_12" for version 1 files
+    twoPortOrder  = '21_12'
+
+    comments = []
+    lines = []
+    # Number of values of a data line of a 2 ports file, the noise
+    # parameters lines having less
+    nbTwoPortValue = 1+2*4
+    with open(filePath, 'r', errors='replace') as f:
+        for line in f:
+            line, _, comment = line.partition('!')
+            if comment.strip()!='':
+                comments.append(comment.strip())
+
+            line = line.strip()
+            if line=='':
+                continue
+            elif line[0]=='#':
+                options = line[1:].lower().split()
+                for index, option in enumerate(options):
+                    if option in FREQUENCY_UNITS:
+                        frequencyUnit = option
+                    elif option in ('s', 'y', 'z', 'h', 'g'):
+                        parameter = option
+                    elif option in ('ri', 'ma', 'db'):
+                        dataFormat = option
+                    elif option=='r' and index+1<len(options):
+                        resistance = float(options[index+1])
+            elif line[0]=='[':
+                keyword, _, value = line[1:].partition(']')
+                keyword = keyword.strip().lower()
+                if keyword=='two-port data order':
+                    twoPortOrder = value.strip()
+                elif keyword in ('noise data', 'end'):
+                    break
+            elif nbPort==2:
+                if len(line.split())==nbTwoPortValue:
+                    lines.append(line)
+            else:
+                lines.append(line)
+
+    if parameter!='s':
+        raise ValueError('only S parameters are supported, not {}'.format(parameter.upper()))
+
+    values = np.array(' '.join(lines).split(), dtype=np.float64)
+    nbValue = 1+2*nbPort**2
+    if len(values)%nbValue!=0:
+        raise ValueError('number of values not consistent with {} ports'.format(nbPort))
+    values = values.reshape(-1, nbValue)
+
+    frequency = values[:,0]*FREQUENCY_UNITS[frequencyUnit]
+    pairs = values[:,1:].reshape(len(values), nbPort, nbPort, 2)
+
+    if dataFormat=='ri':
+        s = pairs[...,0]+1j*pairs[...,1]
+    elif dataFormat=='ma':
+        s = pairs[...,0]*np.exp(1j*np.deg2rad(pairs[...,1]))
+    else:
+        s = 10**(pairs[...,0]/20)*np.exp(1j*np.deg2rad(pairs[...,1]))
+
+    # 2 ports data are written as S11, S21, S12, S22
+    if nbPort==2 and twoPortOrder=='21_12':
+        s = s.transpose(0, 2, 1)
+
+    return {'frequency'  : frequency,
+            's'          : np.ascontiguousarray(s),
+            'comments'   : '\n'.join(comments),
+            'nbPort'     : nbPort,
+            'resistance' : resistance}
+
+
+
+def getTouchstoneQuantity(frequency: np.ndarray,
+                          s: np.ndarray,
+                          quantity: str) -> np.ndarray:
+    """
+    Return a quantity of TOUCHSTONE_QUANTITIES derived from a S parameter.
+
+    Parameters
+    ----------
+    frequency : np.ndarray
+        Frequencies in Hz.
+    s : np.ndarray
+        Complex S parameter.
+    quantity : str
+        Key of TOUCHSTONE_QUANTITIES.
+    """
+
+    if quantity=='dB':
+        return 20*np.log10(np.abs(s))
+    elif quantity=='phase':
+        return np.angle(s, deg=True)
+    elif quantity=='unwrapped phase':
+        return np.rad2deg(np.unwrap(np.angle(s)))
+    elif quantity=='group delay':
+        if len(frequency)<2:
+            raise ValueError('the group delay needs at least two frequencies')
+        return -np.gradient(np.unwrap(np.angle(s)), 2*np.pi*frequency)
+    elif quantity=='real':
+        return s.real
+    elif quantity=='imaginary':
+        return s.imag
+    else:
+        raise ValueError('unknown quantity: '+quantity)
+
+
+
+def getTouchstoneParameters(nbPort: int) -> List[dict]:
+    """
+    Return the parameters displayed for a Touchstone file, each quantity of
+    each S parameter.
+    """
+
+    parameters = []
+    for i in range(nbPort):
+        for j in range(nbPort):
+            for quantity, unit in TOUCHSTONE_QUANTITIES.items():
+                name = '{} {}'.format(getSParameterName(nbPort, i, j), quantity)
+                parameters.append({'depends_on' : [''],
+                                   'label'      : name,
+                                   'port'       : (i, j),
+                                   'quantity'   : quantity,
+                                   'unit'       : unit,
+                                   'name'       : name})
+
+    return parameters
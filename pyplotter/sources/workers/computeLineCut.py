@@ -0,0 +1,91 @@
+from PyQt5 import QtCore
+import numpy as np
+from typing import Tuple
+
+from ..lineCut import getLineCut
+
+
+class ComputeLineCutSignal(QtCore.QObject):
+    """
+    Class containing the signal of the ComputeLineCutThread, see below
+    """
+
+    # When the run method is done
+    # Signature
+    # curveId: str, xSlice: tuple, ySlice: tuple,
+    # xCut: np.ndarray, yCut: np.ndarray, zCut: np.ndarray
+    done = QtCore.pyqtSignal(str, tuple, tuple, np.ndarray, np.ndarray, np.ndarray)
+
+
+
+class ComputeLineCutThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, curveId: str,
+                       x: np.ndarray,
+                       y: np.ndarray,
+                       z: np.ndarray,
+                       xSlice: Tuple[float, float],
+                       ySlice: Tuple[float, float],
+                       nbPoints: int,
+                       width: float) -> None:
+        """
+        Thread used to compute an arbitrary line cut of a 2d map, see
+        getLineCut.
+
+        Parameters
+        ----------
+        curveId : str
+            Id of the curve associated to the line cut.
+        x : np.ndarray
+            Data along the x axis, 1d array.
+        y : np.ndarray
+            Data along the y axis, 1d array.
+        z : np.ndarray
+            Data along the z axis, 2d array.
+        xSlice : Tuple[float, float]
+            x coordinates of the cut extremities.
+        ySlice : Tuple[float, float]
+            y coordinates of the cut extremities.
+        nbPoints : int
+            Number of points along the cut, 0 for automatic.
+        width : float
+            Width of the cut in pixels.
+        """
+
+        super(ComputeLineCutThread, self).__init__()
+
+        self.curveId  = curveId
+        self.x        = x
+        self.y        = y
+        self.z        = z
+        self.xSlice   = xSlice
+        self.ySlice   = ySlice
+        self.nbPoints = nbPoints
+        self.width    = width
+
+        self.signal = ComputeLineCutSignal()
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Compute the line cut and send it back to the 2d plot.
+        """
+
+        xCut, yCut, zCut = getLineCut(self.x,
+                                      self.y,
+                                      self.z,
+                                      self.xSlice,
+                                      self.ySlice,
+                                      self.nbPoints,
+                                      self.width)
+
+        self.signal.done.emit(self.curveId,
+                              self.xSlice,
+                              self.ySlice,
+                              xCut,
+                              yCut,
+                              zCut)
@@ -0,0 +1,81 @@
+from PyQt5 import QtCore
+import multiprocess as mp
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..functions import isLabradFolder
+from ..qcodesDatabase import getNbTotalRun
+from ..labradDatavault import getNbTotalRunmp
+
+
+
+class CountRunSignal(QtCore.QObject):
+    """
+    Class containing the signal of the CountRunThread, see below
+    """
+
+    # When the runs are counted
+    # databaseAbsPath, nbTotalRun
+    done = QtCore.pyqtSignal(str, int)
+
+    # When the runs could not be counted, e.g. the database being locked
+    # databaseAbsPath, error message
+    error = QtCore.pyqtSignal(str, str)
+
+
+
+class CountRunThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, databaseAbsPath: str) -> None:
+        """
+        Thread used to get the number of run of a database, launched by the
+        tableWidgetDatabase when the database is modified, see FileWatcher.
+
+        Parameters
+        ----------
+        databaseAbsPath : str
+            Absolute path of the QCoDeS database or the Labrad datavault
+            folder.
+        """
+
+        super(CountRunThread, self).__init__()
+
+        self.signal = CountRunSignal()
+
+        self.databaseAbsPath = databaseAbsPath
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            # The Labrad client is used in its own process
+            if isLabradFolder(self.databaseAbsPath):
+                queueNbRun: mp.Queue = mp.Queue()
+                worker = mp.Process(target=getNbTotalRunmp,
+                                    args=(self.databaseAbsPath,
+                                          queueNbRun))
+                worker.start()
+                nbTotalRun = queueNbRun.get()
+                queueNbRun.close()
+                queueNbRun.join_thread()
+                worker.join()
+            else:
+                nbTotalRun = getNbTotalRun(self.databaseAbsPath)
+        except Exception as e:
+            self.signal.error.emit(self.databaseAbsPath,
+                                   'Can\'t count the runs of {}: {}'.format(self.databaseAbsPath, e))
+            return
+
+        # Empty database
+        if nbTotalRun is None:
+            nbTotalRun = 0
+
+        self.signal.done.emit(self.databaseAbsPath,
+                              nbTotalRun)
@@ -0,0 +1,371 @@
+from PyQt5 import QtCore
+import numpy as np
+import multiprocess as mp
+import lmfit
+import queue
+from typing import Optional
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..fit import fit1d, fit2dmp, fitSlices, getSlicesChunks, getNbProcess
+
+
+class FitSignal(QtCore.QObject):
+    """
+    Class containing the signal of the Fit1dThread, Fit2dThread and
+    FitSlicesThread, see below
+    """
+
+    # Signal to update the progress bar
+    updateProgressBar = QtCore.pyqtSignal(float)
+    # When the 1d fit is done
+    # Signature
+    # key: tuple, x: np.ndarray, yFit: np.ndarray, params: lmfit.Parameters,
+    # report: str
+    fit1dDone = QtCore.pyqtSignal(tuple, np.ndarray, np.ndarray, lmfit.Parameters, str)
+    # When the 2d fit is done
+    # Signature
+    # x: np.ndarray, y: np.ndarray, zFit: np.ndarray, params: lmfit.Parameters,
+    # report: str
+    fit2dDone = QtCore.pyqtSignal(np.ndarray, np.ndarray, np.ndarray, lmfit.Parameters, str)
+    # When the slice by slice fit is done
+    # Signature
+    # x: np.ndarray, y: np.ndarray, zFit: np.ndarray, params: list
+    # params contains the lmfit.Parameters of each slice, None if the fit failed
+    fitSlicesDone = QtCore.pyqtSignal(np.ndarray, np.ndarray, np.ndarray, list)
+    # When the fit failed
+    fitError = QtCore.pyqtSignal(str)
+    # When the fit has been cancelled by the user
+    fitCancelled = QtCore.pyqtSignal()
+
+
+
+class Fit1dThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, key: tuple,
+                       modelClass: type,
+                       x: np.ndarray,
+                       y: np.ndarray,
+                       method: str,
+                       initialParams: Optional[lmfit.Parameters]=None) -> None:
+        """
+        Thread used to fit a 1d model without freezing the GUI.
+
+        Parameters
+        ----------
+        key : tuple
+            Identify the fit, sent back with the result.
+        modelClass : type
+            Fit model class, see plot1d.dialogFit.
+        x : np.ndarray
+            Data along the x axis.
+        y : np.ndarray
+            Data along the y axis.
+        method : str
+            lmfit minimization method.
+        initialParams : Optional[lmfit.Parameters], optional
+            Parameters used as starting point, see fit1d, by default None.
+        """
+
+        super(Fit1dThread, self).__init__()
+
+        self.key           = key
+        self.modelClass    = modelClass
+        self.x             = x
+        self.y             = y
+        self.method        = method
+        self.initialParams = initialParams
+
+        self.signal = FitSignal()
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Fit the data and send the result.
+        """
+
+        try:
+            yFit, params, report = fit1d(self.modelClass,
+                                         self.x,
+                                         self.y,
+                                         self.method,
+                                         self.initialParams)
+        except Exception as e:
+            self.signal.fitError.emit(str(e))
+            return
+
+        self.signal.fit1dDone.emit(self.key,
+                                   self.x,
+                                   yFit,
+                                   params,
+                                   report)
+
+
+
+class Fit2dThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, modelClass: type,
+                       x: np.ndarray,
+                       y: np.ndarray,
+                       z: np.ndarray) -> None:
+        """
+        Thread used to fit a 2d model on a 2d map.
+        The fit is done in another process so that the GUI is not frozen and
+        the fit can be cancelled at any time.
+
+        Parameters
+        ----------
+        modelClass : type
+            Fit model class, see plot2d.dialogFit.
+        x : np.ndarray
+            Data along the x axis, 1d array.
+        y : np.ndarray
+            Data along the y axis, 1d array.
+        z : np.ndarray
+            Data along the z axis, 2d array.
+        """
+
+        super(Fit2dThread, self).__init__()
+
+        self.modelClass = modelClass
+        self.x          = x
+        self.y          = y
+        self.z          = z
+
+        self._cancelled = False
+
+        self.signal = FitSignal()
+
+
+
+    def cancel(self) -> None:
+        """
+        Stop the fit, the fitting process is killed at the next progress
+        check.
+        """
+
+        self._cancelled = True
+
+
+
+    @staticmethod
+    def closeQueues(*queues: mp.Queue) -> None:
+        """
+        Close the queues without waiting for their content to be read.
+        """
+
+        for q in queues:
+            q.cancel_join_thread()
+            q.close()
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Launch the fit in another process and follow its progress.
+        """
+
+        # Queue will contain the fit result
+        queueData: mp.Queue = mp.Queue()
+        # Queue will contain a float from 0 to 100 for the progress bar
+        queueProgressBar: mp.Queue = mp.Queue()
+        progressBar = 0
+        queueProgressBar.put(progressBar)
+        # Queue will contain True when the fit is done
+        queueDone: mp.Queue = mp.Queue()
+        queueDone.put(False)
+
+        self.worker = mp.Process(target=fit2dmp,
+                                 args=(self.modelClass,
+                                       self.x,
+                                       self.y,
+                                       self.z,
+                                       queueData,
+                                       queueProgressBar,
+                                       queueDone))
+        self.worker.start()
+
+        done = False
+        while not done:
+            QtCore.QThread.msleep(config['delayBetweenProgressBarUpdate'])
+
+            if self._cancelled:
+                self.worker.terminate()
+                self.worker.join()
+                self.signal.fitCancelled.emit()
+                return
+
+            # The process may be updating the progress
+            try:
+                progressBarNew = queueProgressBar.get(timeout=config['delayBetweenProgressBarUpdate']/1000)
+            except queue.Empty:
+                progressBarNew = progressBar
+            else:
+                queueProgressBar.put(progressBarNew)
+            if progressBarNew!=progressBar:
+                progressBar = progressBarNew
+                self.signal.updateProgressBar.emit(progressBar)
+
+            done = queueDone.get()
+            queueDone.put(done)
+
+            # The process died without result, e.g. killed by the OS
+            if not done and not self.worker.is_alive() and self.worker.exitcode!=0:
+                self.closeQueues(queueData, queueProgressBar, queueDone)
+                self.worker.join()
+                self.signal.fitError.emit('The fit process stopped unexpectedly, exit code {}'.format(self.worker.exitcode))
+                return
+
+        # The result may never come if it could not be sent, e.g. not
+        # picklable
+        d = None
+        while d is None:
+            try:
+                d = queueData.get(timeout=config['delayBetweenProgressBarUpdate']/1000)
+            except queue.Empty:
+                if not self.worker.is_alive() and queueData.empty():
+                    break
+
+        if d is None:
+            self.closeQueues(queueData, queueProgressBar, queueDone)
+            self.worker.join()
+            self.signal.fitError.emit('The fit process stopped without sending its result')
+            return
+
+        queueData.close()
+        queueData.join_thread()
+        queueProgressBar.close()
+        queueProgressBar.join_thread()
+        queueDone.close()
+        queueDone.join_thread()
+
+        self.worker.join()
+
+        # If the fit failed, we get the error message
+        if isinstance(d, str):
+            self.signal.fitError.emit(d)
+        else:
+            zFit, params, report = d
+            self.signal.fit2dDone.emit(self.x,
+                                       self.y,
+                                       zFit,
+                                       params,
+                                       report)
+
+
+
+class FitSlicesThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, modelClass: type,
+                       x: np.ndarray,
+                       y: np.ndarray,
+                       z: np.ndarray,
+                       orientation: str='vertical',
+                       method: str='leastsq') -> None:
+        """
+        Thread used to fit a 1d model on every slice of a 2d map.
+        Contiguous chunks of slices are fitted in parallel by a pool of
+        processes, in a chunk each fit starts from the result of the
+        previous slice.
+
+        Parameters
+        ----------
+        modelClass : type
+            Fit model class, see plot1d.dialogFit.
+        x : np.ndarray
+            Data along the x axis, 1d array.
+        y : np.ndarray
+            Data along the y axis, 1d array.
+        z : np.ndarray
+            Data along the z axis, 2d array.
+        orientation : str
+            "vertical" to fit z[i] against y for each x value, "horizontal" to
+            fit z[:,j] against x for each y value, by default "vertical".
+        method : str
+            lmfit minimization method, by default leastsq to get the
+            parameters uncertainties.
+        """
+
+        super(FitSlicesThread, self).__init__()
+
+        self.modelClass  = modelClass
+        self.x           = x
+        self.y           = y
+        self.z           = z
+        self.orientation = orientation
+        self.method      = method
+
+        self._cancelled = False
+
+        self.signal = FitSignal()
+
+
+
+    def cancel(self) -> None:
+        """
+        Stop the fit, the pool is terminated after the next fitted chunk.
+        """
+
+        self._cancelled = True
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Fit all slices in a pool of processes and follow the progress.
+        """
+
+        if self.orientation=='vertical':
+            xSlice = self.y
+            slices = self.z
+        else:
+            xSlice = self.x
+            slices = self.z.T
+
+        zFit = np.full(slices.shape, np.nan)
+        params: list = []
+
+        chunks = getSlicesChunks(len(slices), getNbProcess())
+        tasks = [(self.modelClass, xSlice, slices[chunk], self.method) for chunk in chunks]
+
+        pool = mp.Pool(min(getNbProcess(), len(tasks)))
+        try:
+            # imap keeps the chunks order
+            for chunk, results in zip(chunks, pool.imap(fitSlices, tasks)):
+
+                if self._cancelled:
+                    pool.terminate()
+                    self.signal.fitCancelled.emit()
+                    return
+
+                for i, (sliceFit, sliceParams) in enumerate(results, start=chunk.start):
+                    zFit[i] = sliceFit
+                    params.append(sliceParams)
+                self.signal.updateProgressBar.emit(chunk.stop/len(slices)*100)
+
+        except Exception as e:
+            pool.terminate()
+            self.signal.fitError.emit(str(e))
+            return
+        else:
+            pool.close()
+        finally:
+            pool.join()
+
+        if self.orientation=='horizontal':
+            zFit = zFit.T
+
+        self.signal.fitSlicesDone.emit(self.x,
+                                       self.y,
+                                       zFit,
+                                       params)
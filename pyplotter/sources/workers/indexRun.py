@@ -0,0 +1,68 @@
+from PyQt5 import QtCore
+from typing import List
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..runIndex import updateIndex
+
+
+
+class IndexRunSignal(QtCore.QObject):
+    """
+    Class containing the signal of the IndexRunThread, see below
+    """
+
+    # When the index is up to date
+    # Number of databases indexed
+    done = QtCore.pyqtSignal(int)
+
+    # When the index could not be updated
+    # error message
+    error = QtCore.pyqtSignal(str)
+
+
+
+class IndexRunThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, indexPath: str,
+                       roots: List[str]) -> None:
+        """
+        Thread used to index the runs of the databases of the roots folders,
+        see updateIndex.
+
+        Parameters
+        ----------
+        indexPath : str
+            Path of the index.
+        roots : List[str]
+            Folders to be indexed.
+        """
+
+        super(IndexRunThread, self).__init__()
+
+        self.signal = IndexRunSignal()
+
+        self.indexPath = indexPath
+        self.roots     = roots
+
+        self._stop = False
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            nbDatabase = updateIndex(self.indexPath,
+                                     self.roots,
+                                     lambda: self._stop)
+        except Exception as e:
+            self.signal.error.emit('Can\'t index the runs: {}'.format(e))
+            return
+
+        self.signal.done.emit(nbDatabase)
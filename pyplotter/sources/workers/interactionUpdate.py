@@ -0,0 +1,64 @@
+from PyQt5 import QtCore
+import numpy as np
+from typing import Dict, Callable, Any
+
+
+class InteractionUpdateSignal(QtCore.QObject):
+    """
+    Class containing the signal of the InteractionUpdateThread, see below
+    """
+
+    # When all the analyses are done
+    # Signature
+    # results: dict, {name : result}, result being the raised exception if the
+    # analysis failed
+    done = QtCore.pyqtSignal(dict)
+
+
+
+class InteractionUpdateThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, x: np.ndarray,
+                       y: np.ndarray,
+                       tasks: Dict[str, Callable[[np.ndarray, np.ndarray], Any]]) -> None:
+        """
+        Thread used to compute the analyses of the interaction plots, FFT,
+        histogram, derivative, ..., of a 1d plot selection without freezing
+        the GUI.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Selected data along the x axis.
+        y : np.ndarray
+            Selected data along the y axis.
+        tasks : Dict[str, Callable[[np.ndarray, np.ndarray], Any]]
+            Analyses to be done, called with x and y.
+        """
+
+        super(InteractionUpdateThread, self).__init__()
+
+        self.x     = x
+        self.y     = y
+        self.tasks = tasks
+
+        self.signal = InteractionUpdateSignal()
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Run all the analyses and send their results at once.
+        """
+
+        results: Dict[str, Any] = {}
+        for name, task in self.tasks.items():
+            try:
+                results[name] = task(self.x, self.y)
+            except Exception as e:
+                results[name] = e
+
+        self.signal.done.emit(results)
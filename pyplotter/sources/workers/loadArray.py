@@ -0,0 +1,65 @@
+from PyQt5 import QtCore
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..arrayFile import loadArrayMembers
+
+
+class LoadArraySignal(QtCore.QObject):
+    """
+    Class containing the signal of the LoadArrayThread, see below
+    """
+
+    # When the arrays are loaded
+    # fileAbsPath, {name : data}
+    done = QtCore.pyqtSignal(str, dict)
+
+    # When the arrays could not be loaded
+    # fileAbsPath, error message
+    error = QtCore.pyqtSignal(str, str)
+
+
+
+class LoadArrayThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, fileAbsPath: str,
+                       members: list) -> None:
+        """
+        Thread used to load arrays of a .npy, HDF5 or Parquet file, see
+        loadArrayMembers.
+
+        Parameters
+        ----------
+        fileAbsPath : str
+            Absolute path of the file.
+        members : list
+            Arrays to be loaded, see getArrayMembers.
+        """
+
+        super(LoadArrayThread, self).__init__()
+
+        self.signal = LoadArraySignal()
+
+        self.fileAbsPath = fileAbsPath
+        self.members     = members
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            data = loadArrayMembers(self.fileAbsPath,
+                                    self.members)
+        except Exception as e:
+            self.signal.error.emit(self.fileAbsPath,
+                                   'Can\'t open file: {}'.format(e))
+            return
+
+        self.signal.done.emit(self.fileAbsPath,
+                              data)
@@ -0,0 +1,124 @@
+from PyQt5 import QtCore
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..blueFors import loadBlueForsParameters
+
+
+class LoadBlueForsSignal(QtCore.QObject):
+    """
+    Class containing the signal of the LoadBlueForsThread, see below
+    """
+
+    # When the files are parsed
+    # fileName, parameters with their data
+    done = QtCore.pyqtSignal(str, list)
+
+    # When a file could not be parsed
+    # fileName, error message
+    error = QtCore.pyqtSignal(str, str)
+
+
+
+class LoadBlueForsThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, parameters: list) -> None:
+        """
+        Thread used to parse the BlueFors log files of one name, e.g. "CH6 T",
+        over a folder or a time range.
+        Log files of different names are parsed by different threads running
+        in parallel.
+
+        Parameters
+        ----------
+        parameters : list
+            Parameters of the log files, see getBlueForsRangeParameters.
+        """
+
+        super(LoadBlueForsThread, self).__init__()
+
+        self.signal = LoadBlueForsSignal()
+
+        self.parameters = parameters
+        self.fileName   = parameters[0]['fileName']
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            parameters = loadBlueForsParameters(self.parameters)
+        except Exception as e:
+            self.signal.error.emit(self.fileName,
+                                   'Can\'t read {} log files: {}'.format(self.fileName, e))
+            return
+
+        self.signal.done.emit(self.fileName,
+                              parameters)
+
+
+
+class TailBlueForsSignal(QtCore.QObject):
+    """
+    Class containing the signal of the TailBlueForsThread, see below
+    """
+
+    # When the appended lines are read
+    # {curveId : (x, y)} of the curves having new data
+    done = QtCore.pyqtSignal(dict)
+
+    # When a file could not be read
+    # error message
+    error = QtCore.pyqtSignal(str)
+
+
+
+class TailBlueForsThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, tails: dict) -> None:
+        """
+        Thread used to read the lines appended to the BlueFors log files of
+        the current day, see BlueForsTail.
+
+        Parameters
+        ----------
+        tails : dict
+            {curveId : (BlueForsTail, parameter name)} of the curves being
+            followed.
+        """
+
+        super(TailBlueForsThread, self).__init__()
+
+        self.signal = TailBlueForsSignal()
+
+        self.tails = tails
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        data = {}
+        for curveId, (tail, name) in self.tails.items():
+            try:
+                parameters = tail.read()
+            except Exception as e:
+                self.signal.error.emit('Can\'t read {}: {}'.format(tail.filePath, e))
+                continue
+
+            for parameter in parameters:
+                if parameter['name']==name and len(parameter['x'])>0:
+                    data[curveId] = (parameter['x'], parameter['y'])
+
+        self.signal.done.emit(data)
@@ -0,0 +1,79 @@
+from PyQt5 import QtCore
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..csvFile import loadCsvColumns
+
+
+class LoadCsvSignal(QtCore.QObject):
+    """
+    Class containing the signal of the LoadCsvThread, see below
+    """
+
+    # When the columns are parsed
+    # fileAbsPath, {column : data}
+    done = QtCore.pyqtSignal(str, dict)
+
+    # When the file could not be parsed
+    # fileAbsPath, error message
+    error = QtCore.pyqtSignal(str, str)
+
+    # Signal used to update the status bar
+    updateProgressBar = QtCore.pyqtSignal(int, float, str)
+
+
+
+class LoadCsvThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, fileAbsPath: str,
+                       csvFormat: dict,
+                       columns: list,
+                       progressBarId: int) -> None:
+        """
+        Thread used to parse columns of a csv file.
+
+        Parameters
+        ----------
+        fileAbsPath : str
+            Absolute path of the csv file.
+        csvFormat : dict
+            Format of the file, see sniffCsv.
+        columns : list
+            Index of the columns to be parsed.
+        progressBarId : int
+            Id of the progress bar following the parsing.
+        """
+
+        super(LoadCsvThread, self).__init__()
+
+        self.signal = LoadCsvSignal()
+
+        self.fileAbsPath   = fileAbsPath
+        self.csvFormat     = csvFormat
+        self.columns       = columns
+        self.progressBarId = progressBarId
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            data = loadCsvColumns(self.fileAbsPath,
+                                  self.csvFormat,
+                                  self.columns,
+                                  lambda progress: self.signal.updateProgressBar.emit(self.progressBarId,
+                                                                                      progress*100,
+                                                                                      'Downloading data: {:.0f}%'.format(progress*100)))
+        except Exception as e:
+            self.signal.error.emit(self.fileAbsPath,
+                                   'Can\'t open csv file: {}'.format(e))
+            return
+
+        self.signal.done.emit(self.fileAbsPath,
+                              data)
@@ -0,0 +1,65 @@
+from PyQt5 import QtCore
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..npzFile import loadNpzMembers
+
+
+class LoadNpzSignal(QtCore.QObject):
+    """
+    Class containing the signal of the LoadNpzThread, see below
+    """
+
+    # When the arrays are loaded
+    # fileAbsPath, {name : data}
+    done = QtCore.pyqtSignal(str, dict)
+
+    # When the arrays could not be loaded
+    # fileAbsPath, error message
+    error = QtCore.pyqtSignal(str, str)
+
+
+
+class LoadNpzThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, fileAbsPath: str,
+                       members: list) -> None:
+        """
+        Thread used to load arrays of a npz file, uncompressed ones being
+        memory-mapped and compressed ones decompressed.
+
+        Parameters
+        ----------
+        fileAbsPath : str
+            Absolute path of the npz file.
+        members : list
+            Arrays to be loaded, see getNpzMembers.
+        """
+
+        super(LoadNpzThread, self).__init__()
+
+        self.signal = LoadNpzSignal()
+
+        self.fileAbsPath = fileAbsPath
+        self.members     = members
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            data = loadNpzMembers(self.fileAbsPath,
+                                  self.members)
+        except Exception as e:
+            self.signal.error.emit(self.fileAbsPath,
+                                   'Can\'t open npz file: {}'.format(e))
+            return
+
+        self.signal.done.emit(self.fileAbsPath,
+                              data)
@@ -0,0 +1,111 @@
+from PyQt5 import QtCore
+import os
+
+from ..config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..folderScan import FolderCache, getFileSize, scanFolder
+
+
+# Number of file sizes sent at once to the tableWidgetFolder
+SIZE_BATCH = 100
+
+
+
+class ScanFolderSignal(QtCore.QObject):
+    """
+    Class containing the signal of the ScanFolderThread, see below
+    """
+
+    # When the folder content is listed, without the file sizes
+    # scanId, entries
+    entries = QtCore.pyqtSignal(int, list)
+
+    # When file sizes are read, sent by batch
+    # scanId, {name : size}
+    sizes = QtCore.pyqtSignal(int, dict)
+
+    # When the folder is done
+    # scanId
+    done = QtCore.pyqtSignal(int)
+
+    # When the folder could not be read
+    # scanId, error message
+    error = QtCore.pyqtSignal(int, str)
+
+
+
+class ScanFolderThread(QtCore.QRunnable):
+
+
+
+    def __init__(self, directory: str,
+                       scanId: int,
+                       cache: FolderCache) -> None:
+        """
+        Thread used to list the content of a folder, see scanFolder, so that
+        large or network folders do not freeze the GUI.
+        The items are sent at once, their size being sent afterward by
+        batches.
+
+        Parameters
+        ----------
+        directory : str
+            Path of the folder.
+        scanId : int
+            Id of the scan, results of previous scans being ignored by the
+            tableWidgetFolder.
+        cache : FolderCache
+            Content of the last browsed folders.
+        """
+
+        super(ScanFolderThread, self).__init__()
+
+        self.signal = ScanFolderSignal()
+
+        self.directory = directory
+        self.scanId    = scanId
+        self.cache     = cache
+
+
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        """
+        Method launched by the worker.
+        """
+
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+
+            entries = self.cache.get(self.directory, mtime)
+            if entries is not None:
+                self.signal.entries.emit(self.scanId, entries)
+                self.signal.sizes.emit(self.scanId, {entry['name'] : entry['size'] for entry in entries
+                                                     if not entry['isDir']})
+                self.signal.done.emit(self.scanId)
+                return
+
+            entries, dirEntries = scanFolder(self.directory)
+        except Exception as e:
+            self.signal.error.emit(self.scanId,
+                                   'Can\'t read {}: {}'.format(self.directory, e))
+            return
+
+        self.signal.entries.emit(self.scanId, [dict(entry) for entry in entries])
+
+        sizes = {}
+        for entry, dirEntry in zip(entries, dirEntries):
+            if entry['isDir']:
+                continue
+
+            entry['size'] = getFileSize(dirEntry)
+            sizes[entry['name']] = entry['size']
+            if len(sizes)==SIZE_BATCH:
+                self.signal.sizes.emit(self.scanId, sizes)
+                sizes = {}
+
+        if len(sizes)>0:
+            self.signal.sizes.emit(self.scanId, sizes)
+
+        self.cache.set(self.directory, mtime, entries)
+        self.signal.done.emit(self.scanId)
@@ -10,7 +10,10 @@ from .plot.plot2d.widgetPlot2d import WidgetPlot2d
 from .hBoxLayoutLabelPath import HBoxLayoutLabelPath
 from .widgetCSV import WidgetCSV
 from .widgetNpz import WidgetNpz
+from .widgetArrayFile import WidgetArrayFile
 from .widgetBlueFors import WidgetBlueFors
+from .widgetRunSearch import WidgetRunSearch
+from ..sources.fileWatcher import FileWatcher
 
 from ..sources.config import loadConfigCurrent
 config = loadConfigCurrent()
@@ -41,13 +44,19 @@ class MainApp(QtWidgets.QMainWindow):
         self.qapp = QApplication
         self.widgetCSV = WidgetCSV(None)
         self.widgetNpz = WidgetNpz(None)
+        self.widgetArrayFile = WidgetArrayFile(None)
         self.widgetBlueFors = WidgetBlueFors(None)
+        self.fileWatcher = FileWatcher(self)
 
 
         # Can't promote layout on qtdesigner...
         self.hBoxLayoutPath = HBoxLayoutLabelPath()
         self.ui.verticalLayout_12.addLayout(self.hBoxLayoutPath)
 
+        # Search of the runs of all databases, above the folder table
+        self.widgetRunSearch = WidgetRunSearch(self.ui.layoutWidget_2)
+        self.ui.verticalLayout_5.insertWidget(1, self.widgetRunSearch)
+
 
         self.signalRemoveProgressBar.connect(self.ui.statusBarMain.removeProgressBar)
         self.signalEnableCheck.connect(self.ui.tableWidgetParameter.enableCheck)
@@ -94,6 +103,7 @@ class MainApp(QtWidgets.QMainWindow):
         self.widgetCSV.signalUpdateProgressBar.connect(self.ui.statusBarMain.updateProgressBar)
         self.widgetCSV.signalRemoveProgressBar.connect(self.ui.statusBarMain.removeProgressBar)
         self.widgetCSV.signalLoadedDataFull.connect(self.loadedDataFull)
+        self.widgetCSV.signalLoadedDataEmpty.connect(self.loadedDataEmpty)
 
         self.widgetNpz.signalClearTableWidgetDatabase.connect(self.ui.tableWidgetDataBase.slotClearTable)
         self.widgetNpz.signalClearTableWidgetParameter.connect(self.ui.tableWidgetParameter.slotClearTable)
@@ -107,8 +117,24 @@ class MainApp(QtWidgets.QMainWindow):
         self.widgetNpz.signalUpdateProgressBar.connect(self.ui.statusBarMain.updateProgressBar)
         self.widgetNpz.signalRemoveProgressBar.connect(self.ui.statusBarMain.removeProgressBar)
         self.widgetNpz.signalLoadedDataFull.connect(self.loadedDataFull)
+        self.widgetNpz.signalLoadedDataEmpty.connect(self.loadedDataEmpty)
         self.widgetNpz.signalNpzIncorrectSize.connect(self.ui.tableWidgetParameter.slotNpzIncorrectSize)
 
+        self.widgetArrayFile.signalClearTableWidgetDatabase.connect(self.ui.tableWidgetDataBase.slotClearTable)
+        self.widgetArrayFile.signalClearTableWidgetParameter.connect(self.ui.tableWidgetParameter.slotClearTable)
+        self.widgetArrayFile.signalClearSnapshot.connect(self.ui.treeViewSnapshot.cleanSnapshot)
+        self.widgetArrayFile.signalUpdateLabelCurrentSnapshot.connect(self.ui.labelCurrentSnapshot.setText)
+        self.widgetArrayFile.signalUpdateLabelCurrentRun.connect(self.ui.labelCurrentRun.setText)
+        self.widgetArrayFile.signalLineEditSnapshotEnabled.connect(self.ui.lineEditFilterSnapshot.enabled)
+        self.widgetArrayFile.signalLabelSnapshotEnabled.connect(self.ui.labelSnapshot.enabled)
+        self.widgetArrayFile.signalSendStatusBarMessage.connect(self.ui.statusBarMain.setStatusBarMessage)
+        self.widgetArrayFile.signalFillTableWidgetParameter.connect(self.ui.tableWidgetParameter.slotFillTableWidgetParameter)
+        self.widgetArrayFile.signalUpdateProgressBar.connect(self.ui.statusBarMain.updateProgressBar)
+        self.widgetArrayFile.signalRemoveProgressBar.connect(self.ui.statusBarMain.removeProgressBar)
+        self.widgetArrayFile.signalLoadedDataFull.connect(self.loadedDataFull)
+        self.widgetArrayFile.signalLoadedDataEmpty.connect(self.loadedDataEmpty)
+        self.widgetArrayFile.signalNpzIncorrectSize.connect(self.ui.tableWidgetParameter.slotNpzIncorrectSize)
+
         self.widgetBlueFors.signalClearTableWidgetDatabase.connect(self.ui.tableWidgetDataBase.slotClearTable)
         self.widgetBlueFors.signalClearTableWidgetParameter.connect(self.ui.tableWidgetParameter.slotClearTable)
         self.widgetBlueFors.signalClearSnapshot.connect(self.ui.treeViewSnapshot.cleanSnapshot)
@@ -121,10 +147,13 @@ class MainApp(QtWidgets.QMainWindow):
         self.widgetBlueFors.signalUpdateProgressBar.connect(self.ui.statusBarMain.updateProgressBar)
         self.widgetBlueFors.signalRemoveProgressBar.connect(self.ui.statusBarMain.removeProgressBar)
         self.widgetBlueFors.signalLoadedDataFull.connect(self.loadedDataFull)
+        self.widgetBlueFors.signalLoadedDataEmpty.connect(self.loadedDataEmpty)
+        self.widgetBlueFors.signalUpdateCurve.connect(self.slotUpdateCurve)
 
         self.ui.statusBarMain.signalExportRunLoad.connect(self.ui.tableWidgetDataBase.exportRunLoad)
         self.ui.statusBarMain.signalCsvLoad.connect(self.widgetCSV.csvLoad)
         self.ui.statusBarMain.signalNpzLoad.connect(self.widgetNpz.npzLoad)
+        self.ui.statusBarMain.signalArrayLoad.connect(self.widgetArrayFile.arrayLoad)
         self.ui.statusBarMain.signalBlueForsLoad.connect(self.widgetBlueFors.blueForsLoad)
         self.ui.statusBarMain.signalDatabaseLoad.connect(self.ui.tableWidgetDataBase.databaseClick)
         self.ui.statusBarMain.signalAddCurve.connect(self.ui.tableWidgetParameter.getData)
@@ -133,13 +162,22 @@ class MainApp(QtWidgets.QMainWindow):
         self.ui.tableWidgetFolder.signalBlueForsClick.connect(self.ui.statusBarMain.blueForsLoad)
         self.ui.tableWidgetFolder.signalCSVClick.connect(self.ui.statusBarMain.csvLoad)
         self.ui.tableWidgetFolder.signalNpzClick.connect(self.ui.statusBarMain.npzLoad)
+        self.ui.tableWidgetFolder.signalArrayClick.connect(self.ui.statusBarMain.arrayLoad)
         self.ui.tableWidgetFolder.signalDatabaseClick.connect(self.ui.statusBarMain.databaseLoad)
         self.ui.tableWidgetFolder.signalDatabaseClick.connect(self.ui.checkBoxHidden.databaseClick)
         self.ui.tableWidgetFolder.signalDatabaseClick.connect(self.ui.checkBoxStared.databaseClick)
         self.ui.tableWidgetFolder.signalUpdateLabelPath.connect(self.hBoxLayoutPath.updateLabelPath)
         self.ui.tableWidgetFolder.signalDatabasePathUpdate.connect(self.ui.tableWidgetDataBase.updateDatabasePath)
+        self.ui.tableWidgetFolder.signalUpdateLabelPath.connect(self.fileWatcher.watchFolder)
+        self.fileWatcher.signalFolderChanged.connect(self.ui.tableWidgetFolder.slotFolderChanged)
         self.ui.tableWidgetFolder.first_call()
 
+        self.widgetRunSearch.signalSendStatusBarMessage.connect(self.ui.statusBarMain.setStatusBarMessage)
+        self.widgetRunSearch.signalOpenRun.connect(self.ui.tableWidgetDataBase.slotSelectRun)
+        self.widgetRunSearch.signalOpenRun.connect(self.ui.tableWidgetFolder.slotOpenRun)
+        # First indexing, done only if config['runIndexRoots'] isn't empty
+        self.widgetRunSearch.updateIndex()
+
 
         self.ui.tableWidgetFolder.signalClearTableWidget.connect(self.ui.tableWidgetDataBase.slotClearTable)
         self.ui.tableWidgetFolder.signalAddRows.connect(self.ui.tableWidgetDataBase.databaseClickAddRows)
@@ -154,6 +192,8 @@ class MainApp(QtWidgets.QMainWindow):
         self.ui.tableWidgetDataBase.signalExportRunAddProgressBar.connect(self.ui.statusBarMain.exportRunAddProgressBar)
 
         self.ui.tableWidgetDataBase.signalDatabaseClickDone.connect(self.ui.tableWidgetFolder.databaseClickDone)
+        self.ui.tableWidgetDataBase.signalDatabaseClickDone.connect(self.fileWatcher.watchDatabase)
+        self.fileWatcher.signalDatabaseChanged.connect(self.ui.tableWidgetDataBase.slotDatabaseChanged)
         self.ui.tableWidgetDataBase.signalDatabaseStars.connect(self.ui.tableWidgetFolder.slotFromTableWidgetDataBaseDatabaseStars)
         self.ui.tableWidgetDataBase.signalDatabaseUnstars.connect(self.ui.tableWidgetFolder.slotFromTableWidgetDataBaseDatabaseUnstars)
 
@@ -191,7 +231,9 @@ class MainApp(QtWidgets.QMainWindow):
         self.ui.tableWidgetParameter.signalLoadedDataEmpty.connect(self.loadedDataEmpty)
         self.ui.tableWidgetParameter.signalCSVLoadData.connect(self.widgetCSV.loadData)
         self.ui.tableWidgetParameter.signalNpzLoadData.connect(self.widgetNpz.loadData)
+        self.ui.tableWidgetParameter.signalArrayLoadData.connect(self.widgetArrayFile.loadData)
         self.ui.tableWidgetParameter.signalBlueForsLoadData.connect(self.widgetBlueFors.loadData)
+        self.ui.tableWidgetParameter.signalRemoveCurve.connect(self.widgetBlueFors.slotRemoveCurve)
         self.ui.tableWidgetParameter.signaladdRow.connect(self.addRow)
         self.ui.tableWidgetParameter.first_call()
 
@@ -297,6 +339,8 @@ class MainApp(QtWidgets.QMainWindow):
         if hasattr(self.ui.menuBarMain, 'DialogLiveplot'):
             self.ui.menuBarMain.DialogLiveplot.close()
 
+        self.widgetRunSearch.stop()
+
         plotRefs = [plot for plot in self._plotRefs.keys()]
         # plot1d window open from a plo1d window are taken care by the plot1d itself
         # we so remove them from the selection
@@ -547,8 +591,9 @@ class MainApp(QtWidgets.QMainWindow):
         progressBar : str
             Key to the progress bar in the dict progressBars.
         data : list
-            For 1d plot: [xData, yData]
+            For 1d plot: [xData, yData] or [xData, yData, yErr]
             For 2d plot: [xData, yData, zData]
+            yErr, 1d array, is displayed as error bars.
         xLabelText : str
             Label text for the xAxix.
         xLabelUnits : str
@@ -578,7 +623,13 @@ class MainApp(QtWidgets.QMainWindow):
         if data is None:
             return
 
-        self.signalSendStatusBarMessage.emit('Launching '+str(len(data)-1)+'d plot', 'orange')
+        # 1d data may come with their uncertainties, 2d data have a 2d z array
+        if len(data)==2 or np.ndim(data[2])==1:
+            nbDimension = 1
+        else:
+            nbDimension = 2
+
+        self.signalSendStatusBarMessage.emit('Launching '+str(nbDimension)+'d plot', 'orange')
 
 
         # If some parameters are not given, we find then from the GUI
@@ -587,7 +638,9 @@ class MainApp(QtWidgets.QMainWindow):
 
 
         # 1D plot
-        if len(data)==2:
+        if nbDimension==1:
+
+            yErr = data[2] if len(data)==3 else None
 
             # If the plotRef is not stored we launched a new window
             # Otherwise we add a new PlotDataItem on an existing WidgetPlot1d
@@ -611,13 +664,15 @@ class MainApp(QtWidgets.QMainWindow):
                                  dialogX         = dialogX,
                                  dialogY         = dialogY,
                                  dialogWidth     = dialogWidth,
-                                 dialogHeight    = dialogHeight)
+                                 dialogHeight    = dialogHeight,
+                                 yErr            = yErr)
 
                 # Through interaction, we open new plot
                 p.signal2MainWindowAddPlot.connect(self.slotFromPlotAddPlot)
                 # When a plot is closed, all its sub-interaction plot are closed
                 p.signalClose1dPlot.connect(self.slotClose1dPlot)
                 p.signalUpdateCurve.connect(self.slotUpdateCurve)
+                p.signalSendStatusBarMessage.connect(self.ui.statusBarMain.setStatusBarMessage)
 
 
                 # self.signalAddSliceItem.connect(p.addSliceItem)
@@ -644,11 +699,12 @@ class MainApp(QtWidgets.QMainWindow):
                                                         curveXUnits        = xLabelUnits,
                                                         curveYLabel        = yLabelText,
                                                         curveYUnits        = yLabelUnits,
-                                                        curveLegend        = curveLegend)
+                                                        curveLegend        = curveLegend,
+                                                        yErr               = yErr)
             self.updateList1dCurvesLabels()
 
         # 2D plot
-        elif len(data)==3:
+        else:
 
             # Determine if we should open a new WidgetPlot2d
             if plotRef not in self._plotRefs:
@@ -705,6 +761,10 @@ class MainApp(QtWidgets.QMainWindow):
                               autoRange: bool,
                               interactionUpdateAll: bool) -> None:
 
+        # The plot may have been closed meanwhile
+        if plotRef not in self._plotRefs:
+            return
+
         if len(x)!=len(y):
             self.signalSendStatusBarMessage('Curve update failed: x and y do not have the same length',
                                             'red')
@@ -753,17 +813,23 @@ class MainApp(QtWidgets.QMainWindow):
     @QtCore.pyqtSlot(str)
     def slotClose1dPlot(self, plotRef: str) -> None:
 
+        # The plot may have already been closed by the user
+        if plotRef not in self._plotRefs:
+            return
+
         # We uncheck all curves from the tableWidgetParameter
         curvesId = list(self._plotRefs[plotRef].curves.keys())
         for curveId in curvesId:
             print(f'close 1D plots {plotRef}-{curveId}')
             self.ui.tableWidgetParameter.slotUncheck(curveId)
+            self.widgetBlueFors.slotRemoveCurve(plotRef, curveId)
 
 
         # We check for all possible interaction plots from that 1d plot
         for curveType in ('fft',
                           'fftnodc',
                           'ifft',
+                          'psd',
                           'derivative',
                           'primitive',
                           'unwrap',
@@ -1,15 +1,26 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
+import abc
 import numpy as np
-from typing import Tuple, Any, Optional
-from scipy.signal import savgol_filter
+from typing import Tuple, Any, Optional, Union
 
+from ....sources.spectrum import getSamplingPeriod
+from ....sources import filtering
 
 
 
-class SavitzkyGolay(QtWidgets.QDialog):
+class Filtering1dMeta(type(QtWidgets.QDialog), abc.ABCMeta):
+    """
+    Metaclass allowing abstract methods in a QDialog subclass.
+    """
 
-    # For plot1d GUI
-    comboBoxLabel = 'Savitzky-Golay'
+
+
+class Filtering1d(QtWidgets.QDialog, metaclass=Filtering1dMeta):
+    """
+    Base class of the filters of the plot1d GUI.
+    A filter defines a comboBoxLabel, its parameters through addSpinBox, and
+    the filter and legend2display methods.
+    """
 
     signalCloseDialog  = QtCore.pyqtSignal(str)
     signalUpdateDialog = QtCore.pyqtSignal()
@@ -17,118 +28,128 @@ class SavitzkyGolay(QtWidgets.QDialog):
 
     def __init__(self, parent: QtWidgets.QDialog,
                        xData: np.ndarray,
-                       yData: np.ndarray) -> None:
+                       yData: np.ndarray,
+                       windowTitle: str) -> None:
 
         QtWidgets.QDialog.__init__(self, parent=parent)
 
         self.setMinimumSize(200, 200)
 
-        # SavitzkyGolay needs two parameters
-        self.windowLength       = 3
-        self.polyorder          = 1
-
         self.xData = xData
         self.yData = yData
 
-        spinBoxPolyorder = QtWidgets.QSpinBox()
-        spinBoxPolyorder.setMinimum(1)
-        spinBoxPolyorder.setMaximum(2)
-        spinBoxPolyorder.setValue(self.polyorder)
-        spinBoxPolyorder.valueChanged.connect(lambda value: self.polyorderChanged(value))
+        self.layoutParameters = QtWidgets.QVBoxLayout()
+        self.setLayout(self.layoutParameters)
 
-        labePolyorder = QtWidgets.QLabel('Polyorder: ')
-
-        layoutPolyorder = QtWidgets.QHBoxLayout()
-        layoutPolyorder.addWidget(labePolyorder)
-        layoutPolyorder.addWidget(spinBoxPolyorder)
-
-
-
-        spinBoxWindowLenght = QtWidgets.QSpinBox()
-        spinBoxWindowLenght.setSingleStep(2)
-        spinBoxWindowLenght.setMinimum(3)
-        spinBoxWindowLenght.setMaximum(10000)
-        spinBoxWindowLenght.setValue(self.windowLength)
-        spinBoxWindowLenght.valueChanged.connect(lambda value,
-                                                        spinBoxPolyorder=spinBoxPolyorder: self.windowLengthChanged(value, spinBoxPolyorder))
+        self.setGeometry(1000, 30, 300, 100)
+        self.setWindowTitle(windowTitle)
 
-        labeWindowLength = QtWidgets.QLabel('Window length: ')
 
-        layoutWindowLenght = QtWidgets.QHBoxLayout()
-        layoutWindowLenght.addWidget(labeWindowLength)
-        layoutWindowLenght.addWidget(spinBoxWindowLenght)
 
+    def addSpinBox(self, label: str,
+                         attribute: str,
+                         value: Union[int, float],
+                         minimum: Union[int, float],
+                         maximum: Union[int, float],
+                         step: Union[int, float]=1,
+                         decimals: Optional[int]=None) -> Union[QtWidgets.QSpinBox,
+                                                                QtWidgets.QDoubleSpinBox]:
+        """
+        Add a spinBox setting a parameter of the filter.
+        The filtered curve is updated each time the parameter is changed.
 
+        Parameters
+        ----------
+        label : str
+            Label displayed next to the spinBox.
+        attribute : str
+            Name of the attribute storing the parameter.
+        value : Union[int, float]
+            Initial value of the parameter.
+        minimum : Union[int, float]
+            Minimum value of the parameter.
+        maximum : Union[int, float]
+            Maximum value of the parameter.
+        step : Union[int, float], optional
+            Step of the spinBox, by default 1.
+        decimals : Optional[int], optional
+            Number of decimals of a float parameter, None for an int parameter,
+            by default None.
+        """
 
-        layout = QtWidgets.QVBoxLayout()
-        layout.addLayout(layoutWindowLenght)
-        layout.addLayout(layoutPolyorder)
+        setattr(self, attribute, value)
 
-        self.setLayout(layout)
+        if decimals is None:
+            spinBox = QtWidgets.QSpinBox()
+        else:
+            spinBox = QtWidgets.QDoubleSpinBox()
+            spinBox.setDecimals(decimals)
+        spinBox.setSingleStep(step)
+        spinBox.setMinimum(minimum)
+        spinBox.setMaximum(maximum)
+        spinBox.setValue(value)
+        spinBox.valueChanged.connect(lambda value, attribute=attribute: self.parameterChanged(attribute, value))
 
-        self.setGeometry(1000, 30, 300, 100)
-        self.setWindowTitle('Savitzky-Golay Filter')
+        layoutParameter = QtWidgets.QHBoxLayout()
+        layoutParameter.addWidget(QtWidgets.QLabel(label))
+        layoutParameter.addWidget(spinBox)
+        self.layoutParameters.addLayout(layoutParameter)
 
-        self.show()
+        return spinBox
 
 
 
-    def legend2display(self) -> str:
+    def parameterChanged(self, attribute: str,
+                               value: Union[int, float]) -> None:
         """
-        Legend of the fitted curve displayed in the WidgetPlot1d.
+        Store the new value of a parameter and update the filtered
+        plotDataItem.
         """
 
-        return 'Savitzky-Golay: wl='+str(self.windowLength)+', po='+str(self.polyorder)
+        setattr(self, attribute, value)
 
+        self.signalUpdateDialog.emit()
 
 
-    def windowLengthChanged(self, value            : int,
-                                   spinBoxPolyorder : QtWidgets.QSpinBox) -> None:
-        """
-        Method called when user press on the spinBoxPolyorder QSpinBox, see
-        the SavitzkyGolayWindow class.
-        Store the new window length value, take care that the polyorder
-        parameter is always one less that the window length parameter and
-        update the filtered plotDataItem.
 
-        Parameters
-        ----------
-        value : int
-            Value of the window length parameter.
-        spinBoxPolyorder : QtWidgets.QSpinBox
-            QSpinBox of the polyorder parameter.
+    def getNyquistFrequency(self, xData: np.ndarray) -> float:
+        """
+        Return the Nyquist frequency of the data, in 1/x units.
         """
 
-        self.windowLength = value
-        spinBoxPolyorder.setMaximum(value-1)
+        return 0.5/getSamplingPeriod(xData)
 
-        self.signalUpdateDialog.emit()
 
 
-
-    def polyorderChanged(self, value: int) -> None:
+    @abc.abstractmethod
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Method called when user press on the spinBoxPolyorder QSpinBox, see
-        the SavitzkyGolayWindow class.
-        Store the new polyorder value  and update the filtered plotDataItem.
-
-        Parameters
-        ----------
-        value : int
-            Value of the polyorder parameter.
+        Return the filtered data.
         """
 
-        self.polyorder = value
 
-        self.signalUpdateDialog.emit()
 
+    @abc.abstractmethod
+    def legend2display(self, xData: np.ndarray) -> str:
+        """
+        Legend of the filtered curve displayed in the WidgetPlot1d.
+        """
 
 
 
-    def runFiltering(self) -> Tuple[np.ndarray, Any, str]:
+    def runFiltering(self, xData: Optional[np.ndarray]=None,
+                           yData: Optional[np.ndarray]=None) -> Tuple[np.ndarray, Any, str]:
         """
         Filter the data.
 
+        Parameters
+        ----------
+        xData : Optional[np.ndarray], optional
+            Data along the x axis, by default None to use the dialog ones.
+        yData : Optional[np.ndarray], optional
+            Data along the y axis, by default None to use the dialog ones.
+
         Return
         ------
         xFiltered : np.ndarray
@@ -139,12 +160,261 @@ class SavitzkyGolay(QtWidgets.QDialog):
             Legend of the filtered curve.
         """
 
-        return self.xData, savgol_filter(self.yData,
-                                         self.windowLength,
-                                         self.polyorder), self.legend2display()
+        if xData is None:
+            xData, yData = self.xData, self.yData
+
+        xFiltered, yFiltered = self.filter(xData, yData)
+
+        return xFiltered, yFiltered, self.legend2display(xData)
 
 
 
     def closeEvent(self, evnt: QtGui.QCloseEvent) -> None:
 
-        self.signalCloseDialog.emit('filtering')
\ No newline at end of file
+        self.signalCloseDialog.emit('filtering')
+
+
+
+class SavitzkyGolay(Filtering1d):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Savitzky-Golay'
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, 'Savitzky-Golay Filter')
+
+        # SavitzkyGolay needs two parameters
+        spinBoxWindowLength = self.addSpinBox('Window length: ', 'windowLength', 3, 3, 10000, step=2)
+        spinBoxPolyorder    = self.addSpinBox('Polyorder: ', 'polyorder', 1, 1, 2)
+
+        # The polyorder parameter is always one less that the window length
+        spinBoxWindowLength.valueChanged.connect(lambda value: spinBoxPolyorder.setMaximum(value-1))
+
+        self.show()
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        return 'Savitzky-Golay: wl='+str(self.windowLength)+', po='+str(self.polyorder)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        # The polyorder spinBox may not be updated yet when the window length
+        # is reduced
+        return xData, filtering.savitzkyGolay(yData,
+                                              self.windowLength,
+                                              min(self.polyorder, self.windowLength-1))
+
+
+
+class MovingAverage(Filtering1d):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Moving average'
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, 'Moving average Filter')
+
+        self.addSpinBox('Window length: ', 'windowLength', 3, 1, 1000000, step=2)
+
+        self.show()
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        return 'Moving average: wl='+str(self.windowLength)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return xData, filtering.movingAverage(yData, self.windowLength)
+
+
+
+class Median(Filtering1d):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Median'
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, 'Median Filter')
+
+        self.addSpinBox('Window length: ', 'windowLength', 3, 1, 10001, step=2)
+
+        self.show()
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        return 'Median: wl='+str(self.windowLength)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return xData, filtering.median(yData, self.windowLength)
+
+
+
+class Gaussian(Filtering1d):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Gaussian'
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, 'Gaussian Filter')
+
+        self.addSpinBox('Sigma (points): ', 'sigma', 1., 0.1, 100000., step=0.5, decimals=1)
+
+        self.show()
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        return 'Gaussian: sigma='+str(self.sigma)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return xData, filtering.gaussian(yData, self.sigma)
+
+
+
+class Butterworth(Filtering1d):
+    """
+    Zero-phase Butterworth filter, the cutoff frequencies are given as
+    fraction of the Nyquist frequency, their value in 1/x units being
+    displayed in the legend.
+    """
+
+    btype = ''
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, self.comboBoxLabel+' Filter')
+
+        self.addSpinBox('Order: ', 'order', 4, 1, 10)
+        if self.btype=='bandpass':
+            self.addSpinBox('Low cutoff (Nyquist): ', 'cutoffLow', 0.05, 0.0001, 0.9999, step=0.01, decimals=4)
+            self.addSpinBox('High cutoff (Nyquist): ', 'cutoffHigh', 0.2, 0.0001, 0.9999, step=0.01, decimals=4)
+        else:
+            self.addSpinBox('Cutoff (Nyquist): ', 'cutoff', 0.1, 0.0001, 0.9999, step=0.01, decimals=4)
+
+        self.show()
+
+
+
+    def getCutoff(self) -> Union[float, Tuple[float, float]]:
+
+        if self.btype=='bandpass':
+            return (min(self.cutoffLow, self.cutoffHigh),
+                    max(self.cutoffLow, self.cutoffHigh))
+        else:
+            return self.cutoff
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        cutoff = np.atleast_1d(self.getCutoff())*self.getNyquistFrequency(xData)
+
+        return self.comboBoxLabel+': o='+str(self.order)+', fc='+', '.join('{:.3e}'.format(f) for f in cutoff)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return xData, filtering.butterworth(yData,
+                                            self.order,
+                                            self.getCutoff(),
+                                            self.btype)
+
+
+
+class ButterworthLowPass(Butterworth):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Butterworth low-pass'
+
+    btype = 'lowpass'
+
+
+
+class ButterworthHighPass(Butterworth):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Butterworth high-pass'
+
+    btype = 'highpass'
+
+
+
+class ButterworthBandPass(Butterworth):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Butterworth band-pass'
+
+    btype = 'bandpass'
+
+
+
+class Decimation(Filtering1d):
+
+    # For plot1d GUI
+    comboBoxLabel = 'Decimation'
+
+
+    def __init__(self, parent: QtWidgets.QDialog,
+                       xData: np.ndarray,
+                       yData: np.ndarray) -> None:
+
+        Filtering1d.__init__(self, parent, xData, yData, 'Decimation')
+
+        self.addSpinBox('Factor: ', 'factor', 2, 1, 1000)
+
+        self.show()
+
+
+
+    def legend2display(self, xData: np.ndarray) -> str:
+
+        return 'Decimation: q='+str(self.factor)
+
+
+
+    def filter(self, xData: np.ndarray,
+                     yData: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return filtering.decimate(xData, yData, self.factor)
@@ -14,7 +14,7 @@ warnings.filterwarnings(
 import lmfit
 import os
 from scipy.signal import hilbert
-from typing import Tuple
+from typing import Tuple, Dict
 
 
 from ....sources.config import loadConfigCurrent
@@ -105,6 +105,33 @@ class Fit1d(QtWidgets.QDialog):
 
 
 
+    def getMethod(self) -> str:
+        """
+        Return the lmfit minimization method used by the model.
+        """
+
+        return self._method
+
+
+
+    def displayFitResult(self, report: str) -> None:
+        """
+        Display the model equation and the fit report.
+
+        Parameters
+        ----------
+        report : str
+            Fit report, see lmfit.fit_report.
+        """
+
+        self.webView.setHtml(self.defaultPageSource(self.getLatexEquation),
+                             baseUrl=QtCore.QUrl.fromLocalFile(LOC))
+        self.label.setText(report)
+        self.label.adjustSize()
+        self.webView.adjustSize()
+
+
+
     def residual(self, p: lmfit.parameter.Parameters) -> np.ndarray:
         """
         Return the error between the model and the data.
@@ -145,11 +172,7 @@ class Fit1d(QtWidgets.QDialog):
         # dx = np.gradient(self.xData)/2.
         # x = np.sort(np.concatenate((self.xData, self.xData+dx)))
 
-        self.webView.setHtml(self.defaultPageSource(self.getLatexEquation),
-                             baseUrl=QtCore.QUrl.fromLocalFile(LOC))
-        self.label.setText(lmfit.fit_report(result))
-        self.label.adjustSize()
-        self.webView.adjustSize()
+        self.displayFitResult(lmfit.fit_report(result))
 
         return self.xData, self.func(result.params, self.xData), result.params
 
@@ -243,11 +266,7 @@ class Polynomial(Fit1d):
 
         self.polyFit = np.polynomial.polynomial.Polynomial.fit(self.xData, self.yData, self.getPolyOrder())
 
-        self.webView.setHtml(self.defaultPageSource(self.getLatexEquation),
-                             baseUrl=QtCore.QUrl.fromLocalFile(LOC))
-        self.label.setText(self.displayedLegend(p))
-        self.label.adjustSize()
-        self.webView.adjustSize()
+        self.displayFitResult(self.displayedLegend(p))
 
         return self.xData, self.polyFit(self.xData), p
 
@@ -403,6 +422,42 @@ class T2Gaussian(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        A, T, phi = p['amplitude'].value, p['period'].value, p['phi'].value
+        t2, t2g = p['t2'].value, p['t2_g'].value
+
+        theta = 2.*np.pi*x/T+phi
+        e = np.exp(-x/t2-(x/t2g)**2.)
+        ce = np.cos(theta)*e
+        se = A*np.sin(theta)*e
+
+        return {'amplitude'  : 1.-ce,
+                'period'     : -2.*np.pi*x/T**2*se,
+                't2'         : -A*ce*x/t2**2,
+                't2_g'       : -2.*A*ce*x**2/t2g**3,
+                'phi'        : se,
+                'background' : np.ones_like(x)}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -524,6 +579,40 @@ class T2(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        A, T, phi, t2 = p['amplitude'].value, p['period'].value, p['phi'].value, p['t2'].value
+
+        theta = 2.*np.pi*x/T+phi
+        e = np.exp(-x/t2)
+        ce = np.cos(theta)*e
+        se = A*np.sin(theta)*e
+
+        return {'amplitude'  : 1.-ce,
+                'period'     : -2.*np.pi*x/T**2*se,
+                't2'         : -A*ce*x/t2**2,
+                'phi'        : se,
+                'background' : np.ones_like(x)}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -632,6 +721,35 @@ class T11d(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        A, t1 = p['amplitude'].value, p['t1'].value
+
+        e = np.exp(-x/t1)
+
+        return {'amplitude'  : e,
+                't1'         : A*e*x/t1**2,
+                'background' : np.ones_like(x)}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -731,6 +849,42 @@ class ResonancePeakdB(Fit1d):
         return 20.*np.log10(np.abs(y))+p['background']
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        f0, qi, qc, phi = p['f0'].value, p['qi'].value, p['qc'].value, p['phi'].value
+
+        a = qi/qc*np.exp(1j*phi)
+        d = 1. + 2j*qi*(x - f0)/f0
+        # With g = a/d, y = g/(1+g) and d(log|y|) = Re(dg/(g(1+g)))
+        # h = dg/dqi/(g(1+g))*qi
+        h = 20./np.log(10.)/(d + a)
+        cg = h*d
+
+        return {'background' : np.ones_like(x),
+                'f0'         : -2.*qi*x/f0**2*h.imag,
+                'qi'         : h.real/qi,
+                'qc'         : -cg.real/qc,
+                'phi'        : -cg.imag}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -860,6 +1014,42 @@ class ResonanceDipdB(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        f0, qi, qc, phi = p['f0'].value, p['qi'].value, p['qc'].value, p['phi'].value
+
+        a = qi/qc*np.exp(1j*phi)
+        d = 1. + 2j*qi*(x - f0)/f0
+        # With g = a/d, y = 1/(1+g) and d(log|y|) = -Re(dg/(1+g))
+        # h = -dg/dqi/(1+g)*qi
+        cg = -20./np.log(10.)*a/(d + a)
+        h = cg/d
+
+        return {'background' : np.ones_like(x),
+                'f0'         : -2.*qi*x/f0**2*h.imag,
+                'qi'         : h.real/qi,
+                'qc'         : -cg.real/qc,
+                'phi'        : -cg.imag}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -972,6 +1162,37 @@ class LorentzianPeak(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        h, sigma = p['height'].value, p['fwhm'].value/2
+        dx = (x - p['center'].value)
+
+        l = 1./(dx**2 + sigma**2)
+
+        return {'background' : np.ones_like(x),
+                'center'     : 2.*h*sigma**2*dx*l**2,
+                'fwhm'       : h*sigma*dx**2*l**2,
+                'height'     : sigma**2*l}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -1086,6 +1307,37 @@ class LorentzianDip(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        h, sigma = p['height'].value, p['fwhm'].value/2
+        dx = (x - p['center'].value)
+
+        l = 1./(dx**2 + sigma**2)
+
+        return {'background' : np.ones_like(x),
+                'center'     : -2.*h*sigma**2*dx*l**2,
+                'fwhm'       : -h*sigma*dx**2*l**2,
+                'height'     : -sigma**2*l}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -1205,6 +1457,37 @@ class GaussianPeak(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        h, sigma = p['height'].value, self.fwhm2sigma(p['fwhm'])
+        dx = (x - p['center'].value)
+
+        g = np.exp(-dx**2/2/sigma**2)
+
+        return {'background' : np.ones_like(x),
+                'center'     : h*g*dx/sigma**2,
+                'fwhm'       : h*g*dx**2/sigma**3/2.3548,
+                'height'     : g}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -1326,6 +1609,49 @@ class InterdotTunnelingFit(Fit1d):
 
 
 
+    def derivatives(self, p: lmfit.parameter.Parameters,
+                          x: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analytic partial derivatives of the fit model, used as jacobian by the
+        minimization.
+
+        Parameters
+        ----------
+        p : lmfit.parameter.Parameters
+            Current lmfit parameters.
+        x : np.ndarray
+            Selected data from the x axis.
+
+        Returns
+        -------
+        derivatives : Dict[str, np.ndarray]
+            Derivative of the model along each parameter.
+        """
+
+        a           = p['amplitude'].value
+        e0          = p['center'].value
+        t           = p['tunneling'].value
+        Te          = p['temperature'].value
+        alpha       = p['lever_arm'].value
+        dx          = (x - e0)*alpha
+        omega       = np.sqrt(dx**2+4*t**2)
+        k_b         = 8.617e-5 # eV/K
+        kT2         = 2*k_b*Te
+        th          = np.tanh(omega/kT2)
+        sech2       = 1.-th**2
+
+        # Derivative along the detuning, dx
+        ddx = a*(4*t**2/omega**3*th + dx**2/omega**2*sech2/kT2)
+
+        return {'background'  : np.ones_like(x),
+                'center'      : -alpha*ddx,
+                'amplitude'   : dx/omega*th,
+                'tunneling'   : 4*a*t*dx/omega**2*(sech2/kT2 - th/omega),
+                'temperature' : -a*dx*sech2/kT2/Te,
+                'lever_arm'   : (x - e0)*ddx}
+
+
+
     def displayedLegend(self, p: lmfit.parameter.Parameters) -> str:
         """
         Return the legend of the fit model
@@ -1,10 +1,11 @@
 from PyQt5 import QtCore, QtWidgets
 import numpy as np
-from typing import Tuple
-from scipy.integrate import cumulative_trapezoid
+from functools import partial
+from typing import Tuple, Dict, Callable
 
 from .groupBoxCalculusUi import Ui_groupBoxCalculus
 from ....sources.pyqtgraph import pg
+from ....sources import calculus
 
 
 class GroupBoxCalculus(QtWidgets.QGroupBox):
@@ -36,6 +37,8 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
         self.ui.checkBoxDifferentiate.clicked.connect(self.clickDifferentiate)
         self.ui.checkBoxIntegrate.clicked.connect(self.clickIntegrate)
+        self.ui.spinBoxDifferentiateOrder.valueChanged.connect(self.differentiateUpdateCurve)
+        self.ui.spinBoxDifferentiateSmoothing.valueChanged.connect(self.differentiateUpdateCurve)
 
 
 
@@ -78,16 +81,6 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
         self.selectedYUnits = selectedYUnits
 
 
-    @QtCore.pyqtSlot()
-    def slotDifferentiateUpdate(self):
-        self.differentiateUpdateCurve()
-
-
-    @QtCore.pyqtSlot()
-    def slotIntegrateUpdate(self):
-        self.integrateUpdateCurve()
-
-
     @QtCore.pyqtSlot()
     def slotDifferentiateClosePlot(self):
         self.differentiateClosePlot()
@@ -110,15 +103,57 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
 
 
+    def getInteractionTasks(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """
+        Return the analyses of the opened interaction plots, see
+        WidgetPlot1d.interactionUpdateAll.
+        Structure
+        {name : (compute, publish)}, compute(x, y) being run in a thread and
+        publish(result) in the GUI thread.
+        """
+
+        tasks = {}
+        if hasattr(self, 'differentiatePlotRef'):
+            tasks['differentiate'] = (partial(self.differentiate,
+                                              order=self.ui.spinBoxDifferentiateOrder.value(),
+                                              smoothing=self.ui.spinBoxDifferentiateSmoothing.value()),
+                                      self.differentiatePublish)
+        if hasattr(self, 'integratePlotRef'):
+            tasks['integrate'] = (self.integrate, self.integratePublish)
+
+        return tasks
+
+
+
+    def differentiate(self, x: np.ndarray,
+                            y: np.ndarray,
+                            order: int=1,
+                            smoothing: int=0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Derivative of the selection, sliced from the one of the whole curve
+        when possible, see sources.calculus.Calculus.
+        """
+
+        c, s = calculus.getCalculus(self, x, y)
+        if c is None:
+            return x, calculus.differentiate(x, y, order, smoothing)
+
+        return x, c.differentiate(s, order, smoothing)
+
+
+
     def differentiateGetData(self) -> Tuple[np.ndarray, np.ndarray]:
 
-        return self.selectedX, np.gradient(self.selectedY, self.selectedX)
+        return self.differentiate(self.selectedX,
+                                  self.selectedY,
+                                  self.ui.spinBoxDifferentiateOrder.value(),
+                                  self.ui.spinBoxDifferentiateSmoothing.value())
 
 
 
-    def differentiateUpdateCurve(self) -> None:
+    def differentiatePublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'differentiatePlotRef'):
-            x, y = self.differentiateGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.differentiatePlotRef,
                                         self.differentiateCurveId,
                                         '',
@@ -129,6 +164,12 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
 
 
+    def differentiateUpdateCurve(self) -> None:
+        if hasattr(self, 'differentiatePlotRef'):
+            self.differentiatePublish(self.differentiateGetData())
+
+
+
     def clickDifferentiate(self) -> None:
         """
         Method called when user click on the derivative checkbox.
@@ -140,8 +181,13 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
             xLabelText  = self.selectedXLabel
             xLabelUnits = self.selectedXUnits
-            yLabelText  = '∂('+self.selectedYLabel+')/∂('+xLabelText+')'
-            yLabelUnits = self.selectedYUnits+'/'+xLabelUnits
+            order       = self.ui.spinBoxDifferentiateOrder.value()
+            if order==1:
+                yLabelText  = '∂('+self.selectedYLabel+')/∂('+xLabelText+')'
+                yLabelUnits = self.selectedYUnits+'/'+xLabelUnits
+            else:
+                yLabelText  = '∂^'+str(order)+'('+self.selectedYLabel+')/∂('+xLabelText+')^'+str(order)
+                yLabelUnits = self.selectedYUnits+'/'+xLabelUnits+'^'+str(order)
 
             title       = self._windowTitle+' - derivative'
             self.differentiateCurveId     = self.selectedYLabel+'derivative'
@@ -173,15 +219,30 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
 
 
+    def integrate(self, x: np.ndarray,
+                        y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Primitive of the selection, difference of the one of the whole curve
+        when possible, see sources.calculus.Calculus.
+        """
+
+        c, s = calculus.getCalculus(self, x, y)
+        if c is None:
+            return x, calculus.integrate(x, y)
+
+        return x, c.integrate(s)
+
+
+
     def integrateGetData(self) -> Tuple[np.ndarray, np.ndarray]:
 
-        return self.selectedX, cumulative_trapezoid(self.selectedY, self.selectedX, initial=0)
+        return self.integrate(self.selectedX, self.selectedY)
 
 
 
-    def integrateUpdateCurve(self) -> None:
+    def integratePublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'integratePlotRef'):
-            x, y = self.integrateGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.integratePlotRef,
                                         self.integrateCurveId,
                                         '',
@@ -192,6 +253,12 @@ class GroupBoxCalculus(QtWidgets.QGroupBox):
 
 
 
+    def integrateUpdateCurve(self) -> None:
+        if hasattr(self, 'integratePlotRef'):
+            self.integratePublish(self.integrateGetData())
+
+
+
     def clickIntegrate(self) -> None:
         """
         Method called when user click on the integrate checkbox.
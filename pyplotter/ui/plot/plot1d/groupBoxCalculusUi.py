@@ -14,14 +14,16 @@ class Ui_groupBoxCalculus(object):
     def setupUi(self, groupBoxCalculus):
         groupBoxCalculus.setObjectName("groupBoxCalculus")
         groupBoxCalculus.setEnabled(False)
-        groupBoxCalculus.resize(225, 56)
+        groupBoxCalculus.resize(225, 80)
         groupBoxCalculus.setMaximumSize(QtCore.QSize(225, 16777215))
         font = QtGui.QFont()
         font.setPointSize(10)
         font.setBold(True)
         font.setWeight(75)
         groupBoxCalculus.setFont(font)
-        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(groupBoxCalculus)
+        self.verticalLayoutCalculus = QtWidgets.QVBoxLayout(groupBoxCalculus)
+        self.verticalLayoutCalculus.setObjectName("verticalLayoutCalculus")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_3.setObjectName("horizontalLayout_3")
         self.checkBoxDifferentiate = QtWidgets.QCheckBox(groupBoxCalculus)
         font = QtGui.QFont()
@@ -39,6 +41,35 @@ class Ui_groupBoxCalculus(object):
         self.horizontalLayout_3.addWidget(self.checkBoxIntegrate)
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_3.addItem(spacerItem)
+        self.verticalLayoutCalculus.addLayout(self.horizontalLayout_3)
+        self.horizontalLayoutDifferentiate = QtWidgets.QHBoxLayout()
+        self.horizontalLayoutDifferentiate.setObjectName("horizontalLayoutDifferentiate")
+        self.spinBoxDifferentiateOrder = QtWidgets.QSpinBox(groupBoxCalculus)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.spinBoxDifferentiateOrder.setFont(font)
+        self.spinBoxDifferentiateOrder.setMinimum(1)
+        self.spinBoxDifferentiateOrder.setMaximum(3)
+        self.spinBoxDifferentiateOrder.setProperty("value", 1)
+        self.spinBoxDifferentiateOrder.setObjectName("spinBoxDifferentiateOrder")
+        self.horizontalLayoutDifferentiate.addWidget(self.spinBoxDifferentiateOrder)
+        self.spinBoxDifferentiateSmoothing = QtWidgets.QSpinBox(groupBoxCalculus)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.spinBoxDifferentiateSmoothing.setFont(font)
+        self.spinBoxDifferentiateSmoothing.setMinimum(1)
+        self.spinBoxDifferentiateSmoothing.setMaximum(100001)
+        self.spinBoxDifferentiateSmoothing.setSingleStep(2)
+        self.spinBoxDifferentiateSmoothing.setProperty("value", 1)
+        self.spinBoxDifferentiateSmoothing.setObjectName("spinBoxDifferentiateSmoothing")
+        self.horizontalLayoutDifferentiate.addWidget(self.spinBoxDifferentiateSmoothing)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayoutDifferentiate.addItem(spacerItem1)
+        self.verticalLayoutCalculus.addLayout(self.horizontalLayoutDifferentiate)
 
         self.retranslateUi(groupBoxCalculus)
         QtCore.QMetaObject.connectSlotsByName(groupBoxCalculus)
@@ -48,3 +79,9 @@ class Ui_groupBoxCalculus(object):
         groupBoxCalculus.setTitle(_translate("groupBoxCalculus", "Calculus"))
         self.checkBoxDifferentiate.setText(_translate("groupBoxCalculus", "differentiate"))
         self.checkBoxIntegrate.setText(_translate("groupBoxCalculus", "integrate"))
+        self.spinBoxDifferentiateOrder.setToolTip(_translate("groupBoxCalculus", "Order of the derivative"))
+        self.spinBoxDifferentiateOrder.setPrefix(_translate("groupBoxCalculus", "order "))
+        self.spinBoxDifferentiateSmoothing.setToolTip(_translate("groupBoxCalculus", "Window length of the Savitzky-Golay smoothing applied before differentiating noisy data"))
+        self.spinBoxDifferentiateSmoothing.setSpecialValueText(_translate("groupBoxCalculus", "no smoothing"))
+        self.spinBoxDifferentiateSmoothing.setPrefix(_translate("groupBoxCalculus", "smooth "))
+        self.spinBoxDifferentiateSmoothing.setSuffix(_translate("groupBoxCalculus", " pts"))
@@ -1,9 +1,12 @@
 from PyQt5 import QtCore, QtWidgets
 import numpy as np
-from typing import Tuple
+import copy
+from functools import partial
+from typing import Tuple, Dict, Callable, Optional
 
 from .groupBoxFFTUi import Ui_QGroupBoxFFT
 from ....sources.pyqtgraph import pg
+from ....sources.spectrum import amplitudeSpectrum, isUniform, lombScargleDensity, welch, getSamplingPeriod, Welch
 
 
 class GroupBoxFFT(QtWidgets.QGroupBox):
@@ -33,10 +36,23 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
         self.plotRef = plotRef
         self._windowTitle = windowTitle
 
+        # Power spectral density accumulated during a live plot, see psd
+        self.psdWelch: Optional[Welch] = None
 
         self.ui.checkBoxFFT.clicked.connect(self.clickFFT)
         self.ui.checkBoxFFTnoDC.clicked.connect(self.clickFFTnoDC)
         self.ui.checkBoxIFFT.clicked.connect(self.clickIFFT)
+        self.ui.checkBoxPSD.clicked.connect(self.clickPSD)
+
+        # Settings of the power spectral density, see psd
+        self.ui.spinBoxPSDSegmentLength.setValue(self.config['fftWelchSegmentLength'])
+        self.ui.doubleSpinBoxPSDOverlap.setValue(self.config['fftWelchOverlap'])
+        if self.ui.comboBoxPSDWindow.findText(self.config['fftWelchWindow'])==-1:
+            self.ui.comboBoxPSDWindow.addItem(self.config['fftWelchWindow'])
+        self.ui.comboBoxPSDWindow.setCurrentText(self.config['fftWelchWindow'])
+        self.ui.spinBoxPSDSegmentLength.valueChanged.connect(self.psdSettingsChanged)
+        self.ui.doubleSpinBoxPSDOverlap.valueChanged.connect(self.psdSettingsChanged)
+        self.ui.comboBoxPSDWindow.currentTextChanged.connect(self.psdSettingsChanged)
 
 
 
@@ -69,6 +85,19 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
         del(self.ifftPlotRef)
         del(self.ifftCurveId)
 
+    @QtCore.pyqtSlot(bool)
+    def slotCheckBoxPSDSetChecked(self, state: bool):
+        self.ui.checkBoxPSD.setChecked(state)
+        del(self.psdPlotRef)
+        del(self.psdCurveId)
+        self.psdWelch = None
+
+
+    @QtCore.pyqtSlot(str, int)
+    def slotGetSelectedCurve(self, curveId: str,
+                                   dataVersion: int) -> None:
+        self.selectedCurveId = curveId
+
 
     @QtCore.pyqtSlot(np.ndarray, str, str, np.ndarray, str, str)
     def slotGetSelectedData(self, selectedX,
@@ -85,25 +114,6 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
         self.selectedYUnits = selectedYUnits
 
 
-    ####################################
-    #
-    #           Slot to update plot
-    #
-    ####################################
-
-    @QtCore.pyqtSlot()
-    def slotFFTUpdate(self):
-        self.fftUpdateCurve()
-
-    @QtCore.pyqtSlot()
-    def slotFFTNoDcUpdate(self):
-        self.fftNoDcUpdateCurve()
-
-    @QtCore.pyqtSlot()
-    def slotIFFTUpdate(self):
-        self.ifftUpdateCurve()
-
-
     ####################################
     #
     #           Slot to close plot
@@ -125,6 +135,11 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
     def slotIFFTClosePlot(self):
         self.ifftClosePlot()
 
+
+    @QtCore.pyqtSlot()
+    def slotPSDClosePlot(self):
+        self.psdClosePlot()
+
     ####################################
     #
     #           Method to related to FFT
@@ -133,19 +148,60 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
 
 
 
-    def fftGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+    def getInteractionTasks(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """
+        Return the analyses of the opened interaction plots, see
+        WidgetPlot1d.interactionUpdateAll.
+        Structure
+        {name : (compute, publish)}, compute(x, y) being run in a thread and
+        publish(result) in the GUI thread.
+        """
 
-        x = np.fft.fftfreq(len(self.selectedX), d=self.selectedX[1] - self.selectedX[0])
-        y = np.abs(np.fft.fft(self.selectedY))[x>=0]
-        x = x[x>=0]
+        tasks = {}
+        if hasattr(self, 'fftPlotRef'):
+            tasks['fft'] = (self.fft, self.fftPublish)
+        if hasattr(self, 'fftNoDcPlotRef'):
+            tasks['fftNoDc'] = (self.fftNoDc, self.fftNoDcPublish)
+        if hasattr(self, 'ifftPlotRef'):
+            tasks['ifft'] = (self.ifft, self.ifftPublish)
+        if hasattr(self, 'psdPlotRef'):
+            tasks['psd'] = (partial(self.psd, **self.getPSDSettings()), self.psdPublish)
 
-        return x, y
+        return tasks
 
 
 
-    def fftUpdateCurve(self) -> None:
+    def getTransformName(self, name: str) -> str:
+        """
+        Non uniformly sampled data are transformed by Lomb-Scargle periodogram,
+        see sources.spectrum.amplitudeSpectrum, which is mentioned in the
+        labels.
+        """
+
+        if isUniform(self.selectedX):
+            return name
+        else:
+            return name+' (Lomb-Scargle)'
+
+
+
+    @staticmethod
+    def fft(x: np.ndarray,
+            y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return amplitudeSpectrum(x, y)
+
+
+
+    def fftGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+
+        return self.fft(self.selectedX, self.selectedY)
+
+
+
+    def fftPublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'fftPlotRef'):
-            x, y = self.fftGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.fftPlotRef,
                                         self.fftCurveId,
                                         '',
@@ -156,6 +212,12 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
 
 
 
+    def fftUpdateCurve(self) -> None:
+        if hasattr(self, 'fftPlotRef'):
+            self.fftPublish(self.fftGetData())
+
+
+
     def clickFFT(self) -> None:
 
         if self.ui.checkBoxFFT.isChecked():
@@ -164,9 +226,9 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
             self.fftPlotRef = self.plotRef+'fft'
             xLabelText  = '1/'+self.selectedXLabel
             xLabelUnits = '1/'+self.selectedXUnits
-            yLabelText  = 'FFT'+'( '+self.selectedYLabel+' )'
+            yLabelText  = self.getTransformName('FFT')+'( '+self.selectedYLabel+' )'
             yLabelUnits = self.selectedYUnits+'/'+self.selectedXUnits
-            title       = self._windowTitle+' - '+'FFT'
+            title       = self._windowTitle+' - '+self.getTransformName('FFT')
 
             self.signal2MainWindowAddPlot.emit(1, # runId
                                                self.fftCurveId, # curveId
@@ -192,19 +254,25 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
 
 
 
-    def fftNoDcGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+    @staticmethod
+    def fftNoDc(x: np.ndarray,
+                y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
 
-        x = np.fft.fftfreq(len(self.selectedX), d=self.selectedX[1] - self.selectedX[0])
-        y = np.abs(np.fft.fft(self.selectedY))[x>=0][1:]
-        x = x[x>=0][1:]
+        f, s = amplitudeSpectrum(x, y)
 
-        return x, y
+        return f[1:], s[1:]
 
 
 
-    def fftNoDcUpdateCurve(self) -> None:
+    def fftNoDcGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+
+        return self.fftNoDc(self.selectedX, self.selectedY)
+
+
+
+    def fftNoDcPublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'fftNoDcPlotRef'):
-            x, y = self.fftNoDcGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.fftNoDcPlotRef,
                                         self.fftNoDcCurveId,
                                         '',
@@ -215,6 +283,12 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
 
 
 
+    def fftNoDcUpdateCurve(self) -> None:
+        if hasattr(self, 'fftNoDcPlotRef'):
+            self.fftNoDcPublish(self.fftNoDcGetData())
+
+
+
     def clickFFTnoDC(self) -> None:
 
         if self.ui.checkBoxFFTnoDC.isChecked():
@@ -223,9 +297,9 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
             self.fftNoDcPlotRef = self.plotRef+'fftnodc'
             xLabelText  = '1/'+self.selectedXLabel
             xLabelUnits = '1/'+self.selectedXUnits
-            yLabelText  = 'FFT NO DC'+'( '+self.selectedYLabel+' )'
+            yLabelText  = self.getTransformName('FFT NO DC')+'( '+self.selectedYLabel+' )'
             yLabelUnits = self.selectedYUnits+'/'+self.selectedXUnits
-            title       = self._windowTitle+' - '+'FFT NO DC'
+            title       = self._windowTitle+' - '+self.getTransformName('FFT NO DC')
 
             self.signal2MainWindowAddPlot.emit(1, # runId
                                                self.fftNoDcCurveId, # curveId
@@ -251,19 +325,26 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
 
 
 
-    def ifftGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+    @staticmethod
+    def ifft(x: np.ndarray,
+             y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
 
-        x = np.fft.fftfreq(len(self.selectedX), d=self.selectedX[1] - self.selectedX[0])
-        y = np.abs(np.fft.ifft(self.selectedY))[x>=0]
-        x = x[x>=0]
+        # For real data, |ifft(y)| is |fft(y)|/n
+        f, s = amplitudeSpectrum(x, y)
 
-        return x, y
+        return f, s/len(y)
 
 
 
-    def ifftUpdateCurve(self) -> None:
+    def ifftGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+
+        return self.ifft(self.selectedX, self.selectedY)
+
+
+
+    def ifftPublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'ifftPlotRef'):
-            x, y = self.ifftGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.ifftPlotRef,
                                         self.ifftCurveId,
                                         '',
@@ -273,6 +354,13 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
                                         False)
 
 
+
+    def ifftUpdateCurve(self) -> None:
+        if hasattr(self, 'ifftPlotRef'):
+            self.ifftPublish(self.ifftGetData())
+
+
+
     def clickIFFT(self) -> None:
 
         if self.ui.checkBoxIFFT.isChecked():
@@ -281,9 +369,9 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
             self.ifftPlotRef = self.plotRef+'ifft'
             xLabelText  = '1/'+self.selectedXLabel
             xLabelUnits = '1/'+self.selectedXUnits
-            yLabelText  = 'IFFT'+'( '+self.selectedYLabel+' )'
+            yLabelText  = self.getTransformName('IFFT')+'( '+self.selectedYLabel+' )'
             yLabelUnits = self.selectedYUnits+'/'+self.selectedXUnits
-            title       = self._windowTitle+' - '+'IFFT'
+            title       = self._windowTitle+' - '+self.getTransformName('IFFT')
 
             self.signal2MainWindowAddPlot.emit(1, # runId
                                                self.ifftCurveId, # curveId
@@ -307,3 +395,150 @@ class GroupBoxFFT(QtWidgets.QGroupBox):
         if hasattr(self, 'ifftPlotRef'):
             self.signalClose1dPlot.emit(self.ifftPlotRef)
 
+
+
+
+    def getPSDSettings(self) -> dict:
+        """
+        Return the settings of the power spectral density, read in the GUI
+        thread, see psd.
+        """
+
+        return {'curveId'       : self.selectedCurveId,
+                'segmentLength' : self.ui.spinBoxPSDSegmentLength.value(),
+                'overlap'       : self.ui.doubleSpinBoxPSDOverlap.value(),
+                'window'        : self.ui.comboBoxPSDWindow.currentText()}
+
+
+
+    def psd(self, x: np.ndarray,
+                  y: np.ndarray,
+                  curveId: str,
+                  segmentLength: int,
+                  overlap: float,
+                  window: str) -> Tuple[np.ndarray, np.ndarray, Optional[Welch]]:
+        """
+        Power spectral density of the data, see sources.spectrum.Welch.
+
+        Non uniformly sampled data are not averaged, their density is given by
+        the Lomb-Scargle periodogram.
+        During a live plot, the selection grows from the same first point, only
+        the segments of the new points are then computed, on a copy of the
+        accumulated spectrum so that the one of the GUI is never modified from
+        the interaction thread.
+        Live data preallocated with nan are used up to their last measured
+        point.
+
+        Return
+        ------
+        f : np.ndarray
+            Frequencies.
+        psd : np.ndarray
+            Power spectral density.
+        psdWelch : Optional[Welch]
+            Accumulated spectrum to continue with the next data, None if the
+            data are shorter than a segment or non uniform.
+        """
+
+        # Non uniform data can't be cut in segments of same duration
+        if not isUniform(x):
+            f, p = lombScargleDensity(x, y)
+            return f, p, None
+
+        if len(y)<segmentLength:
+            f, p = welch(x, y, segmentLength, overlap, window)
+            return f, p, None
+
+        samplingPeriod = getSamplingPeriod(x)
+        psdWelch = self.psdWelch
+        if (psdWelch is not None and
+            (psdWelch.segmentLength, psdWelch.overlap, psdWelch.windowName)==(segmentLength, overlap, window) and
+            psdWelch.isContinuedBy(x, y, curveId, samplingPeriod)):
+            psdWelch = copy.deepcopy(psdWelch)
+        else:
+            psdWelch = Welch(samplingPeriod,
+                             segmentLength,
+                             overlap,
+                             window,
+                             x[0],
+                             curveId)
+
+        y = y[psdWelch.nbPoint:]
+        measured = np.flatnonzero(~np.isnan(y))
+        psdWelch.update(y[:measured[-1]+1 if len(measured)>0 else 0])
+
+        return (*psdWelch.getData(), psdWelch)
+
+
+
+    def psdGetData(self) -> Tuple[np.ndarray, np.ndarray]:
+
+        f, p, self.psdWelch = self.psd(self.selectedX, self.selectedY, **self.getPSDSettings())
+
+        return f, p
+
+
+
+    def psdPublish(self, data: Tuple[np.ndarray, np.ndarray, Optional[Welch]]) -> None:
+        if hasattr(self, 'psdPlotRef'):
+            x, y, self.psdWelch = data
+            self.signalUpdateCurve.emit(self.psdPlotRef,
+                                        self.psdCurveId,
+                                        '',
+                                        x,
+                                        y,
+                                        False,
+                                        False)
+
+
+
+    def psdUpdateCurve(self) -> None:
+        if hasattr(self, 'psdPlotRef'):
+            self.psdPublish(self.psd(self.selectedX, self.selectedY, **self.getPSDSettings()))
+
+
+
+    def clickPSD(self) -> None:
+
+        if self.ui.checkBoxPSD.isChecked():
+
+            self.psdCurveId = self.selectedYLabel+'psd'
+            self.psdPlotRef = self.plotRef+'psd'
+            xLabelText  = '1/'+self.selectedXLabel
+            xLabelUnits = '1/'+self.selectedXUnits
+            yLabelText  = self.getTransformName('PSD')+'( '+self.selectedYLabel+' )'
+            yLabelUnits = self.selectedYUnits+'²/(1/'+self.selectedXUnits+')'
+            title       = self._windowTitle+' - '+self.getTransformName('PSD')
+
+            self.psdWelch = None
+            self.signal2MainWindowAddPlot.emit(1, # runId
+                                               self.psdCurveId, # curveId
+                                               title, # plotTitle
+                                               title, # windowTitle
+                                               self.psdPlotRef, # plotRef
+                                               self.databaseAbsPath, # databaseAbsPath
+                                               self.psdGetData(), # data
+                                               xLabelText, # xLabelText
+                                               xLabelUnits, # xLabelUnits
+                                               yLabelText, # yLabelText
+                                               yLabelUnits, # yLabelUnits
+                                               '', # zLabelText
+                                               '') # zLabelUnits
+        else:
+            self.psdClosePlot()
+
+
+
+    def psdSettingsChanged(self) -> None:
+        """
+        Compute again the power spectral density with the new settings.
+        """
+
+        self.psdWelch = None
+        self.psdUpdateCurve()
+
+
+
+    def psdClosePlot(self) -> None:
+        if hasattr(self, 'psdPlotRef'):
+            self.signalClose1dPlot.emit(self.psdPlotRef)
@@ -14,15 +14,17 @@ class Ui_QGroupBoxFFT(object):
     def setupUi(self, groupBoxFFT):
         groupBoxFFT.setObjectName("groupBoxFFT")
         groupBoxFFT.setEnabled(False)
-        groupBoxFFT.setGeometry(QtCore.QRect(80, 0, 225, 44))
-        groupBoxFFT.setMaximumSize(QtCore.QSize(225, 16777215))
+        groupBoxFFT.setGeometry(QtCore.QRect(80, 0, 275, 70))
+        groupBoxFFT.setMaximumSize(QtCore.QSize(275, 16777215))
         font = QtGui.QFont()
         font.setPointSize(10)
         font.setBold(True)
         font.setWeight(75)
         groupBoxFFT.setFont(font)
-        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(groupBoxFFT)
-        self.horizontalLayout_4.setContentsMargins(1, 5, 1, 1)
+        self.verticalLayoutFFT = QtWidgets.QVBoxLayout(groupBoxFFT)
+        self.verticalLayoutFFT.setContentsMargins(1, 5, 1, 1)
+        self.verticalLayoutFFT.setObjectName("verticalLayoutFFT")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_4.setObjectName("horizontalLayout_4")
         self.checkBoxFFT = QtWidgets.QCheckBox(groupBoxFFT)
         font = QtGui.QFont()
@@ -48,8 +50,59 @@ class Ui_QGroupBoxFFT(object):
         self.checkBoxIFFT.setFont(font)
         self.checkBoxIFFT.setObjectName("checkBoxIFFT")
         self.horizontalLayout_4.addWidget(self.checkBoxIFFT)
+        self.checkBoxPSD = QtWidgets.QCheckBox(groupBoxFFT)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.checkBoxPSD.setFont(font)
+        self.checkBoxPSD.setObjectName("checkBoxPSD")
+        self.horizontalLayout_4.addWidget(self.checkBoxPSD)
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_4.addItem(spacerItem)
+        self.verticalLayoutFFT.addLayout(self.horizontalLayout_4)
+        self.horizontalLayoutPSD = QtWidgets.QHBoxLayout()
+        self.horizontalLayoutPSD.setObjectName("horizontalLayoutPSD")
+        self.spinBoxPSDSegmentLength = QtWidgets.QSpinBox(groupBoxFFT)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.spinBoxPSDSegmentLength.setFont(font)
+        self.spinBoxPSDSegmentLength.setMinimum(4)
+        self.spinBoxPSDSegmentLength.setMaximum(16777216)
+        self.spinBoxPSDSegmentLength.setProperty("value", 1024)
+        self.spinBoxPSDSegmentLength.setObjectName("spinBoxPSDSegmentLength")
+        self.horizontalLayoutPSD.addWidget(self.spinBoxPSDSegmentLength)
+        self.doubleSpinBoxPSDOverlap = QtWidgets.QDoubleSpinBox(groupBoxFFT)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.doubleSpinBoxPSDOverlap.setFont(font)
+        self.doubleSpinBoxPSDOverlap.setDecimals(2)
+        self.doubleSpinBoxPSDOverlap.setMaximum(0.95)
+        self.doubleSpinBoxPSDOverlap.setSingleStep(0.05)
+        self.doubleSpinBoxPSDOverlap.setProperty("value", 0.5)
+        self.doubleSpinBoxPSDOverlap.setObjectName("doubleSpinBoxPSDOverlap")
+        self.horizontalLayoutPSD.addWidget(self.doubleSpinBoxPSDOverlap)
+        self.comboBoxPSDWindow = QtWidgets.QComboBox(groupBoxFFT)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.comboBoxPSDWindow.setFont(font)
+        self.comboBoxPSDWindow.setObjectName("comboBoxPSDWindow")
+        self.comboBoxPSDWindow.addItem("")
+        self.comboBoxPSDWindow.addItem("")
+        self.comboBoxPSDWindow.addItem("")
+        self.comboBoxPSDWindow.addItem("")
+        self.comboBoxPSDWindow.addItem("")
+        self.comboBoxPSDWindow.addItem("")
+        self.horizontalLayoutPSD.addWidget(self.comboBoxPSDWindow)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayoutPSD.addItem(spacerItem1)
+        self.verticalLayoutFFT.addLayout(self.horizontalLayoutPSD)
 
         self.retranslateUi(groupBoxFFT)
         QtCore.QMetaObject.connectSlotsByName(groupBoxFFT)
@@ -60,3 +113,17 @@ class Ui_QGroupBoxFFT(object):
         self.checkBoxFFT.setText(_translate("QGroupBoxFFT", "FFT"))
         self.checkBoxFFTnoDC.setText(_translate("QGroupBoxFFT", "FFT (no DC)"))
         self.checkBoxIFFT.setText(_translate("QGroupBoxFFT", "IFFT"))
+        self.checkBoxPSD.setToolTip(_translate("QGroupBoxFFT", "Power spectral density, averaged on overlapping segments (Welch method)"))
+        self.checkBoxPSD.setText(_translate("QGroupBoxFFT", "PSD"))
+        self.spinBoxPSDSegmentLength.setToolTip(_translate("QGroupBoxFFT", "Number of points of the segments averaged by the power spectral density"))
+        self.spinBoxPSDSegmentLength.setPrefix(_translate("QGroupBoxFFT", "segment "))
+        self.spinBoxPSDSegmentLength.setSuffix(_translate("QGroupBoxFFT", " pts"))
+        self.doubleSpinBoxPSDOverlap.setToolTip(_translate("QGroupBoxFFT", "Overlap between successive segments of the power spectral density"))
+        self.doubleSpinBoxPSDOverlap.setPrefix(_translate("QGroupBoxFFT", "overlap "))
+        self.comboBoxPSDWindow.setToolTip(_translate("QGroupBoxFFT", "Window applied to the segments of the power spectral density"))
+        self.comboBoxPSDWindow.setItemText(0, _translate("QGroupBoxFFT", "hann"))
+        self.comboBoxPSDWindow.setItemText(1, _translate("QGroupBoxFFT", "hamming"))
+        self.comboBoxPSDWindow.setItemText(2, _translate("QGroupBoxFFT", "blackman"))
+        self.comboBoxPSDWindow.setItemText(3, _translate("QGroupBoxFFT", "blackmanharris"))
+        self.comboBoxPSDWindow.setItemText(4, _translate("QGroupBoxFFT", "flattop"))
+        self.comboBoxPSDWindow.setItemText(5, _translate("QGroupBoxFFT", "boxcar"))
@@ -1,6 +1,7 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
 import numpy as np
 import inspect
+from typing import Tuple, Dict, Callable
 
 from ....sources.pyqtgraph import pg
 from . import dialogFiltering
@@ -13,6 +14,9 @@ class GroupBoxFiltering(QtWidgets.QGroupBox):
     signalUpdatePlotDataItem = QtCore.pyqtSignal(np.ndarray, np.ndarray, str, str, bool, bool)
     signalRemovePlotDataItem = QtCore.pyqtSignal(str, str)
 
+    # Propagated to the main window status bar
+    signalSendStatusBarMessage = QtCore.pyqtSignal(str, str)
+
     dialogRef: dict
 
     def __init__(self, parent: QtWidgets.QGroupBox,
@@ -35,8 +39,8 @@ class GroupBoxFiltering(QtWidgets.QGroupBox):
         self.verticalLayoutFilteringModel = QtWidgets.QVBoxLayout(self)
         self.comboBoxFiltering = QtWidgets.QComboBox(self)
 
-        # Get list of fit model
-        listClasses = [m[0] for m in inspect.getmembers(dialogFiltering, inspect.isclass) if 'runFiltering' in [*m[1].__dict__.keys()]]
+        # Get list of filters
+        listClasses = [m[0] for m in inspect.getmembers(dialogFiltering, inspect.isclass) if 'comboBoxLabel' in [*m[1].__dict__.keys()]]
 
         self.comboBoxFiltering.addItem('None')
         for i, j in enumerate(listClasses):
@@ -98,8 +102,38 @@ class GroupBoxFiltering(QtWidgets.QGroupBox):
                                             legend, # curveLegend
                                             True, # showInLegend
                                             False) # hidden
-        except:
-            pass
+        except Exception as e:
+            self.signalSendStatusBarMessage.emit('Filtering failed: {}'.format(e), 'red')
+
+
+
+    def getInteractionTasks(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """
+        Return the analyses of the opened interaction plots, see
+        WidgetPlot1d.interactionUpdateAll.
+        Structure
+        {name : (compute, publish)}, compute(x, y) being run in a thread and
+        publish(result) in the GUI thread.
+        """
+
+        tasks = {}
+        if hasattr(self, 'curveIdFiltering'):
+            tasks['filtering'] = (self.dialog.runFiltering, self.filteringPublish)
+
+        return tasks
+
+
+
+    def filteringPublish(self, data: Tuple[np.ndarray, np.ndarray, str]) -> None:
+
+        if hasattr(self, 'curveIdFiltering'):
+            x, y, legend = data
+            self.signalUpdatePlotDataItem.emit(x, # x
+                                               y, # y
+                                               self.curveIdFiltering, # curveId
+                                               legend, # curveLegend
+                                               False, # autoRange
+                                               False) # interactionUpdateAll
 
 
 
@@ -108,15 +142,9 @@ class GroupBoxFiltering(QtWidgets.QGroupBox):
         if hasattr(self, 'curveIdFiltering'):
             # We catch possible error occuring during the filtering procedure
             try:
-                x, y, legend =  self.dialog.runFiltering()
-                self.signalUpdatePlotDataItem.emit(x, # x
-                                                   y, # y
-                                                   self.curveIdFiltering, # curveId
-                                                   legend, # curveLegend
-                                                   False, # autoRange
-                                                   False) # interactionUpdateAll
-            except:
-                pass
+                self.filteringPublish(self.dialog.runFiltering())
+            except Exception as e:
+                self.signalSendStatusBarMessage.emit('Filtering failed: {}'.format(e), 'red')
 
 
 
@@ -149,11 +177,6 @@ class GroupBoxFiltering(QtWidgets.QGroupBox):
 
 
 
-    @QtCore.pyqtSlot()
-    def slotFilteringUpdate(self):
-        self.filteringUpdate()
-
-
     @QtCore.pyqtSlot()
     def slotFilteringClose(self):
         self.filteringClose()
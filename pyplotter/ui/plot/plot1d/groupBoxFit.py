@@ -1,8 +1,13 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
 import numpy as np
 import inspect
+import lmfit
+from collections import OrderedDict
+from typing import Optional
 
 from ....sources.pyqtgraph import pg
+from ....sources.config import loadConfigCurrent
+from ....sources.workers.fit import Fit1dThread
 from . import dialogFit
 
 
@@ -12,6 +17,7 @@ class GroupBoxFit(QtWidgets.QGroupBox):
     signalAddPlotDataItem    = QtCore.pyqtSignal(np.ndarray, np.ndarray, str, str, str, str, str, str, bool, bool)
     signalUpdatePlotDataItem = QtCore.pyqtSignal(np.ndarray, np.ndarray, str, str, bool, bool)
     signalRemovePlotDataItem = QtCore.pyqtSignal(str, str)
+    signalSendStatusBarMessage = QtCore.pyqtSignal(str, str)
 
     dialogRef: dict
 
@@ -21,9 +27,28 @@ class GroupBoxFit(QtWidgets.QGroupBox):
 
         QtWidgets.QGroupBox.__init__(self, parent)
 
+        self.config = loadConfigCurrent()
+
         self.plotItem = plotItem
         self.plotRef = plotRef
 
+        # Fits are done in a thread, while a fit is running the last request
+        # is kept and launched once the fit is done
+        self.threadpool = QtCore.QThreadPool()
+        self.fitRunning = False
+        self.fitPending = False
+
+        # Fit results already obtained
+        # Structure
+        # self.fitCache = {key : (x, yFit, params, report)}
+        # see getFitKey
+        self.fitCache: OrderedDict = OrderedDict()
+
+        # Last converged fit, used as starting point of the next one
+        # Structure
+        # self.fitLast = {'key' : tuple, 'params' : lmfit.Parameters}
+        self.fitLast: dict = {}
+
         # Build GUI
         self.setEnabled(False)
         font = QtGui.QFont()
@@ -74,6 +99,8 @@ class GroupBoxFit(QtWidgets.QGroupBox):
             return
 
         # Find which model has been chosed and instance it
+        # A result of the previous model still running is discarded
+        self.fitPending = False
         _class = getattr(dialogFit, self.comboBoxFit.currentData())
         self.dialog = _class(parent=self,
                         xData=self.selectedX,
@@ -86,10 +113,161 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         self.dialogRef = {'dialog' : self.dialog,
                           'comboBox': self.comboBoxFit}
         self.curveIdFit = self.plotRef+'fit'
-        # We catch possible error occuring during the fiting procedure
-        try:
-            x, y, params =  self.dialog.ffit()
-            # Plot fit curve
+        self.curveFitPlotted = False
+
+        self.fitRequest()
+
+
+
+    def fitUpdate(self) -> None:
+
+        if hasattr(self, 'curveIdFit'):
+            self.fitRequest()
+
+
+
+    def getFitKey(self) -> tuple:
+        """
+        Return the key identifying the fit of the current selection by the
+        current model.
+        The data version of the curve is part of the key so that a curve
+        updated during a live plot is fitted again, see
+        WidgetPlot1d.updatePlotDataItem.
+        """
+
+        return (self.selectedCurveId,
+                self.comboBoxFit.currentData(),
+                self.dialog.getMethod(),
+                self.selectedX[0],
+                self.selectedX[-1],
+                len(self.selectedX),
+                self.selectedDataVersion)
+
+
+
+    def getWarmStartParams(self, key: tuple) -> Optional[lmfit.Parameters]:
+        """
+        Return the parameters of the last converged fit if it was done with the
+        same model on the same curve and on a selection overlapping enough the
+        current one, None otherwise.
+        """
+
+        if not self.fitLast or self.fitLast['key'][:3]!=key[:3]:
+            return None
+
+        lastMin, lastMax = sorted(self.fitLast['key'][3:5])
+        newMin, newMax = sorted(key[3:5])
+        union = max(lastMax, newMax)-min(lastMin, newMin)
+        overlap = min(lastMax, newMax)-max(lastMin, newMin)
+
+        if union>0 and overlap/union>=self.config['fitWarmStartMinOverlap']:
+            return self.fitLast['params']
+
+        return None
+
+
+
+    def fitRequest(self) -> None:
+        """
+        Fit the current selection with the current model.
+        Known results are displayed immediately, otherwise the fit is done in a
+        thread.
+        If a fit is already running, the request is postponed until it is
+        done, only the last request being kept.
+        """
+
+        # Models with their own, fast, fit procedure are fitted directly
+        if 'ffit' in type(self.dialog).__dict__:
+            # We catch possible error occuring during the fiting procedure
+            try:
+                x, y, params = self.dialog.ffit()
+                self.showFitResult(x, y, params)
+            except Exception as e:
+                self.signalSendStatusBarMessage.emit('Fit failed: {}'.format(e), 'red')
+                self.dialog.fitError()
+            return
+
+        if self.fitRunning:
+            self.fitPending = True
+            return
+
+        key = self.getFitKey()
+        if key in self.fitCache:
+            self.fitCache.move_to_end(key)
+            x, y, params, report = self.fitCache[key]
+            self.dialog.displayFitResult(report)
+            self.showFitResult(x, y, params)
+            return
+
+        self.fitRunning = True
+        worker = Fit1dThread(key,
+                             getattr(dialogFit, self.comboBoxFit.currentData()),
+                             self.selectedX,
+                             self.selectedY,
+                             self.dialog.getMethod(),
+                             self.getWarmStartParams(key))
+        worker.signal.fit1dDone.connect(self.fitDone)
+        worker.signal.fitError.connect(self.fitFailed)
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(tuple, np.ndarray, np.ndarray, lmfit.Parameters, str)
+    def fitDone(self, key: tuple,
+                      x: np.ndarray,
+                      y: np.ndarray,
+                      params: lmfit.Parameters,
+                      report: str) -> None:
+        """
+        Called when a fit done in a thread succeeded.
+        """
+
+        self.fitRunning = False
+
+        self.fitCache[key] = (x, y, params, report)
+        if len(self.fitCache)>self.config['fitCacheSize']:
+            self.fitCache.popitem(last=False)
+        self.fitLast = {'key' : key,
+                        'params' : params}
+
+        # The fit may have been closed, or another requested, in the meantime
+        if hasattr(self, 'curveIdFit'):
+            if self.fitPending:
+                self.fitPending = False
+                self.fitRequest()
+            else:
+                self.dialog.displayFitResult(report)
+                self.showFitResult(x, y, params)
+
+
+
+    @QtCore.pyqtSlot(str)
+    def fitFailed(self, error: str) -> None:
+        """
+        Called when a fit done in a thread failed.
+        """
+
+        self.fitRunning = False
+
+        if hasattr(self, 'curveIdFit'):
+            if self.fitPending:
+                self.fitPending = False
+                self.fitRequest()
+            else:
+                self.signalSendStatusBarMessage.emit('Fit failed: {}'.format(error), 'red')
+                self.dialog.fitError()
+
+
+
+    def showFitResult(self, x: np.ndarray,
+                            y: np.ndarray,
+                            params: lmfit.Parameters) -> None:
+        """
+        Plot the fit curve, or update it if already plotted.
+        """
+
+        if not self.curveFitPlotted:
+            self.curveFitPlotted = True
             self.signalAddPlotDataItem.emit(x, # x
                                             y, # y
                                             self.curveIdFit, # curveId
@@ -100,26 +278,13 @@ class GroupBoxFit(QtWidgets.QGroupBox):
                                             self.dialog.displayedLegend(params), # curveLegend
                                             True, # showInLegend
                                             False) # hidden
-        except Exception as e:
-            print(e)
-            self.dialog.fitError()
-
-
-
-    def fitUpdate(self) -> None:
-
-        if hasattr(self, 'curveIdFit'):
-            # We catch possible error occuring during the fiting procedure
-            try:
-                x, y, params =  self.dialog.ffit()
-                self.signalUpdatePlotDataItem.emit(x, # x
-                                                   y, # y
-                                                   self.curveIdFit, # curveId
-                                                   self.dialog.displayedLegend(params), # curveLegend
-                                                   False, # autoRange
-                                                   False) # interactionUpdateAll
-            except:
-                self.dialog.fitError()
+        else:
+            self.signalUpdatePlotDataItem.emit(x, # x
+                                               y, # y
+                                               self.curveIdFit, # curveId
+                                               self.dialog.displayedLegend(params), # curveLegend
+                                               False, # autoRange
+                                               False) # interactionUpdateAll
 
 
 
@@ -131,6 +296,14 @@ class GroupBoxFit(QtWidgets.QGroupBox):
 
 
 
+    @QtCore.pyqtSlot(str, int)
+    def slotGetSelectedCurve(self, curveId: str,
+                                   dataVersion: int) -> None:
+        self.selectedCurveId = curveId
+        self.selectedDataVersion = dataVersion
+
+
+
     @QtCore.pyqtSlot(np.ndarray, str, str, np.ndarray, str, str)
     def slotGetSelectedData(self, selectedX,
                                   selectedXLabel,
@@ -179,8 +352,9 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         # We remove the curve
         if hasattr(self, 'curveIdFit'):
 
-            self.signalRemovePlotDataItem.emit(self.plotRef,
-                                               self.curveIdFit)
+            if self.curveFitPlotted:
+                self.signalRemovePlotDataItem.emit(self.plotRef,
+                                                   self.curveIdFit)
 
             # Delete the reference
             del(self.curveIdFit)
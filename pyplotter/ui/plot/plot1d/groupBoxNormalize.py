@@ -1,6 +1,6 @@
 from PyQt5 import QtCore, QtWidgets
 import numpy as np
-from typing import Tuple
+from typing import Tuple, Dict, Callable
 
 from .groupBoxNormalizeUi import Ui_GroupBoxNormalize
 from ....sources.pyqtgraph import pg
@@ -109,18 +109,6 @@ class GroupBoxNormalize(QtWidgets.QGroupBox):
 
 
 
-    @QtCore.pyqtSlot()
-    def slotUnwrapUpdate(self):
-        self.unwrapUpdateCurve()
-
-
-
-    @QtCore.pyqtSlot()
-    def slotRemoveSlopeUpdate(self):
-        self.removeSlopeUpdateCurve()
-
-
-
     ####################################
     #
     #           Slot to close plot
@@ -148,15 +136,42 @@ class GroupBoxNormalize(QtWidgets.QGroupBox):
 
 
 
+    def getInteractionTasks(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """
+        Return the analyses of the opened interaction plots, see
+        WidgetPlot1d.interactionUpdateAll.
+        Structure
+        {name : (compute, publish)}, compute(x, y) being run in a thread and
+        publish(result) in the GUI thread.
+        """
+
+        tasks = {}
+        if hasattr(self, 'unwrapPlotRef'):
+            tasks['unwrap'] = (self.unwrap, self.unwrapPublish)
+        if hasattr(self, 'removeSlopePlotRef'):
+            tasks['removeSlope'] = (self.removeSlope, self.removeSlopePublish)
+
+        return tasks
+
+
+
+    @staticmethod
+    def unwrap(x: np.ndarray,
+               y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return x, np.unwrap(y)
+
+
+
     def unwrapGetData(self) -> Tuple[np.ndarray, np.ndarray]:
 
-        return self.selectedX, np.unwrap(self.selectedY)
+        return self.unwrap(self.selectedX, self.selectedY)
 
 
 
-    def unwrapUpdateCurve(self) -> None:
+    def unwrapPublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'unwrapPlotRef'):
-            x, y = self.unwrapGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.unwrapPlotRef,
                                         self.unwrapCurveId,
                                         '',
@@ -167,6 +182,12 @@ class GroupBoxNormalize(QtWidgets.QGroupBox):
 
 
 
+    def unwrapUpdateCurve(self) -> None:
+        if hasattr(self, 'unwrapPlotRef'):
+            self.unwrapPublish(self.unwrapGetData())
+
+
+
     def clickUnwrap(self) -> None:
 
         # If user wants to plot the unwrap, we add a new plotWindow
@@ -202,16 +223,23 @@ class GroupBoxNormalize(QtWidgets.QGroupBox):
 
 
 
+    @staticmethod
+    def removeSlope(x: np.ndarray,
+                    y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        return x, y-np.polyfit(x, y, 1)[0]*x
+
+
+
     def removeSlopeGetData(self) -> Tuple[np.ndarray, np.ndarray]:
 
-        return (self.selectedX,
-                self.selectedY-np.polyfit(self.selectedX, self.selectedY, 1)[0]*self.selectedX)
+        return self.removeSlope(self.selectedX, self.selectedY)
 
 
 
-    def removeSlopeUpdateCurve(self) -> None:
+    def removeSlopePublish(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
         if hasattr(self, 'removeSlopePlotRef'):
-            x, y = self.removeSlopeGetData()
+            x, y = data
             self.signalUpdateCurve.emit(self.removeSlopePlotRef,
                                         self.removeSlopeCurveId,
                                         '',
@@ -222,6 +250,12 @@ class GroupBoxNormalize(QtWidgets.QGroupBox):
 
 
 
+    def removeSlopeUpdateCurve(self) -> None:
+        if hasattr(self, 'removeSlopePlotRef'):
+            self.removeSlopePublish(self.removeSlopeGetData())
+
+
+
     def clickRemoveSlope(self) -> None:
 
         # If user wants to plot the unslop, we add a new plotWindow
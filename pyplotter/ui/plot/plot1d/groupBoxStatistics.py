@@ -1,10 +1,13 @@
 from PyQt5 import QtCore, QtWidgets
 import numpy as np
-from typing import Tuple
+import copy
+from functools import partial
+from typing import Tuple, Dict, Callable, Optional
 
 from .groupBoxStatisticsUi import Ui_groupBoxStatistics
 from ....sources.functions import parse_number
 from ....sources.pyqtgraph import pg
+from ....sources.statistics import Statistics
 
 class GroupBoxStatistics(QtWidgets.QGroupBox):
 
@@ -33,6 +36,8 @@ class GroupBoxStatistics(QtWidgets.QGroupBox):
         self.plotRef = plotRef
         self._windowTitle = windowTitle
 
+        # Statistics accumulated during a live plot, see statistics
+        self.statisticsAccumulator: Optional[Statistics] = None
         self.ui.checkBoxStatistics.clicked.connect(self.clickStatistics)
         self.ui.spinBoxStatistics.valueChanged.connect(self.statisticsUpdateCurve)
 
@@ -52,6 +57,7 @@ class GroupBoxStatistics(QtWidgets.QGroupBox):
         self.ui.statisticsLabel.setMaximumHeight(0)
         del(self.statisticsPlotRef)
         del(self.statisticsCurveId)
+        self.statisticsAccumulator = None
 
 
 
@@ -70,11 +76,6 @@ class GroupBoxStatistics(QtWidgets.QGroupBox):
         self.selectedYUnits = selectedYUnits
 
 
-    @QtCore.pyqtSlot()
-    def slotUpdate(self):
-        self.statisticsUpdateCurve()
-
-
     @QtCore.pyqtSlot()
     def slotClosePlot(self):
         self.statisticsClosePlot()
@@ -89,19 +90,68 @@ class GroupBoxStatistics(QtWidgets.QGroupBox):
 
 
 
+    def getInteractionTasks(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """
+        Return the analyses of the opened interaction plots, see
+        WidgetPlot1d.interactionUpdateAll.
+        Structure
+        {name : (compute, publish)}, compute(x, y) being run in a thread and
+        publish(result) in the GUI thread.
+        """
+
+        tasks = {}
+        if hasattr(self, 'statisticsPlotRef'):
+            tasks['statistics'] = (partial(self.statistics, bins=self.ui.spinBoxStatistics.value()),
+                                   self.statisticsPublish)
+
+        return tasks
+
+
+
+    def statistics(self, x: np.ndarray,
+                         y: np.ndarray,
+                         bins: int) -> Tuple[np.ndarray, np.ndarray, Tuple[float, float, float], Statistics]:
+        """
+        Return the histogram of y and its mean, standard deviation and median,
+        see sources.statistics.Statistics.
+        The histogram, mean and standard deviation are obtained in a single
+        pass, the exact median in a second one.
+
+        During a live plot, the selection grows from the same first point, only
+        the new points are then added, on a copy of the accumulated statistics
+        so that the one of the GUI is never modified from the interaction
+        thread.
+        """
+
+        if self.statisticsAccumulator is not None and self.statisticsAccumulator.isContinuedBy(x, y):
+            accumulator = copy.deepcopy(self.statisticsAccumulator)
+        else:
+            accumulator = Statistics(xStart=x[0] if len(x)>0 else None)
+
+        accumulator.update(y[accumulator.nbPoint:])
+        center, count = accumulator.getHistogram(bins)
+
+        return (center,
+                count,
+                (accumulator.mean, accumulator.getStd(), accumulator.getMedian(y)),
+                accumulator)
+
+
+
     def statisticsGetData(self) -> Tuple[np.ndarray, np.ndarray]:
 
-        y, binEdges   = np.histogram(self.selectedY, bins=self.ui.spinBoxStatistics.value())
-        x = np.mean(np.vstack([binEdges[0:-1],binEdges[1:]]), axis=0)
+        x, y, _, self.statisticsAccumulator = self.statistics(self.selectedX,
+                                                              self.selectedY,
+                                                              self.ui.spinBoxStatistics.value())
 
         return x, y
 
 
 
-    def statisticsUpdateCurve(self) -> None:
+    def statisticsPublish(self, data: Tuple[np.ndarray, np.ndarray, Tuple[float, float, float], Statistics]) -> None:
         if hasattr(self, 'statisticsPlotRef'):
-            x, y = self.statisticsGetData()
-            self.statisticsUpdateLabel()
+            x, y, statistics, self.statisticsAccumulator = data
+            self.statisticsUpdateLabel(statistics)
 
             self.signalUpdateCurve.emit(self.statisticsPlotRef,
                                         self.statisticsCurveId,
@@ -112,12 +162,22 @@ class GroupBoxStatistics(QtWidgets.QGroupBox):
                                         False)
 
 
-    def statisticsUpdateLabel(self) -> None:
+
+    def statisticsUpdateCurve(self) -> None:
+        if hasattr(self, 'statisticsPlotRef'):
+            self.statisticsPublish(self.statistics(self.selectedX,
+                                                   self.selectedY,
+                                                   self.ui.spinBoxStatistics.value()))
+
+
+    def statisticsUpdateLabel(self, statistics: Optional[Tuple[float, float, float]]=None) -> None:
         if hasattr(self, 'statisticsPlotRef'):
 
-            mean   = np.nanmean(self.selectedY)
-            std    = np.nanstd(self.selectedY)
-            median = np.nanmedian(self.selectedY)
+            if statistics is None:
+                _, _, statistics, self.statisticsAccumulator = self.statistics(self.selectedX,
+                                                                               self.selectedY,
+                                                                               self.ui.spinBoxStatistics.value())
+            mean, std, median = statistics
             xLabelUnits = self.selectedYLabel
 
             # We add some statistics info on the GUI
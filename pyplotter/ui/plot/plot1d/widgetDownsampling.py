@@ -15,6 +15,9 @@ class WidgetDownsampling(QtWidgets.QWidget):
         When the user change the downsampling value, a signal is sent to the
         widgetplot1d which will use the pyqtgraph downsampling method of all
         plotDataItem.
+        The default value, 0, displayed as "auto", downsamples the curves
+        according to the plot width by keeping the first, last, min and max
+        points of each pixel, see sources.downsampling.
 
         Args:
             parent: Parent of the widget.
@@ -24,7 +27,8 @@ class WidgetDownsampling(QtWidgets.QWidget):
         super(WidgetDownsampling, self).__init__(parent)
 
         self.setToolTip("Sets the downsampling value of all displayed curves.\n"
-                        "Downsampling reduces the number of points drawn and increase performance.")
+                        "Downsampling reduces the number of points drawn and increase performance.\n"
+                        "auto: keep the first, last, min and max points of each pixel.")
 
         font = QtGui.QFont()
         font.setPointSize(8)
@@ -40,9 +44,10 @@ class WidgetDownsampling(QtWidgets.QWidget):
 
         self.sbox = QtWidgets.QSpinBox(self)
         self.sbox.setFont(font)
-        self.sbox.setValue(1)
-        self.sbox.setMinimum(1)
+        self.sbox.setMinimum(0)
         self.sbox.setMaximum(1000000)
+        self.sbox.setSpecialValueText('auto')
+        self.sbox.setValue(0)
         self.sbox.valueChanged.connect(self.sboxValueChanged)
 
         spacerItem = QtWidgets.QSpacerItem(1, 1, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 from PyQt5 import QtWidgets, QtCore, QtGui
 import numpy as np
-from typing import Union, Optional, Tuple, Dict
+from typing import Union, Optional, Tuple, Dict, Callable
 
 from .widgetPlot1dui import Ui_Dialog
 from ....sources.config import loadConfigCurrent
 from ....sources.functions import getCurveColorIndex
+from ....sources.curveStorage import storeCurve
+from ....sources.curveStore import curveStore
+from ....sources.axisIndex import getAxisIndex
+from ....sources.workers.interactionUpdate import InteractionUpdateThread
 from ....sources.pyqtgraph import pg
 from ..widgetPlotContainer import WidgetPlotContainer
 
@@ -37,52 +41,51 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
     # To send selected data to interaction group boxes
     signalSendSelectedData = QtCore.pyqtSignal(np.ndarray, str, str, np.ndarray, str, str)
+    # curveId, data version of the selected curve, see updatePlotDataItem
+    signalSendSelectedCurve = QtCore.pyqtSignal(str, int)
+
+    # Propagated to the main window status bar
+    signalSendStatusBarMessage = QtCore.pyqtSignal(str, str)
 
     # Fit interaction
     signalFitUpdate = QtCore.pyqtSignal()
     signalFitClose  = QtCore.pyqtSignal()
 
     # Filtering interaction
-    signalFilteringUpdate  = QtCore.pyqtSignal()
     signalFilteringClose = QtCore.pyqtSignal()
 
     # Statistics interaction
     signalCheckBoxStatisticsSetChecked = QtCore.pyqtSignal(bool)
     signalStatisticsClosePlot = QtCore.pyqtSignal()
-    signalStatisticsUpdate = QtCore.pyqtSignal()
 
 
     # FFT interaction
     signalCheckBoxFFTSetChecked = QtCore.pyqtSignal(bool)
-    signalFFTUpdate = QtCore.pyqtSignal()
     signalFFTClosePlot = QtCore.pyqtSignal()
 
     signalCheckBoxFFTnoDCSetChecked = QtCore.pyqtSignal(bool)
-    signalFFTNoDcUpdate = QtCore.pyqtSignal()
     signalFFTNoDcClosePlot = QtCore.pyqtSignal()
 
     signalCheckBoxIFFTSetChecked = QtCore.pyqtSignal(bool)
-    signalIFFTUpdate = QtCore.pyqtSignal()
     signalIFFTClosePlot = QtCore.pyqtSignal()
 
+    signalCheckBoxPSDSetChecked = QtCore.pyqtSignal(bool)
+    signalPSDClosePlot = QtCore.pyqtSignal()
+
 
     # Calculus interaction
     signalCheckBoxDifferentiateSetChecked = QtCore.pyqtSignal(bool)
-    signalDifferentiateUpdate = QtCore.pyqtSignal()
     signalDifferentiateClosePlot = QtCore.pyqtSignal()
 
     signalCheckBoxIntegrateSetChecked = QtCore.pyqtSignal(bool)
-    signalIntegrateUpdate = QtCore.pyqtSignal()
     signalIntegrateClosePlot = QtCore.pyqtSignal()
 
 
     # Normalization interaction
     signalCheckBoxUnwrapSetChecked = QtCore.pyqtSignal(bool)
-    signalUnwrapUpdate = QtCore.pyqtSignal()
     signalUnwrapClosePlot = QtCore.pyqtSignal()
 
     signalCheckBoxRemoveSlopeSetChecked = QtCore.pyqtSignal(bool)
-    signalRemoveSlopeUpdate = QtCore.pyqtSignal()
     signalRemoveSlopeClosePlot = QtCore.pyqtSignal()
 
 
@@ -104,7 +107,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
                        dialogX         : Optional[int]=None,
                        dialogY         : Optional[int]=None,
                        dialogWidth     : Optional[int]=None,
-                       dialogHeight    : Optional[int]=None) -> None:
+                       dialogHeight    : Optional[int]=None,
+                       yErr            : Optional[np.ndarray]=None) -> None:
         """
         Class handling the plot of 1d data.
         Allow some quick data treatment.
@@ -151,6 +155,9 @@ class WidgetPlot1d(QtWidgets.QDialog):
         dateTimeAxis : bool, optional
             If yes, the x axis becomes a pyqtgraph DateAxisItem.
             See pyqtgraph doc about DateAxisItem
+        yErr : Optional[np.ndarray], optional
+            Uncertainty along the y axis, displayed as error bars, by default
+            None.
         """
 
         # Set parent to None to have "free" qdialog
@@ -189,6 +196,29 @@ class WidgetPlot1d(QtWidgets.QDialog):
         # Keep track of the sub-interaction plots launched fron that plot
         self.dialogInteraction: Dict[str, dict] = {}
 
+        # Interaction plots are updated in a thread, at most once every
+        # config['plot1dInteractionDelay'] ms, with the latest selection
+        # See interactionUpdateAll
+        self.threadpool = QtCore.QThreadPool()
+        self.interactionRunning = False
+        self.interactionPending = False
+        # Structure
+        # self.interactionPublish = {name : publish}, see getInteractionTasks
+        # of the groupBoxes
+        self.interactionPublish: Dict[str, Callable] = {}
+        self.interactionTimer = QtCore.QTimer(self)
+        self.interactionTimer.setSingleShot(True)
+        self.interactionTimer.setInterval(self.config['plot1dInteractionDelay'])
+        self.interactionTimer.timeout.connect(self.interactionRun)
+
+        # Curves updated live are kept in memory and stored on disk once not
+        # updated for config['plot1dMemmapDelay'] s, see storeUpdatedCurves
+        self.curvesToStore: set = set()
+        self.storeTimer = QtCore.QTimer(self)
+        self.storeTimer.setSingleShot(True)
+        self.storeTimer.setInterval(self.config['plot1dMemmapDelay']*1000)
+        self.storeTimer.timeout.connect(self.storeUpdatedCurves)
+
         # References of the infinietLines used to select data for the fit.
         # Structured
         # self.sliceItems = {'a' : pg.InfiniteLine,
@@ -288,7 +318,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
                              curveXUnits        = xLabelUnits,
                              curveYLabel        = yLabelText,
                              curveYUnits        = yLabelUnits,
-                             curveLegend        = curveLegend)
+                             curveLegend        = curveLegend,
+                             yErr               = yErr)
 
         self.resize(*self.config['dialogWindowSize'])
         self.show()
@@ -344,19 +375,18 @@ class WidgetPlot1d(QtWidgets.QDialog):
                                        self.plotRef,
                                        self._windowTitle)
 
+        self.signalSendSelectedCurve.connect(self.groupBoxFFT.slotGetSelectedCurve)
         self.signalSendSelectedData.connect(self.groupBoxFFT.slotGetSelectedData)
 
         self.signalCheckBoxFFTSetChecked.connect(self.groupBoxFFT.slotCheckBoxFFTSetChecked)
         self.signalCheckBoxFFTnoDCSetChecked.connect(self.groupBoxFFT.slotCheckBoxFFTnoDCSetChecked)
         self.signalCheckBoxIFFTSetChecked.connect(self.groupBoxFFT.slotCheckBoxIFFTSetChecked)
-
-        self.signalFFTUpdate.connect(self.groupBoxFFT.slotFFTUpdate)
-        self.signalFFTNoDcUpdate.connect(self.groupBoxFFT.slotFFTNoDcUpdate)
-        self.signalIFFTUpdate.connect(self.groupBoxFFT.slotIFFTUpdate)
+        self.signalCheckBoxPSDSetChecked.connect(self.groupBoxFFT.slotCheckBoxPSDSetChecked)
 
         self.signalFFTClosePlot.connect(self.groupBoxFFT.slotFFTClosePlot)
         self.signalFFTNoDcClosePlot.connect(self.groupBoxFFT.slotFFTNoDcClosePlot)
         self.signalIFFTClosePlot.connect(self.groupBoxFFT.slotIFFTClosePlot)
+        self.signalPSDClosePlot.connect(self.groupBoxFFT.slotPSDClosePlot)
 
         self.groupBoxFFT.signalUpdateCurve.connect(self.signalUpdateCurve)
         self.groupBoxFFT.signal2MainWindowAddPlot.connect(self.signal2MainWindowAddPlot)
@@ -375,7 +405,6 @@ class WidgetPlot1d(QtWidgets.QDialog):
                                                      self._windowTitle)
         self.signalSendSelectedData.connect(self.groupBoxStatistics.slotGetSelectedData)
         self.signalCheckBoxStatisticsSetChecked.connect(self.groupBoxStatistics.slotCheckBoxStatisticsSetChecked)
-        self.signalStatisticsUpdate.connect(self.groupBoxStatistics.slotUpdate)
         self.signalStatisticsClosePlot.connect(self.groupBoxStatistics.slotClosePlot)
 
         self.groupBoxStatistics.signalUpdateCurve.connect(self.signalUpdateCurve)
@@ -399,9 +428,7 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
         self.signalCheckBoxDifferentiateSetChecked.connect(self.groupBoxCalculus.slotCheckBoxDifferentiateSetChecked)
         self.signalCheckBoxIntegrateSetChecked.connect(self.groupBoxCalculus.slotCheckBoxIntegrateSetChecked)
-        self.signalDifferentiateUpdate.connect(self.groupBoxCalculus.slotDifferentiateUpdate)
         self.signalDifferentiateClosePlot.connect(self.groupBoxCalculus.slotDifferentiateClosePlot)
-        self.signalIntegrateUpdate.connect(self.groupBoxCalculus.slotIntegrateUpdate)
         self.signalIntegrateClosePlot.connect(self.groupBoxCalculus.slotIntegrateClosePlot)
 
         self.groupBoxCalculus.signalUpdateCurve.connect(self.signalUpdateCurve)
@@ -424,11 +451,9 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.signalSendSelectedData.connect(self.groupBoxNormalize.slotGetSelectedData)
 
         self.signalCheckBoxUnwrapSetChecked.connect(self.groupBoxNormalize.slotCheckBoxUnwrapSetChecked)
-        self.signalUnwrapUpdate.connect(self.groupBoxNormalize.slotUnwrapUpdate)
         self.signalUnwrapClosePlot.connect(self.groupBoxNormalize.slotUnwrapClosePlot)
 
         self.signalCheckBoxRemoveSlopeSetChecked.connect(self.groupBoxNormalize.slotCheckBoxRemoveSlopeSetChecked)
-        self.signalRemoveSlopeUpdate.connect(self.groupBoxNormalize.slotRemoveSlopeUpdate)
         self.signalRemoveSlopeClosePlot.connect(self.groupBoxNormalize.slotRemoveSlopeClosePlot)
 
         self.groupBoxNormalize.signalUpdateCurve.connect(self.signalUpdateCurve)
@@ -454,8 +479,10 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.groupBoxFit.signalAddPlotDataItem.connect(self.slotAddPlotDataItem)
         self.groupBoxFit.signalUpdatePlotDataItem.connect(self.slotUpdatePlotDataItem)
         self.groupBoxFit.signalRemovePlotDataItem.connect(self.slotRemoveCurve)
+        self.groupBoxFit.signalSendStatusBarMessage.connect(self.signalSendStatusBarMessage)
 
         # Events from the plot1d to the groupBox
+        self.signalSendSelectedCurve.connect(self.groupBoxFit.slotGetSelectedCurve)
         self.signalSendSelectedData.connect(self.groupBoxFit.slotGetSelectedData)
         self.signalFitUpdate.connect(self.groupBoxFit.slotFitUpdate)
         self.signalFitClose.connect(self.groupBoxFit.slotFitClose)
@@ -481,10 +508,10 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.groupBoxFiltering.signalAddPlotDataItem.connect(self.slotAddPlotDataItem)
         self.groupBoxFiltering.signalUpdatePlotDataItem.connect(self.slotUpdatePlotDataItem)
         self.groupBoxFiltering.signalRemovePlotDataItem.connect(self.slotRemoveCurve)
+        self.groupBoxFiltering.signalSendStatusBarMessage.connect(self.signalSendStatusBarMessage)
 
         # Events from the plot1d to the groupBox
         self.signalSendSelectedData.connect(self.groupBoxFiltering.slotGetSelectedData)
-        self.signalFilteringUpdate.connect(self.groupBoxFiltering.slotFilteringUpdate)
         self.signalFilteringClose.connect(self.groupBoxFiltering.slotFilteringClose)
 
         # Add GUI
@@ -725,6 +752,12 @@ class WidgetPlot1d(QtWidgets.QDialog):
         # if histogram:
         #     stepMode = 'center'
 
+        # Long curves are stored on disk once their updates stop, see
+        # storeUpdatedCurves
+        x, y = curveStore.add(curveId, x, y)
+        self.curvesToStore.add(curveId)
+        self.storeTimer.start()
+
         self.curves[curveId].setData(x=x,
                                      y=y)
 
@@ -732,6 +765,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.curves[curveId].x = x
         self.curves[curveId].y = y
         self.curves[curveId].curveLegend = curveLegend
+        # Results computed from the previous data are outdated
+        self.curves[curveId].dataVersion += 1
 
         self.updateLegend()
 
@@ -751,6 +786,34 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
 
 
+    def storeUpdatedCurves(self) -> None:
+        """
+        Store on disk the long curves updated live, once they are not updated
+        anymore, see storeCurve.
+        Copying the whole curve in a new file at each update would make every
+        refresh O(n) in disk writes.
+        """
+
+        for curveId in self.curvesToStore:
+            if curveId not in self.curves:
+                continue
+
+            curve = self.curves[curveId]
+            x, y, _ = storeCurve(curve.x, curve.y)
+            if x is curve.x and y is curve.y:
+                continue
+
+            # The data are unchanged, only moved on disk
+            x, y = curveStore.add(curveId, x, y, replace=True)
+            curve.setData(x=x,
+                          y=y)
+            curve.x = x
+            curve.y = y
+
+        self.curvesToStore.clear()
+
+
+
     def addPlotDataItem(self, x                 : np.ndarray,
                               y                 : np.ndarray,
                               curveId           : str,
@@ -760,7 +823,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
                               curveYUnits       : str,
                               curveLegend       : str,
                               showInLegend      : bool=True,
-                              hidden            : bool=False) -> None:
+                              hidden            : bool=False,
+                              yErr              : Optional[np.ndarray]=None) -> None:
         """
         Method adding a plotDataItem to the plotItem.
 
@@ -785,8 +849,16 @@ class WidgetPlot1d(QtWidgets.QDialog):
         hidden : bool
             If the plotDataItem is hidden.
             Default False.
+        yErr : Optional[np.ndarray]
+            Uncertainty along the y axis, displayed as error bars.
+            Default None.
         """
 
+        # Long curves are kept on disk
+        x, y, yErr = storeCurve(x, y, yErr)
+        # Data are shared, read-only, with the other plots and panels
+        x, y = curveStore.add(curveId, x, y)
+
         # Get the dataPlotItem color
         colorIndex, linePen, symbol, symbolPen, symbolBrush = self.getLineColor(len(x)==1)
 
@@ -798,7 +870,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
                                                   symbolPen=symbolPen,
                                                   symbolBrush=symbolBrush,
                                                   useCache=True, # Improve performance
-                                                  autoDownsample=True, # Improve performance
+                                                  downsample=max(self.widgetDownsampling.sbox.value(), 1),
+                                                  autoDownsample=self.widgetDownsampling.sbox.value()==0, # Improve performance
                                                 #   clipToView = True, # Improve performance
                                                   )
 
@@ -814,6 +887,17 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.curves[curveId].showInLegend       = showInLegend
         self.curves[curveId].hidden             = hidden
         self.curves[curveId].pen                = linePen
+        self.curves[curveId].errorBarItem       = None
+        self.curves[curveId].dataVersion        = 0
+
+        if yErr is not None:
+            # nan uncertainties are not drawn
+            self.curves[curveId].errorBarItem = pg.ErrorBarItem(x=x,
+                                                                y=y,
+                                                                height=2*np.nan_to_num(yErr),
+                                                                beam=0,
+                                                                pen=linePen)
+            self.plotItem.addItem(self.curves[curveId].errorBarItem)
 
         self.updateListDataPlotItem(curveId)
         self.updateListXAxis()
@@ -837,6 +921,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
         else:
             # Remove the curve
             self.plotItem.removeItem(self.curves[curveId])
+            if self.curves[curveId].errorBarItem is not None:
+                self.plotItem.removeItem(self.curves[curveId].errorBarItem)
             del(self.curves[curveId])
 
             self.updateListDataPlotItem(curveId)
@@ -1177,6 +1263,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
             # if checkBox.isChecked():
             plotDataItem.setAlpha(0, False)
             plotDataItem.hidden = True
+            if plotDataItem.errorBarItem is not None:
+                plotDataItem.errorBarItem.setVisible(False)
 
             # When the curve is hidden, we do not allow interaction with it
             radioBox.setEnabled(False)
@@ -1185,6 +1273,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
             if plotDataItem.hidden:
                 plotDataItem.hidden = False
                 plotDataItem.setAlpha(1, False)
+                if plotDataItem.errorBarItem is not None:
+                    plotDataItem.errorBarItem.setVisible(True)
 
                 radioBox.setEnabled(True)
 
@@ -1202,12 +1292,16 @@ class WidgetPlot1d(QtWidgets.QDialog):
         Used to changed the downSampling of the displayed curves.
 
         Args:
-            downsamplingValue: Factor of the downsampling
+            downsamplingValue: Factor of the downsampling, 0 for an automatic
+                downsampling according to the plot width.
         """
 
         # We update all the curve with the new downsampling
         for curve in self.curves.values():
-            curve.setDownsampling(downsamplingValue)
+            if downsamplingValue==0:
+                curve.setDownsampling(ds=1, auto=True)
+            else:
+                curve.setDownsampling(ds=downsamplingValue, auto=False)
 
 
 
@@ -1225,7 +1319,9 @@ class WidgetPlot1d(QtWidgets.QDialog):
         Uncheck their associated checkBox
         """
 
-        if 'fftnodc' in curveId:
+        if 'psd' in curveId:
+            self.signalCheckBoxPSDSetChecked.emit(False)
+        elif 'fftnodc' in curveId:
             self.signalCheckBoxFFTnoDCSetChecked.emit(False)
         elif 'ifft' in curveId:
             self.signalCheckBoxIFFTSetChecked.emit(False)
@@ -1270,8 +1366,9 @@ class WidgetPlot1d(QtWidgets.QDialog):
             a = self.sliceItems['a'].value()
             b = self.sliceItems['b'].value()
 
-            n = np.abs(self.curves[curveId].xData-a).argmin()
-            m = np.abs(self.curves[curveId].xData-b).argmin()
+            xIndex = getAxisIndex(self.curves[curveId], 'xData')
+            n = xIndex.nearest(a)
+            m = xIndex.nearest(b)
 
             # +1 to take into account the last selection point
             if n<m:
@@ -1288,6 +1385,8 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
             self.selectedX, self.selectedY = x, y
 
+            self.signalSendSelectedCurve.emit(curveId,
+                                              self.curves[curveId].dataVersion)
             self.signalSendSelectedData.emit(self.selectedX,
                                              self.selectedXLabel,
                                              self.selectedXUnits,
@@ -1340,6 +1439,10 @@ class WidgetPlot1d(QtWidgets.QDialog):
         # We overide a pyqtgraph attribute when user drag an infiniteLine
         lineItem.mouseHovering  = True
 
+        # The interaction plots follow the selection while it is dragged
+        self.updateSelectedData()
+        self.interactionRequest()
+
 
 
     def updateSelectionInifiteLine(self, curveId: Union[str, None]) -> None:
@@ -1534,6 +1637,7 @@ class WidgetPlot1d(QtWidgets.QDialog):
         self.signalFFTClosePlot.emit()
         self.signalFFTNoDcClosePlot.emit()
         self.signalIFFTClosePlot.emit()
+        self.signalPSDClosePlot.emit()
         self.signalDifferentiateClosePlot.emit()
         self.signalIntegrateClosePlot.emit()
         self.signalUnwrapClosePlot.emit()
@@ -1543,17 +1647,83 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
 
     def interactionUpdateAll(self) -> None:
+        """
+        Update all the interaction plots with the current selection.
+        Fits are done in their own thread, see GroupBoxFit.
+        """
 
-        self.signalFilteringUpdate.emit()
         self.signalFitUpdate.emit()
-        self.signalFFTUpdate.emit()
-        self.signalFFTNoDcUpdate.emit()
-        self.signalIFFTUpdate.emit()
-        self.signalDifferentiateUpdate.emit()
-        self.signalIntegrateUpdate.emit()
-        self.signalUnwrapUpdate.emit()
-        self.signalRemoveSlopeUpdate.emit()
-        self.signalStatisticsUpdate.emit()
+        self.interactionRequest()
+
+
+
+    def interactionRequest(self) -> None:
+        """
+        Ask for an update of the interaction plots, fft, histogram, ...
+        Successive requests, e.g. while the selection is dragged, are
+        coalesced, the update being done config['plot1dInteractionDelay'] ms
+        after the first one.
+        """
+
+        if not self.interactionTimer.isActive():
+            self.interactionTimer.start()
+
+
+
+    def interactionRun(self) -> None:
+        """
+        Compute the analyses of the opened interaction plots in a thread.
+        If the previous ones are still running, they are computed once done.
+        """
+
+        if self.interactionRunning:
+            self.interactionPending = True
+            return
+
+        if not hasattr(self, 'selectedX'):
+            return
+
+        tasks = {}
+        self.interactionPublish = {}
+        for groupBox in (self.groupBoxFFT,
+                         self.groupBoxStatistics,
+                         self.groupBoxCalculus,
+                         self.groupBoxNormalize,
+                         self.groupBoxFiltering):
+            for name, (compute, publish) in groupBox.getInteractionTasks().items():
+                tasks[name] = compute
+                self.interactionPublish[name] = publish
+
+        if len(tasks)==0:
+            return
+
+        self.interactionRunning = True
+        worker = InteractionUpdateThread(self.selectedX,
+                                         self.selectedY,
+                                         tasks)
+        worker.signal.done.connect(self.interactionDone)
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(dict)
+    def interactionDone(self, results: dict) -> None:
+        """
+        Display the results of the analyses and launch the ones requested in
+        the meantime.
+        """
+
+        self.interactionRunning = False
+
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                self.signalSendStatusBarMessage.emit('Analysis "{}" failed: {}'.format(name, result), 'red')
+            else:
+                self.interactionPublish[name](result)
+
+        if self.interactionPending:
+            self.interactionPending = False
+            self.interactionRun()
 
 
 
@@ -1659,4 +1829,5 @@ class WidgetPlot1d(QtWidgets.QDialog):
 
         self.curves[curveId].setData(x=x, y=y)
         self.curves[curveId].curveLegend = curveLegend
+        self.curves[curveId].dataVersion += 1
         self.updateLegend()
\ No newline at end of file
@@ -13,11 +13,11 @@ warnings.filterwarnings(
 )
 import lmfit
 import os
-from typing import Tuple
 
 from ....sources.config import loadConfigCurrent
 config = loadConfigCurrent()
 from ....sources.functions import parse_number
+from ....sources.workers.fit import Fit2dThread, FitSlicesThread
 
 LOC = os.path.join(os.path.dirname(os.path.realpath(__file__)))
 JSPATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', '..', 'mathjax', 'tex-chtml.js')
@@ -45,11 +45,25 @@ class Fit2d(QtWidgets.QDialog):
         self.label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
         self.label.installEventFilter(self)
 
+        # The fit is done in another process, we follow its progress and allow
+        # the user to cancel it
+        self.progressBar = QtWidgets.QProgressBar()
+        self.progressBar.setMaximum(100)
+        self.pushButtonCancel = QtWidgets.QPushButton('Cancel')
+        self.pushButtonCancel.clicked.connect(self.fitCancel)
+        horizontalLayout = QtWidgets.QHBoxLayout()
+        horizontalLayout.addWidget(self.progressBar)
+        horizontalLayout.addWidget(self.pushButtonCancel)
+
         self.layout = QtWidgets.QVBoxLayout()
         self.layout.addWidget(self.webView)
         self.layout.addWidget(self.label)
+        self.layout.addLayout(horizontalLayout)
         self.setLayout(self.layout)
 
+        self.threadpool = QtCore.QThreadPool()
+        self.worker = None
+
         self.setWindowTitle('Fit results')
         self.label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
 
@@ -57,15 +71,52 @@ class Fit2d(QtWidgets.QDialog):
 
 
 
+    @QtCore.pyqtSlot(str)
     def fitError(self, error:str) -> None:
         """
         Called when the fitting procedure failed
         """
+        self.worker = None
+        self.fitRunning(False)
         self.webView.setVisible(False)
         self.label.setText('<p style="color: red;">Fitting procedure failed</p><p>'+error+'</p>')
 
 
 
+    def fitRunning(self, running: bool) -> None:
+        """
+        Show the progress bar and the cancel button while a fit is running.
+        """
+
+        self.progressBar.setValue(0)
+        self.progressBar.setVisible(running)
+        self.pushButtonCancel.setVisible(running)
+
+
+
+    def fitCancel(self) -> None:
+        """
+        Cancel the running fit, if any.
+        """
+
+        if self.worker is not None:
+            # Results of a cancelled fit are ignored
+            self.worker.signal.blockSignals(True)
+            self.worker.cancel()
+            self.worker = None
+            self.label.setText('Fit cancelled')
+
+        self.fitRunning(False)
+
+
+
+    @QtCore.pyqtSlot(float)
+    def fitProgress(self, progress: float) -> None:
+
+        self.progressBar.setValue(int(progress))
+
+
+
     def defaultPageSource(self, equation: str) -> str:
 
             return  '<html>'\
@@ -106,42 +157,57 @@ class Fit2d(QtWidgets.QDialog):
     @QtCore.pyqtSlot(np.ndarray, np.ndarray, np.ndarray)
     def ffit(self, x: np.ndarray,
                    y: np.ndarray,
-                   z: np.ndarray) -> Tuple[np.ndarray,
-                                           np.ndarray,
-                                           np.ndarray,
-                                           lmfit.parameter.Parameters]:
+                   z: np.ndarray) -> None:
         """
         Perform the fit through lmfit minimize function.
+        The fit is done in another process, the results are sent to fitDone.
+        A fit already running is cancelled.
 
-        Returns
-        -------
-        xSelected : np.ndarray
+        Parameters
+        ----------
+        x : np.ndarray
             Selected data from the x axis.
-        ySelected : np.ndarray
-            Selected data from the y ayis.
-        zFit : np.ndarray
-            Array of the z axis from the fit procedure.
-        p : lmfit.parameter.Parameters
-            lmfit parameters.
+        y : np.ndarray
+            Selected data from the y axis.
+        z : np.ndarray
+            Selected data from the z axis.
         """
 
-        try :
-            self.webView.setVisible(True)
-            result = lmfit.minimize(fcn=self.residual,
-                                    params=self.getInitialParams(x, y, z),
-                                    args=(x, y, z))
+        self.fitCancel()
+        self.fitRunning(True)
+        self.label.setText('Fitting...')
+
+        self.worker = Fit2dThread(type(self), x, y, z)
+        self.worker.signal.updateProgressBar.connect(self.fitProgress)
+        self.worker.signal.fit2dDone.connect(self.fitDone)
+        self.worker.signal.fitError.connect(self.fitError)
+
+        self.threadpool.start(self.worker)
 
-            self.webView.setHtml(self.defaultPageSource(self.getLatexEquation),
-                                baseUrl=QtCore.QUrl.fromLocalFile(LOC))
-            self.label.setText(lmfit.fit_report(result))
-            self.label.adjustSize()
-            self.webView.adjustSize()
 
-            self.signalFitResult.emit(x, y, self.func(result.params, x, y), result.params)
 
-        except Exception as e:
-            print(e)
-            self.fitError(str(e))
+    @QtCore.pyqtSlot(np.ndarray, np.ndarray, np.ndarray, lmfit.Parameters, str)
+    def fitDone(self, x: np.ndarray,
+                      y: np.ndarray,
+                      zFit: np.ndarray,
+                      params: lmfit.Parameters,
+                      report: str) -> None:
+        """
+        Called when the fit process is done, display the fit report and send
+        the results to the fit groupBox.
+        """
+
+        self.worker = None
+        self.fitRunning(False)
+
+        self.webView.setVisible(True)
+        self.webView.setHtml(self.defaultPageSource(self.getLatexEquation),
+                             baseUrl=QtCore.QUrl.fromLocalFile(LOC))
+        self.label.setText(report)
+        self.label.adjustSize()
+        self.webView.adjustSize()
+
+        self.signalFitResult.emit(x, y, zFit, params)
 
 
 
@@ -150,12 +216,129 @@ class Fit2d(QtWidgets.QDialog):
         Catch the closing of the dialog and propagate it to the fit groupBox.
         """
 
+        self.fitCancel()
         self.signalCloseDialog.emit()
 
 
 
 
 
+class FitSlices(Fit2d):
+
+    # To the fit groupBox
+    signalFitSlicesResult = QtCore.pyqtSignal(np.ndarray, np.ndarray, np.ndarray, list)
+    signalPlotParameter = QtCore.pyqtSignal(str, bool)
+
+    def __init__(self, parent: QtWidgets.QGroupBox,
+                       modelClass: type,
+                       orientation: str) -> None:
+        """
+        Fit a 1d model on every slice of the 2d map.
+        The slices are fitted in parallel by a pool of processes, each fit
+        starting from the result of its neighbour.
+        Once done, each fitted parameter can be displayed against the slices
+        position.
+
+        Parameters
+        ----------
+        modelClass : type
+            1d fit model class, see plot1d.dialogFit.
+        orientation : str
+            "vertical" or "horizontal", see FitSlicesThread.
+        """
+
+        self.modelClass = modelClass
+        self.orientation = orientation
+        self.displayedLabel = modelClass.displayedLabel
+
+        Fit2d.__init__(self, parent=parent)
+
+        self.webView.setVisible(False)
+        self.setWindowTitle('Fit results - '+self.displayedLabel+' on '+orientation+' slices')
+
+        # One checkBox per fitted parameter, filled when the fit is done
+        self.checkBoxParameters: dict = {}
+        self.layoutParameters = QtWidgets.QHBoxLayout()
+        self.layout.insertLayout(2, self.layoutParameters)
+
+
+
+    @QtCore.pyqtSlot(np.ndarray, np.ndarray, np.ndarray)
+    def ffit(self, x: np.ndarray,
+                   y: np.ndarray,
+                   z: np.ndarray) -> None:
+        """
+        Perform the fit of every slice, the results are sent to fitSlicesDone.
+        A fit already running is cancelled.
+        """
+
+        self.fitCancel()
+        self.fitRunning(True)
+        nbSlices = len(x) if self.orientation=='vertical' else len(y)
+        self.label.setText('Fitting {} slices...'.format(nbSlices))
+
+        self.worker = FitSlicesThread(self.modelClass, x, y, z, self.orientation)
+        self.worker.signal.updateProgressBar.connect(self.fitProgress)
+        self.worker.signal.fitSlicesDone.connect(self.fitSlicesDone)
+        self.worker.signal.fitError.connect(self.fitError)
+
+        self.threadpool.start(self.worker)
+
+
+
+    @QtCore.pyqtSlot(np.ndarray, np.ndarray, np.ndarray, list)
+    def fitSlicesDone(self, x: np.ndarray,
+                            y: np.ndarray,
+                            zFit: np.ndarray,
+                            params: list) -> None:
+        """
+        Called when all slices have been fitted, display a summary and send the
+        results to the fit groupBox.
+        """
+
+        self.worker = None
+        self.fitRunning(False)
+
+        nbFailed = sum(p is None for p in params)
+        text = '{} slices fitted with the model: {}'.format(len(params)-nbFailed,
+                                                            self.displayedLabel)
+        if nbFailed>0:
+            text += '<br/><span style="color: red;">{} slices failed</span>'.format(nbFailed)
+        self.label.setText(text)
+        self.label.adjustSize()
+
+        # The result must be known by the groupBox before any parameter is
+        # plotted
+        self.signalFitSlicesResult.emit(x, y, zFit, params)
+
+        # Varying parameters, from the first successful fit
+        names = next(([k for k, v in p.items() if v.vary] for p in params if p is not None), [])
+        self.updateCheckBoxParameters(names)
+
+
+
+    def updateCheckBoxParameters(self, names: list) -> None:
+        """
+        Add a checkBox for each fitted parameter, the checkBox already checked
+        are kept.
+        """
+
+        for name in list(self.checkBoxParameters.keys()):
+            if name not in names:
+                self.layoutParameters.removeWidget(self.checkBoxParameters[name])
+                self.checkBoxParameters[name].deleteLater()
+                del(self.checkBoxParameters[name])
+
+        for name in names:
+            if name not in self.checkBoxParameters:
+                checkBox = QtWidgets.QCheckBox(name)
+                checkBox.setToolTip('Plot {} against the slices position'.format(name))
+                checkBox.stateChanged.connect(lambda state, name=name: self.signalPlotParameter.emit(name, state==QtCore.Qt.Checked))
+                self.layoutParameters.addWidget(checkBox)
+                self.checkBoxParameters[name] = checkBox
+
+
+
 class RabiChevron(Fit2d):
 
     displayedLabel = 'Rabi chevron'
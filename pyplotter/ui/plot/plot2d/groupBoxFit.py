@@ -5,7 +5,9 @@ import lmfit
 
 from ....sources.pyqtgraph import pg
 from . import dialogFit
+from ..plot1d import dialogFit as dialogFit1d
 from ....sources.config import loadConfigCurrent
+from ....sources.fit import getParameterValues
 
 
 class GroupBoxFit(QtWidgets.QGroupBox):
@@ -13,6 +15,7 @@ class GroupBoxFit(QtWidgets.QGroupBox):
     ## To the main
     # Add a new plot
     signal2MainWindowAddPlot = QtCore.pyqtSignal(int, str, str, str, str, str, tuple, str, str, str, str, str, str)
+    signalClose1dPlot = QtCore.pyqtSignal(str)
     signalClose2dPlot = QtCore.pyqtSignal(str, str)
 
     ## To the 2d plot displaying the fit result
@@ -60,6 +63,12 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         self._windowTitle = windowTitle
         self.databaseAbsPath = databaseAbsPath
 
+        # References of the 1d plots displaying the parameters fitted on all
+        # slices
+        # Structure
+        # self.parameterPlotRefs = {'parameterName' : plotRef}
+        self.parameterPlotRefs: dict = {}
+
         # Build GUI
         fontBold = QtGui.QFont()
         fontBold.setBold(True)
@@ -82,25 +91,65 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         # horizon.addWidget(label)
         horizon.addSpacerItem(QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum))
         self.verticalLayoutFitModel.addLayout(horizon)
+        horizon = QtWidgets.QHBoxLayout()
+        self.checkBoxSlices = QtWidgets.QCheckBox('Fit all slices (1d models)')
+        self.checkBoxSlices.setToolTip('Fit a 1d model on every slice of the map in parallel')
+        self.checkBoxSlices.stateChanged.connect(self.checkBoxSlicesStateChanged)
+        self.checkBoxSlices.setFont(font)
+        self.checkBoxSlices.setEnabled(False)
+        self.comboBoxSlicesOrientation = QtWidgets.QComboBox(self)
+        self.comboBoxSlicesOrientation.addItems(['vertical', 'horizontal'])
+        self.comboBoxSlicesOrientation.currentIndexChanged.connect(self.checkBoxSlicesStateChanged)
+        self.comboBoxSlicesOrientation.setFont(font)
+        self.comboBoxSlicesOrientation.setEnabled(False)
+        horizon.addWidget(self.checkBoxSlices)
+        horizon.addWidget(self.comboBoxSlicesOrientation)
+        self.verticalLayoutFitModel.addLayout(horizon)
         self.comboBoxFit = QtWidgets.QComboBox(self)
         self.comboBoxFit.setEnabled(False)
+        self.comboBoxFit.setFont(font)
 
-        # Get list of fit model
-        listClasses = [m[0] for m in inspect.getmembers(dialogFit, inspect.isclass) if 'getInitialParams' in [*m[1].__dict__.keys()]]
+        self.populateComboBoxFit()
+
+        self.comboBoxFit.currentIndexChanged.connect(self.comboBoxFitIndexChanched)
+        self.verticalLayoutFitModel.addWidget(self.comboBoxFit)
 
-        self.comboBoxFit.addItem('None')
-        for i, j in enumerate(listClasses):
 
-            _class = getattr(dialogFit, j)
-            font = QtGui.QFont()
-            font.setPointSize(8)
-            font.setBold(False)
-            self.comboBoxFit.setFont(font)
+
+    def populateComboBoxFit(self) -> None:
+        """
+        Fill the comboBox with the available fit models.
+        2d models by default, 1d models when fitting all slices.
+        The Polynomial model, having its own fit procedure, can't be fitted
+        on all slices.
+        """
+
+        if self.checkBoxSlices.isChecked():
+            module = dialogFit1d
+            listClasses = [m[0] for m in inspect.getmembers(module, inspect.isclass) if 'getInitialParams' in [*m[1].__dict__.keys()] and 'ffit' not in [*m[1].__dict__.keys()]]
+        else:
+            module = dialogFit
+            listClasses = [m[0] for m in inspect.getmembers(module, inspect.isclass) if 'getInitialParams' in [*m[1].__dict__.keys()]]
+
+        self.comboBoxFit.blockSignals(True)
+        self.comboBoxFit.clear()
+        self.comboBoxFit.addItem('None')
+        for j in listClasses:
+            _class = getattr(module, j)
             self.comboBoxFit.addItem(_class.displayedLabel,
                                      userData=j)
+        self.comboBoxFit.blockSignals(False)
 
-        self.comboBoxFit.currentIndexChanged.connect(self.comboBoxFitIndexChanched)
-        self.verticalLayoutFitModel.addWidget(self.comboBoxFit)
+
+
+    def checkBoxSlicesStateChanged(self) -> None:
+        """
+        Switch between 2d models and 1d models fitted on all slices.
+        """
+
+        self.fitClose()
+        self.comboBoxSlicesOrientation.setEnabled(self.checkBoxSlices.isChecked())
+        self.populateComboBoxFit()
 
 
 
@@ -113,6 +162,8 @@ class GroupBoxFit(QtWidgets.QGroupBox):
 
             self.signalAddROI.emit()
             self.comboBoxFit.setEnabled(True)
+            self.checkBoxSlices.setEnabled(True)
+            self.comboBoxSlicesOrientation.setEnabled(self.checkBoxSlices.isChecked())
 
         # If unchecked:
         #   - We remove the ROI
@@ -121,6 +172,8 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         else:
             self.signalRemoveROI.emit()
             self.comboBoxFit.setEnabled(False)
+            self.checkBoxSlices.setEnabled(False)
+            self.comboBoxSlicesOrientation.setEnabled(False)
             self.fitClose()
 
 
@@ -146,15 +199,23 @@ class GroupBoxFit(QtWidgets.QGroupBox):
             return
 
         # Find which model has been chosed and instance it
-        _class = getattr(dialogFit, self.comboBoxFit.currentData())
-        self.dialog = _class(parent=self)
+        if self.checkBoxSlices.isChecked():
+            _class = getattr(dialogFit1d, self.comboBoxFit.currentData())
+            self.dialog = dialogFit.FitSlices(parent=self,
+                                              modelClass=_class,
+                                              orientation=self.comboBoxSlicesOrientation.currentText())
+            self.dialog.signalFitSlicesResult.connect(self.fitSlicesGetResult)
+            self.dialog.signalPlotParameter.connect(self.slotPlotParameter)
+        else:
+            _class = getattr(dialogFit, self.comboBoxFit.currentData())
+            self.dialog = _class(parent=self)
+            self.dialog.signalFitResult.connect(self.fitGetResult)
 
         # From groupBox to dialog
         self.signalFit.connect(self.dialog.ffit)
         self.signalFitError.connect(self.dialog.fitError)
 
         # To dialog to groupBox
-        self.dialog.signalFitResult.connect(self.fitGetResult)
         self.dialog.signalCloseDialog.connect(self.slotCloseDialog)
 
         # Send signal to perform fit and send results to fitGetResult
@@ -203,6 +264,102 @@ class GroupBoxFit(QtWidgets.QGroupBox):
             p: lmfit parameters after minimization
         """
 
+        self.plotFitResult(x, y, z)
+
+
+
+    @QtCore.pyqtSlot(np.ndarray, np.ndarray, np.ndarray, list)
+    def fitSlicesGetResult(self, x: np.ndarray,
+                                 y: np.ndarray,
+                                 z: np.ndarray,
+                                 params: list) -> None:
+        """
+        Called from the fit dialog when all slices have been fitted
+
+        Args:
+            x: Data used in the fit
+            y: Data used in the fit
+            z: Fitted map, nan for the slices whose fit failed
+            params: lmfit parameters of each slice, None if the fit failed
+        """
+
+        if self.dialog.orientation=='vertical':
+            self.slicesPosition = x
+        else:
+            self.slicesPosition = y
+        self.slicesParams = params
+
+        self.plotFitResult(x, y, z)
+
+        # Displayed parameters are replotted with the new results
+        for name in list(self.parameterPlotRefs.keys()):
+            self.parameterClosePlot(name)
+            self.parameterPlot(name)
+
+
+
+    @QtCore.pyqtSlot(str, bool)
+    def slotPlotParameter(self, name: str,
+                                show: bool) -> None:
+        """
+        Called from the fit dialog when the user wants to display, or hide, a
+        fitted parameter against the slices position.
+        """
+
+        if show:
+            self.parameterPlot(name)
+        else:
+            self.parameterClosePlot(name)
+
+
+
+    def parameterPlot(self, name: str) -> None:
+        """
+        Display a fitted parameter against the slices position with its
+        uncertainty as error bars, in its own 1d plot.
+        """
+
+        values, stderr = getParameterValues(self.slicesParams, name)
+
+        if self.dialog.orientation=='vertical':
+            label, unit = self.xLabel, self.xUnit
+        else:
+            label, unit = self.yLabel, self.yUnit
+
+        plotRef = self.plotRef+'slicesfit'+name
+        title   = self._windowTitle+' - '+self.dialog.displayedLabel+' - '+name
+        self.parameterPlotRefs[name] = plotRef
+
+        self.signal2MainWindowAddPlot.emit(1, # fake runId
+                                           plotRef, # curveId
+                                           title, # plotTitle
+                                           title, # windowTitle
+                                           plotRef, # plotRef
+                                           self.databaseAbsPath, # databaseAbsPath
+                                           (self.slicesPosition, values, stderr), # data
+                                           label, # xLabelText
+                                           unit, # xLabelUnits
+                                           name, # yLabelText
+                                           '', # yLabelUnits
+                                           '', # zLabelText
+                                           '') # zLabelUnits
+
+
+
+    def parameterClosePlot(self, name: str) -> None:
+
+        if name in self.parameterPlotRefs:
+            self.signalClose1dPlot.emit(self.parameterPlotRefs.pop(name))
+
+
+
+    def plotFitResult(self, x: np.ndarray,
+                            y: np.ndarray,
+                            z: np.ndarray) -> None:
+        """
+        Display the fitted map in its own 2d plot, created at the first fit.
+        """
+
         # If there is no fit plot, we create one
         if not hasattr(self, 'curveIdFit'):
 
@@ -245,6 +402,10 @@ class GroupBoxFit(QtWidgets.QGroupBox):
         Take care of closing everything properly and to erase references.
         """
 
+        # We remove the fitted parameters plots
+        for name in list(self.parameterPlotRefs.keys()):
+            self.parameterClosePlot(name)
+
         # We remove the curve
         if hasattr(self, 'curveIdFit'):
 
@@ -11,6 +11,9 @@ from ....sources.config import loadConfigCurrent
 from ....sources.functions import getCurveColorIndex, hex_to_rgba
 from ....sources.pyqtgraph import pg
 from ....sources.functions import parse_number
+from ....sources.lineCut import getLineCut
+from ....sources.axisIndex import getAxisIndex
+from ....sources.workers.computeLineCut import ComputeLineCutThread
 from ..widgetPlotContainer import WidgetPlotContainer
 from .widgetHistogram import WidgetHistogram
 
@@ -161,6 +164,13 @@ class WidgetPlot2d(QtWidgets.QDialog):
         self.sliceItems = {}
         self.sliceOrientation = 'vertical'
 
+        # Line cuts along any direction are computed in a thread
+        # We keep track of the running ones and of the last request received
+        # while running so that only the latest position is computed
+        self.threadpool = QtCore.QThreadPool()
+        self.lineCutRunning: Dict[str, bool] = {}
+        self.lineCutPending: Dict[str, pg.LineSegmentROI] = {}
+
         # Keep track of the sub-interaction plots launched fron that plot
         self.interactionRefs: Dict[str, dict] = {}
 
@@ -213,7 +223,7 @@ class WidgetPlot2d(QtWidgets.QDialog):
 
 
         # Initialize internal widget
-        # self.initGroupBoxFit()
+        self.initGroupBoxFit()
 
         self.setStyleSheet("background-color: "+str(self.config['styles'][self.config['style']]['dialogBackgroundColor'])+";")
         self.setStyleSheet("color: "+str(self.config['styles'][self.config['style']]['dialogTextColor'])+";")
@@ -240,6 +250,8 @@ class WidgetPlot2d(QtWidgets.QDialog):
         self.ui.radioButtonSliceSingleVertical.toggled.connect(self.radioBoxSliceChanged)
         self.ui.radioButtonSliceAveragedHorizontal.toggled.connect(self.radioBoxSliceChanged)
         self.ui.radioButtonSliceAveragedVertical.toggled.connect(self.radioBoxSliceChanged)
+        self.ui.spinBoxSliceAnyNbPoints.valueChanged.connect(self.lineCutParameterChanged)
+        self.ui.doubleSpinBoxSliceAnyWidth.valueChanged.connect(self.lineCutParameterChanged)
 
 
         # UI for the derivative combobox
@@ -605,43 +617,145 @@ class WidgetPlot2d(QtWidgets.QDialog):
             orientaton of the slice being dragged
         """
 
+        # Line cuts along any direction are computed in a thread, the curves
+        # are updated in lineCutDone
+        if isinstance(sliceItem, pg.LineSegmentROI):
+            self.lineCutRequest(sliceItem)
+            return
+
         # We get the slice data from the 2d plot
         sliceX, sliceY, sliceLegend, sliceLabel = self.getDataSlice(sliceItem=sliceItem)
 
         # We update the curve associated to the sliceLine
-        if isinstance(sliceItem, pg.LineSegmentROI):
-            self.signalUpdateCurve.emit(self.plotRef+sliceOrientation+'Horizontal', # plotRef
-                                        sliceItem.curveId, # curveId
-                                        sliceLegend, # curveLegend
-                                        sliceX[0], # x
-                                        sliceY, # y
-                                        False, # autorange
-                                        True) # interactionUpdateAll
-            self.signalUpdateCurve.emit(self.plotRef+sliceOrientation+'Vertical', # plotRef
-                                        sliceItem.curveId, # curveId
-                                        sliceLegend, # curveLegend
-                                        sliceX[1], # x
-                                        sliceY, # y
-                                        False, # autorange
-                                        True) # interactionUpdateAll
-        else:
-            self.signalUpdateCurve.emit(self.plotRef+sliceOrientation, # plotRef
-                                        sliceItem.curveId, # curveId
-                                        sliceLegend, # curveLegend
-                                        sliceX, # x
-                                        sliceY, # y
-                                        False, # autorange
-                                        True) # interactionUpdateAll
+        self.signalUpdateCurve.emit(self.plotRef+sliceOrientation, # plotRef
+                                    sliceItem.curveId, # curveId
+                                    sliceLegend, # curveLegend
+                                    sliceX, # x
+                                    sliceY, # y
+                                    False, # autorange
+                                    True) # interactionUpdateAll
 
         # We update the label of the infinity line with the value corresponding
         # to the cut
         if isinstance(sliceItem, pg.InfiniteLine):
             sliceItem.label.setFormat(sliceLabel)
-        elif isinstance(sliceItem, pg.LinearRegionItem):
+        else:
             sliceItem.labelmin.setFormat(sliceLabel[0])
             sliceItem.labelmax.setFormat(sliceLabel[1])
-        else:
-            pass
+
+
+
+    def getLineCutPosition(self, sliceItem: pg.LineSegmentROI) -> Tuple[Tuple[float, float],
+                                                                         Tuple[float, float]]:
+        """
+        Return the x and y coordinates of the extremities of a LineSegmentROI.
+        """
+
+        pos0, pos1 = [self.plotItem.vb.mapSceneToView(i[1]) for i in sliceItem.getSceneHandlePositions()]
+
+        return (pos0.x(), pos1.x()), (pos0.y(), pos1.y())
+
+
+
+    def getLineCutLegend(self, xSlice: Tuple[float, float],
+                               ySlice: Tuple[float, float]) -> str:
+        """
+        Return the legend of a line cut from its extremities.
+        """
+
+        return 'From ({}{}, {}{}) to ({}{}, {}{})'.format(parse_number(xSlice[0], 3, unified=True), self._xLabelUnits,
+                                                          parse_number(ySlice[0], 3, unified=True), self._yLabelUnits,
+                                                          parse_number(xSlice[1], 3, unified=True), self._xLabelUnits,
+                                                          parse_number(ySlice[1], 3, unified=True), self._yLabelUnits)
+
+
+
+    def lineCutRequest(self, sliceItem: pg.LineSegmentROI) -> None:
+        """
+        Launch the computation of a line cut in a thread.
+        If the line cut associated to the sliceItem is already being computed,
+        the request is kept and launched once the current one is done, see
+        lineCutDone.
+        Consequently, while dragging, only the latest position is computed.
+
+        Parameters
+        ----------
+        sliceItem : pg.LineSegmentROI
+            sliceItem currently being dragged.
+        """
+
+        if self.lineCutRunning.get(sliceItem.curveId, False):
+            self.lineCutPending[sliceItem.curveId] = sliceItem
+            return
+
+        xSlice, ySlice = self.getLineCutPosition(sliceItem)
+
+        self.lineCutRunning[sliceItem.curveId] = True
+
+        worker = ComputeLineCutThread(sliceItem.curveId,
+                                      self.xData,
+                                      self.yData,
+                                      self.zData,
+                                      xSlice,
+                                      ySlice,
+                                      self.ui.spinBoxSliceAnyNbPoints.value(),
+                                      self.ui.doubleSpinBoxSliceAnyWidth.value())
+        worker.signal.done.connect(self.lineCutDone)
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, tuple, tuple, np.ndarray, np.ndarray, np.ndarray)
+    def lineCutDone(self, curveId: str,
+                          xSlice: Tuple[float, float],
+                          ySlice: Tuple[float, float],
+                          xCut: np.ndarray,
+                          yCut: np.ndarray,
+                          zCut: np.ndarray) -> None:
+        """
+        Called when a line cut has been computed.
+        Update the two curves associated to the line cut and launch the pending
+        request if any.
+        """
+
+        self.lineCutRunning[curveId] = False
+
+        # The slice may have been removed during the computation
+        if curveId in self.sliceItems.keys():
+            sliceLegend = self.getLineCutLegend(xSlice, ySlice)
+
+            self.signalUpdateCurve.emit(self.plotRef+'anyHorizontal', # plotRef
+                                        curveId, # curveId
+                                        sliceLegend, # curveLegend
+                                        xCut, # x
+                                        zCut, # y
+                                        False, # autorange
+                                        True) # interactionUpdateAll
+            self.signalUpdateCurve.emit(self.plotRef+'anyVertical', # plotRef
+                                        curveId, # curveId
+                                        sliceLegend, # curveLegend
+                                        yCut, # x
+                                        zCut, # y
+                                        False, # autorange
+                                        True) # interactionUpdateAll
+
+        if curveId in self.lineCutPending.keys():
+            sliceItem = self.lineCutPending.pop(curveId)
+            if curveId in self.sliceItems.keys():
+                self.lineCutRequest(sliceItem)
+
+
+
+    def lineCutParameterChanged(self) -> None:
+        """
+        Called when user changes the number of points or the width of the line
+        cuts.
+        Update all the line cuts.
+        """
+
+        for sliceItem in self.sliceItems.values():
+            if isinstance(sliceItem, pg.LineSegmentROI):
+                self.lineCutRequest(sliceItem)
 
 
 
@@ -792,6 +906,9 @@ class WidgetPlot2d(QtWidgets.QDialog):
             self.plotItem.removeItem(self.sliceItems[curveId])
             del(self.sliceItems[curveId])
 
+            self.lineCutRunning.pop(curveId, None)
+            self.lineCutPending.pop(curveId, None)
+
 
         if len(self.sliceItems)==0:
             # when we do not interact with the map, we allow swapping
@@ -866,9 +983,7 @@ class WidgetPlot2d(QtWidgets.QDialog):
                     ySlice = sliceItem.value()
                 else:
                     orientation = 'any'
-                    pos0, pos1 = [self.plotItem.vb.mapSceneToView(i[1]) for i in sliceItem.getSceneHandlePositions()]
-                    xSlice = (pos0.x(), pos1.x())
-                    ySlice = (pos0.y(), pos1.y())
+                    xSlice, ySlice = self.getLineCutPosition(sliceItem)
 
 
         if sliceType=='single':
@@ -876,7 +991,7 @@ class WidgetPlot2d(QtWidgets.QDialog):
             # associated with the cut.
             if orientation=='vertical':
 
-                n = np.abs(self.xData-xSlice).argmin()
+                n = getAxisIndex(self, 'xData').nearest(xSlice)
                 sliceX        = self.yData
                 sliceY        = self.zData[n]
                 sliceLegend   = '{} = {}{}'.format(self._xLabelText,
@@ -885,7 +1000,7 @@ class WidgetPlot2d(QtWidgets.QDialog):
                 sliceLabel = '{}{}'.format(parse_number(self.xData[n], 3, unified=True), self._xLabelUnits)
             elif orientation=='horizontal':
 
-                n = np.abs(self.yData-ySlice).argmin()
+                n = getAxisIndex(self, 'yData').nearest(ySlice)
                 sliceX        = self.xData
                 sliceY        = self.zData[:,n]
                 sliceLegend   = '{} = {}{}'.format(self._yLabelText,
@@ -893,26 +1008,17 @@ class WidgetPlot2d(QtWidgets.QDialog):
                                                    self._yLabelUnits)
                 sliceLabel = '{}{}'.format(parse_number(self.yData[n], 3, unified=True), self._yLabelUnits)
             else:
-                # Greatly inspired from
-                # https://stackoverflow.com/questions/7878398/how-to-extract-an-arbitrary-line-of-values-from-a-numpy-array
-
-                # Get index min and max
-                x0_index = np.abs(self.xData - xSlice[0]).argmin()
-                x1_index = np.abs(self.xData - xSlice[1]).argmin()
-                y0_index = np.abs(self.yData - ySlice[0]).argmin()
-                y1_index = np.abs(self.yData - ySlice[1]).argmin()
-
-                # Get the slice data
-                nb_points = int(np.hypot(x1_index-x0_index, y1_index-y0_index))
-                x_index = np.linspace(x0_index, x1_index, nb_points).astype(int)
-                y_index = np.linspace(y0_index, y1_index, nb_points).astype(int)
-
-                sliceX = (self.xData[x_index], self.yData[y_index])
-                sliceY = self.zData[x_index,y_index]
-                sliceLegend = 'From ({}{}, {}{}) to ({}{}, {}{})'.format(parse_number(xSlice[0], 3, unified=True), self._xLabelUnits,
-                                                                         parse_number(ySlice[0], 3, unified=True), self._yLabelUnits,
-                                                                         parse_number(xSlice[1], 3, unified=True), self._xLabelUnits,
-                                                                         parse_number(ySlice[1], 3, unified=True), self._yLabelUnits,)
+
+                xCut, yCut, sliceY = getLineCut(self.xData,
+                                                self.yData,
+                                                self.zData,
+                                                xSlice,
+                                                ySlice,
+                                                self.ui.spinBoxSliceAnyNbPoints.value(),
+                                                self.ui.doubleSpinBoxSliceAnyWidth.value())
+
+                sliceX = (xCut, yCut)
+                sliceLegend = self.getLineCutLegend(xSlice, ySlice)
                 sliceLabel = ''
 
         # If averaged  slice
@@ -920,8 +1026,8 @@ class WidgetPlot2d(QtWidgets.QDialog):
             # Depending on the slice we return the x and y axis data and the legend
             # associated with the cut.
             if orientation=='vertical':
-                nmin = np.abs(self.xData-xSlice[0]).argmin()
-                nmax = np.abs(self.xData-xSlice[1]).argmin()
+                nmin = getAxisIndex(self, 'xData').nearest(xSlice[0])
+                nmax = getAxisIndex(self, 'xData').nearest(xSlice[1])
                 if nmin==nmax:
                     if nmax<len(self.xData):
                         nmax=nmin+1
@@ -942,8 +1048,8 @@ class WidgetPlot2d(QtWidgets.QDialog):
                               '{}{}'.format(parse_number(self.xData[nmax], 3, unified=True), self._xLabelUnits))
             else:
 
-                nmin = np.abs(self.yData-ySlice[0]).argmin()
-                nmax = np.abs(self.yData-ySlice[1]).argmin()
+                nmin = getAxisIndex(self, 'yData').nearest(ySlice[0])
+                nmax = getAxisIndex(self, 'yData').nearest(ySlice[1])
                 if nmin==nmax:
                     if nmax<len(self.yData):
                         nmax=nmin+1
@@ -1612,6 +1718,7 @@ class WidgetPlot2d(QtWidgets.QDialog):
 
         # Event from groupBox to main
         self.groupBoxFit.signal2MainWindowAddPlot.connect(self.signal2MainWindowAddPlot.emit)
+        self.groupBoxFit.signalClose1dPlot.connect(self.signalClose1dPlot.emit)
         self.groupBoxFit.signalClose2dPlot.connect(self.signalClose2dPlot.emit)
 
         # Event from groupBox to the 2d plot displaying the fit result
@@ -1671,13 +1778,16 @@ class WidgetPlot2d(QtWidgets.QDialog):
         Get the selected data and send them to the fit groupBox
         """
 
-        t = self.roi.getArrayRegion(data=self.zData,
-                                    img=self.imageItem,
-                                    returnMappedCoords=True)
+        # Selection done in the data coordinates so that the fit gets the
+        # original, non interpolated, data
+        x0, y0 = self.roi.pos()
+        dx, dy = self.roi.size()
+        xMask = (self.xData>=min(x0, x0+dx)) & (self.xData<=max(x0, x0+dx))
+        yMask = (self.yData>=min(y0, y0+dy)) & (self.yData<=max(y0, y0+dy))
 
-        self.xSelected = t[1][0,:,0]
-        self.ySelected = t[1][1,0,:]
-        self.zSelected = t[0]
+        self.xSelected = self.xData[xMask]
+        self.ySelected = self.yData[yMask]
+        self.zSelected = self.zData[xMask][:,yMask]
 
         self.signalUpdate2dFitData.emit(self.xSelected,
                                         self.ySelected,
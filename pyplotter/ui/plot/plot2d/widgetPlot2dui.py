@@ -311,6 +311,29 @@ class Ui_Dialog(object):
         self.horizontalLayout_10.addWidget(self.radioButtonSliceAveragedVertical)
         self.horizontalLayout_9.addLayout(self.horizontalLayout_10)
         self.verticalLayout_6.addWidget(self.groupBoxSlicingAveraged)
+        self.groupBoxSlicingAny = QtWidgets.QGroupBox(self.groupBoxSlicing)
+        self.groupBoxSlicingAny.setObjectName("groupBoxSlicingAny")
+        self.horizontalLayout_14 = QtWidgets.QHBoxLayout(self.groupBoxSlicingAny)
+        self.horizontalLayout_14.setObjectName("horizontalLayout_14")
+        self.spinBoxSliceAnyNbPoints = QtWidgets.QSpinBox(self.groupBoxSlicingAny)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        self.spinBoxSliceAnyNbPoints.setFont(font)
+        self.spinBoxSliceAnyNbPoints.setMaximum(1000000)
+        self.spinBoxSliceAnyNbPoints.setSingleStep(10)
+        self.spinBoxSliceAnyNbPoints.setObjectName("spinBoxSliceAnyNbPoints")
+        self.horizontalLayout_14.addWidget(self.spinBoxSliceAnyNbPoints)
+        self.doubleSpinBoxSliceAnyWidth = QtWidgets.QDoubleSpinBox(self.groupBoxSlicingAny)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        self.doubleSpinBoxSliceAnyWidth.setFont(font)
+        self.doubleSpinBoxSliceAnyWidth.setDecimals(1)
+        self.doubleSpinBoxSliceAnyWidth.setMaximum(10000.0)
+        self.doubleSpinBoxSliceAnyWidth.setObjectName("doubleSpinBoxSliceAnyWidth")
+        self.horizontalLayout_14.addWidget(self.doubleSpinBoxSliceAnyWidth)
+        self.verticalLayout_6.addWidget(self.groupBoxSlicingAny)
         self.verticalLayout_3.addWidget(self.groupBoxSlicing)
         self.groupBoxExtraction = QtWidgets.QGroupBox(self.scrollAreaWidgetContents)
         font = QtGui.QFont()
@@ -384,6 +407,12 @@ class Ui_Dialog(object):
         self.groupBoxSlicingAveraged.setTitle(_translate("Dialog", "Averaged"))
         self.radioButtonSliceAveragedHorizontal.setText(_translate("Dialog", "horizontal"))
         self.radioButtonSliceAveragedVertical.setText(_translate("Dialog", "vertical"))
+        self.groupBoxSlicingAny.setTitle(_translate("Dialog", "Any cut"))
+        self.spinBoxSliceAnyNbPoints.setToolTip(_translate("Dialog", "Number of points along the cut, auto for one point per pixel crossed"))
+        self.spinBoxSliceAnyNbPoints.setSpecialValueText(_translate("Dialog", "auto"))
+        self.spinBoxSliceAnyNbPoints.setSuffix(_translate("Dialog", " points"))
+        self.doubleSpinBoxSliceAnyWidth.setToolTip(_translate("Dialog", "Width of the cut in pixels, the cut is averaged along its perpendicular direction"))
+        self.doubleSpinBoxSliceAnyWidth.setSuffix(_translate("Dialog", " px width"))
         self.groupBoxExtraction.setTitle(_translate("Dialog", "Extraction"))
         self.checkBoxMinimum.setText(_translate("Dialog", "minimum"))
         self.checkBoxMaximum.setText(_translate("Dialog", "maximum"))
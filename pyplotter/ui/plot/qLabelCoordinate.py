@@ -1,11 +1,11 @@
 from PyQt5 import QtCore, QtWidgets
 import datetime
-import numpy as np
 from typing import TYPE_CHECKING
 
 from ...sources.config import loadConfigCurrent
 config = loadConfigCurrent()
 from ...sources.pyqtgraph import pg
+from ...sources.axisIndex import getAxisIndex
 
 if TYPE_CHECKING:
     from .widgetPlotContainer import WidgetPlotContainer
@@ -97,8 +97,8 @@ class QLabelCoordinate(QtWidgets.QLabel):
                     self.setText('x: {}{:.{nbDecimal}e}<br/>y: {}{:.{nbDecimal}e}'.format(spaceX, x,spaceY, y, nbDecimal=config['plotCoordinateNbNumber']))
             elif self.widget.plotType=='2d':
 
-                n = np.abs(self.widget.xData-x).argmin()
-                m = np.abs(self.widget.yData-y).argmin()
+                n = getAxisIndex(self.widget, 'xData').nearest(x)
+                m = getAxisIndex(self.widget, 'yData').nearest(y)
                 z = self.widget.zData[n,m]
 
                 spaceZ = ''
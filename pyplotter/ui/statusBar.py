@@ -13,6 +13,7 @@ class StatusBar(QtWidgets.QStatusBar):
     signalDatabaseLoad        = QtCore.pyqtSignal(str, int)
     signalCsvLoad             = QtCore.pyqtSignal(str, bool, int)
     signalNpzLoad             = QtCore.pyqtSignal(str, bool, int)
+    signalArrayLoad           = QtCore.pyqtSignal(str, bool, int)
     signalExportRunLoad       = QtCore.pyqtSignal(str, str, int, int)
     signalBlueForsLoad        = QtCore.pyqtSignal(str, bool, int)
     signalAddCurve            = QtCore.pyqtSignal(str, str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
@@ -116,6 +117,27 @@ class StatusBar(QtWidgets.QStatusBar):
 
 
 
+    @QtCore.pyqtSlot(str, bool)
+    def arrayLoad(self, databaseAbsPath: str,
+                        doubleClick: bool) -> None:
+        """
+        Signal sent from tableWidgetFolder when user click on a .npy, HDF5 or
+        Parquet file to display its info in the tableWidgetParameter.
+        Add a progressBar to the statusBar and propagate the signal to the
+        tableWidgetParameter with progressBar id.
+
+        Args:
+            databaseAbsPath: Absolute path of the file
+            doubleClick: if the user double click on the file.
+        """
+
+        progressBarId = self.addProgressBar()
+        self.signalArrayLoad.emit(databaseAbsPath,
+                                  doubleClick,
+                                  progressBarId)
+
+
+
     @QtCore.pyqtSlot(str, bool)
     def blueForsLoad(self, databaseAbsPath: str,
                            doubleClick: bool) -> None:
@@ -2,7 +2,7 @@ from PyQt5 import QtCore, QtWidgets, QtGui
 from typing import List
 import os
 from time import time
-from typing import Optional
+from typing import Optional, Tuple
 
 from ..sources.config import loadConfigCurrent
 config = loadConfigCurrent()
@@ -11,9 +11,9 @@ from .tableWidgetItemNumOrdered import TableWidgetItemNumOrdered
 from ..sources.workers.loadDataBase import LoadDataBaseThread
 from ..sources.labradDatavault import getLabradDatabaseInfos
 # from ..sources.workers.loadRunInfo import LoadRunInfoThread
-# from ..sources.workers.checkNbRunDatabase import dataBaseCheckNbRunThread
-from ..sources.workers import loadRunInfo, checkNbRunDatabase
-from ..sources.workers import loadLabradRunInfo, checkNbRunLabrad
+from ..sources.workers import loadRunInfo
+from ..sources.workers import loadLabradRunInfo
+from ..sources.workers.countRun import CountRunThread
 from ..sources.workers.exportRun import ExportRunThread
 from ..sources.functions import clearTableWidget, getDatabaseNameFromAbsPath, isLabradFolder, isQcodesData
 from ..ui.dialogs.dialogComment import DialogComment
@@ -73,6 +73,18 @@ class TableWidgetDatabase(QtWidgets.QTableWidget):
         self.properties = RunPropertiesExtra()
         self.threadpool = QtCore.QThreadPool()
 
+        # To count the runs when the database is modified, see
+        # slotDatabaseChanged
+        self.databaseAbsPath = ''
+        self.nbTotalRun = 0
+        self._databaseLoading = False
+        self._countingRun = False
+        self._countRunPending = False
+
+        # Run to be selected once its database is displayed, see
+        # slotSelectRun
+        self.runSelection: Optional[Tuple[str, int]] = None
+
     def eventFilter(self, source,
                           event) -> Optional[bool] | None:
         """
@@ -144,6 +156,9 @@ class TableWidgetDatabase(QtWidgets.QTableWidget):
         self.properties.jsonLoad(os.path.dirname(databaseAbsPath),
                                  os.path.basename(databaseAbsPath))
 
+        # Changes of the database are ignored until it is displayed
+        self._databaseLoading = True
+
         # Remove all previous row in the table
         clearTableWidget(self)
 
@@ -322,10 +337,13 @@ class TableWidgetDatabase(QtWidgets.QTableWidget):
         self.signalDatabaseClickDone.emit(databaseAbsPath)
         self.signalUpdateCurrentDatabase.emit(getDatabaseNameFromAbsPath(databaseAbsPath))
 
-        # We periodically check if there is not a new run to display
+        # New runs are displayed when the database is modified, see
+        # slotDatabaseChanged
         self.databaseAbsPath = databaseAbsPath
-        self.dataBaseCheckNbRun(databaseAbsPath,
-                                nbTotalRun)
+        self._databaseLoading = False
+
+        if not error:
+            self.selectRun(databaseAbsPath)
 
     @QtCore.pyqtSlot(str, int)
     def labradDatabaseClickDone(self, databaseAbsPath: str, nbTotalRun: int) -> None:
@@ -348,52 +366,106 @@ class TableWidgetDatabase(QtWidgets.QTableWidget):
         self.signalDatabaseClickDone.emit(databaseAbsPath)
         self.signalUpdateCurrentDatabase.emit(getDatabaseNameFromAbsPath(databaseAbsPath))
 
-        # We periodically check if there is not a new run to display
+        # New runs are displayed when the database is modified, see
+        # slotDatabaseChanged
         self.databaseAbsPath = databaseAbsPath
-        self.dataBaseCheckNbRun(databaseAbsPath, nbTotalRun)
+        self._databaseLoading = False
+
+        self.selectRun(databaseAbsPath)
 
-    def dataBaseCheckNbRun(self, databaseAbsPath: str,
-                                 nbTotalRun:  int):
+    @QtCore.pyqtSlot(str, int)
+    def slotSelectRun(self, databaseAbsPath: str,
+                            runId: int) -> None:
         """
-        Method called by databaseClickDone.
-        Launch a thread every config['delayBetweendataBaseNbRunCheck'] ms
-        which will launch a process to get the nb of run in the database.
-        If that number is the same as the database currently displayed, nothing
-        happen, otherwise, the method databaseClick is called which will
-        refresh the diaplayed database.
+        Called from the widgetRunSearch, the run is selected once its
+        database is displayed, see selectRun.
         """
 
-        # From launch a thread which will periodically check if the database has
-        # more run that what is currently displayed
-        if isQcodesData(databaseAbsPath):
-            self.workerCheck = checkNbRunDatabase.dataBaseCheckNbRunThread(databaseAbsPath, nbTotalRun)
-        elif isLabradFolder(databaseAbsPath):
-            self.workerCheck = checkNbRunLabrad.dataBaseCheckNbRunThread(databaseAbsPath, nbTotalRun)
-        else:
-            raise Exception('dataset not supportted!')
+        self.runSelection = (databaseAbsPath.replace("\\", "/"), runId)
 
-        # Connect signals
-        self.workerCheck.signal.dataBaseUpdate.connect(self.signal2StatusBarDatabaseUpdate)
-        self.workerCheck.signal.addStatusBarMessage.connect(self.signalAddStatusBarMessage)
-        self.workerCheck.signal.dataBaseCheckNbRun.connect(self.slotDataBaseCheckNbRun)
+    def selectRun(self, databaseAbsPath: str) -> None:
+        """
+        Select and display the run asked by the widgetRunSearch, if it
+        belongs to the displayed database.
+        """
+
+        if self.runSelection is None or self.runSelection[0]!=databaseAbsPath:
+            return
+
+        runId = self.runSelection[1]
+        self.runSelection = None
+
+        for row in range(self.rowCount()):
+            item = self.item(row, config['DatabaseDisplayColumn']['itemRunId']['index'])
+            if item is not None and int(item.text())==runId:
+                self.selectRow(row)
+                self.scrollToItem(item)
+                self.runClick(row)
+                break
+
+    @QtCore.pyqtSlot(str)
+    def slotDatabaseChanged(self, databaseAbsPath: str) -> None:
+        """
+        Called by the FileWatcher when the displayed database is modified.
+        Count its runs in a thread, the database being displayed again if
+        there are new runs, see countRunDone.
+        """
+
+        if databaseAbsPath!=self.databaseAbsPath or self._databaseLoading:
+            return
+
+        # The database is counted again once the current count is done
+        if self._countingRun:
+            self._countRunPending = True
+            return
+
+        self._countingRun = True
+        self._countRunPending = False
+
+        worker = CountRunThread(databaseAbsPath)
+        worker.signal.done.connect(self.countRunDone)
+        worker.signal.error.connect(self.countRunError)
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, int)
+    def countRunDone(self, databaseAbsPath: str,
+                           nbTotalRun: int) -> None:
+
+        self._countingRun = False
+
+        if databaseAbsPath!=self.databaseAbsPath or self._databaseLoading:
+            return
+
+        if self.nbTotalRun<nbTotalRun:
+            self.signalAddStatusBarMessage.emit(' (New run detected)',
+                                                'orange')
+            self._databaseLoading = True
+            self.signal2StatusBarDatabaseUpdate.emit(databaseAbsPath)
+        elif self._countRunPending:
+            self.slotDatabaseChanged(databaseAbsPath)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def countRunError(self, databaseAbsPath: str,
+                            message: str) -> None:
+        """
+        The database may be locked while being written, it is counted again
+        at its next modification.
+        """
+
+        self._countingRun = False
+
+        if self._countRunPending:
+            self.slotDatabaseChanged(databaseAbsPath)
 
-        # Execute the thread
-        self.threadpool.start(self.workerCheck)
 
-    QtCore.pyqtSlot(str, int)
-    def slotDataBaseCheckNbRun(self, databaseAbsPath: str,
-                                     nbTotalRun:  int):
-        # If we are style displaying the same database
-        if self.databaseAbsPath==databaseAbsPath:
-            self.nbTotalRun = nbTotalRun
-            self.dataBaseCheckNbRun(databaseAbsPath,
-                                    nbTotalRun)
 
     QtCore.pyqtSlot(str)
     def updateDatabasePath(self, databaseAbsPath: str):
         self.databaseAbsPath=databaseAbsPath
-        if hasattr(self, 'workerCheck'):
-            self.workerCheck._stop = True
 
     def runClick(self, currentRow: int=0) -> None:
         """
@@ -1,5 +1,5 @@
 from PyQt5 import QtCore, QtWidgets, QtGui
-from typing import Union
+from typing import Union, Dict, List
 import os
 from time import time
 
@@ -16,6 +16,11 @@ from ..sources.functions import (
     getDatabaseNameFromAbsPath
 )
 from ..sources.labradDatavault import getLabradDatabaseInfos
+from ..sources.blueFors import getBlueForsRangePath
+from ..sources.arrayFile import ARRAY_EXTENSIONS, getExtension
+from ..sources.touchstone import getTouchstonePortNumber
+from ..sources.folderScan import FolderCache
+from ..sources.workers.scanFolder import ScanFolderThread
 
 # Get the folder path for pictures
 PICTURESPATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'pictures')
@@ -30,6 +35,7 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
     signalDatabaseLoadingStop    = QtCore.pyqtSignal()
     signalCSVClick         = QtCore.pyqtSignal(str, bool)
     signalNpzClick         = QtCore.pyqtSignal(str, bool)
+    signalArrayClick       = QtCore.pyqtSignal(str, bool)
     signalBlueForsClick         = QtCore.pyqtSignal(str, bool)
     signalDatabasePathUpdate         = QtCore.pyqtSignal(str)
     signalUpdateLabelPath    = QtCore.pyqtSignal(str)
@@ -57,6 +63,15 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
         self.lastClickTime = time()
         self.lastClickRow  = 100
 
+        # Folders are read in threads
+        self.threadpool = QtCore.QThreadPool()
+        self.folderCache = FolderCache()
+        self.folderScanId = 0
+        self.folderSizeItems: Dict[str, QtWidgets.QTableWidgetItem] = {}
+        self.folderSelection = ''
+        self.folderDatabase = ''
+        self.databaseStared: List[str] = []
+
     def first_call(self):
 
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
@@ -86,45 +101,75 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
         # To avoid calling the signal when starting the GUI
         self._guiInitialized = True
 
-    def folderClicked(self, directory: str) -> None:
+    def folderClicked(self, directory: str,
+                            selection: str='') -> None:
         """
         Basically display folder and csv file of the current folder.
+        The folder is read in a thread, see ScanFolderThread, the items being
+        displayed by folderEntries and their size by folderSizes.
 
         Parameters
         ----------
         directory : str
             Path of the folder to be browsed.
+        selection : str, optional
+            Item selected once the folder is displayed, by default ''.
         """
 
-        # When signal the updating of the folder to prevent unwanted item events
-        self._folderUpdating = True
         self.currentPath = directory
+        self.folderSelection = selection
 
         self.signalUpdateLabelPath.emit(directory)
 
         # Load runs extra properties
         self.properties.jsonLoad(self.currentPath)
-        databaseStared = self.properties.getDatabaseStared()
+        self.databaseStared = self.properties.getDatabaseStared()
 
-        ## Display the current dir content
         clearTableWidget(self)
-        row = 0
-        for file in sorted(os.listdir(self.currentPath), reverse=True):
+        # Items of the folder
+        # {name : size QTableWidgetItem}
+        self.folderSizeItems = {}
+
+        # Results of previous folders are ignored
+        self.folderScanId += 1
+        worker = ScanFolderThread(directory,
+                                  self.folderScanId,
+                                  self.folderCache)
+        worker.signal.entries.connect(self.folderEntries)
+        worker.signal.sizes.connect(self.folderSizes)
+        worker.signal.done.connect(self.folderDone)
+        worker.signal.error.connect(self.folderError)
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(int, list)
+    def folderEntries(self, scanId: int,
+                            entries: list) -> None:
+        """
+        Display the folders and files of the current folder, see scanFolder.
+        """
 
-            # We do not display files and folders starting with a "."
-            if file[0]=='.':
-                continue
+        if scanId!=self.folderScanId:
+            return
 
-            abs_filename = os.path.join(self.currentPath, file)
-            file_extension = os.path.splitext(abs_filename)[-1][1:]
+        # When signal the updating of the folder to prevent unwanted item events
+        self._folderUpdating = True
+
+        ## Display the current dir content
+        self.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+
+            file = entry['name']
+            file_extension = entry['extension']
 
             # Only display folder and Qcodes database
             # Add icon depending of the item type
+            item =  QtWidgets.QTableWidgetItem(file)
 
             # If folder
-            if os.path.isdir(abs_filename):
+            if entry['isDir']:
 
-                item =  QtWidgets.QTableWidgetItem(file)
                 # If looks like a BlueFors log folder
                 if isBlueForsFolder(file):
                     item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'bluefors.png')))
@@ -134,54 +179,96 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
                         item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'folderEnhanced.png')))
                     else:
                         item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'folder.png')))
-                self.insertRow(row)
                 self.setItem(row, 0, item)
-                row += 1
             # If files
             else:
-                if file not in config['forbiddenFile']:
-                    if file_extension.lower() in config['authorizedExtension']:
-
-                        # We look if the file is already opened by someone else
-                        DatabaseAlreadyOpened = False
-                        for subfile in os.listdir(self.currentPath):
-                            if subfile==file[:-2]+'db-wal':
-                                DatabaseAlreadyOpened = True
-
-                        item =  QtWidgets.QTableWidgetItem(file)
-                        if file_extension.lower()=='csv':
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'csv.png')))
-                        elif file_extension.lower()=='s2p':
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 's2p.png')))
-                        elif file_extension.lower()=='npz':
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'npz.png')))
-                        elif DatabaseAlreadyOpened and file in databaseStared:
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseOpenedStared.png')))
-                            item.setForeground(QtGui.QBrush(QtGui.QColor(255, 0, 0)))
-                        elif DatabaseAlreadyOpened:
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseOpened.png')))
-                            item.setForeground(QtGui.QBrush(QtGui.QColor(255, 0, 0)))
-                        elif file in databaseStared:
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseStared.png')))
-                        else:
-                            item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'database.png')))
-                        self.insertRow(row)
-                        self.setItem(row, 0, item)
-
-                        # Get file size in hman readable format
-                        fileSizeItem = QtWidgets.QTableWidgetItem(sizeof_fmt(os.path.getsize(abs_filename)))
-                        fileSizeItem.setTextAlignment(QtCore.Qt.AlignRight)
-                        fileSizeItem.setTextAlignment(QtCore.Qt.AlignVCenter)
-                        self.setItem(row, 1, fileSizeItem)
-                        row += 1
+                # We look if the file is already opened by someone else
+                DatabaseAlreadyOpened = entry['opened']
+
+                if file_extension=='csv':
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'csv.png')))
+                elif getTouchstonePortNumber(file)>0:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 's2p.png')))
+                elif file_extension in ('npz',)+ARRAY_EXTENSIONS:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'npz.png')))
+                elif DatabaseAlreadyOpened and file in self.databaseStared:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseOpenedStared.png')))
+                    item.setForeground(QtGui.QBrush(QtGui.QColor(255, 0, 0)))
+                elif DatabaseAlreadyOpened:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseOpened.png')))
+                    item.setForeground(QtGui.QBrush(QtGui.QColor(255, 0, 0)))
+                elif file in self.databaseStared:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'databaseStared.png')))
+                else:
+                    item.setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, 'database.png')))
+                self.setItem(row, 0, item)
+
+                # File size in human readable format, see folderSizes
+                fileSizeItem = QtWidgets.QTableWidgetItem('')
+                fileSizeItem.setTextAlignment(QtCore.Qt.AlignRight)
+                fileSizeItem.setTextAlignment(QtCore.Qt.AlignVCenter)
+                self.setItem(row, 1, fileSizeItem)
+                self.folderSizeItems[file] = fileSizeItem
+
+            if file==self.folderSelection:
+                self.setCurrentCell(row, 0)
 
-        self.setSortingEnabled(True)
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
         self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
 
         # Allow item event again
         self._folderUpdating = False
 
+
+
+    @QtCore.pyqtSlot(int, dict)
+    def folderSizes(self, scanId: int,
+                          sizes: dict) -> None:
+        """
+        Display the size of files of the current folder.
+        """
+
+        if scanId!=self.folderScanId:
+            return
+
+        for file, size in sizes.items():
+            if size is not None and file in self.folderSizeItems:
+                self.folderSizeItems[file].setText(sizeof_fmt(size))
+
+
+
+    @QtCore.pyqtSlot(int)
+    def folderDone(self, scanId: int) -> None:
+
+        if scanId!=self.folderScanId:
+            return
+
+        self.setSortingEnabled(True)
+        self.signalSendStatusBarMessage.emit('Ready', 'green')
+
+        # Database opened from the run search, see slotOpenRun
+        if self.folderDatabase!='':
+            self.databaseAbsPath = self.folderDatabase
+            self.folderDatabase = ''
+            if isLabradFolder(self.databaseAbsPath):
+                self.labradDatabaseClick()
+            else:
+                self.databaseClick()
+
+
+
+    @QtCore.pyqtSlot(int, str)
+    def folderError(self, scanId: int,
+                          message: str) -> None:
+
+        if scanId!=self.folderScanId:
+            return
+
+        self.setSortingEnabled(True)
+        self.signalSendStatusBarMessage.emit(message, 'red')
+
+
+
     def itemClicked_(self, b: Union[int, QtCore.QPoint], double_click: bool=False) -> None:
         """
         Handle event when user clicks on datafile.
@@ -205,13 +292,15 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
             if double_click and os.path.isdir(nextPath):
                 self.signalSendStatusBarMessage.emit('Updating', 'orange')
                 self.folderClicked(directory=nextPath)
-                self.signalSendStatusBarMessage.emit('Ready', 'green')
             # If the folder is a BlueFors folder
             elif isBlueForsFolder(currentItem):
                 self.blueForsClick()
-            # If it is a csv or a s2p file
-            elif nextPath[-3:].lower() in ['csv', 's2p']:
+            # If it is a csv or a Touchstone file
+            elif nextPath[-3:].lower()=='csv' or getTouchstonePortNumber(nextPath)>0:
                 self.csvClick()
+            # If it is a .npy, HDF5 or Parquet file
+            elif getExtension(nextPath) in ARRAY_EXTENSIONS:
+                self.arrayClick()
             # If it is a npz file
             elif nextPath[-3:].lower() in 'npz':
                 self.npzClick()
@@ -225,7 +314,6 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
             elif os.path.isdir(nextPath):
                 self.signalSendStatusBarMessage.emit('Updating', 'orange')
                 self.folderClicked(directory=nextPath)
-                self.signalSendStatusBarMessage.emit('Ready', 'green')
             else:
                 # If right clicked
                 if isinstance(b, QtCore.QPoint):
@@ -257,6 +345,15 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
             if time() - self.lastClickTime<0.5:
                 doubleClick = True
 
+        # Several BlueFors folders selected, shift or ctrl click, are shown
+        # as one time range
+        folderNames = [self.model().index(row, 0).data() for row in
+                       sorted(set(index.row() for index in self.selectedIndexes()))]
+        folderNames = [i for i in folderNames if isBlueForsFolder(i)]
+        if len(folderNames)>1:
+            self.databaseAbsPath = getBlueForsRangePath(self.currentPath,
+                                                        folderNames).replace("\\", "/")
+
         # We inform the tableWidgetDatabase of the the databasePath
         self.signalDatabasePathUpdate.emit(self.databaseAbsPath)
         self.signalBlueForsClick.emit(self.databaseAbsPath,
@@ -292,6 +389,21 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
         self.signalNpzClick.emit(self.databaseAbsPath,
                                  doubleClick)
 
+    def arrayClick(self, currentRow: int=0,
+                         currentColumn: int=0,
+                         previousRow: int=0,
+                         previousColumn: int=0) -> None:
+
+        doubleClick = False
+        if currentRow==self.lastClickRow:
+            if time() - self.lastClickTime<0.5:
+                doubleClick = True
+
+        # We inform the tableWidgetDatabase of the the databasePath
+        self.signalDatabasePathUpdate.emit(self.databaseAbsPath)
+        self.signalArrayClick.emit(self.databaseAbsPath,
+                                   doubleClick)
+
     def databaseClick(self) -> None:
         """
         Display the content of the clicked dataBase into the database table
@@ -438,7 +550,9 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
             iconName: New icon name
         """
 
-        self.item(row, 0).setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, iconName)))
+        # The folder may be displayed again meanwhile
+        if self.item(row, 0) is not None:
+            self.item(row, 0).setIcon(QtGui.QIcon(os.path.join(PICTURESPATH, iconName)))
 
     def rowNumberFromText(self, text: str) -> int:
         """
@@ -469,6 +583,36 @@ class TableWidgetFolder(QtWidgets.QTableWidget):
 
         self.folderClicked(directory)
 
+    @QtCore.pyqtSlot(str, int)
+    def slotOpenRun(self, databaseAbsPath: str,
+                          runId: int) -> None:
+        """
+        Called from the widgetRunSearch, display the folder of a database and
+        open it once the folder is displayed, see folderDone.
+        """
+
+        databaseAbsPath = databaseAbsPath.replace("\\", "/")
+        self.folderClicked(os.path.dirname(databaseAbsPath),
+                           os.path.basename(databaseAbsPath))
+        self.folderDatabase = databaseAbsPath
+
+    @QtCore.pyqtSlot(str)
+    def slotFolderChanged(self, directory: str) -> None:
+        """
+        Called by the FileWatcher when an item of the current folder is
+        added, removed or renamed, the folder is displayed again keeping the
+        selected item.
+        """
+
+        if directory!=self.currentPath:
+            return
+
+        selection = ''
+        if self.currentRow()>=0 and self.item(self.currentRow(), 0) is not None:
+            selection = self.item(self.currentRow(), 0).text()
+
+        self.folderClicked(directory, selection)
+
     @QtCore.pyqtSlot()
     def slotFromTableWidgetDataBaseDatabaseStars(self):
 
@@ -48,6 +48,7 @@ class TableWidgetParameter(QtWidgets.QTableWidget):
     signalLoadedDataFull   = QtCore.pyqtSignal(int, str, str, str, str, str, QtWidgets.QCheckBox, int, tuple, str, str, str, str, str, str, bool)
     signalCSVLoadData      = QtCore.pyqtSignal(str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
     signalNpzLoadData      = QtCore.pyqtSignal(str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
+    signalArrayLoadData    = QtCore.pyqtSignal(str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
     signalBlueForsLoadData = QtCore.pyqtSignal(str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
 
 
@@ -325,6 +326,17 @@ class TableWidgetParameter(QtWidgets.QTableWidget):
                                         windowTitle,
                                         cb,
                                         progressBarId)
+        elif dataType=='array':
+
+            self.signalArrayLoadData.emit(curveId,
+                                          databaseAbsPath,
+                                          dependentParamName,
+                                          plotRef,
+                                          plotTitle,
+                                          runId,
+                                          windowTitle,
+                                          cb,
+                                          progressBarId)
         elif dataType=='bluefors':
 
             self.signalBlueForsLoadData.emit(curveId,
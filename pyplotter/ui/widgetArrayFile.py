@@ -0,0 +1,316 @@
+from PyQt5 import QtWidgets, QtCore
+import os
+import numpy as np
+from typing import Dict, List, Optional
+
+from ..sources.config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..sources.arrayFile import getArrayMembers
+from ..sources.workers.loadArray import LoadArrayThread
+
+
+class WidgetArrayFile(QtWidgets.QWidget):
+
+
+    ## Bunch of signals to clean the main window when a user click on the
+    ## file in the tableWidgetFolder
+    signalLineEditSnapshotEnabled    = QtCore.pyqtSignal(bool)
+    signalLabelSnapshotEnabled       = QtCore.pyqtSignal(bool)
+    signalClearTableWidgetDatabase   = QtCore.pyqtSignal()
+    signalClearTableWidgetParameter  = QtCore.pyqtSignal()
+    signalClearSnapshot              = QtCore.pyqtSignal()
+    signalUpdateLabelCurrentSnapshot = QtCore.pyqtSignal(str)
+    signalUpdateLabelCurrentRun      = QtCore.pyqtSignal(str)
+
+    signalSendStatusBarMessage = QtCore.pyqtSignal(str, str)
+
+
+    signalUpdateProgressBar = QtCore.pyqtSignal(int, float, str)
+    signalRemoveProgressBar = QtCore.pyqtSignal(int)
+    signalFillTableWidgetParameter = QtCore.pyqtSignal(int, list, dict, dict, str, str, str, str, bool)
+    signalLoadedDataFull = QtCore.pyqtSignal(int, str, str, str, str, str, QtWidgets.QCheckBox, int, tuple, str, str, str, str, str, str, bool)
+    signalLoadedDataEmpty = QtCore.pyqtSignal(QtWidgets.QCheckBox, int)
+
+    # Send to the tableWidgetParameter
+    # Signal that the y parameter can't be plotter as function of the x one
+    # since they do not share the same size
+    signalNpzIncorrectSize = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Class handling the reading of .npy, HDF5 and Parquet files, see
+        getArrayMembers.
+        """
+
+        super(WidgetArrayFile, self).__init__(parent)
+
+        self.paramDependentList: List[dict] = []
+        self.fileAbsPath = ''
+        self.independentMember: Optional[dict] = None
+        self.arrayData: Dict[str, np.ndarray] = {}
+        self.arrayPending: Dict[str, List[tuple]] = {}
+
+        # Arrays not memory-mapped are read in threads
+        self.threadpool = QtCore.QThreadPool()
+
+
+    @QtCore.pyqtSlot(str, bool, int)
+    def arrayLoad(self, fileAbsPath: str,
+                        doubleClick: bool,
+                        progressBarId: int) -> None:
+        """
+        Signal from the tableWidgetFolder when a user click on a .npy, HDF5 or
+        Parquet file.
+        The signal went trough the StatusBar to display a progressBar.
+
+        List the arrays of the file, without reading them, and send them to
+        the tableWidgetParameter.
+        As for npz files, 1d arrays are plotted as function of the first one,
+        or of their index if there is only one.
+        2d arrays are plotted as maps as function of their indexes.
+
+        Args:
+            fileAbsPath: Absolute path of the file
+            doubleClick: If the user double click on the file or not.
+                If yes, the first dependent parameter is launched automatically.
+            progressBarId: Id of the progress bar.
+        """
+
+        fileName = os.path.basename(fileAbsPath)
+
+        self.signalSendStatusBarMessage.emit('Loading {}'.format(fileName),
+                                             'orange')
+
+        # Clean GUI
+        self.signalLineEditSnapshotEnabled.emit(False)
+        self.signalLabelSnapshotEnabled.emit(False)
+        self.signalClearTableWidgetDatabase.emit()
+        self.signalClearTableWidgetParameter.emit()
+        self.signalClearSnapshot.emit()
+        self.signalUpdateLabelCurrentSnapshot.emit('')
+        self.signalUpdateLabelCurrentRun.emit('')
+
+        try:
+            members = getArrayMembers(fileAbsPath)
+        except Exception as e:
+            self.signalSendStatusBarMessage.emit("Can't open {}: {}".format(fileName, e),
+                                                 'red')
+            self.signalRemoveProgressBar.emit(progressBarId)
+            return
+
+        curves = [member for member in members if len(member['shape'])==1]
+        maps   = [member for member in members if len(member['shape'])==2]
+
+        # 1d arrays
+        if len(curves)>1:
+            self.independentMember = curves[0]
+            self.independentParameter = curves[0]['name']
+            curves = curves[1:]
+        else:
+            self.independentMember = None
+            self.independentParameter = 'index'
+
+        self.paramDependentList = []
+        for member in curves:
+            self.paramDependentList.append({'depends_on' : [self.independentParameter],
+                                            'label' : member['name'],
+                                            'member' : member,
+                                            'shape' : member['shape'][0],
+                                            'unit' : '',
+                                            'name' : member['name']})
+
+        # 2d arrays
+        for member in maps:
+            self.paramDependentList.append({'depends_on' : ['index 0', 'index 1'],
+                                            'label' : member['name'],
+                                            'member' : member,
+                                            'shape' : list(member['shape']),
+                                            'unit' : '',
+                                            'name' : member['name']})
+
+        self.fileAbsPath = fileAbsPath
+        # Loaded arrays
+        # self.arrayData = {name : data}
+        self.arrayData = {}
+        # Data requested while their array is loaded
+        # self.arrayPending = {name : [loadData arguments]}
+        self.arrayPending = {}
+
+        # Send info to the tableWidgetParameter
+        self.signalFillTableWidgetParameter.emit(0, # runId
+                                                 self.paramDependentList, # dependentList,
+                                                 {}, # snapshotDict,
+                                                 {i['name'] : i['shape'] for i in self.paramDependentList}, # shapes
+                                                 '', # experimentName
+                                                 '', # runName
+                                                 fileAbsPath, # fileAbsPath
+                                                 'array', # dataType
+                                                 doubleClick) # doubleClick
+
+        # Once all is done, we remove the progressBar
+        self.signalRemoveProgressBar.emit(progressBarId)
+
+
+
+    QtCore.pyqtSlot(str, str, str, str, str, int, str, QtWidgets.QCheckBox, int)
+    def loadData(self, curveId: str,
+                       fileAbsPath: str,
+                       dependentParamName: str,
+                       plotRef: str,
+                       plotTitle: str,
+                       runId: int,
+                       windowTitle: str,
+                       cb: QtWidgets.QCheckBox,
+                       progressBarId: int) -> None:
+        """
+        Called from the tableWidgetParameter when a user click on a dependent
+        parameter.
+        Load the array, and the x one for a 1d array, in a thread, or use them
+        if already loaded.
+
+        Args:
+            curveId: Id of the curve.
+                See getCurveId from MainApp
+            fileAbsPath: Absolute path of the file
+            dependentParamName: name of the dependent parameter
+            plotRef: Reference of the plot
+            plotTitle: Plot title.
+            runId: Id of the QCoDeS run.
+            windowTitle: Window title.
+            cb: TableWidgetParameter checkbox associated with the dependentParameter
+            progressBarId: Id of the progress bar.
+                See statusBar widget
+        """
+
+        for paramDependent in self.paramDependentList:
+            if paramDependent['name'] == dependentParamName:
+                break
+        else:
+            self.signalLoadedDataEmpty.emit(cb, progressBarId)
+            return
+
+        members = [paramDependent['member']]
+        if len(paramDependent['depends_on'])==1 and self.independentMember is not None:
+
+            # Handle case where the x and y array doesn't have the same length
+            # The shapes are known before loading the arrays
+            if self.independentMember['shape']!=paramDependent['member']['shape']:
+                self.signalSendStatusBarMessage.emit('x, y does not have the same length',
+                                                     'red')
+                self.signalRemoveProgressBar.emit(progressBarId)
+                self.signalNpzIncorrectSize.emit(dependentParamName)
+                return
+
+            members.append(self.independentMember)
+
+        request = (curveId, fileAbsPath, dependentParamName, plotRef, plotTitle,
+                   runId, windowTitle, cb, progressBarId)
+
+        members = [member for member in members if member['name'] not in self.arrayData]
+
+        # Arrays already loaded
+        if len(members)==0:
+            self.emitLoadedData(*request)
+        # Array being loaded
+        elif dependentParamName in self.arrayPending:
+            self.arrayPending[dependentParamName].append(request)
+        else:
+            self.arrayPending[dependentParamName] = [request]
+
+            worker = LoadArrayThread(self.fileAbsPath, members)
+            worker.signal.done.connect(self.arrayMembersLoaded)
+            worker.signal.error.connect(self.arrayMembersError)
+            self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, dict)
+    def arrayMembersLoaded(self, fileAbsPath: str,
+                                 data: dict) -> None:
+        """
+        Called when arrays of the file are loaded, send the data requested
+        meanwhile.
+        Arrays of a previously loaded file are ignored.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.arrayData.update(data)
+
+        for name in list(self.arrayPending.keys()):
+            if name in self.arrayData and (self.independentMember is None or
+                                           self.independentParameter in self.arrayData):
+                for request in self.arrayPending.pop(name):
+                    self.emitLoadedData(*request)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def arrayMembersError(self, fileAbsPath: str,
+                                message: str) -> None:
+        """
+        Called when arrays of the file could not be loaded, uncheck the
+        parameters requested meanwhile.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.signalSendStatusBarMessage.emit(message, 'red')
+        for name in list(self.arrayPending.keys()):
+            if name not in self.arrayData:
+                for request in self.arrayPending.pop(name):
+                    self.signalLoadedDataEmpty.emit(request[7], request[8])
+
+
+
+    def emitLoadedData(self, curveId: str,
+                             fileAbsPath: str,
+                             dependentParamName: str,
+                             plotRef: str,
+                             plotTitle: str,
+                             runId: int,
+                             windowTitle: str,
+                             cb: QtWidgets.QCheckBox,
+                             progressBarId: int) -> None:
+
+        self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
+
+        y = self.arrayData[dependentParamName]
+
+        # 2d arrays, plotted as function of their indexes
+        if y.ndim==2:
+            data = (np.arange(y.shape[0]),
+                    np.arange(y.shape[1]),
+                    y)
+            xLabelText  = 'index 0'
+            yLabelText  = 'index 1'
+            zLabelText  = dependentParamName
+        else:
+            if self.independentMember is None:
+                x = np.arange(len(y))
+            else:
+                x = self.arrayData[self.independentParameter]
+            data = (x, y)
+            xLabelText  = self.independentParameter
+            yLabelText  = dependentParamName
+            zLabelText  = ''
+
+        # Send info to the mainWindow to launch the plot
+        self.signalLoadedDataFull.emit(runId,
+                                       curveId,
+                                       plotTitle,
+                                       windowTitle,
+                                       plotRef,
+                                       fileAbsPath,
+                                       cb,
+                                       progressBarId,
+                                       data,
+                                       xLabelText,
+                                       '', # xLabelUnits
+                                       yLabelText,
+                                       '', # yLabelUnits
+                                       zLabelText,
+                                       '', # zLabelUnits
+                                       False) # pg.DateAxisItem
@@ -1,10 +1,14 @@
 from PyQt5 import QtWidgets, QtWidgets, QtCore
 import os
-import pandas as pd
-from ..sources.functions import pandasTimestamp2Int
+import numpy as np
+from typing import Dict, List
 
 from ..sources.config import loadConfigCurrent
 config = loadConfigCurrent()
+from ..sources.blueFors import (getBlueForsRangeParameters,
+                                isBlueForsToday,
+                                BlueForsTail)
+from ..sources.workers.loadBlueFors import LoadBlueForsThread, TailBlueForsThread
 
 
 class WidgetBlueFors(QtWidgets.QWidget):
@@ -24,6 +28,8 @@ class WidgetBlueFors(QtWidgets.QWidget):
     signalRemoveProgressBar = QtCore.pyqtSignal(int)
     signalFillTableWidgetParameter = QtCore.pyqtSignal(int, list, dict, dict, str, str, str, str, bool)
     signalLoadedDataFull = QtCore.pyqtSignal(int, str, str, str, str, str, QtWidgets.QCheckBox, int, tuple, str, str, str, str, str, str, bool)
+    signalLoadedDataEmpty = QtCore.pyqtSignal(QtWidgets.QCheckBox, int)
+    signalUpdateCurve = QtCore.pyqtSignal(str, str, str, np.ndarray, np.ndarray, bool, bool)
 
     def __init__(self, parent):
         """
@@ -32,6 +38,32 @@ class WidgetBlueFors(QtWidgets.QWidget):
 
         super(WidgetBlueFors, self).__init__(parent)
 
+        self.paramDependentList: List[dict] = []
+
+        # Parameters of the parsed files
+        # self.blueForsData = {fileName : paramDependentList}
+        self.blueForsData: Dict[str, List[dict]] = {}
+        # Data requested while their file is parsed
+        # self.blueForsPending = {fileName : [loadData arguments]}
+        self.blueForsPending: Dict[str, List[tuple]] = {}
+
+        # Curves of the current day, updated while the controller writes
+        # Structure
+        # self.blueForsLive = {curveId : {'plotRef' : str,
+        #                                 'name'    : str,
+        #                                 'label'   : str,
+        #                                 'tail'    : BlueForsTail,
+        #                                 'x'       : np.ndarray,
+        #                                 'y'       : np.ndarray}}
+        self.blueForsLive: Dict[str, dict] = {}
+        self._blueForsLiveReading = False
+
+        self.blueForsLiveTimer = QtCore.QTimer()
+        self.blueForsLiveTimer.timeout.connect(self.blueForsLiveRead)
+
+        # Each BlueFors log file is parsed in its own thread
+        self.threadpool = QtCore.QThreadPool()
+
 
 
     @QtCore.pyqtSlot(str, bool, int)
@@ -54,390 +86,18 @@ class WidgetBlueFors(QtWidgets.QWidget):
         self.signalUpdateLabelCurrentRun.emit('')
 
 
-        self.paramDependentList = []
-        progress = 0.
-        progressIteration = 1/22
-        for file in sorted(os.listdir(absPath)):
-
-            fileName = file[:-13]
-            filePath = os.path.join(absPath, file)
-            # We only show file handled by the plotter
-            if fileName in config.keys():
-
-                # Maxigauges file (all pressure gauges)
-                if fileName=='maxigauge':
-
-                    df = pd.read_csv(filePath,
-                                     delimiter=',',
-                                     names=['date', 'time',
-                                         'ch1_name', 'ch1_void1', 'ch1_status', 'ch1_pressure', 'ch1_void2', 'ch1_void3',
-                                         'ch2_name', 'ch2_void1', 'ch2_status', 'ch2_pressure', 'ch2_void2', 'ch2_void3',
-                                         'ch3_name', 'ch3_void1', 'ch3_status', 'ch3_pressure', 'ch3_void2', 'ch3_void3',
-                                         'ch4_name', 'ch4_void1', 'ch4_status', 'ch4_pressure', 'ch4_void2', 'ch4_void3',
-                                         'ch5_name', 'ch5_void1', 'ch5_status', 'ch5_pressure', 'ch5_void2', 'ch5_void3',
-                                         'ch6_name', 'ch6_void1', 'ch6_status', 'ch6_pressure', 'ch6_void2', 'ch6_void3',
-                                         'void'],
-                                     header=None)
-
-                    x = pandasTimestamp2Int(pd.to_datetime(df['date']+'-'+df['time'], format='%d-%m-%y-%H:%M:%S'))
-
-                    for i in range(1, 7):
-
-                        self.signalUpdateProgressBar.emit(progressBarId, progress, 'Downloading data: {:.0f}%'.format(progress*100))
-                        progress += progressIteration
-
-                        name = 'ch'+str(i)+'_pressure'
-                        y = df[name].to_numpy()*1e-3
-                        self.paramDependentList.append({'depends_on' : ['time'],
-                                                        'name'  : config[fileName][name[:3]]['labelText'],
-                                                        'label' : config[fileName][name[:3]]['labelText'],
-                                                        'x' : x,
-                                                        'y' : y,
-                                                        'unit' : config[fileName][name[:3]]['labelUnits']})
-
-                # Status file (compressor temperatures)
-                elif fileName=='Status':
-
-                    try:
-                        # Old BlueFors log files
-                        # 1. There is a space before the day
-                        # 2. Column name are specific
-
-                        df = pd.read_csv(
-                            filePath,
-                            delimiter=",",
-                            names=[
-                                "date",
-                                "time",
-                                "tvpower1_name",
-                                "tvpower1_value",
-                                "tvbearingtemp1_name",
-                                "tvbearingtemp1_value",
-                                "tvcontrollertemp1_name",
-                                "tvcontrollertemp1_value",
-                                "tvbodytemp1_name",
-                                "tvbodytemp1_value",
-                                "tvrot1_name",
-                                "tvrot1_value",
-                                "tvlife1_name",
-                                "tvlife1_value",
-                                "nxdsf_name",
-                                "nxdsf_value",
-                                "nxdsct_name",
-                                "nxdsct_value",
-                                "nxdst_name",
-                                "nxdst_value",
-                                "nxdsbs_name",
-                                "nxdsbs_value",
-                                "nxdstrs_name",
-                                "nxdstrs_value",
-                                "tc400errorcode_name",
-                                "tc400errorcode_value",
-                                "tc400ovtempelec_name",
-                                "tc400ovtempelec_value",
-                                "tc400ovtemppump_name",
-                                "tc400ovtemppump_value",
-                                "tc400setspdatt_name",
-                                "tc400setspdatt_value",
-                                "tc400pumpaccel_name",
-                                "tc400pumpaccel_value",
-                                "tc400commerr_name",
-                                "tc400commerr_value",
-                                "ctrl_pres_name",
-                                "ctrl_pres_value",
-                                "cpastate_name",
-                                "cpastate_value",
-                                "cparun_name",
-                                "cparun_value",
-                                "cpawarn_name",
-                                "cpawarn_value",
-                                "cpaerr_name",
-                                "cpaerr_value",
-                                "cpatempwi_name",
-                                "cpatempwi_value",
-                                "cpatempwo_name",
-                                "cpatempwo_value",
-                                "cpatempo_name",
-                                "cpatempo_value",
-                                "cpatemph_name",
-                                "cpatemph_value",
-                                "cpalp_name",
-                                "cpalp_value",
-                                "cpalpa_name",
-                                "cpalpa_value",
-                                "cpahp_name",
-                                "cpahp_value",
-                                "cpahpa_name",
-                                "cpahpa_value",
-                                "cpadp_name",
-                                "cpadp_value",
-                                "cpacurrent_name",
-                                "cpacurrent_value",
-                                "cpahours_name",
-                                "cpahours_value",
-                                "cpapscale_name",
-                                "cpapscale_value",
-                                "cpatscale_name",
-                                "cpatscale_value",
-                                "cpasn_name",
-                                "cpasn_value",
-                                "cpamodel_name",
-                                "cpamodel_value",
-                            ],
-                            header=None,
-                        )
-                        x = pandasTimestamp2Int(
-                            pd.to_datetime(
-                                df["date"] + "-" + df["time"],
-                                format=" %d-%m-%y-%H:%M:%S",
-                            )
-                        )
-                    except ValueError:
-                        # Recent BlueFors log files
-                        # 1. There is no space before the day
-                        # 2. Column name are specific
-                        df = pd.read_csv(
-                            filePath,
-                            delimiter=",",
-                            names=[
-                                "date",
-                                "time",
-                                "tvpower1_name",
-                                "tvpower1_value",
-                                "tvbearingtemp1_name",
-                                "tvbearingtemp1_value",
-                                "tvcontrollertemp1_name",
-                                "tvcontrollertemp1_value",
-                                "tvbodytemp1_name",
-                                "tvbodytemp1_value",
-                                "tvrot1_name",
-                                "tvrot1_value",
-                                "tvlife1_name",
-                                "tvlife1_value",
-                                "nxdsf_name",
-                                "nxdsf_value",
-                                "nxdsct_name",
-                                "nxdsct_value",
-                                "nxdst_name",
-                                "nxdst_value",
-                                "nxdsbs_name",
-                                "nxdsbs_value",
-                                "nxdstrs_name",
-                                "nxdstrs_value",
-                                "tc400errorcode_name",
-                                "tc400errorcode_value",
-                                "tc400ovtempelec_name",
-                                "tc400ovtempelec_value",
-                                "tc400ovtemppump_name",
-                                "tc400ovtemppump_value",
-                                "tc400setspdatt_name",
-                                "tc400setspdatt_value",
-                                "tc400pumpaccel_name",
-                                "tc400pumpaccel_value",
-                                "tc400commerr_name",
-                                "tc400commerr_value",
-                                "ctrl_pres_name",
-                                "ctrl_pres_value",
-                                "cpastate_name",
-                                "cpastate_value",
-                                "cparun_name",
-                                "cparun_value",
-                                "cpawarn_name",
-                                "cpawarn_value",
-                                "cpaerr_name",
-                                "cpaerr_value",
-                                "cpatempwi_name",
-                                "cpatempwi_value",
-                                "cpatempwo_name",
-                                "cpatempwo_value",
-                                "cpatempo_name",
-                                "cpatempo_value",
-                                "cpatemph_name",
-                                "cpatemph_value",
-                                "cpalp_name",
-                                "cpalp_value",
-                                "cpalpa_name",
-                                "cpalpa_value",
-                                "cpahp_name",
-                                "cpahp_value",
-                                "cpahpa_name",
-                                "cpahpa_value",
-                                "cpadp_name",
-                                "cpadp_value",
-                                "cpacurrent_name",
-                                "cpacurrent_value",
-                                "cpahours_name",
-                                "cpahours_value",
-                                "cpapscale_name",
-                                "cpapscale_value",
-                                "cpatscale_name",
-                                "cpatscale_value",
-                                "cpasn_name",
-                                "cpasn_value",
-                                "cpamodel_name",
-                                "cpamodel_value",
-                            ],
-                            header=None,
-                        )
-                        x = pandasTimestamp2Int(
-                            pd.to_datetime(
-                                df["date"] + "-" + df["time"],
-                                format="%d-%m-%y-%H:%M:%S",
-                            )
-                        )
-                    except TypeError:
-                        # Even more recent BlueFors log files
-                        # 1. There is no space before the day
-                        # 2. Column name are specific
-                        df = pd.read_csv(
-                            filePath,
-                            delimiter=",",
-                            names=[
-                                'date',
-                                'time',
-                                'ctrl_pres_ok_name',
-                                'ctrl_pres_ok_value',
-                                'ctrl_pres_name',
-                                'ctrl_pres_value',
-                                'cpastate_name',
-                                'cpastate_value',
-                                'cparun_name',
-                                'cparun_value',
-                                'cpawarn_name',
-                                'cpawarn_value',
-                                'cpaerr_name',
-                                'cpaerr_value',
-                                'cpatempwi_name',
-                                'cpatempwi_value',
-                                'cpatempwo_name',
-                                'cpatempwo_value',
-                                'cpatempo_name',
-                                'cpatempo_value',
-                                'cpatemph_name',
-                                'cpatemph_value',
-                                'cpalp_name',
-                                'cpalp_value',
-                                'cpalpa_name',
-                                'cpalpa_value',
-                                'cpahp_name',
-                                'cpahp_value',
-                                'cpahpa_name',
-                                'cpahpa_value',
-                                'cpadp_name',
-                                'cpadp_value',
-                                'cpacurrent_name',
-                                'cpacurrent_value',
-                                'cpahours_name',
-                                'cpahours_value',
-                                'cpascale_name',
-                                'cpascale_value',
-                                'cpasn_name',
-                                'cpasn_value',
-                                'ctr_pressure_ok_name',
-                                'ctr_pressure_ok_value',
-                                'el302p_v_name',
-                                'el302p_v_value',
-                                'el302p_i_name',
-                                'el302p_i_value',
-                                'el302p_on_name',
-                                'el302p_on_value',
-                                'el302p_vo_name',
-                                'el302p_vo_value',
-                                'el302p_io_name',
-                                'el302p_io_value',
-                                'tc400actualspd_name',
-                                'tc400actualspd_value',
-                                'tc400ovtempelec_name',
-                                'tc400ovtempelec_value',
-                                'tc400ovtemppum_name',
-                                'tc400ovtemppum_value',
-                                'tc400heating_name',
-                                'tc400heating_value',
-                                'tc400pumpaccel_name',
-                                'tc400pumpaccel_value',
-                                'tc400pumpstatn_name',
-                                'tc400pumpstatn_value',
-                                'tc400remoteprio_name',
-                                'tc400remoteprio_value',
-                                'tc400spdswptatt_name',
-                                'tc400spdswptatt_value',
-                                'tc400setspdatt_name',
-                                'tc400setspdatt_value',
-                                'tc400standby_name',
-                                'tc400standby_value',
-                                'tc400actualspd_2_name',
-                                'tc400actualspd_2_value',
-                                'tc400ovtempelec_2_name',
-                                'tc400ovtempelec_2_value',
-                                'tc400ovtemppum_2_name',
-                                'tc400ovtemppum_2_value',
-                                'tc400heating_2_name',
-                                'tc400heating_2_value',
-                                'tc400pumpaccel_2_name',
-                                'tc400pumpaccel_2_value',
-                                'tc400pumpstatn_2_name',
-                                'tc400pumpstatn_2_value',
-                                'tc400remoteprio_2_name',
-                                'tc400remoteprio_2_value',
-                                'tc400spdswptatt_2_name',
-                                'tc400spdswptatt_2_value',
-                                'tc400setspdatt_2_name',
-                                'tc400setspdatt_2_value',
-                                'tc400standby_2_name',
-                                'tc400standby_2_value',
-                            ],
-                            header=None,
-                        )
-                        x = pandasTimestamp2Int(
-                            pd.to_datetime(
-                                df["date"] + "-" + df["time"],
-                                format="%d-%m-%y-%H:%M:%S",
-                            )
-                        )
-
-                    for key in config[fileName]:
-
-                        self.signalUpdateProgressBar.emit(progressBarId, progress, 'Downloading data: {:.0f}%'.format(progress*100))
-                        progress += progressIteration
-
-                        df_column_name = key+'_value'
-                        y = df[df_column_name].to_numpy()
-                        self.paramDependentList.append({'depends_on' : ['time'],
-                                                        'name'  : config[fileName][key]['labelText'],
-                                                        'label' : config[fileName][key]['labelText'],
-                                                        'x' : x,
-                                                        'y' : y,
-                                                        'unit' : config[fileName][key]['labelUnits']})
-
-                else:
-
-                    # Thermometers files
-                    df = pd.read_csv(filePath,
-                                     delimiter = ',',
-                                     names     = ['date', 'time', 'y'],
-                                     header    = None)
-
-                    self.signalUpdateProgressBar.emit(progressBarId, progress, 'Downloading data: {:.0f}%'.format(progress*100))
-                    progress += progressIteration
-
-                    try:
-                        # Old BlueFors log files
-                        # There is a space before the day
-                        x = pandasTimestamp2Int(pd.to_datetime(df['date']+'-'+df['time'], format=' %d-%m-%y-%H:%M:%S'))
-                    except ValueError:
-                        # Recent BlueFors log files
-                        # There is no space before the day
-                        x = pandasTimestamp2Int(pd.to_datetime(df['date']+'-'+df['time'], format='%d-%m-%y-%H:%M:%S'))
-
-                    y = df['y'].to_numpy()*1e-3
-
-                    self.paramDependentList.append({'depends_on' : ['time'],
-                                                    'name'  : config[fileName]['labelText'],
-                                                    'label' : config[fileName]['labelText'],
-                                                    'x' : x,
-                                                    'y' : y,
-                                                    'unit' : config[fileName]['labelUnits']})
+        # Only the parameters are listed, the files are parsed when one of
+        # their parameters is ticked, see loadData
+        # absPath is a BlueFors folder or a time range of several folders,
+        # see getBlueForsRangePath
+        self.paramDependentList = getBlueForsRangeParameters(absPath)
 
+        # Files of the previous folder still being parsed are dropped
+        for requests in self.blueForsPending.values():
+            for request in requests:
+                self.signalRemoveProgressBar.emit(request[8])
+        self.blueForsData    = {}
+        self.blueForsPending = {}
 
         self.signalFillTableWidgetParameter.emit(0, # runId
                                                  self.paramDependentList, # dependentList,
@@ -463,6 +123,84 @@ class WidgetBlueFors(QtWidgets.QWidget):
                        cb: QtWidgets.QCheckBox,
                        progressBarId: int) -> None:
 
+        # Parameters listed from the BlueFors folder
+        fileName = None
+        for paramDependent in self.paramDependentList:
+            if paramDependent['name'] == dependentParamName:
+                fileName = paramDependent['fileName']
+        if fileName is None:
+            self.signalLoadedDataEmpty.emit(cb, progressBarId)
+            return
+
+        request = (curveId, absPath, dependentParamName, plotRef, plotTitle,
+                   runId, windowTitle, cb, progressBarId)
+
+        # Files already parsed
+        if fileName in self.blueForsData:
+            self.emitLoadedData(self.blueForsData[fileName], *request)
+        # Files being parsed
+        elif fileName in self.blueForsPending:
+            self.blueForsPending[fileName].append(request)
+        else:
+            self.signalUpdateProgressBar.emit(progressBarId, 0., 'Downloading data: 0%')
+            self.blueForsPending[fileName] = [request]
+
+            worker = LoadBlueForsThread([i for i in self.paramDependentList if i['fileName']==fileName])
+            worker.signal.done.connect(self.blueForsFileLoaded)
+            worker.signal.error.connect(self.blueForsFileError)
+            self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, list)
+    def blueForsFileLoaded(self, fileName: str,
+                                 paramDependentList: list) -> None:
+        """
+        Called when the BlueFors log files of a name are parsed, send the data
+        requested meanwhile.
+        Files of a previously loaded folder are ignored.
+        """
+
+        if fileName not in self.blueForsPending:
+            return
+        filePaths = [i['filePaths'] for i in self.paramDependentList if i['fileName']==fileName]
+        if paramDependentList[0]['filePaths'] not in filePaths:
+            return
+
+        self.blueForsData[fileName] = paramDependentList
+        for request in self.blueForsPending.pop(fileName):
+            self.emitLoadedData(paramDependentList, *request)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def blueForsFileError(self, fileName: str,
+                                message: str) -> None:
+        """
+        Called when the BlueFors log files of a name could not be parsed,
+        uncheck the parameters requested meanwhile.
+        """
+
+        if fileName not in self.blueForsPending:
+            return
+
+        self.signalSendStatusBarMessage.emit(message, 'red')
+        for request in self.blueForsPending.pop(fileName):
+            self.signalLoadedDataEmpty.emit(request[7], request[8])
+
+
+
+    def emitLoadedData(self, paramDependentList: List[dict],
+                             curveId: str,
+                             absPath: str,
+                             dependentParamName: str,
+                             plotRef: str,
+                             plotTitle: str,
+                             runId: int,
+                             windowTitle: str,
+                             cb: QtWidgets.QCheckBox,
+                             progressBarId: int) -> None:
+
         self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
 
         xLabelText  = 'Time'
@@ -470,7 +208,7 @@ class WidgetBlueFors(QtWidgets.QWidget):
         zLabelText  = ''
         zLabelUnits = ''
 
-        for paramDependent in self.paramDependentList:
+        for paramDependent in paramDependentList:
             if paramDependent['name'] == dependentParamName:
                 data = (paramDependent['x'], paramDependent['y'])
                 yLabelText  = paramDependent['label']
@@ -492,3 +230,91 @@ class WidgetBlueFors(QtWidgets.QWidget):
                                        zLabelText,
                                        zLabelUnits,
                                        True) # pg.DateAxisItem
+
+        # Log files of the current day are followed
+        for paramDependent in paramDependentList:
+            if (paramDependent['name'] == dependentParamName and
+                isBlueForsToday(paramDependent['filePaths'][-1])):
+                self.blueForsLiveAdd(curveId, plotRef, paramDependent)
+
+
+
+    def blueForsLiveAdd(self, curveId: str,
+                              plotRef: str,
+                              paramDependent: dict) -> None:
+        """
+        Follow a curve of the current day, see blueForsLiveRead.
+        """
+
+        self.blueForsLive[curveId] = {'plotRef' : plotRef,
+                                      'name'    : paramDependent['name'],
+                                      'label'   : paramDependent['label'],
+                                      'tail'    : BlueForsTail(paramDependent['fileName'],
+                                                               paramDependent['filePaths'][-1],
+                                                               paramDependent['nbByte']),
+                                      'x'       : paramDependent['x'],
+                                      'y'       : paramDependent['y']}
+
+        if not self.blueForsLiveTimer.isActive():
+            self.blueForsLiveTimer.start(config['blueForsLiveDelay']*1000)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def slotRemoveCurve(self, plotRef: str,
+                              curveId: str) -> None:
+        """
+        Stop following a curve, when it is unchecked or its plot closed.
+        """
+
+        if curveId in self.blueForsLive:
+            del(self.blueForsLive[curveId])
+
+        if len(self.blueForsLive)==0:
+            self.blueForsLiveTimer.stop()
+
+
+
+    def blueForsLiveRead(self) -> None:
+        """
+        Called periodically by a QTimer, read in a thread the lines appended
+        to the log files of the curves being followed.
+        """
+
+        # The previous read is not done yet
+        if self._blueForsLiveReading:
+            return
+
+        self._blueForsLiveReading = True
+
+        worker = TailBlueForsThread({curveId : (live['tail'], live['name'])
+                                     for curveId, live in self.blueForsLive.items()})
+        worker.signal.done.connect(self.blueForsLiveUpdate)
+        worker.signal.error.connect(lambda message: self.signalSendStatusBarMessage.emit(message, 'red'))
+        self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(dict)
+    def blueForsLiveUpdate(self, data: dict) -> None:
+        """
+        Append the lines read to the curves still followed.
+        """
+
+        self._blueForsLiveReading = False
+
+        for curveId, (x, y) in data.items():
+            if curveId not in self.blueForsLive:
+                continue
+
+            live = self.blueForsLive[curveId]
+            live['x'] = np.concatenate((live['x'], x))
+            live['y'] = np.concatenate((live['y'], y))
+
+            self.signalUpdateCurve.emit(live['plotRef'],
+                                        curveId,
+                                        live['label'],
+                                        live['x'],
+                                        live['y'],
+                                        False, # autoRange
+                                        True) # interactionUpdateAll
@@ -1,10 +1,19 @@
 from PyQt5 import QtWidgets, QtCore
 import os
-from typing import Union
-import pandas as pd
-from skrf import Touchstone # To easily read s2p file
+from typing import Dict, List
 import numpy as np
 
+from ..sources.config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..sources.csvFile import sniffCsv
+from ..sources.workers.loadCsv import LoadCsvThread
+from ..sources.touchstone import (
+    getTouchstonePortNumber,
+    getTouchstoneParameters,
+    getTouchstoneQuantity,
+    loadTouchstone
+)
+
 
 
 class WidgetCSV(QtWidgets.QWidget):
@@ -25,14 +34,26 @@ class WidgetCSV(QtWidgets.QWidget):
     signalRemoveProgressBar = QtCore.pyqtSignal(int)
     signalFillTableWidgetParameter = QtCore.pyqtSignal(int, list, dict, dict, str, str, str, str, bool)
     signalLoadedDataFull = QtCore.pyqtSignal(int, str, str, str, str, str, QtWidgets.QCheckBox, int, tuple, str, str, str, str, str, str, bool)
+    signalLoadedDataEmpty = QtCore.pyqtSignal(QtWidgets.QCheckBox, int)
 
     def __init__(self, parent):
         """
-        Class handling the reading of csv file.
+        Class handling the reading of csv and Touchstone files.
         """
 
         super(WidgetCSV, self).__init__(parent)
 
+        self.paramDependentList: List[dict] = []
+        self.fileAbsPath = ''
+        self.csvFormat: dict = {}
+        self.csvData: Dict[int, np.ndarray] = {}
+        self.csvPending: Dict[int, List[tuple]] = {}
+        self.touchstone: dict = {}
+        self.touchstoneData: Dict[str, np.ndarray] = {}
+
+        # csv files are parsed in threads
+        self.threadpool = QtCore.QThreadPool()
+
 
     @QtCore.pyqtSlot(str, bool, int)
     def csvLoad(self, fileAbsPath: str,
@@ -54,89 +75,58 @@ class WidgetCSV(QtWidgets.QWidget):
         self.signalUpdateLabelCurrentRun.emit('')
 
         # csv file
+        # Only the columns are listed, they are parsed when ticked, see
+        # loadData
         if fileAbsPath[-3:].lower()=='csv':
 
             try:
-
-                ## Guess comment character
-                # We check if there is no comment on the csv file by guessing
-                # if the first character of the first line is part of a float
-                # number.
-                # If there is comment c will contain the comment character
-                # otherwise it will return None.
-                f = open(fileAbsPath, 'r')
-                c = f.readline()[0]
-                f.close()
-                if c.isnumeric() or c=='+' or c=='-':
-                    comment = None
-                else:
-                    comment = c
-
-
-                ## Determine the csv file header
-                header: Union[None, int]=None
-                if c is None:
-                    header = None
-                else:
-                    f = open(fileAbsPath, 'r')
-                    header = 0
-                    d = f.readline()
-                    while d[0]==comment:
-                        d = f.readline()
-                        header += 1
-                f.close()
-
-                ## Guess delimiter character
-                f = open(fileAbsPath, 'r')
-                d = f.readline()
-                for i in range(9):
-                    d += f.readline()
-                f.close()
-                delimiter = None
-                if ',' in d:
-                    delimiter = ','
-                elif ';' in d:
-                    delimiter = ';'
-                else:
-                    delimiter = ' '
-
-                # Get the data as panda dataframe
-                df = pd.read_csv(fileAbsPath, comment=comment, sep=delimiter, header=header)
-
-                # Get the column name as string
-                self.independentParameter = str(df.columns[0])
-                columnsName = df.columns[1:].astype(str)
-
-                x = df.values[:,0]
-                ys = df.values.T[1:]
+                csvFormat = sniffCsv(fileAbsPath)
             except Exception as e:
                 self.signalSendStatusBarMessage.emit("Can't open csv file: {}".format(e),
                                                     'red')
+                self.signalRemoveProgressBar.emit(progressBarId)
                 return
-        # s2p file
+
+            self.independentParameter = csvFormat['names'][0]
+
+            self.paramDependentList = []
+            for column, columnName in enumerate(csvFormat['names'][1:], start=1):
+                self.paramDependentList.append({'depends_on' : [''],
+                                                'label' : columnName,
+                                                'column' : column,
+                                                'unit' : '',
+                                                'name' : columnName})
+        # Touchstone file
+        # The S matrix is parsed once, the quantities of the S parameters are
+        # derived from it when ticked, see loadData
         else:
 
             try:
-                ts = Touchstone(fileAbsPath)
-                self.signalAddSnapshot.emit({'comment': ts.get_comments()})
-                self.independentParameter = 'Frequency'
-                temp = ts.get_sparameter_data("db")
-                columnsName = list(temp.keys())[1:]
-                x = temp['frequency']
-                ys = [temp[i] for i in list(temp.keys())[1:]]
+                touchstone = loadTouchstone(fileAbsPath)
             except Exception as e:
-                self.signalSendStatusBarMessage.emit("Can't open s2p file: {}".format(e),
+                self.signalSendStatusBarMessage.emit("Can't open Touchstone file: {}".format(e),
                                                     'red')
+                self.signalRemoveProgressBar.emit(progressBarId)
                 return
 
-        self.paramDependentList = []
-        for columnName, y in zip(columnsName, ys):
-            self.paramDependentList.append({'depends_on' : [''],
-                                            'label' : columnName,
-                                            'x' : x,
-                                            'y' : y,
-                                            'unit' : '',
-                                            'name' : columnName})
+            self.signalAddSnapshot.emit({'comment': touchstone['comments']})
+            self.independentParameter = 'Frequency'
+
+            csvFormat = {}
+            self.paramDependentList = getTouchstoneParameters(touchstone['nbPort'])
+            self.touchstone = touchstone
+
+        self.csvFormat   = csvFormat
+        self.fileAbsPath = fileAbsPath
+        # Parsed columns
+        # self.csvData = {column : data}
+        self.csvData: Dict[int, np.ndarray] = {}
+        # Data requested while their column is parsed
+        # self.csvPending = {column : [loadData arguments]}
+        self.csvPending: Dict[int, List[tuple]] = {}
+        # Derived quantities of the Touchstone file
+        # self.touchstoneData = {name : data}
+        self.touchstoneData: Dict[str, np.ndarray] = {}
 
         self.signalFillTableWidgetParameter.emit(0, # runId
                                                  self.paramDependentList, # dependentList,
@@ -162,16 +152,118 @@ class WidgetCSV(QtWidgets.QWidget):
                        cb: QtWidgets.QCheckBox,
                        progressBarId: int) -> None:
 
-        self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
-
         for paramDependent in self.paramDependentList:
             if paramDependent['name'] == dependentParamName:
-                data = (paramDependent['x'], paramDependent['y'])
+                break
+        else:
+            self.signalLoadedDataEmpty.emit(cb, progressBarId)
+            return
+
+        request = (curveId, fileAbsPath, dependentParamName, plotRef, plotTitle,
+                   runId, windowTitle, cb, progressBarId)
+
+        # Touchstone files are parsed at once
+        if 'port' in paramDependent:
+            if dependentParamName not in self.touchstoneData:
+                i, j = paramDependent['port']
+                try:
+                    self.touchstoneData[dependentParamName] = getTouchstoneQuantity(self.touchstone['frequency'],
+                                                                                    self.touchstone['s'][:,i,j],
+                                                                                    paramDependent['quantity'])
+                except Exception as e:
+                    self.signalSendStatusBarMessage.emit("Can't compute {}: {}".format(dependentParamName, e),
+                                                         'red')
+                    self.signalLoadedDataEmpty.emit(cb, progressBarId)
+                    return
+            self.emitLoadedData((self.touchstone['frequency'],
+                                 self.touchstoneData[dependentParamName]), *request)
+            return
+
+        column = paramDependent['column']
+        columns = [i for i in (0, column) if i not in self.csvData]
+
+        # Column already parsed
+        if len(columns)==0:
+            self.emitLoadedData((self.csvData[0], self.csvData[column]), *request)
+        # Column being parsed
+        elif column in self.csvPending:
+            self.csvPending[column].append(request)
+        else:
+            self.csvPending[column] = [request]
+
+            worker = LoadCsvThread(self.fileAbsPath,
+                                   self.csvFormat,
+                                   columns,
+                                   progressBarId)
+            worker.signal.done.connect(self.csvColumnsLoaded)
+            worker.signal.error.connect(self.csvColumnsError)
+            worker.signal.updateProgressBar.connect(self.signalUpdateProgressBar)
+            self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, dict)
+    def csvColumnsLoaded(self, fileAbsPath: str,
+                               data: dict) -> None:
+        """
+        Called when columns of the csv file are parsed, send the data requested
+        meanwhile.
+        Columns of a previously loaded file are ignored.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.csvData.update(data)
+
+        for column in list(self.csvPending.keys()):
+            if 0 in self.csvData and column in self.csvData:
+                for request in self.csvPending.pop(column):
+                    self.emitLoadedData((self.csvData[0], self.csvData[column]), *request)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def csvColumnsError(self, fileAbsPath: str,
+                              message: str) -> None:
+        """
+        Called when the csv file could not be parsed, uncheck the columns
+        requested meanwhile.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.signalSendStatusBarMessage.emit(message, 'red')
+        for column in list(self.csvPending.keys()):
+            if column not in self.csvData:
+                for request in self.csvPending.pop(column):
+                    self.signalLoadedDataEmpty.emit(request[7], request[8])
+
+
+
+    def emitLoadedData(self, data: tuple,
+                             curveId: str,
+                             fileAbsPath: str,
+                             dependentParamName: str,
+                             plotRef: str,
+                             plotTitle: str,
+                             runId: int,
+                             windowTitle: str,
+                             cb: QtWidgets.QCheckBox,
+                             progressBarId: int) -> None:
+
+        self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
 
         xLabelText  = self.independentParameter
         xLabelUnits = ''
         yLabelText  = dependentParamName
         yLabelUnits = ''
+        if getTouchstonePortNumber(fileAbsPath)>0:
+            xLabelUnits = 'Hz'
+            for paramDependent in self.paramDependentList:
+                if paramDependent['name']==dependentParamName:
+                    yLabelUnits = paramDependent['unit']
         zLabelText  = ''
         zLabelUnits = ''
 
@@ -190,4 +282,4 @@ class WidgetCSV(QtWidgets.QWidget):
                                         yLabelUnits,
                                         zLabelText,
                                         zLabelUnits,
-                                        False) # pg.DateAxisItem
\ No newline at end of file
+                                        False) # pg.DateAxisItem
@@ -1,6 +1,12 @@
 from PyQt5 import QtWidgets, QtCore
 import os
 import numpy as np
+from typing import Dict, List
+
+from ..sources.config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..sources.npzFile import getNpzMembers
+from ..sources.workers.loadNpz import LoadNpzThread
 
 
 class WidgetNpz(QtWidgets.QWidget):
@@ -23,6 +29,7 @@ class WidgetNpz(QtWidgets.QWidget):
     signalRemoveProgressBar = QtCore.pyqtSignal(int)
     signalFillTableWidgetParameter = QtCore.pyqtSignal(int, list, dict, dict, str, str, str, str, bool)
     signalLoadedDataFull = QtCore.pyqtSignal(int, str, str, str, str, str, QtWidgets.QCheckBox, int, tuple, str, str, str, str, str, str, bool)
+    signalLoadedDataEmpty = QtCore.pyqtSignal(QtWidgets.QCheckBox, int)
 
     # Send to the tableWidgetParameter
     # Signal that the npz y parameter can't be plotter as function of the x one
@@ -36,6 +43,14 @@ class WidgetNpz(QtWidgets.QWidget):
 
         super(WidgetNpz, self).__init__(parent)
 
+        self.paramDependentList: List[dict] = []
+        self.fileAbsPath = ''
+        self.npzData: Dict[str, np.ndarray] = {}
+        self.npzPending: Dict[str, List[tuple]] = {}
+
+        # Compressed arrays are decompressed in threads
+        self.threadpool = QtCore.QThreadPool()
+
 
     @QtCore.pyqtSlot(str, bool, int)
     def npzLoad(self, fileAbsPath: str,
@@ -70,19 +85,35 @@ class WidgetNpz(QtWidgets.QWidget):
         self.signalUpdateLabelCurrentRun.emit('')
 
         # Get info from the npz file
+        # Only the .npy headers are read, the arrays are loaded when ticked,
+        # see loadData
+        try:
+            members = getNpzMembers(fileAbsPath)
+        except Exception as e:
+            self.signalSendStatusBarMessage.emit("Can't open npz file: {}".format(e),
+                                                 'red')
+            self.signalRemoveProgressBar.emit(progressBarId)
+            return
+
+        self.independentMember = members[0]
+        self.independentParameter = members[0]['name']
+
         self.paramDependentList = []
-        with np.load(fileAbsPath) as file:
-            self.independentParameter = list(file.keys())[0]
-            x = list(file.values())[0]
-
-            for name, y in list(file.items())[1:]:
-                self.paramDependentList.append({'depends_on' : [self.independentParameter],
-                                                'label' : name,
-                                                'x' : x,
-                                                'y' : y,
-                                                'shape' : len(y),
-                                                'unit' : '',
-                                                'name' : name})
+        for member in members[1:]:
+            self.paramDependentList.append({'depends_on' : [self.independentParameter],
+                                            'label' : member['name'],
+                                            'member' : member,
+                                            'shape' : member['shape'][0] if len(member['shape'])>0 else 1,
+                                            'unit' : '',
+                                            'name' : member['name']})
+
+        self.fileAbsPath = fileAbsPath
+        # Loaded arrays
+        # self.npzData = {name : data}
+        self.npzData = {}
+        # Data requested while their array is loaded
+        # self.npzPending = {name : [loadData arguments]}
+        self.npzPending = {}
 
         # Send info to the tableWidgetParameter
         self.signalFillTableWidgetParameter.emit(0, # runId
@@ -132,22 +163,99 @@ class WidgetNpz(QtWidgets.QWidget):
                 See statusBar widget
         """
 
-        # Since the data are already in memory
-        self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
-
-        # Get the data of the dependent parameter from memory
         for paramDependent in self.paramDependentList:
             if paramDependent['name'] == dependentParamName:
-                data = (paramDependent['x'], paramDependent['y'])
+                break
+        else:
+            self.signalLoadedDataEmpty.emit(cb, progressBarId)
+            return
 
         # Handle case where the x and y array doesn't have the same length
-        if len(data[0])!=len(data[1]):
+        # The shapes are known before loading the arrays
+        if self.independentMember['shape'][:1]!=paramDependent['member']['shape'][:1]:
             self.signalSendStatusBarMessage.emit('x, y does not have the same length',
                                                  'red')
             self.signalRemoveProgressBar.emit(progressBarId)
             self.signalNpzIncorrectSize.emit(dependentParamName)
             return
 
+        request = (curveId, fileAbsPath, dependentParamName, plotRef, plotTitle,
+                   runId, windowTitle, cb, progressBarId)
+
+        members = [member for member in (self.independentMember, paramDependent['member'])
+                   if member['name'] not in self.npzData]
+
+        # Arrays already loaded
+        if len(members)==0:
+            self.emitLoadedData(*request)
+        # Array being loaded
+        elif dependentParamName in self.npzPending:
+            self.npzPending[dependentParamName].append(request)
+        else:
+            self.npzPending[dependentParamName] = [request]
+
+            worker = LoadNpzThread(self.fileAbsPath, members)
+            worker.signal.done.connect(self.npzMembersLoaded)
+            worker.signal.error.connect(self.npzMembersError)
+            self.threadpool.start(worker)
+
+
+
+    @QtCore.pyqtSlot(str, dict)
+    def npzMembersLoaded(self, fileAbsPath: str,
+                               data: dict) -> None:
+        """
+        Called when arrays of the npz file are loaded, send the data requested
+        meanwhile.
+        Arrays of a previously loaded file are ignored.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.npzData.update(data)
+
+        for name in list(self.npzPending.keys()):
+            if self.independentParameter in self.npzData and name in self.npzData:
+                for request in self.npzPending.pop(name):
+                    self.emitLoadedData(*request)
+
+
+
+    @QtCore.pyqtSlot(str, str)
+    def npzMembersError(self, fileAbsPath: str,
+                              message: str) -> None:
+        """
+        Called when arrays of the npz file could not be loaded, uncheck the
+        parameters requested meanwhile.
+        """
+
+        if fileAbsPath!=self.fileAbsPath:
+            return
+
+        self.signalSendStatusBarMessage.emit(message, 'red')
+        for name in list(self.npzPending.keys()):
+            if name not in self.npzData:
+                for request in self.npzPending.pop(name):
+                    self.signalLoadedDataEmpty.emit(request[7], request[8])
+
+
+
+    def emitLoadedData(self, curveId: str,
+                             fileAbsPath: str,
+                             dependentParamName: str,
+                             plotRef: str,
+                             plotTitle: str,
+                             runId: int,
+                             windowTitle: str,
+                             cb: QtWidgets.QCheckBox,
+                             progressBarId: int) -> None:
+
+        self.signalUpdateProgressBar.emit(progressBarId, 100., 'Downloading data: 100%')
+
+        data = (self.npzData[self.independentParameter],
+                self.npzData[dependentParamName])
+
         # Senfd
         xLabelText  = self.independentParameter
         xLabelUnits = ''
@@ -172,4 +280,4 @@ class WidgetNpz(QtWidgets.QWidget):
                                        yLabelUnits,
                                        zLabelText,
                                        zLabelUnits,
-                                       False) # pg.DateAxisItem
\ No newline at end of file
+                                       False) # pg.DateAxisItem
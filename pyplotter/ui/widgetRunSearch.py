@@ -0,0 +1,176 @@
+from PyQt5 import QtCore, QtWidgets
+import os
+from typing import Optional
+
+from ..sources.config import loadConfigCurrent
+config = loadConfigCurrent()
+from ..sources.runIndex import getIndexPath, searchRuns
+from ..sources.workers.indexRun import IndexRunThread
+
+
+
+class WidgetRunSearch(QtWidgets.QWidget):
+
+
+    # Propagated to the tableWidgetFolder
+    # databaseAbsPath, runId
+    signalOpenRun = QtCore.pyqtSignal(str, int)
+
+    signalSendStatusBarMessage = QtCore.pyqtSignal(str, str)
+
+
+
+    def __init__(self, parent=None) -> None:
+        """
+        Search box of the runs of all the databases of the
+        config['runIndexRoots'] folders, hidden if there is none.
+        The runs are indexed in background, see updateIndex, every
+        config['runIndexDelay'] s, the search being done on the index.
+        Double-clicking a result opens its database and selects the run.
+        """
+
+        super(WidgetRunSearch, self).__init__(parent)
+
+        self.indexPath = getIndexPath()
+
+        self.lineEditSearch = QtWidgets.QLineEdit(self)
+        self.lineEditSearch.setPlaceholderText('Search runs of all databases')
+        self.lineEditSearch.setClearButtonEnabled(True)
+
+        self.tableWidgetResult = QtWidgets.QTableWidget(self)
+        self.tableWidgetResult.setColumnCount(4)
+        self.tableWidgetResult.setHorizontalHeaderLabels(['database', 'run id', 'run name', 'started'])
+        self.tableWidgetResult.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidgetResult.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidgetResult.setAlternatingRowColors(True)
+        self.tableWidgetResult.setShowGrid(False)
+        self.tableWidgetResult.verticalHeader().setVisible(False)
+        self.tableWidgetResult.horizontalHeader().setStretchLastSection(True)
+        self.tableWidgetResult.hide()
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.lineEditSearch)
+        layout.addWidget(self.tableWidgetResult)
+
+        # The search is done once the user stops typing
+        self.timerSearch = QtCore.QTimer(self)
+        self.timerSearch.setSingleShot(True)
+        self.timerSearch.setInterval(200)
+        self.timerSearch.timeout.connect(self.search)
+        self.lineEditSearch.textChanged.connect(self.timerSearch.start)
+
+        self.tableWidgetResult.cellDoubleClicked.connect(self.resultDoubleClicked)
+
+        # The index is updated in a thread
+        self.threadpool = QtCore.QThreadPool()
+        self.workerIndex: Optional[IndexRunThread] = None
+
+        self.timerIndex = QtCore.QTimer(self)
+        self.timerIndex.setInterval(config['runIndexDelay']*1000)
+        self.timerIndex.timeout.connect(self.updateIndex)
+
+        # The first indexing is launched by MainApp
+        if len(config['runIndexRoots'])>0:
+            self.timerIndex.start()
+        else:
+            self.hide()
+
+
+
+    @QtCore.pyqtSlot()
+    def updateIndex(self) -> None:
+        """
+        Launch the indexing of the config['runIndexRoots'] folders, unless
+        the previous one is still running or there is no folder to index.
+        """
+
+        if self.workerIndex is not None or len(config['runIndexRoots'])==0:
+            return
+
+        self.workerIndex = IndexRunThread(self.indexPath,
+                                          config['runIndexRoots'])
+        self.workerIndex.signal.done.connect(self.indexDone)
+        self.workerIndex.signal.error.connect(self.indexError)
+        self.threadpool.start(self.workerIndex)
+
+
+
+    @QtCore.pyqtSlot(int)
+    def indexDone(self, nbDatabase: int) -> None:
+
+        self.workerIndex = None
+
+        # Results may have changed
+        if nbDatabase>0 and self.lineEditSearch.text()!='':
+            self.search()
+
+
+
+    @QtCore.pyqtSlot(str)
+    def indexError(self, message: str) -> None:
+
+        self.workerIndex = None
+        self.signalSendStatusBarMessage.emit(message, 'red')
+
+
+
+    def stop(self) -> None:
+        """
+        Called when the main window is closed, stop the indexing.
+        """
+
+        self.timerIndex.stop()
+        if self.workerIndex is not None:
+            self.workerIndex._stop = True
+
+
+
+    @QtCore.pyqtSlot()
+    def search(self) -> None:
+        """
+        Display the runs matching the text typed by the user.
+        """
+
+        text = self.lineEditSearch.text()
+        if text.strip()=='':
+            self.tableWidgetResult.setRowCount(0)
+            self.tableWidgetResult.hide()
+            return
+
+        runs = searchRuns(self.indexPath, text)
+
+        self.tableWidgetResult.setSortingEnabled(False)
+        self.tableWidgetResult.setRowCount(len(runs))
+        for row, (databaseAbsPath, runId, experimentName, runName, started) in enumerate(runs):
+
+            item = QtWidgets.QTableWidgetItem(os.path.basename(databaseAbsPath))
+            item.setToolTip(databaseAbsPath)
+            item.setData(QtCore.Qt.UserRole, databaseAbsPath)
+            self.tableWidgetResult.setItem(row, 0, item)
+
+            item = QtWidgets.QTableWidgetItem()
+            item.setData(QtCore.Qt.DisplayRole, runId)
+            self.tableWidgetResult.setItem(row, 1, item)
+
+            item = QtWidgets.QTableWidgetItem(runName)
+            item.setToolTip(experimentName)
+            self.tableWidgetResult.setItem(row, 2, item)
+
+            self.tableWidgetResult.setItem(row, 3, QtWidgets.QTableWidgetItem(started))
+
+        self.tableWidgetResult.resizeColumnsToContents()
+        self.tableWidgetResult.show()
+
+        self.signalSendStatusBarMessage.emit('{} runs found'.format(len(runs)), 'green')
+
+
+
+    @QtCore.pyqtSlot(int, int)
+    def resultDoubleClicked(self, row: int,
+                                  column: int) -> None:
+
+        databaseAbsPath = self.tableWidgetResult.item(row, 0).data(QtCore.Qt.UserRole)
+        runId = self.tableWidgetResult.item(row, 1).data(QtCore.Qt.DisplayRole)
+
+        self.signalOpenRun.emit(databaseAbsPath, int(runId))